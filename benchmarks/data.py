@@ -0,0 +1,49 @@
+"""
+벤치마크 입력 (합성 시장, 시드 고정)
+
+모든 스위트가 같은 시드/구간을 써서 실행마다 같은 입력을 만든다.
+이 모듈은 설정 패키지(config)를 import하지 않으므로 Scanner 스위트에서도 쓸 수 있다.
+"""
+import json
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from src.utils.synthetic_market import DEFAULT_ORIGIN_MS, MINUTE_MS, SyntheticMarketGenerator
+
+BENCH_SEED = 7
+BENCH_SYMBOLS = 20
+BENCH_HISTORY_DAYS = 14  # 1분봉 10,000개 + 여유 (블록 2개 → 준비 시간 최소화)
+
+
+@lru_cache(maxsize=None)
+def generator(symbols: int = BENCH_SYMBOLS) -> SyntheticMarketGenerator:
+    return SyntheticMarketGenerator(
+        symbols=symbols,
+        seed=BENCH_SEED,
+        now_ms=DEFAULT_ORIGIN_MS + BENCH_HISTORY_DAYS * 1440 * MINUTE_MS
+    )
+
+
+@lru_cache(maxsize=None)
+def ws_frames(minutes: int = 1, symbols: int = 5) -> List[Tuple[int, str]]:
+    """Scanner가 받는 public linear 프레임 (마지막 minutes분, (ts_ms, JSON))"""
+    gen = generator()
+    end_ms = gen.now_ms
+    return list(gen.ws_frames(end_ms - minutes * MINUTE_MS, end_ms, symbols=gen.symbols[:symbols]))
+
+
+def parsed_frames(topic_prefix: str, minutes: int = 1, symbols: int = 5) -> List[Dict]:
+    """topic_prefix로 시작하는 프레임만 파싱 (예: "orderbook.")"""
+    frames = []
+    for _, raw in ws_frames(minutes, symbols):
+        message = json.loads(raw)
+        if message.get("topic", "").startswith(topic_prefix):
+            frames.append(message)
+    return frames
+
+
+@lru_cache(maxsize=None)
+def tickers(count: int = 500) -> List[Dict]:
+    """REST tickers 목록 (심볼 count개)"""
+    gen = generator(count)
+    return [gen.ticker(symbol) for symbol in gen.symbols]
@@ -0,0 +1,173 @@
+"""
+Benchmark Harness
+핫패스 측정 (ops/sec, p50/p99 지연, 최대 메모리) + 결과 JSON + 기준선 비교
+
+- 케이스 1회 호출 = 연산 ops개 (배치). 샘플 지연은 호출 시간 / ops
+- 최소 시간(min_time)과 최소 샘플 수를 모두 채울 때까지 반복 (워밍업 1회 제외)
+- 최대 메모리는 시간 측정과 별도로 tracemalloc 아래에서 1회 더 호출해 측정 (추적 오버헤드 분리)
+"""
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+RESULT_VERSION = 1
+
+
+class Case:
+    """벤치마크 케이스"""
+
+    __slots__ = ("name", "fn", "ops")
+
+    def __init__(self, name: str, fn: Callable[[], object], ops: int = 1):
+        """
+        Args:
+            name: 케이스 이름 (그룹.대상[크기], 결과/기준선 키)
+            fn: 측정할 호출 (인자 없음, 입력은 미리 준비)
+            ops: 호출 1회당 연산 수
+        """
+        self.name = name
+        self.fn = fn
+        self.ops = ops
+
+
+def measure(case: Case, min_time: float = 1.0, min_samples: int = 5, max_samples: int = 10_000) -> Dict:
+    """케이스 1개 측정 → 결과 dict"""
+    fn = case.fn
+    fn()  # 워밍업 (지연 초기화, 캐시)
+
+    gc.collect()
+    samples: List[float] = []
+    perf = time.perf_counter
+    started = perf()
+    while len(samples) < max_samples:
+        t0 = perf()
+        fn()
+        samples.append(perf() - t0)
+        if len(samples) >= min_samples and perf() - started >= min_time:
+            break
+
+    elapsed = float(np.sum(samples))
+    per_op = np.asarray(samples) / case.ops
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops_per_sec": case.ops * len(samples) / elapsed if elapsed > 0 else 0.0,
+        "p50_us": float(np.percentile(per_op, 50)) * 1e6,
+        "p99_us": float(np.percentile(per_op, 99)) * 1e6,
+        "peak_kib": max(peak - base, 0) / 1024,
+        "samples": len(samples),
+        "ops": case.ops,
+    }
+
+
+def run_cases(cases: List[Case], min_time: float = 1.0, name_filter: str = "", log=print) -> Dict[str, Dict]:
+    """케이스 목록 측정 (name_filter: 이름에 포함된 케이스만)"""
+    results = {}
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        try:
+            result = measure(case, min_time=min_time)
+        except Exception as e:
+            log(f"  ❌ {case.name}: {e}")
+            continue
+        results[case.name] = result
+        log(
+            f"  {case.name:<45} {result['ops_per_sec']:>14,.0f} ops/s | "
+            f"p50 {result['p50_us']:>10.1f}us | p99 {result['p99_us']:>10.1f}us | "
+            f"peak {result['peak_kib']:>9,.0f}KiB"
+        )
+    return results
+
+
+def machine_info() -> Dict:
+    """결과를 만든 환경 (기준선과 환경이 다르면 비교 시 경고)"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+
+
+def build_report(results: Dict[str, Dict], quick: bool) -> Dict:
+    return {
+        "version": RESULT_VERSION,
+        "created": datetime.utcnow().isoformat() + "Z",
+        "quick": quick,
+        "machine": machine_info(),
+        "results": dict(sorted(results.items())),
+    }
+
+
+def save_report(report: Dict, path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        report = json.load(f)
+    if report.get("version") != RESULT_VERSION:
+        raise ValueError(f"지원하지 않는 결과 버전: {report.get('version')} ({path})")
+    return report
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.2, memory_floor_kib: float = 64.0) -> List[Dict]:
+    """
+    기준선 대비 변화
+
+    Args:
+        threshold: 회귀 판정 비율 (처리량 감소 또는 최대 메모리 증가)
+        memory_floor_kib: 이보다 작은 메모리 증가는 무시 (할당 잡음)
+
+    Returns:
+        케이스별 {"name", "speed", "memory", "status"} (speed = 현재/기준 처리량)
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, cur in current.get("results", {}).items():
+        base = base_results.get(name)
+        if base is None:
+            rows.append({"name": name, "speed": None, "memory": None, "status": "new"})
+            continue
+
+        speed = cur["ops_per_sec"] / base["ops_per_sec"] if base["ops_per_sec"] else None
+        memory_delta = cur["peak_kib"] - base["peak_kib"]
+        memory = cur["peak_kib"] / base["peak_kib"] if base["peak_kib"] else None
+
+        status = "ok"
+        if speed is not None and speed < 1 - threshold:
+            status = "slower"
+        elif memory is not None and memory > 1 + threshold and memory_delta > memory_floor_kib:
+            status = "memory"
+        elif speed is not None and speed > 1 + threshold:
+            status = "faster"
+        rows.append({"name": name, "speed": speed, "memory": memory, "status": status})
+
+    for name in base_results:
+        if name not in current.get("results", {}):
+            rows.append({"name": name, "speed": None, "memory": None, "status": "missing"})
+    return rows
@@ -0,0 +1,139 @@
+"""
+벤치마크 실행 / 기준선 비교
+
+스위트마다 별도 프로세스로 실행하고 (Scanner와 루트 config 패키지 충돌 회피, 메모리 격리)
+결과를 하나의 JSON으로 합친 뒤 기준선과 비교한다.
+
+실행 (저장소 루트에서):
+    python -m benchmarks.run                                   # 전체 + benchmarks/baseline.json과 비교
+    python -m benchmarks.run --quick                           # 작은 입력 / 짧은 측정
+    python -m benchmarks.run --suite scanner --filter orderbook
+    python -m benchmarks.run --suite startup                   # 서비스 콜드 스타트 (기본 실행에서 제외)
+    python -m benchmarks.run --suite analyzer                  # Analyzer 순차 vs 파이프라인 (기본 실행에서 제외)
+    python -m benchmarks.run --output results.json --fail-on-regression
+    python -m benchmarks.run --save-baseline                   # 현재 결과를 기준선으로 저장
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.harness import build_report, compare, load_report, run_cases, save_report
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SUITES = ("strategy", "scanner", "discovery", "startup", "analyzer")
+# startup은 케이스마다 프로세스를 띄우고, analyzer는 호출 1회가 수 초 (백테스트 여러 건) → 지정 시에만
+DEFAULT_SUITES = ("strategy", "scanner", "discovery")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+RESULT_MARKER = "#bench-result "
+
+STATUS_ICONS = {"ok": "✅", "faster": "🚀", "slower": "❌", "memory": "⚠️", "new": "🆕", "missing": "❔"}
+
+
+def run_suite_inline(suite: str, quick: bool, min_time: float, name_filter: str) -> dict:
+    """현재 프로세스에서 스위트 1개 실행 (자식 프로세스 진입점)"""
+    module = importlib.import_module(f"benchmarks.suite_{suite}")
+    started = time.perf_counter()
+    cases = module.cases(quick)
+    print(f"📦 {suite}: 입력 준비 {time.perf_counter() - started:.1f}s", flush=True)
+    return run_cases(cases, min_time=min_time, name_filter=name_filter, log=lambda line: print(line, flush=True))
+
+
+def run_suite(suite: str, quick: bool, min_time: float, name_filter: str) -> dict:
+    """자식 프로세스에서 스위트 1개 실행 → 결과"""
+    command = [
+        sys.executable, "-m", "benchmarks.run", "--child", suite,
+        "--min-time", str(min_time), "--filter", name_filter
+    ]
+    if quick:
+        command.append("--quick")
+
+    results = {}
+    process = subprocess.Popen(command, cwd=ROOT_DIR, stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if line.startswith(RESULT_MARKER):
+            results = json.loads(line[len(RESULT_MARKER):])
+        else:
+            print(line, end="", flush=True)
+    if process.wait() != 0:
+        print(f"❌ {suite} 스위트 실패 (종료 코드 {process.returncode})")
+    return results
+
+
+def print_comparison(rows, baseline: dict, current: dict):
+    print("=" * 60)
+    print(f"📊 기준선 비교 ({baseline.get('created', '?')})")
+    if baseline.get("machine") != current.get("machine"):
+        print("   ⚠️ 기준선과 실행 환경이 다름 (수치 차이는 환경 차이일 수 있음)")
+    if baseline.get("quick") != current.get("quick"):
+        print("   ⚠️ 기준선과 --quick 여부가 다름 (입력 크기가 다른 케이스는 new/missing)")
+    for row in rows:
+        speed = f"{row['speed']:.2f}x" if row["speed"] is not None else "-"
+        memory = f"{row['memory']:.2f}x" if row["memory"] is not None else "-"
+        print(f"  {STATUS_ICONS[row['status']]} {row['name']:<45} 처리량 {speed:>7} | 메모리 {memory:>7}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="핫패스 벤치마크")
+    parser.add_argument("--suite", action="append", choices=SUITES, help="실행할 스위트 (반복 가능, 기본 startup / analyzer 제외 전체)")
+    parser.add_argument("--filter", default="", help="이름에 포함된 케이스만")
+    parser.add_argument("--quick", action="store_true", help="작은 입력 / 케이스당 0.2초")
+    parser.add_argument("--min-time", type=float, default=0.0, help="케이스당 최소 측정 시간 (초, 기본 1.0 / quick 0.2)")
+    parser.add_argument("--output", default="", help="결과 JSON 경로")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="비교할 기준선 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀 판정 비율 (기본 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀 시 종료 코드 1")
+    parser.add_argument("--child", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    min_time = args.min_time or (0.2 if args.quick else 1.0)
+
+    if args.child:
+        results = run_suite_inline(args.child, args.quick, min_time, args.filter)
+        print(RESULT_MARKER + json.dumps(results), flush=True)
+        return
+
+    results = {}
+    for suite in args.suite or DEFAULT_SUITES:
+        results.update(run_suite(suite, args.quick, min_time, args.filter))
+
+    report = build_report(results, args.quick)
+    if args.output:
+        save_report(report, args.output)
+        print(f"💾 결과 저장: {args.output}")
+
+    partial = bool(args.suite or args.filter)
+    if args.save_baseline:
+        # 일부 스위트/케이스만 실행했으면 기존 기준선에 덮어쓰기
+        previous = load_report(args.baseline) if partial else None
+        if previous:
+            report["results"] = dict(sorted({**previous["results"], **report["results"]}.items()))
+        save_report(report, args.baseline)
+        print(f"💾 기준선 저장: {args.baseline}")
+        return
+
+    baseline = load_report(args.baseline)
+    if baseline is None:
+        print(f"ℹ️ 기준선 없음: {args.baseline} (--save-baseline으로 생성)")
+        return
+
+    rows = compare(report, baseline, threshold=args.threshold)
+    if partial:
+        rows = [row for row in rows if row["status"] != "missing"]
+    print_comparison(rows, baseline, report)
+
+    regressions = [row for row in rows if row["status"] in ("slower", "memory")]
+    if regressions:
+        print(f"❌ 회귀 {len(regressions)}건: {', '.join(row['name'] for row in regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Startup Probe
+서비스 1개의 콜드 스타트 측정 (새 프로세스에서 실행, suite_startup이 호출)
+
+    python benchmarks/startup_probe.py scanner     # → "#startup {json}" 한 줄
+
+- 컨테이너와 같은 경로 구성: 서비스 디렉터리가 sys.path[0] (/app), 저장소 루트(src/, config/)는 뒤에
+- import: 진입 스크립트 모듈 import (`if __name__ == "__main__"` 본문 제외)
+- ready: 서비스 객체 생성까지 (네트워크 연결 전 단계, 생성 중 지연 import 포함)
+- 측정 대상 import에 영향이 없도록 표준 라이브러리만 사용
+"""
+import importlib
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKER = "#startup "
+
+# 서비스 → (디렉터리, 진입 모듈, 준비 상태 함수 (진입 모듈 → 서비스 객체))
+SERVICES = {
+    "scanner": (
+        "services/scanner", "main",
+        lambda module: importlib.import_module("core.scanner_service_redis").ScannerService()
+    ),
+    "discovery": ("services/discovery", "discovery_service_redis", lambda module: module.DiscoveryServiceRedis()),
+    "analyzer": ("services/analyzer", "analyzer_service", lambda module: module.AnalyzerService()),
+    "selector": ("services/selector", "strategy_selector_service", lambda module: module.StrategySelectorService()),
+    "finder": ("services/finder", "position_finder_service", lambda module: module.PositionFinderService()),
+    "order_executor": ("services/executor", "order_executor_service", lambda module: module.OrderExecutorService()),
+    "executor": ("services/executor", "executor_service", lambda module: module.ExecutorService()),
+}
+
+
+def probe(service: str) -> dict:
+    directory, entry, ready = SERVICES[service]
+    service_dir = os.path.join(ROOT_DIR, directory)
+    sys.path[0] = service_dir
+    sys.path.append(ROOT_DIR)
+    os.chdir(service_dir)
+    # 자격 증명/엔드포인트 없이 객체 생성만 (연결은 하지 않음)
+    os.environ.setdefault("AWS_REGION", "ap-northeast-2")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "startup-probe")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "startup-probe")
+    before = set(sys.modules)
+
+    started = time.perf_counter()
+    module = importlib.import_module(entry)
+    imported = time.perf_counter()
+    ready(module)
+    finished = time.perf_counter()
+
+    loaded = set(sys.modules) - before
+    return {
+        "service": service,
+        "import_ms": round((imported - started) * 1000, 1),
+        "ready_ms": round((finished - started) * 1000, 1),
+        "modules": len(loaded),
+        "heavy": sorted(name for name in ("pandas", "numpy", "boto3", "pika", "pybit", "aiohttp", "redis") if name in loaded)
+    }
+
+
+if __name__ == "__main__":
+    result = probe(sys.argv[1])
+    sys.stdout.flush()
+    print(MARKER + json.dumps(result), flush=True)
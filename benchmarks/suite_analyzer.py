@@ -0,0 +1,93 @@
+"""
+Analyzer 처리량 - 순차 처리 vs 파이프라인 모드 (ANALYZER_PIPELINE)
+
+- 케이스 1회 = 태스크 TASKS개 (심볼별 백테스트 1건), ops = 태스크 수
+- 시장 데이터: 합성 시장 + API 호출마다 LATENCY_MS 지연 (Bybit REST 왕복 근사)
+- 저장: WRITE_MS 대기 (DynamoDB put/update 근사)
+- analyzer.compute_only: 미리 조회한 데이터로 계산만 → 파이프라인이 다가갈 계산 한계
+"""
+import time
+from typing import List
+
+from benchmarks.data import generator
+from benchmarks.harness import Case
+from src.backtesting.backtest_engine import BacktestEngine
+from src.backtesting.pipeline import BacktestPipeline
+from src.utils import structured_log
+from src.utils.bybit_client import BybitClient
+from src.utils.synthetic_market import SyntheticSession
+
+TIMEFRAME = '5'
+LATENCY_MS = 50
+WRITE_MS = 50
+DEPTH = 4
+SYMBOLS = ("ETHUSDT", "SOLUSDT", "SYN0004USDT", "SYN0005USDT")
+
+
+class _SlowSession:
+    """API 호출마다 고정 지연을 넣는 세션 래퍼"""
+
+    def __init__(self, session, latency_ms: float):
+        self._session = session
+        self._latency = latency_ms / 1000
+
+    def __getattr__(self, name):
+        attr = getattr(self._session, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            time.sleep(self._latency)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+def _compute(engine: BacktestEngine, symbol: str, data, candles: int):
+    engine.trades = []
+    engine.total_pnl = 0.0
+    engine.run_backtest(symbols=[symbol], candles=candles, timeframe=TIMEFRAME,
+                        market_data={symbol: data}, report=False)
+    return len(engine.trades)
+
+
+def _write(symbol, result):
+    time.sleep(WRITE_MS / 1000)
+
+
+def cases(quick: bool = False) -> List[Case]:
+    # 엔진 단계별 로그는 측정에서 제외
+    structured_log.setup(levels={"src.backtesting.backtest_engine": "WARNING"})
+    # 파이프라인 채우기(첫 태스크 조회) 비용이 묻히도록 호출당 태스크를 여러 개
+    tasks = [SYMBOLS[i % len(SYMBOLS)] for i in range(6 if quick else 12)]
+    candles = 100 if quick else 200
+    engine = BacktestEngine(client=BybitClient(session=_SlowSession(SyntheticSession(generator()), LATENCY_MS)))
+    prefetched = {symbol: engine.fetch_market_data(symbol, candles, TIMEFRAME) for symbol in SYMBOLS}
+
+    def fetch(symbol):
+        return engine.fetch_market_data(symbol, candles, TIMEFRAME)
+
+    def compute(symbol, data):
+        return _compute(engine, symbol, data, candles)
+
+    def sequential():
+        for symbol in tasks:
+            _write(symbol, compute(symbol, fetch(symbol)))
+
+    def pipelined():
+        pipeline = BacktestPipeline(fetch, compute, _write, lambda symbol, error: None, depth=DEPTH, name="bench")
+        pipeline.start()
+        for symbol in tasks:
+            pipeline.submit(symbol)
+        pipeline.stop(timeout=600)
+
+    def compute_only():
+        for symbol in tasks:
+            compute(symbol, prefetched[symbol])
+
+    ops = len(tasks)
+    return [
+        Case("analyzer.compute_only", compute_only, ops=ops),
+        Case("analyzer.sequential", sequential, ops=ops),
+        Case(f"analyzer.pipelined[{DEPTH}]", pipelined, ops=ops),
+    ]
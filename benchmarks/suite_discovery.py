@@ -0,0 +1,34 @@
+"""
+Discovery 핫패스 (services/discovery)
+
+- DiscoveryServiceRedis.filter_and_rank (티커 1개당, Redis 연결 없음)
+"""
+import logging
+import os
+import sys
+from typing import List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'services', 'discovery'))
+
+from benchmarks.harness import Case
+from benchmarks.data import tickers
+
+from discovery_service_redis import DiscoveryServiceRedis
+
+TICKER_COUNTS = (100, 500)  # Bybit linear 전체 ≈ 500
+
+
+def cases(quick: bool = False) -> List[Case]:
+    # 호출마다 찍히는 INFO 로그 제외
+    logging.getLogger("discovery_service_redis").setLevel(logging.WARNING)
+    service = DiscoveryServiceRedis()
+    universe = tickers(TICKER_COUNTS[-1])
+    result = []
+    for count in (TICKER_COUNTS[-1:] if quick else TICKER_COUNTS):
+        batch = universe[:count]
+        result.append(Case(
+            f"discovery.filter_and_rank[{count}]",
+            lambda batch=batch: service.filter_and_rank(batch),
+            ops=count
+        ))
+    return result
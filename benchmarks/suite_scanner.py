@@ -0,0 +1,97 @@
+"""
+Scanner 핫패스 (services/scanner)
+
+- SqueezeDetector.update (업데이트 1개당, 봉마다 진행 중 3회 + 확정 1회)
+- OrderbookAnalyzer.update / get_imbalance (호가 메시지 1개당)
+- BybitWebSocketClient._dispatch_message (토픽 라우팅, 빈 핸들러)
+
+Scanner는 자체 config 패키지(config.settings)를 쓰므로 루트 config와 같은 프로세스에서
+import할 수 없다 → run.py가 스위트마다 별도 프로세스로 실행한다.
+"""
+import asyncio
+import os
+import sys
+from typing import List
+
+SCANNER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'services', 'scanner')
+sys.path.insert(0, SCANNER_DIR)  # 루트 config보다 Scanner config 우선
+sys.path.append(os.path.join(SCANNER_DIR, 'core'))
+sys.path.append(os.path.join(SCANNER_DIR, 'managers'))
+sys.path.append(os.path.join(SCANNER_DIR, 'processors'))
+
+from benchmarks.harness import Case
+from benchmarks.data import generator, parsed_frames
+
+from orderbook_analyzer import OrderbookAnalyzer
+from squeeze_detector import SqueezeDetector
+from utils.websocket_client import BybitWebSocketClient
+
+SQUEEZE_BARS = 200
+
+
+def _squeeze_case(quick: bool) -> Case:
+    gen = generator()
+    bars = 50 if quick else SQUEEZE_BARS
+    stream = []
+    for symbol in gen.symbols:
+        for bar in gen.bars(symbol, '1', bars).tolist():
+            _, o, h, l, c = bar[:5]
+            stream += [(symbol, o, False), (symbol, h, False), (symbol, l, False), (symbol, c, True)]
+
+    detector = SqueezeDetector()
+    update = detector.update
+
+    def run():
+        for symbol, price, confirm in stream:
+            update(symbol, price, confirm)
+
+    return Case(f"scanner.squeeze_update[{len(gen.symbols)}x{bars}]", run, ops=len(stream))
+
+
+def _orderbook_cases() -> List[Case]:
+    messages = [(m["data"]["s"], m) for m in parsed_frames("orderbook.")]
+    symbols = sorted({symbol for symbol, _ in messages})
+    analyzer = OrderbookAnalyzer(depth=50)
+
+    def update():
+        # 첫 메시지가 심볼별 스냅샷이므로 반복해도 매번 재동기화
+        for symbol, message in messages:
+            analyzer.update(symbol, message)
+
+    update()
+    rounds = 1000
+
+    def imbalance():
+        for _ in range(rounds):
+            for symbol in symbols:
+                analyzer.get_imbalance(symbol)
+
+    return [
+        Case("scanner.orderbook_update[50]", update, ops=len(messages)),
+        Case("scanner.orderbook_imbalance", imbalance, ops=rounds * len(symbols)),
+    ]
+
+
+def _dispatch_case() -> Case:
+    messages = [(m["topic"], m) for m in parsed_frames("")]
+    client = BybitWebSocketClient()
+    client.capture = None
+
+    async def noop(topic, data):
+        pass
+
+    for pattern in ("tickers", "orderbook", "kline"):
+        client.register_handler(pattern, noop)
+
+    loop = asyncio.new_event_loop()
+    dispatch = client._dispatch_message
+
+    async def dispatch_all():
+        for topic, data in messages:
+            await dispatch(topic, data)
+
+    return Case("scanner.ws_dispatch", lambda: loop.run_until_complete(dispatch_all()), ops=len(messages))
+
+
+def cases(quick: bool = False) -> List[Case]:
+    return [_squeeze_case(quick)] + _orderbook_cases() + [_dispatch_case()]
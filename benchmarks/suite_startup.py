@@ -0,0 +1,79 @@
+"""
+서비스 콜드 스타트 (프로세스 시작 → import → 서비스 객체 생성)
+
+- 케이스 1회 = 새 Python 프로세스 1개 (startup_probe.py), 지연 = 프로세스 전체 벽시계 시간
+- startup.python: 빈 인터프리터 (서비스 수치에서 빼면 순수 import + 생성 비용)
+- 네트워크/AWS/RabbitMQ 불필요 (연결 전 단계까지만)
+
+구간별 수치 (import / ready / 로드된 무거운 패키지):
+    python -m benchmarks.suite_startup
+    python -m benchmarks.suite_startup --runs 10 --service scanner --service selector
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.harness import Case
+from benchmarks.startup_probe import MARKER, ROOT_DIR, SERVICES
+
+PROBE = os.path.join(ROOT_DIR, "benchmarks", "startup_probe.py")
+QUICK_SERVICES = ("scanner", "selector")
+
+
+def run_probe(service: str) -> Dict:
+    """새 프로세스에서 서비스 1개 측정 → probe 결과 + 프로세스 벽시계 시간 (wall_ms)"""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, PROBE, service], cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    line = next((l for l in completed.stdout.splitlines() if l.startswith(MARKER)), None)
+    if completed.returncode != 0 or line is None:
+        error = completed.stderr.strip().splitlines()
+        raise RuntimeError(f"{service} 시작 실패: {error[-1] if error else completed.returncode}")
+    result = json.loads(line[len(MARKER):])
+    result["wall_ms"] = round(wall_ms, 1)
+    return result
+
+
+def run_bare():
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+
+def cases(quick: bool = False) -> List[Case]:
+    result = [Case("startup.python", run_bare)]
+    for service in (QUICK_SERVICES if quick else SERVICES):
+        result.append(Case(f"startup.{service}", lambda service=service: run_probe(service)))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서비스 콜드 스타트 측정")
+    parser.add_argument("--runs", type=int, default=5, help="서비스당 반복 횟수 (중앙값)")
+    parser.add_argument("--service", action="append", choices=list(SERVICES), help="측정할 서비스 (반복 가능)")
+    args = parser.parse_args()
+
+    bare = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        run_bare()
+        bare.append((time.perf_counter() - started) * 1000)
+    print(f"빈 인터프리터: {statistics.median(bare):.0f}ms")
+    print(f"{'서비스':<16} {'import':>8} {'ready':>8} {'전체':>8} {'모듈':>6}  무거운 패키지")
+
+    for service in args.service or SERVICES:
+        runs = [run_probe(service) for _ in range(args.runs)]
+        median = {key: statistics.median(r[key] for r in runs) for key in ("import_ms", "ready_ms", "wall_ms")}
+        print(
+            f"{service:<16} {median['import_ms']:>6.0f}ms {median['ready_ms']:>6.0f}ms {median['wall_ms']:>6.0f}ms "
+            f"{runs[-1]['modules']:>6}  {', '.join(runs[-1]['heavy']) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
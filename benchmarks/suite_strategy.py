@@ -0,0 +1,130 @@
+"""
+전략/백테스트 핫패스 (src/)
+
+- Indicators.* (봉 수별)
+- EntryStrategy.analyze_entry (봉 1개당, 백테스트 루프처럼 윈도우 복사 포함)
+- BacktestEngine._simulate_trade (거래 1건당)
+- RollingFibonacci.calculate_rolling_fibonacci (출력 행 1개당)
+
+입력은 합성 시장 (네트워크 없음)
+"""
+from typing import List
+
+from benchmarks.harness import Case
+from benchmarks.data import generator
+
+from config.config import Config
+from src.backtesting.backtest_engine import BacktestEngine
+from src.strategies.entry_strategy import EntryStrategy
+from src.utils.bybit_client import BybitClient
+from src.utils.indicators import Indicators
+from src.utils.rolling_fibonacci import RollingFibonacci
+from src.utils.synthetic_market import SyntheticSession
+from src.utils.trend_analyzer import TrendAnalyzer
+
+SYMBOL = "ETHUSDT"
+INDICATOR_SIZES = (200, 1000, 10_000)
+ENTRY_BARS = 50  # analyze_entry 호출 1회 배치
+TRADES = 50
+
+
+def _indicator_cases(quick: bool) -> List[Case]:
+    cases = []
+    sizes = INDICATOR_SIZES[:2] if quick else INDICATOR_SIZES
+    for size in sizes:
+        df = generator().klines_frame(SYMBOL, '1', size)
+        high, low = float(df['high'].max()), float(df['low'].min())
+        levels = Indicators.calculate_fibonacci_levels(high, low)
+        closes = df['close'].tolist()
+
+        def near_levels(closes=closes, levels=levels):
+            for price in closes:
+                Indicators.is_near_fibonacci_level(price, levels)
+
+        cases += [
+            Case(f"indicators.bollinger[{size}]", lambda df=df: Indicators.calculate_bollinger_bands(df, Config.BB_PERIOD, Config.BB_STD)),
+            Case(f"indicators.rsi[{size}]", lambda df=df: Indicators.calculate_rsi(df, period=14)),
+            Case(f"indicators.volatility[{size}]", lambda df=df: Indicators.calculate_volatility(df, period=14)),
+            Case(f"indicators.near_fibonacci[{size}]", near_levels, ops=size),
+        ]
+    return cases
+
+
+def _entry_case(client) -> Case:
+    strategy = EntryStrategy(client)
+    entry_df = client.get_klines(SYMBOL, interval='1', limit=400)
+    btc_df = client.get_klines('BTCUSDT', interval='1', limit=60)
+    btc_trend = TrendAnalyzer.get_coin_trend(btc_df, timeframe_minutes=60)
+    btc_trend['trend_type'] = 'BTC'
+    funding_info = strategy.advanced_analyzer.get_funding_rate(client, SYMBOL)
+    instrument_info = client.get_instrument_info(SYMBOL)
+
+    mtf_fib = {}
+    for interval in Config.FIBONACCI_TIMEFRAMES:
+        df = client.get_klines(SYMBOL, interval=interval, limit=200)
+        high, low = df['high'].max(), df['low'].min()
+        mtf_fib[interval] = {
+            'levels': Indicators.calculate_fibonacci_levels(high, low),
+            'high': high, 'low': low, 'range': high - low
+        }
+
+    first = len(entry_df) - ENTRY_BARS
+
+    def analyze_bars():
+        for i in range(first, len(entry_df)):
+            window_df = entry_df.iloc[:i + 1].copy()
+            strategy.analyze_entry(
+                window_df, SYMBOL, mtf_fib,
+                btc_trend=btc_trend, funding_info=funding_info, instrument_info=instrument_info
+            )
+
+    return Case("strategy.analyze_entry", analyze_bars, ops=ENTRY_BARS)
+
+
+def _simulate_case(client) -> Case:
+    engine = BacktestEngine(client=client)
+    df = client.get_klines(SYMBOL, interval='1', limit=1000)
+    signals = []
+    step = (len(df) - 200) // TRADES
+    for n in range(TRADES):
+        i = n * step
+        price = float(df['close'].iloc[i])
+        position_type = 'LONG' if n % 2 == 0 else 'SHORT'
+        sign = 1 if position_type == 'LONG' else -1
+        signals.append((i, {
+            'symbol': SYMBOL,
+            'type': position_type,
+            'timestamp': df['timestamp'].iloc[i],
+            'entry_price': price,
+            'stop_loss': price * (1 - sign * 0.005),
+            'take_profit': price * (1 + sign * 0.01),
+            'position_size': 100.0,
+            'leverage': 10,
+        }))
+
+    def simulate():
+        for i, signal in signals:
+            engine._simulate_trade(df, i, signal)
+
+    return Case("backtest.simulate_trade", simulate, ops=TRADES)
+
+
+def _rolling_fib_cases(quick: bool) -> List[Case]:
+    cases = []
+    for size in ((500,) if quick else (500, 2000)):
+        df = generator().klines_frame(SYMBOL, '5', size)
+        cases.append(Case(
+            f"fibonacci.rolling[{size}]",
+            lambda df=df: RollingFibonacci.calculate_rolling_fibonacci(df, lookback_period=100),
+            ops=size - 100
+        ))
+    return cases
+
+
+def cases(quick: bool = False) -> List[Case]:
+    client = BybitClient(session=SyntheticSession(generator()))
+    return (
+        _indicator_cases(quick)
+        + [_entry_case(client), _simulate_case(client)]
+        + _rolling_fib_cases(quick)
+    )
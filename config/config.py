@@ -8,6 +8,7 @@ class Config:
     BYBIT_API_KEY = os.getenv('BYBIT_API_KEY', '')
     BYBIT_API_SECRET = os.getenv('BYBIT_API_SECRET', '')
     BYBIT_TESTNET = os.getenv('BYBIT_TESTNET', 'True') == 'True'
+    BYBIT_REST_URL = os.getenv('BYBIT_REST_URL', '')  # 비어 있으면 pybit 기본 (로컬 fake 거래소 등으로 교체 가능)
     
     # 백테스팅 설정
     BACKTEST_CANDLES = 1000  # 백테스팅할 캔들 수
@@ -55,3 +56,6 @@ class Config:
     
     # 스케줄링
     SCAN_INTERVAL_MINUTES = 5  # 스캔 주기 (분) - 단타용
+    
+    # Scanner 합성 캔들 (Redis, 예: redis://localhost:6379) - 비어 있으면 REST만 사용
+    LOCAL_CANDLES_REDIS_URL = os.getenv('LOCAL_CANDLES_REDIS_URL', '')
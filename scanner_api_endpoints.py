@@ -3,10 +3,25 @@ Scanner V2 모니터링 API 엔드포인트
 로컬 백엔드에 추가할 API 함수들
 """
 import json
+import os
 import subprocess
 import re
+import time
+import urllib.request
+from collections import deque
 from datetime import datetime, timedelta
 
+# Scanner /metrics 주소 (쉼표 구분, 멀티 프로세스 워커별 포트 가능)
+# 예: http://scanner:9100/metrics,http://scanner:9101/metrics
+SCANNER_METRICS_URL = os.getenv("SCANNER_METRICS_URL", "")
+
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(.*)\})?\s+(\S+)$')
+_LABEL_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+OPPORTUNITY_WINDOW_SEC = 3600
+# /metrics 주소별 (조회 시각, 누적 기회 수, Scanner 프로세스 시작 시각) - 1시간 증가분 계산용
+_opportunity_samples = {}
+
 def get_scanner_status():
     """Scanner 서비스 상태 조회"""
     try:
@@ -68,8 +83,106 @@ def get_scanner_logs(minutes=5):
     except:
         return []
 
+def parse_metrics(text):
+    """Prometheus 텍스트 형식 → {이름: [(라벨 dict, 값), ...]}"""
+    metrics = {}
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        match = _SAMPLE_RE.match(line.strip())
+        if not match:
+            continue
+        name, _, labels, value = match.groups()
+        metrics.setdefault(name, []).append((dict(_LABEL_RE.findall(labels or '')), float(value)))
+    return metrics
+
+def _metrics_urls(urls=None):
+    return [u.strip() for u in (urls or SCANNER_METRICS_URL).split(',') if u.strip()]
+
+def _fetch_metrics(url):
+    with urllib.request.urlopen(url, timeout=3) as resp:
+        return parse_metrics(resp.read().decode('utf-8'))
+
+def get_scanner_metrics(urls=None):
+    """Scanner /metrics 조회 (여러 워커면 같은 이름끼리 합침), 실패 시 None"""
+    urls = _metrics_urls(urls)
+    if not urls:
+        return None
+    merged = {}
+    try:
+        for url in urls:
+            for name, samples in _fetch_metrics(url).items():
+                merged.setdefault(name, []).extend(samples)
+        return merged
+    except Exception:
+        return None
+
+def metric_total(metrics, name, **labels):
+    """샘플 합계 (labels로 필터)"""
+    return sum(
+        value for sample_labels, value in metrics.get(name, [])
+        if all(sample_labels.get(k) == v for k, v in labels.items())
+    )
+
+def get_opportunities_sent():
+    """
+    Scanner 시작 후 누적 발행 기회 수 (/metrics 카운터)
+
+    프로세스 재시작 시 0부터 다시 센다. SCANNER_METRICS_URL이 없거나 조회 실패 시 None
+    """
+    metrics = get_scanner_metrics()
+    if metrics is None:
+        return None
+    return int(metric_total(metrics, 'scanner_opportunities_sent_total'))
+
+def _windowed_count(url, value, started, now, window):
+    """
+    누적 카운터 → 최근 window초 증가분
+
+    - Scanner가 window 안에 시작했으면 누적값 전체 (재시작 전 발행분은 제외)
+    - window 전 샘플이 있으면 그 샘플과의 차이
+    - 아직 없으면 (API가 막 시작) 시작 후 평균 속도로 추정
+    """
+    samples = _opportunity_samples.setdefault(url, deque())
+    if samples and samples[-1][2] != started:
+        samples.clear()  # Scanner 재시작 → 이전 카운터와 비교 불가
+    samples.append((now, value, started))
+    # window보다 오래된 샘플은 기준점 1개만 남김
+    while len(samples) > 1 and samples[1][0] <= now - window:
+        samples.popleft()
+
+    if started >= now - window:
+        return value
+    base_time, base_value, _ = samples[0]
+    if base_time <= now - window:
+        return value - base_value
+    return value * window / max(now - started, 1)
+
 def get_opportunities_count():
-    """발행된 기회 신호 개수 조회"""
+    """
+    최근 1시간 발행된 기회 신호 개수 조회
+
+    SCANNER_METRICS_URL이 있으면 /metrics 카운터(scanner_opportunities_sent_total)의
+    1시간 증가분 (워커별 합, 조회 실패 시 None), 없으면 CloudWatch 로그에서 집계
+    """
+    urls = _metrics_urls()
+    if not urls:
+        return _count_opportunities_from_logs()
+
+    now = time.time()
+    total = 0.0
+    try:
+        for url in urls:
+            metrics = _fetch_metrics(url)
+            value = metric_total(metrics, 'scanner_opportunities_sent_total')
+            started = metric_total(metrics, 'process_start_time_seconds')
+            total += _windowed_count(url, value, started, now, OPPORTUNITY_WINDOW_SEC)
+    except Exception:
+        return None
+    return int(round(total))
+
+def _count_opportunities_from_logs():
+    """최근 1시간 발행된 기회 신호 개수 (CloudWatch 로그에서 집계)"""
     try:
         since_time = datetime.now() - timedelta(hours=1)
         since_str = f"{int(since_time.timestamp())}000"
@@ -117,5 +230,22 @@ def api_scanner_logs():
 @app.route('/api/scanner/opportunities')
 def api_scanner_opportunities():
     count = get_opportunities_count()
-    return jsonify({'success': True, 'data': {'total': count}})
+    if count is None:
+        return jsonify({'success': False})
+    sent = get_opportunities_sent()
+    return jsonify({'success': True, 'data': {'total': count, 'sent_since_start': sent}})
+
+@app.route('/api/scanner/metrics')
+def api_scanner_metrics():
+    metrics = get_scanner_metrics()
+    if metrics is None:
+        return jsonify({'success': False})
+    return jsonify({'success': True, 'data': {
+        'received': metric_total(metrics, 'scanner_messages_received_total'),
+        'dropped': metric_total(metrics, 'scanner_messages_dropped_total'),
+        'queue_depth': metric_total(metrics, 'scanner_ingest_queue_depth'),
+        'emitted': metric_total(metrics, 'scanner_emissions_total'),
+        'suppressed': metric_total(metrics, 'scanner_emissions_suppressed_total'),
+        'reconnects': metric_total(metrics, 'scanner_ws_reconnects_total')
+    }})
 """
@@ -5,14 +5,22 @@ Auto-scaling으로 1-10개 컨테이너 실행
 import os
 import json
 import time
+import functools
 import boto3
 import pika
 from decimal import Decimal
 from datetime import datetime, timezone
 from src.backtesting.backtest_engine import BacktestEngine
+from src.backtesting.pipeline import BacktestPipeline
+from src.utils.stage_profiler import profiled
+from src.utils import api_accounting, structured_log, trace_context
+from src.utils.api_accounting import ApiBudgetExceeded
+from src.utils.trace_context import span
 from config.config import Config
 import pandas as pd
 
+logger = structured_log.get_logger("analyzer")
+
 def convert_floats_to_decimal(obj):
     """재귀적으로 float를 Decimal로 변환"""
     if isinstance(obj, float):
@@ -39,6 +47,15 @@ class AnalyzerService:
         
         self.analyzer_id = os.getenv('HOSTNAME', 'analyzer-1')
         self.prefetch_count = int(os.getenv('PREFETCH_COUNT', '1'))  # 동시 처리 수
+        
+        # 파이프라인 모드: 다음 N개 태스크의 시장 데이터를 미리 조회 + DynamoDB 저장은 백그라운드 (0 = 순차 처리)
+        self.pipeline_depth = int(os.getenv('ANALYZER_PIPELINE', '0'))
+        if self.pipeline_depth > 0:
+            # 조회 대기 N개 + 계산 중 1개 (저장 후 ACK → 저장 대기분도 이 안에 포함, 콜백이 막히지 않음)
+            self.prefetch_count = self.pipeline_depth + 1
+        self.pipeline = None
+        self.connection = None
+        self.message_counts = structured_log.counters("analyzer.messages")
     
     def connect_rabbitmq(self):
         """RabbitMQ 연결"""
@@ -68,15 +85,19 @@ class AnalyzerService:
         
         return connection, channel
     
-    def analyze_coin(self, message):
-        """코인 백테스팅 수행"""
+    @profiled("analyze_coin")
+    def analyze_coin(self, message, market_data=None, report=True):
+        """코인 백테스팅 수행
+
+        Args:
+            market_data: 미리 조회한 MarketData (파이프라인 모드, 없으면 엔진이 조회)
+            report: 엔진 전체 리포트 + 거래 내역 CSV
+        """
         scan_id = message['scan_id']
         symbol = message['symbol']
         timeframe = message['timeframe']
         
-        print(f"\n{'='*80}")
-        print(f"📊 분석 시작: {symbol} ({timeframe}분봉)")
-        print(f"{'='*80}\n")
+        logger.info(f"📊 분석 시작: {symbol} ({timeframe}분봉)")
         
         start_time = time.time()
         
@@ -87,10 +108,16 @@ class AnalyzerService:
             self.engine.run_backtest(
                 symbols=[symbol],
                 candles=Config.BACKTEST_CANDLES,
-                timeframe=timeframe
+                timeframe=timeframe,
+                market_data={symbol: market_data} if market_data is not None else None,
+                report=report
             )
+            if symbol in self.engine.budget_exceeded:
+                raise self.engine.budget_exceeded[symbol]
             
             analysis_time = time.time() - start_time
+            if market_data is not None:
+                analysis_time += market_data.fetch_seconds()  # 조회 스레드에서 쓴 시간 (순차 처리와 같은 기준)
             
             # 결과 집계
             if self.engine.trades:
@@ -136,16 +163,19 @@ class AnalyzerService:
                     'status': 'no_trades'
                 }
             
-            print(f"\n✅ 분석 완료: {symbol} ({timeframe}분봉)")
-            print(f"  - 거래 수: {result['total_trades']}")
-            print(f"  - 승률: {result['win_rate']}%")
-            print(f"  - 수익: ${result['total_pnl']}")
-            print(f"  - 소요 시간: {result['analysis_time']}초\n")
+            logger.info(
+                f"✅ 분석 완료: {symbol} ({timeframe}분봉) | 거래 {result['total_trades']}건, 승률 {result['win_rate']}%, "
+                f"수익 ${result['total_pnl']}, {result['analysis_time']}초"
+            )
+            self.message_counts.incr(result['status'])
             
             return result
             
+        except ApiBudgetExceeded:
+            raise  # 중단된 분석은 결과로 저장하지 않음 (호출자가 NACK)
         except Exception as e:
-            print(f"\n❌ 분석 실패: {symbol} ({timeframe}분봉) - {e}\n")
+            logger.exception(f"❌ 분석 실패: {symbol} ({timeframe}분봉) - {e}")
+            self.message_counts.incr("failed")
             return {
                 'total_trades': 0,
                 'win_rate': 0,
@@ -159,6 +189,7 @@ class AnalyzerService:
                 'error': str(e)
             }
     
+    @profiled("save_result")
     def save_result(self, message, timeframe_result):
         """DynamoDB에 결과 저장"""
         scan_id = message['scan_id']
@@ -193,7 +224,8 @@ class AnalyzerService:
                     ':opt_tf': best_tf[0],
                     ':opt_pnl': convert_floats_to_decimal(best_tf[1]['total_pnl']),
                     ':opt_wr': convert_floats_to_decimal(best_tf[1]['win_rate']),
-                    ':updated': datetime.now(timezone.utc).isoformat()
+                    ':updated': datetime.now(timezone.utc).isoformat(),
+                    ':trace': message.get('trace')
                 }
                 
                 self.results_table.update_item(
@@ -203,11 +235,12 @@ class AnalyzerService:
                     },
                     UpdateExpression='SET timeframes = :tf, optimal_timeframe = :opt_tf, '
                                    'optimal_pnl = :opt_pnl, optimal_win_rate = :opt_wr, '
-                                   'updated_at = :updated',
+                                   'updated_at = :updated, #trace = :trace',
+                    ExpressionAttributeNames={'#trace': 'trace'},
                     ExpressionAttributeValues=update_values
                 )
                 
-                print(f"✅ DynamoDB 업데이트: {symbol} ({timeframe}분봉)")
+                logger.debug(f"✅ DynamoDB 업데이트: {symbol} ({timeframe}분봉)")
                 
             else:
                 # 새 레코드 생성
@@ -234,71 +267,155 @@ class AnalyzerService:
                     'created_at': datetime.now(timezone.utc).isoformat(),
                     'updated_at': datetime.now(timezone.utc).isoformat(),
                     'version': 1,
-                    'status': 'active'
+                    'status': 'active',
+                    'trace': message.get('trace')
                 }
                 
                 # Float를 Decimal로 변환
                 item = convert_floats_to_decimal(item)
                 
                 self.results_table.put_item(Item=item)
-                print(f"✅ DynamoDB 저장: {symbol} ({timeframe}분봉)")
+                logger.debug(f"✅ DynamoDB 저장: {symbol} ({timeframe}분봉)")
                 
         except Exception as e:
-            print(f"❌ DynamoDB 저장 실패: {symbol} ({timeframe}분봉) - {e}")
+            logger.error(f"❌ DynamoDB 저장 실패: {symbol} ({timeframe}분봉) - {e}")
+            self.message_counts.incr("save_failed")
     
+    @profiled("analyzer.process_message")
     def process_message(self, ch, method, properties, body):
         """메시지 처리 콜백"""
         try:
             message = json.loads(body)
             
-            # 백테스팅 수행
-            result = self.analyze_coin(message)
+            # 트레이스 (태스크 발행 측에서 시작하지 않았으면 여기서 시작)
+            trace = trace_context.extract(message) or trace_context.new_trace()
             
-            # DynamoDB에 저장
-            self.save_result(message, result)
+            # 백테스팅 수행 (메시지 1건의 API 사용량 → 결과 아이템에 기록)
+            label = f"analyzer {message.get('symbol')} {message.get('timeframe')}m"
+            with span(trace, "analyzer.backtest"), api_accounting.footprint(label) as fp:
+                result = self.analyze_coin(message)
+            result['api_calls'] = fp.total.calls
+            result['api_bytes'] = fp.total.bytes
+            logger.info(fp.summary())
+            
+            # DynamoDB에 저장 (결과 아이템에 트레이스 포함 → Selector로 전달)
+            trace_context.inject(message, trace)
+            with span(trace, "analyzer.save"):
+                self.save_result(message, result)
+            trace_context.report(trace, "saved", self.analyzer_id)
             
             # ACK (성공)
             ch.basic_ack(delivery_tag=method.delivery_tag)
             
+        except ApiBudgetExceeded as e:
+            # 예산은 실행마다 같으므로 재전달해도 다시 초과 → 저장/재시도 없이 거부
+            logger.error(f"❌ {e} - 메시지 거부 (저장 안 함)")
+            self.message_counts.incr("budget_exceeded")
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
         except Exception as e:
-            print(f"❌ 메시지 처리 실패: {e}")
+            logger.exception(f"❌ 메시지 처리 실패: {e}")
             # NACK (실패 - 재시도)
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
     
+    # === 파이프라인 모드 (ANALYZER_PIPELINE=N) ===
+    # 수신 콜백 → 조회 스레드 N개 (시장 데이터) → 계산 스레드 1개 (백테스트) → 저장 스레드 (DynamoDB) → ACK
+    
+    def enqueue_message(self, ch, method, properties, body):
+        """메시지 수신 콜백 (파이프라인 모드) - 바로 조회 시작, ACK/NACK는 저장 후 finish_task"""
+        try:
+            message = json.loads(body)
+        except Exception as e:
+            logger.exception(f"❌ 메시지 처리 실패: {e}")
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            return
+        
+        trace = trace_context.extract(message) or trace_context.new_trace()
+        self.pipeline.submit({'channel': ch, 'delivery_tag': method.delivery_tag, 'message': message, 'trace': trace})
+    
+    def prefetch_task(self, task):
+        """조회 단계 (조회 스레드) - 백테스트에 필요한 API 호출 전부"""
+        message = task['message']
+        label = f"analyzer {message.get('symbol')} {message.get('timeframe')}m"
+        with span(task['trace'], "analyzer.prefetch"), api_accounting.footprint(label) as fp:
+            market_data = self.engine.fetch_market_data(message['symbol'], Config.BACKTEST_CANDLES, message['timeframe'])
+        return market_data, fp
+    
+    def compute_task(self, task, prefetched):
+        """계산 단계 (계산 스레드) - 미리 조회한 데이터로 백테스트 (엔진 리포트/CSV 생략)"""
+        market_data, fetch_fp = prefetched
+        message = task['message']
+        with span(task['trace'], "analyzer.backtest"), api_accounting.footprint(fetch_fp.label) as fp:
+            result = self.analyze_coin(message, market_data=market_data, report=False)
+        result['api_calls'] = fetch_fp.total.calls + fp.total.calls
+        result['api_bytes'] = fetch_fp.total.bytes + fp.total.bytes
+        logger.info(fetch_fp.summary())
+        return result
+    
+    def write_task(self, task, result):
+        """저장 단계 (저장 스레드 1개 → 같은 심볼의 타임프레임별 조회-갱신이 겹치지 않음)"""
+        message, trace = task['message'], task['trace']
+        trace_context.inject(message, trace)
+        with span(trace, "analyzer.save"):
+            self.save_result(message, result)
+        trace_context.report(trace, "saved", self.analyzer_id)
+    
+    def finish_task(self, task, error):
+        """ACK (성공) / NACK (실패 - 재시도, 예산 초과 - 거부) - 채널은 연결 스레드에서만 사용"""
+        ch, delivery_tag = task['channel'], task['delivery_tag']
+        if error is None:
+            callback = functools.partial(ch.basic_ack, delivery_tag=delivery_tag)
+        elif isinstance(error, ApiBudgetExceeded):
+            # 조회/계산 중 예산 초과 → 저장하지 않고 거부 (재전달해도 다시 초과)
+            self.message_counts.incr("budget_exceeded")
+            callback = functools.partial(ch.basic_nack, delivery_tag=delivery_tag, requeue=False)
+        else:
+            callback = functools.partial(ch.basic_nack, delivery_tag=delivery_tag, requeue=True)
+        self.connection.add_callback_threadsafe(callback)
+    
     def run(self):
         """메인 실행 로직"""
-        print(f"\n{'='*80}")
-        print(f"🚀 Analyzer Service 시작")
-        print(f"{'='*80}")
-        print(f"Analyzer ID: {self.analyzer_id}")
-        print(f"RabbitMQ: {self.rabbitmq_host}:{self.rabbitmq_port}")
-        print(f"Queue: {self.queue_name}")
-        print(f"Prefetch: {self.prefetch_count}")
-        print(f"DynamoDB: {self.results_table.table_name}")
-        print(f"{'='*80}\n")
+        logger.info(
+            f"🚀 Analyzer Service 시작 | ID {self.analyzer_id} | RabbitMQ {self.rabbitmq_host}:{self.rabbitmq_port} | "
+            f"Queue {self.queue_name} (prefetch {self.prefetch_count}) | DynamoDB {self.results_table.table_name}"
+        )
         
         connection, channel = self.connect_rabbitmq()
+        self.connection = connection
+        
+        on_message = self.process_message
+        if self.pipeline_depth > 0:
+            self.pipeline = BacktestPipeline(
+                self.prefetch_task, self.compute_task, self.write_task, self.finish_task,
+                depth=self.pipeline_depth
+            )
+            self.pipeline.start()
+            on_message = self.enqueue_message
+            logger.info(f"🔀 파이프라인 모드: 미리 조회 {self.pipeline_depth}개, DynamoDB 저장 백그라운드")
         
         try:
             # 메시지 소비 시작
             channel.basic_consume(
                 queue=self.queue_name,
-                on_message_callback=self.process_message,
+                on_message_callback=on_message,
                 auto_ack=False  # 수동 ACK
             )
             
-            print(f"✅ 메시지 대기 중... (Ctrl+C로 종료)\n")
+            logger.info(f"✅ 메시지 대기 중... (Ctrl+C로 종료)")
             channel.start_consuming()
             
         except KeyboardInterrupt:
-            print(f"\n\n{'='*80}")
-            print(f"⏹️  Analyzer Service 종료")
-            print(f"{'='*80}\n")
+            logger.info(f"⏹️  Analyzer Service 종료")
             channel.stop_consuming()
+            if self.pipeline is not None:
+                # 받은 태스크는 끝까지 처리하고 ACK 전송 (남은 미확인 메시지는 연결 종료 시 재전달)
+                self.pipeline.stop()
+                connection.process_data_events(time_limit=0)
             
         finally:
             connection.close()
 
 if __name__ == "__main__":
+    # 백테스트 엔진의 단계별 진행/리포트는 메시지마다 수십 줄 → 기본 WARNING (LOG_LEVELS로 조정)
+    structured_log.setup("analyzer", levels={"src.backtesting.backtest_engine": "WARNING"})
     service = AnalyzerService()
     service.run()
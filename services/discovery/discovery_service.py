@@ -2,6 +2,7 @@
 Discovery Service
 전체 시장 스캔 및 Top N 선정 (REST API 기반)
 """
+import os
 import time
 import logging
 import sys
@@ -12,12 +13,13 @@ from datetime import datetime
 
 import pika
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+# 공통 라이브러리 (src/) - 컨테이너에서는 /app/src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils import structured_log, trace_context
+from src.utils.trace_context import span
+
+# 로깅 설정 (큐 핸들러 + 쓰기 스레드)
+structured_log.setup("discovery", fmt="text")
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +27,7 @@ class DiscoveryService:
     """시장 발견 서비스 - REST API 기반"""
     
     def __init__(self):
-        self.bybit_api_url = "https://api.bybit.com/v5/market/tickers"
+        self.bybit_api_url = os.getenv("BYBIT_REST_URL", "https://api.bybit.com").rstrip("/") + "/v5/market/tickers"
         self.rabbitmq_host = "localhost"  # 환경 변수로 대체 가능
         self.rabbitmq_port = 5672
         self.rabbitmq_user = "admin"
@@ -149,7 +151,7 @@ class DiscoveryService:
         
         return filtered[:self.top_n]
     
-    def publish_discovery(self, top_symbols: List[Dict]) -> bool:
+    def publish_discovery(self, top_symbols: List[Dict], trace: Dict = None) -> bool:
         """발견 결과 발행"""
         try:
             if not self.connection or self.connection.is_closed:
@@ -162,6 +164,7 @@ class DiscoveryService:
                 "symbols": [s["symbol"] for s in top_symbols],
                 "details": top_symbols
             }
+            trace_context.inject(message, trace)
             
             self.channel.basic_publish(
                 exchange='',
@@ -190,6 +193,10 @@ class DiscoveryService:
         logger.info("🔍 Discovery 시작")
         logger.info("=" * 60)
         
+        # 트레이스 시작 (발행 페이로드에 실려 Scanner/Analyzer로 전달)
+        trace = trace_context.new_trace()
+        scan_start = trace_context.now_ms()
+        
         # 1. 전체 티커 조회
         tickers = self.fetch_all_tickers()
         if not tickers:
@@ -202,8 +209,12 @@ class DiscoveryService:
             logger.warning("⚠️ 필터링 결과 없음 - 스킵")
             return
         
+        trace_context.add_span(trace, "discovery.scan", scan_start)
+        
         # 3. 발행
-        self.publish_discovery(top_symbols)
+        with span(trace, "discovery.publish"):
+            published = self.publish_discovery(top_symbols, trace)
+        trace_context.report(trace, "published" if published else "failed")
         
         logger.info("=" * 60)
     
@@ -2,6 +2,7 @@
 Discovery Service - Redis 기반
 Scanner 수에 따라 동적으로 Top N 조정
 """
+import os
 import time
 import logging
 import sys
@@ -12,12 +13,14 @@ from datetime import datetime
 
 import redis
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+# 공통 라이브러리 (src/) - 컨테이너에서는 /app/src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.scanner_membership import ScannerMembership
+from src.utils import structured_log, trace_context
+from src.utils.trace_context import span
+
+# 로깅 설정 (큐 핸들러 + 쓰기 스레드)
+structured_log.setup("discovery", fmt="text")
 logger = logging.getLogger(__name__)
 
 
@@ -25,14 +28,14 @@ class DiscoveryServiceRedis:
     """Redis 기반 Discovery Service"""
     
     def __init__(self):
-        self.bybit_api_url = "https://api.bybit.com/v5/market/tickers"
+        self.bybit_api_url = os.getenv("BYBIT_REST_URL", "https://api.bybit.com").rstrip("/") + "/v5/market/tickers"
         
         # Redis 연결 (환경 변수)
-        import os
         self.redis_host = os.getenv("REDIS_HOST", "localhost")
         self.redis_port = int(os.getenv("REDIS_PORT", "6379"))
         self.redis_db = 0
         self.redis_client = None
+        self.membership = None
         
         # 필터 기준 (환경 변수)
         self.min_volume_24h = float(os.getenv("MIN_VOLUME_24H", "1000000"))
@@ -53,6 +56,7 @@ class DiscoveryServiceRedis:
             
             # 연결 테스트
             self.redis_client.ping()
+            self.membership = ScannerMembership(self.redis_client)
             
             logger.info(f"✅ Redis 연결 성공: {self.redis_host}:{self.redis_port}")
             return True
@@ -64,23 +68,10 @@ class DiscoveryServiceRedis:
     def get_active_scanner_count(self) -> int:
         """활성 Scanner 수 조회"""
         try:
-            # scanner:active Set에서 활성 Scanner 조회
-            active_scanners = self.redis_client.smembers("scanner:active")
-            
-            # TTL 체크: 60초 이상 업데이트 없으면 제거
-            now = time.time()
-            valid_scanners = []
-            
-            for scanner_id in active_scanners:
-                last_heartbeat = self.redis_client.get(f"scanner:{scanner_id}:heartbeat")
-                if last_heartbeat:
-                    age = now - float(last_heartbeat)
-                    if age < 60:  # 60초 이내
-                        valid_scanners.append(scanner_id)
-                    else:
-                        # 오래된 Scanner 제거
-                        self.redis_client.srem("scanner:active", scanner_id)
-                        logger.warning(f"⚠️ Scanner {scanner_id} 타임아웃 제거")
+            # 만료 Scanner 정리 + 활성 목록 조회 (Lua 1회)
+            valid_scanners, expired = self.membership.prune()
+            for scanner_id in expired:
+                logger.warning(f"⚠️ Scanner {scanner_id} 타임아웃 제거")
             
             count = len(valid_scanners)
             logger.info(f"📊 활성 Scanner: {count}개 ({', '.join(valid_scanners) if valid_scanners else 'None'})")
@@ -166,7 +157,7 @@ class DiscoveryServiceRedis:
         
         return selected
     
-    def publish_to_redis(self, top_symbols: List[Dict]) -> bool:
+    def publish_to_redis(self, top_symbols: List[Dict], trace: Dict = None) -> bool:
         """Redis에 발행"""
         try:
             # 현재 버전 조회
@@ -181,6 +172,7 @@ class DiscoveryServiceRedis:
                 "symbols": [s["symbol"] for s in top_symbols],
                 "details": top_symbols
             }
+            trace_context.inject(data, trace)
             
             # Redis에 저장
             self.redis_client.set(
@@ -217,6 +209,10 @@ class DiscoveryServiceRedis:
         
         logger.info(f"🎯 목표: 변동성*볼륨 Top 75개 심볼")
         
+        # 트레이스 시작 (발행 페이로드에 실려 Scanner/Analyzer로 전달)
+        trace = trace_context.new_trace()
+        scan_start = trace_context.now_ms()
+        
         # 1. 전체 티커 조회
         tickers = self.fetch_all_tickers()
         if not tickers:
@@ -229,8 +225,12 @@ class DiscoveryServiceRedis:
             logger.warning("⚠️ 필터링 결과 없음 - 스킵")
             return
         
+        trace_context.add_span(trace, "discovery.scan", scan_start)
+        
         # 3. Redis에 발행
-        self.publish_to_redis(top_symbols)
+        with span(trace, "discovery.publish"):
+            published = self.publish_to_redis(top_symbols, trace)
+        trace_context.report(trace, "published" if published else "failed")
         
         logger.info("=" * 60)
     
@@ -3,6 +3,7 @@ Discovery Service 로컬 테스트
 RabbitMQ 없이 콘솔 출력
 """
 import logging
+import os
 import sys
 import requests
 from typing import List, Dict
@@ -20,7 +21,7 @@ class TestDiscovery:
     """테스트용 Discovery (RabbitMQ 없음)"""
     
     def __init__(self):
-        self.bybit_api_url = "https://api.bybit.com/v5/market/tickers"
+        self.bybit_api_url = os.getenv("BYBIT_REST_URL", "https://api.bybit.com").rstrip("/") + "/v5/market/tickers"
         self.min_volume_24h = 1_000_000
         self.min_volatility_pct = 2.0
         self.top_n = 50
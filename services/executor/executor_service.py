@@ -9,6 +9,7 @@ import json
 import logging
 import os
 import ssl
+import sys
 import time
 from datetime import datetime
 from decimal import Decimal, ROUND_DOWN
@@ -17,11 +18,13 @@ import redis
 import pika
 from pybit.unified_trading import HTTP
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# 공통 라이브러리 (로컬 실행 시 저장소 루트, 컨테이너는 /app/src)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.loop_watchdog import LoopWatchdog
+from src.utils import api_accounting, structured_log, trace_context
+
+# 로깅 설정 (큐 핸들러 + 쓰기 스레드)
+structured_log.setup("executor", fmt="text")
 logger = logging.getLogger(__name__)
 
 class ExecutorService:
@@ -32,9 +35,15 @@ class ExecutorService:
         self.rabbitmq_channel = None
         self.position_size_usd = 10.0  # $10 포지션
         self.leverage = 10
+        self.loop = None
+        # 루프 감시 (pybit/boto3 동기 호출로 인한 정지 감지)
+        self.watchdog = LoopWatchdog.from_env("executor")
+        self.watchdog_task = None
         
     async def initialize(self):
         """서비스 초기화"""
+        self.loop = asyncio.get_running_loop()
+        self.watchdog_task = self.watchdog.start()
         await self._setup_redis()
         await self._setup_bybit()
         await self._setup_rabbitmq()
@@ -59,11 +68,13 @@ class ExecutorService:
             api_key = api_key_secret['SecretString']
             api_secret = api_secret_secret['SecretString']
             
-            self.bybit_session = HTTP(
+            self.bybit_session = api_accounting.metered(HTTP(
                 testnet=False,  # 프로덕션 모드
                 api_key=api_key,
                 api_secret=api_secret
-            )
+            ))
+            if os.getenv('BYBIT_REST_URL'):
+                self.bybit_session.endpoint = os.getenv('BYBIT_REST_URL').rstrip('/')
             
             # 연결 테스트
             account_info = self.bybit_session.get_wallet_balance(accountType="UNIFIED")
@@ -289,7 +300,8 @@ class ExecutorService:
                 "stopLoss": signal_data.get('stop_loss'),
                 "confidence": signal_data.get('confidence'),
                 "timestamp": datetime.utcnow().isoformat(),
-                "status": "executed"
+                "status": "executed",
+                "trace": signal_data.get('trace')
             }
             
             # Redis에 저장
@@ -304,17 +316,29 @@ class ExecutorService:
         except Exception as e:
             logger.error(f"로그 저장 실패: {e}")
             
+    async def _execute_signal(self, signal_data):
+        """신호 1건 주문 + API 사용량 (footprint는 루프 쪽 컨텍스트에서 열어야 호출이 집계됨)"""
+        with api_accounting.footprint(f"executor {signal_data.get('symbol')}") as fp:
+            success = await self.execute_order(signal_data)
+        logger.info(fp.summary())
+        return success
+        
     def on_entry_signal(self, ch, method, properties, body):
-        """entry-signal 메시지 처리"""
+        """entry-signal 메시지 처리 (pika 소비 스레드)"""
         try:
             signal_data = json.loads(body)
             logger.info(f"📨 Entry Signal 수신: {signal_data}")
             
-            # 비동기 실행
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            success = loop.run_until_complete(self.execute_order(signal_data))
-            loop.close()
+            # 트레이스: 수신 ~ 주문 완료 (실행 로그에는 주문 전까지의 구간이 저장됨)
+            trace = trace_context.extract(signal_data) or trace_context.new_trace()
+            order_start = trace_context.now_ms()
+            trace_context.inject(signal_data, trace)
+            
+            # 주문은 메인 이벤트 루프에서 실행하고 (루프 감시 대상) ack/nack는 pika 스레드에서
+            future = asyncio.run_coroutine_threadsafe(self._execute_signal(signal_data), self.loop)
+            success = future.result()
+            trace_context.add_span(trace, "executor.execute_order", order_start)
+            trace_context.report(trace, "ordered" if success else "rejected")
             
             if success:
                 ch.basic_ack(delivery_tag=method.delivery_tag)
@@ -325,8 +349,15 @@ class ExecutorService:
             logger.error(f"메시지 처리 실패: {e}")
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
             
+    def _consume(self):
+        """pika 블로킹 소비 (전용 스레드, 연결은 이 스레드에서만 사용)"""
+        try:
+            self.rabbitmq_channel.start_consuming()
+        finally:
+            self.rabbitmq_connection.close()
+            
     async def start_consuming(self):
-        """메시지 소비 시작"""
+        """메시지 소비 시작 (pika는 스레드에서, 주문은 이벤트 루프에서)"""
         try:
             self.rabbitmq_channel.basic_qos(prefetch_count=1)
             self.rabbitmq_channel.basic_consume(
@@ -335,12 +366,15 @@ class ExecutorService:
             )
             
             logger.info("🎧 Entry Signal 대기 중...")
-            self.rabbitmq_channel.start_consuming()
+            await asyncio.to_thread(self._consume)
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             logger.info("서비스 종료 중...")
-            self.rabbitmq_channel.stop_consuming()
-            self.rabbitmq_connection.close()
+            self.rabbitmq_connection.add_callback_threadsafe(self.rabbitmq_channel.stop_consuming)
+        finally:
+            self.watchdog.stop()
+            if self.watchdog_task:
+                self.watchdog_task.cancel()
 
 async def main():
     """메인 실행"""
@@ -3,20 +3,30 @@ Order Executor Service - 실제 주문 실행
 5초마다 DynamoDB trading-positions 스캔하여 진입 조건 확인 및 주문 실행
 """
 import os
+import sys
 import time
 import boto3
 from datetime import datetime, timezone
 from decimal import Decimal
 from pybit.unified_trading import HTTP
 
+# 공통 라이브러리 (로컬 실행 시 저장소 루트, 컨테이너는 /app/src)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils import api_accounting, structured_log, trace_context
+from src.utils.trace_context import span
+
+logger = structured_log.get_logger("order_executor")
+
 class OrderExecutorService:
     def __init__(self):
         # Bybit 클라이언트
-        self.session = HTTP(
+        self.session = api_accounting.metered(HTTP(
             testnet=os.getenv('BYBIT_TESTNET', 'False') == 'True',
             api_key=os.getenv('BYBIT_API_KEY'),
             api_secret=os.getenv('BYBIT_API_SECRET')
-        )
+        ))
+        if os.getenv('BYBIT_REST_URL'):
+            self.session.endpoint = os.getenv('BYBIT_REST_URL').rstrip('/')
         
         # DynamoDB
         self.dynamodb = boto3.resource('dynamodb', region_name=os.getenv('AWS_REGION', 'ap-northeast-2'))
@@ -29,6 +39,12 @@ class OrderExecutorService:
         self.leverage = int(os.getenv('LEVERAGE', '10'))  # 10x 레버리지
         self.scan_interval = int(os.getenv('SCAN_INTERVAL', '5'))  # 5초
         
+        # 포지션(signal_id)을 처음 발견한 시각 (ms) - 트레이스의 폴링 대기 / 진입 조건 대기 구분
+        self.first_seen = {}
+        
+        # 주기마다 반복되는 결과(대기/스킵)는 포지션별 로그 대신 집계 (LOG_COUNTER_SEC마다 한 줄)
+        self.cycle_counts = structured_log.counters("order_executor.cycles")
+        
         # 진입 조건
         self.entry_conditions = {
             'price_tolerance': 0.005,  # 0.5% 이내 (진입가 대비) - 0.2%에서 완화
@@ -50,20 +66,18 @@ class OrderExecutorService:
                 total_equity = float(account.get('totalEquity') or 0)
                 total_wallet = float(account.get('totalWalletBalance') or 0)
                 
-                print(f"💰 계정 잔고:")
-                print(f"  - 총 자산: ${total_equity:.2f}")
-                print(f"  - 지갑 잔고: ${total_wallet:.2f}")
-                print(f"  - 사용 가능: ${total_available:.2f}")
+                logger.info(f"💰 계정 잔고:")
+                logger.info(f"  - 총 자산: ${total_equity:.2f}")
+                logger.info(f"  - 지갑 잔고: ${total_wallet:.2f}")
+                logger.info(f"  - 사용 가능: ${total_available:.2f}")
                 
                 return total_available
             
-            print(f"⚠️  잔고 조회 응답: {result}")
+            logger.warning(f"⚠️  잔고 조회 응답: {result}")
             return 0.0
             
         except Exception as e:
-            print(f"❌ 잔고 조회 실패: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ 잔고 조회 실패: {e}")
             return 0.0
     
     def get_open_positions(self):
@@ -80,16 +94,16 @@ class OrderExecutorService:
                 open_positions = [p for p in positions if float(p['size']) > 0]
                 
                 if open_positions:
-                    print(f"\n📊 현재 오픈 포지션: {len(open_positions)}개")
+                    logger.info(f"\n📊 현재 오픈 포지션: {len(open_positions)}개")
                     for pos in open_positions:
-                        print(f"  - {pos['symbol']}: {pos['side']} {pos['size']} (진입가: ${float(pos['avgPrice']):.2f})")
+                        logger.info(f"  - {pos['symbol']}: {pos['side']} {pos['size']} (진입가: ${float(pos['avgPrice']):.2f})")
                 
                 return open_positions
             
             return []
             
         except Exception as e:
-            print(f"❌ 포지션 조회 실패: {e}")
+            logger.error(f"❌ 포지션 조회 실패: {e}")
             return []
     
     def get_active_positions_from_db(self):
@@ -114,7 +128,7 @@ class OrderExecutorService:
             return positions
             
         except Exception as e:
-            print(f"❌ DynamoDB 조회 실패: {e}")
+            logger.error(f"❌ DynamoDB 조회 실패: {e}")
             return []
     
     def get_current_price(self, symbol):
@@ -135,7 +149,7 @@ class OrderExecutorService:
             return None
             
         except Exception as e:
-            print(f"❌ 가격 조회 실패 ({symbol}): {e}")
+            logger.error(f"❌ 가격 조회 실패 ({symbol}): {e}")
             return None
     
     def check_entry_conditions(self, position, current_price_data):
@@ -184,7 +198,7 @@ class OrderExecutorService:
             result = self.session.get_instruments_info(category="linear", symbol=symbol)
             
             if result['retCode'] != 0 or not result['result']['list']:
-                print(f"❌ 심볼 정보 조회 실패: {symbol}")
+                logger.error(f"❌ 심볼 정보 조회 실패: {symbol}")
                 return None
             
             instrument = result['result']['list'][0]
@@ -204,29 +218,29 @@ class OrderExecutorService:
             
             # 최소/최대 범위 확인
             if qty < min_order_qty:
-                print(f"⚠️  계산된 수량({qty})이 최소 주문 수량({min_order_qty})보다 작음")
+                logger.warning(f"⚠️  계산된 수량({qty})이 최소 주문 수량({min_order_qty})보다 작음")
                 qty = min_order_qty
             
             if qty > max_order_qty:
-                print(f"⚠️  계산된 수량({qty})이 최대 주문 수량({max_order_qty})보다 큼")
+                logger.warning(f"⚠️  계산된 수량({qty})이 최대 주문 수량({max_order_qty})보다 큼")
                 qty = max_order_qty
             
             # 소수점 자릿수 맞추기
             decimals = len(str(qty_step).split('.')[-1]) if '.' in str(qty_step) else 0
             qty = round(qty, decimals)
             
-            print(f"📊 수량 계산:")
-            print(f"  - 포지션 크기: ${position_size}")
-            print(f"  - 레버리지: {leverage}x")
-            print(f"  - 진입가: ${entry_price:.2f}")
-            print(f"  - 계산된 수량: {qty}")
-            print(f"  - 최소/최대: {min_order_qty} / {max_order_qty}")
-            print(f"  - 수량 단위: {qty_step}")
+            logger.info(f"📊 수량 계산:")
+            logger.info(f"  - 포지션 크기: ${position_size}")
+            logger.info(f"  - 레버리지: {leverage}x")
+            logger.info(f"  - 진입가: ${entry_price:.2f}")
+            logger.info(f"  - 계산된 수량: {qty}")
+            logger.info(f"  - 최소/최대: {min_order_qty} / {max_order_qty}")
+            logger.info(f"  - 수량 단위: {qty_step}")
             
             return qty
             
         except Exception as e:
-            print(f"❌ 수량 계산 실패: {e}")
+            logger.error(f"❌ 수량 계산 실패: {e}")
             return None
     
     def place_order(self, position, current_price):
@@ -237,13 +251,13 @@ class OrderExecutorService:
         stop_loss = position['stop_loss']
         take_profit = position['take_profit']
         
-        print(f"\n{'='*80}")
-        print(f"📤 주문 실행: {symbol} ({position_type})")
-        print(f"{'='*80}\n")
+        logger.info(f"\n{'='*80}")
+        logger.info(f"📤 주문 실행: {symbol} ({position_type})")
+        logger.info(f"{'='*80}\n")
         
         try:
             # 1. 레버리지 설정
-            print(f"[1/3] 레버리지 설정 ({self.leverage}x)...")
+            logger.info(f"[1/3] 레버리지 설정 ({self.leverage}x)...")
             try:
                 leverage_result = self.session.set_leverage(
                     category="linear",
@@ -253,26 +267,26 @@ class OrderExecutorService:
                 )
                 
                 if leverage_result['retCode'] != 0:
-                    print(f"⚠️  레버리지 설정 실패 (이미 설정되어 있을 수 있음)")
+                    logger.warning(f"⚠️  레버리지 설정 실패 (이미 설정되어 있을 수 있음)")
                 else:
-                    print(f"✅ 레버리지 설정 완료")
+                    logger.info(f"✅ 레버리지 설정 완료")
             except Exception as lev_error:
                 # 레버리지가 이미 설정되어 있으면 에러 무시
                 if "110043" in str(lev_error) or "leverage not modified" in str(lev_error):
-                    print(f"✅ 레버리지 이미 {self.leverage}x로 설정됨")
+                    logger.info(f"✅ 레버리지 이미 {self.leverage}x로 설정됨")
                 else:
-                    print(f"⚠️  레버리지 설정 오류: {lev_error}")
+                    logger.warning(f"⚠️  레버리지 설정 오류: {lev_error}")
                     # 레버리지 설정 실패해도 계속 진행
             
             # 2. 주문 수량 계산
-            print(f"[2/3] 주문 수량 계산...")
+            logger.info(f"[2/3] 주문 수량 계산...")
             qty = self.calculate_order_qty(symbol, entry_price, self.position_size, self.leverage)
             
             if not qty:
                 return None
             
             # 3. 주문 실행 (Market Order + TP/SL)
-            print(f"[3/3] 주문 실행...")
+            logger.info(f"[3/3] 주문 실행...")
             
             side = "Buy" if position_type == "LONG" else "Sell"
             
@@ -290,16 +304,16 @@ class OrderExecutorService:
             if order_result['retCode'] == 0:
                 order_id = order_result['result']['orderId']
                 
-                print(f"\n✅ 주문 실행 성공!")
-                print(f"  - Order ID: {order_id}")
-                print(f"  - 심볼: {symbol}")
-                print(f"  - 타입: {position_type}")
-                print(f"  - 수량: {qty}")
-                print(f"  - 진입가: ${entry_price:.2f} (예상)")
-                print(f"  - 손절가: ${stop_loss:.2f}")
-                print(f"  - 익절가: ${take_profit:.2f}")
-                print(f"  - 포지션 크기: ${self.position_size}")
-                print(f"  - 레버리지: {self.leverage}x\n")
+                logger.info(f"\n✅ 주문 실행 성공!")
+                logger.info(f"  - Order ID: {order_id}")
+                logger.info(f"  - 심볼: {symbol}")
+                logger.info(f"  - 타입: {position_type}")
+                logger.info(f"  - 수량: {qty}")
+                logger.info(f"  - 진입가: ${entry_price:.2f} (예상)")
+                logger.info(f"  - 손절가: ${stop_loss:.2f}")
+                logger.info(f"  - 익절가: ${take_profit:.2f}")
+                logger.info(f"  - 포지션 크기: ${self.position_size}")
+                logger.info(f"  - 레버리지: {self.leverage}x\n")
                 
                 return {
                     'order_id': order_id,
@@ -312,16 +326,14 @@ class OrderExecutorService:
                     'timestamp': datetime.now(timezone.utc).isoformat()
                 }
             else:
-                print(f"❌ 주문 실행 실패: {order_result['retMsg']}")
+                logger.error(f"❌ 주문 실행 실패: {order_result['retMsg']}")
                 return None
                 
         except Exception as e:
-            print(f"❌ 주문 실행 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ 주문 실행 오류: {e}")
             return None
     
-    def update_position_status(self, position, status, order_info=None):
+    def update_position_status(self, position, status, order_info=None, trace=None):
         """DynamoDB 포지션 상태 업데이트"""
         try:
             update_expr = "SET #status = :status, updated_at = :updated"
@@ -331,6 +343,12 @@ class OrderExecutorService:
             }
             expr_names = {'#status': 'status'}
             
+            # 주문까지 이어진 트레이스 (주문 구간 포함)
+            if trace:
+                update_expr += ", #trace = :trace"
+                expr_values[':trace'] = trace
+                expr_names['#trace'] = 'trace'
+            
             # 주문 정보 추가
             if order_info:
                 update_expr += ", order_id = :order_id, executed_at = :executed, executed_price = :exec_price"
@@ -350,16 +368,17 @@ class OrderExecutorService:
                 ExpressionAttributeValues=expr_values
             )
             
-            print(f"✅ DynamoDB 상태 업데이트: {position['symbol']} → {status}")
+            logger.info(f"✅ DynamoDB 상태 업데이트: {position['symbol']} → {status}")
             return True
             
         except Exception as e:
-            print(f"❌ DynamoDB 업데이트 실패: {e}")
+            logger.error(f"❌ DynamoDB 업데이트 실패: {e}")
             return False
     
     def process_position(self, position):
         """포지션 처리"""
         symbol = position['symbol']
+        first_seen = self.first_seen.setdefault(position.get('signal_id', symbol), trace_context.now_ms())
         
         # 심볼 정보 조회 (소수점 자릿수 확인)
         try:
@@ -376,32 +395,33 @@ class OrderExecutorService:
         except:
             price_decimals = 2  # 기본값
         
-        print(f"\n{'='*80}")
-        print(f"🔍 포지션 확인: {symbol}")
-        print(f"{'='*80}")
-        print(f"  - 진입가: ${position['entry_price']:.{price_decimals}f}")
-        print(f"  - 타입: {position['position_type']}")
-        print(f"  - 신뢰도: {position['confidence']}점")
-        print(f"  - 상태: {position['status']}")
+        self.cycle_counts.incr("positions")
+        logger.debug(
+            f"🔍 포지션 확인: {symbol} | 진입가 ${position['entry_price']:.{price_decimals}f} | "
+            f"{position['position_type']} | 신뢰도 {position['confidence']}점 | 상태 {position['status']}"
+        )
         
         # 1. 현재 가격 조회
         current_price_data = self.get_current_price(symbol)
         
         if not current_price_data:
-            print(f"⚠️  가격 조회 실패 - 스킵")
+            self.cycle_counts.incr("price_failed")
+            logger.warning(f"⚠️  가격 조회 실패 - 스킵 ({symbol})")
             return
         
         current_price = current_price_data['last_price']
-        print(f"  - 현재가: ${current_price:.{price_decimals}f}")
         
         # 2. 진입 조건 확인
         can_enter, reason = self.check_entry_conditions(position, current_price_data)
         
         if not can_enter:
-            print(f"⏳ 진입 대기: {reason}")
+            self.cycle_counts.incr("waiting")
+            logger.debug(f"⏳ 진입 대기: {symbol} 현재가 ${current_price:.{price_decimals}f} | {reason}")
             return
         
-        print(f"✅ 진입 조건 충족: {reason}")
+        logger.info(f"\n{'='*80}")
+        logger.info(f"✅ 진입 조건 충족: {symbol} ({position['position_type']}, 신뢰도 {position['confidence']}점) | {reason}")
+        logger.info(f"  - 진입가: ${position['entry_price']:.{price_decimals}f} | 현재가: ${current_price:.{price_decimals}f}")
         
         # 3. 잔고 및 마진 확인
         balance = self.get_account_balance()
@@ -419,66 +439,79 @@ class OrderExecutorService:
         available_margin = balance - used_margin
         required_margin = self.position_size / self.leverage
         
-        print(f"  - 사용 가능 마진: ${available_margin:.2f}")
-        print(f"  - 필요 마진: ${required_margin:.2f}")
-        print(f"  - 오픈 포지션: {len(open_positions)}개")
+        logger.info(f"  - 사용 가능 마진: ${available_margin:.2f}")
+        logger.info(f"  - 필요 마진: ${required_margin:.2f}")
+        logger.info(f"  - 오픈 포지션: {len(open_positions)}개")
         
         if available_margin < required_margin:
-            print(f"⚠️  마진 부족 (${available_margin:.2f} < ${required_margin:.2f}) - 대기")
+            self.cycle_counts.incr("margin_wait")
+            logger.warning(f"⚠️  마진 부족 (${available_margin:.2f} < ${required_margin:.2f}) - 대기")
             return
         
-        # 4. 주문 실행
-        order_info = self.place_order(position, current_price)
+        # 4. 주문 실행 (Finder 저장 → 첫 폴링 → 진입 조건 충족 → 주문)
+        trace = trace_context.extract(position)
+        trace_context.add_span(trace, "executor.wait_entry", first_seen)
+        with span(trace, "executor.place_order"):
+            order_info = self.place_order(position, current_price)
         
         if order_info:
             # 5. 상태 업데이트 (active → executing)
-            self.update_position_status(position, 'executing', order_info)
+            self.update_position_status(position, 'executing', order_info, trace)
+            trace_context.report(trace, "ordered", self.executor_id)
+            self.cycle_counts.incr("ordered")
         else:
-            print(f"❌ 주문 실행 실패")
+            trace_context.report(trace, "order_failed", self.executor_id)
+            self.cycle_counts.incr("order_failed")
+            logger.error(f"❌ 주문 실행 실패")
     
     def run_once(self):
-        """1회 실행"""
-        print(f"\n{'='*80}")
-        print(f"🔄 Order Executor 스캔 시작 - {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC")
-        print(f"{'='*80}\n")
+        """1회 실행 (주기 1회의 API 사용량은 DEBUG, 호출 수는 집계)"""
+        with api_accounting.footprint("executor cycle") as fp:
+            self._run_cycle()
+        self.cycle_counts.incr("cycles")
+        self.cycle_counts.incr("api_calls", fp.total.calls)
+        logger.debug(fp.summary())
+    
+    def _run_cycle(self):
+        """활성 포지션 조회 → 포지션별 진입 조건 확인 / 주문"""
+        logger.debug(f"🔄 Order Executor 스캔 시작 - {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC")
         
         # 1. 활성 포지션 조회
         positions = self.get_active_positions_from_db()
         
+        # 더 이상 활성이 아닌 포지션 정리
+        active_ids = {position.get('signal_id', position['symbol']) for position in positions}
+        self.first_seen = {k: v for k, v in self.first_seen.items() if k in active_ids}
+        
         if not positions:
-            print("⚠️  활성 포지션 없음")
+            logger.debug("활성 포지션 없음")
             return
         
-        print(f"✅ {len(positions)}개 활성 포지션 발견\n")
+        logger.debug(f"✅ {len(positions)}개 활성 포지션 발견")
         
         # 2. 각 포지션 처리
         for position in positions:
             try:
                 self.process_position(position)
             except Exception as e:
-                print(f"❌ 포지션 처리 오류 ({position['symbol']}): {e}")
-                import traceback
-                traceback.print_exc()
-        
-        print(f"\n{'='*80}")
-        print(f"✅ 스캔 완료")
-        print(f"{'='*80}\n")
+                self.cycle_counts.incr("errors")
+                logger.exception(f"❌ 포지션 처리 오류 ({position['symbol']}): {e}")
     
     def run(self):
         """메인 실행 로직 (무한 루프)"""
-        print(f"\n{'='*80}")
-        print(f"🚀 Order Executor Service 시작")
-        print(f"{'='*80}")
-        print(f"Executor ID: {self.executor_id}")
-        print(f"포지션 크기: ${self.position_size}")
-        print(f"레버리지: {self.leverage}x")
-        print(f"스캔 주기: {self.scan_interval}초")
-        print(f"진입 조건:")
-        print(f"  - 가격 허용 범위: ±{self.entry_conditions['price_tolerance']*100:.2f}%")
-        print(f"  - 최소 신뢰도: {self.entry_conditions['min_confidence']}점")
-        print(f"  - 스프레드 확인: {self.entry_conditions['check_spread']}")
-        print(f"  - 거래량 확인: {self.entry_conditions['check_volume']}")
-        print(f"{'='*80}\n")
+        logger.info(f"\n{'='*80}")
+        logger.info(f"🚀 Order Executor Service 시작")
+        logger.info(f"{'='*80}")
+        logger.info(f"Executor ID: {self.executor_id}")
+        logger.info(f"포지션 크기: ${self.position_size}")
+        logger.info(f"레버리지: {self.leverage}x")
+        logger.info(f"스캔 주기: {self.scan_interval}초")
+        logger.info(f"진입 조건:")
+        logger.info(f"  - 가격 허용 범위: ±{self.entry_conditions['price_tolerance']*100:.2f}%")
+        logger.info(f"  - 최소 신뢰도: {self.entry_conditions['min_confidence']}점")
+        logger.info(f"  - 스프레드 확인: {self.entry_conditions['check_spread']}")
+        logger.info(f"  - 거래량 확인: {self.entry_conditions['check_volume']}")
+        logger.info(f"{'='*80}\n")
         
         try:
             while True:
@@ -486,10 +519,11 @@ class OrderExecutorService:
                 time.sleep(self.scan_interval)
                 
         except KeyboardInterrupt:
-            print(f"\n\n{'='*80}")
-            print(f"⏹️  Order Executor Service 종료")
-            print(f"{'='*80}\n")
+            logger.info(f"\n\n{'='*80}")
+            logger.info(f"⏹️  Order Executor Service 종료")
+            logger.info(f"{'='*80}\n")
 
 if __name__ == "__main__":
+    structured_log.setup("order-executor")
     service = OrderExecutorService()
     service.run()
@@ -0,0 +1,368 @@
+"""
+Fake Exchange - 계정 / 주문 / 포지션
+
+- 시장가 주문은 현재가에 즉시 체결, 지정가 주문은 미체결 목록(/v5/order/realtime)에 보관 후 가격 도달 시 체결
+- 포지션은 One-way 모드 (positionIdx=0), 반대 방향 주문은 축소/청산/반전
+- 주문 시 takeProfit/stopLoss 또는 set-leverage/trading-stop으로 지정한 TP/SL은 가격 갱신마다 확인
+- 인증(서명)은 검사하지 않음 (pybit 비공개 엔드포인트는 아무 키나 넣으면 동작)
+
+오류는 Bybit와 같은 retCode/retMsg로 반환 (예외 대신)
+"""
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from market import fmt_num
+
+TAKER_FEE = 0.0006
+
+# Bybit v5 retCode
+OK = 0
+INVALID_PARAM = 10001
+LEVERAGE_NOT_MODIFIED = 110043
+INSUFFICIENT_BALANCE = 110007
+ORDER_NOT_FOUND = 110001
+
+
+class FakePosition:
+    """심볼별 One-way 포지션"""
+
+    __slots__ = ("symbol", "side", "size", "avg_price", "leverage", "take_profit", "stop_loss",
+                 "realised_pnl", "created_ms", "updated_ms")
+
+    def __init__(self, symbol: str, leverage: int):
+        self.symbol = symbol
+        self.side = ""  # "" = 포지션 없음
+        self.size = 0.0
+        self.avg_price = 0.0
+        self.leverage = leverage
+        self.take_profit = 0.0
+        self.stop_loss = 0.0
+        self.realised_pnl = 0.0
+        self.created_ms = 0
+        self.updated_ms = 0
+
+    def to_dict(self, mark_price: float) -> Dict:
+        direction = 1 if self.side == "Buy" else -1
+        unrealised = (mark_price - self.avg_price) * self.size * direction if self.size else 0.0
+        value = self.avg_price * self.size
+        return {
+            "positionIdx": 0,
+            "symbol": self.symbol,
+            "side": self.side if self.size else "",
+            "size": fmt_num(self.size),
+            "avgPrice": fmt_num(self.avg_price),
+            "positionValue": f"{value:.4f}",
+            "leverage": f"{self.leverage}",
+            "markPrice": fmt_num(mark_price),
+            "positionIM": f"{value / self.leverage:.4f}" if self.leverage else "0",
+            "takeProfit": fmt_num(self.take_profit) if self.take_profit else "",
+            "stopLoss": fmt_num(self.stop_loss) if self.stop_loss else "",
+            "tpslMode": "Full",
+            "unrealisedPnl": f"{unrealised:.4f}",
+            "cumRealisedPnl": f"{self.realised_pnl:.4f}",
+            "positionStatus": "Normal",
+            "tradeMode": 0,
+            "createdTime": f"{self.created_ms}",
+            "updatedTime": f"{self.updated_ms}"
+        }
+
+
+class FakeAccount:
+    """단일 UNIFIED 계정"""
+
+    def __init__(self, market, balance: float = 10_000.0, default_leverage: int = 10):
+        """
+        Args:
+            market: SyntheticMarket (현재가/심볼 정보)
+            balance: 시작 USDT 잔고
+            default_leverage: 심볼 기본 레버리지
+        """
+        self.market = market
+        self.balance = balance
+        self.default_leverage = default_leverage
+        self.positions: Dict[str, FakePosition] = {}
+        self.open_orders: Dict[str, Dict] = {}  # orderId → 주문 (지정가 미체결)
+        self.fills: List[Dict] = []
+
+        # 통계
+        self.orders_placed = 0
+        self.orders_filled = 0
+        self.orders_rejected = 0
+        self.tpsl_triggered = 0
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def _position(self, symbol: str) -> FakePosition:
+        position = self.positions.get(symbol)
+        if position is None:
+            position = self.positions[symbol] = FakePosition(symbol, self.default_leverage)
+        return position
+
+    def _price(self, symbol: str) -> float:
+        return self.market.symbols[symbol].price
+
+    def _unrealised(self) -> float:
+        total = 0.0
+        for symbol, position in self.positions.items():
+            if position.size:
+                direction = 1 if position.side == "Buy" else -1
+                total += (self._price(symbol) - position.avg_price) * position.size * direction
+        return total
+
+    def wallet_balance(self) -> Dict:
+        """GET /v5/account/wallet-balance 결과"""
+        unrealised = self._unrealised()
+        equity = self.balance + unrealised
+        margin = sum(
+            p.avg_price * p.size / p.leverage for p in self.positions.values() if p.size and p.leverage
+        )
+        available = max(0.0, equity - margin)
+        return {"list": [{
+            "accountType": "UNIFIED",
+            "totalEquity": f"{equity:.4f}",
+            "totalWalletBalance": f"{self.balance:.4f}",
+            "totalMarginBalance": f"{equity:.4f}",
+            "totalAvailableBalance": f"{available:.4f}",
+            "totalPerpUPL": f"{unrealised:.4f}",
+            "totalInitialMargin": f"{margin:.4f}",
+            "totalMaintenanceMargin": "0",
+            "accountIMRate": "0",
+            "accountMMRate": "0",
+            "coin": [{
+                "coin": "USDT",
+                "equity": f"{equity:.4f}",
+                "walletBalance": f"{self.balance:.4f}",
+                "availableToWithdraw": f"{available:.4f}",
+                "unrealisedPnl": f"{unrealised:.4f}",
+                "cumRealisedPnl": f"{sum(p.realised_pnl for p in self.positions.values()):.4f}",
+                "usdValue": f"{equity:.4f}"
+            }]
+        }]}
+
+    def position_list(self, symbol: str = "") -> Dict:
+        """GET /v5/position/list 결과 (symbol 없으면 열린 포지션 전체)"""
+        if symbol:
+            if symbol not in self.market.symbols:
+                return {"category": "linear", "list": []}
+            positions = [self._position(symbol)]
+        else:
+            positions = [p for p in self.positions.values() if p.size]
+        return {
+            "category": "linear",
+            "list": [p.to_dict(self._price(p.symbol)) for p in positions],
+            "nextPageCursor": ""
+        }
+
+    def order_list(self, symbol: str = "") -> Dict:
+        """GET /v5/order/realtime 결과"""
+        orders = [o for o in self.open_orders.values() if not symbol or o["symbol"] == symbol]
+        return {"category": "linear", "list": orders, "nextPageCursor": ""}
+
+    # ------------------------------------------------------------------
+    # 주문 / 설정
+    # ------------------------------------------------------------------
+
+    def place_order(self, params: Dict, now_ms: int) -> Tuple[int, str, Dict]:
+        """POST /v5/order/create → (retCode, retMsg, result)"""
+        self.orders_placed += 1
+        symbol = params.get("symbol", "")
+        side = params.get("side", "")
+        order_type = params.get("orderType", "Market")
+        try:
+            qty = float(params.get("qty", 0))
+            price = float(params.get("price") or 0)
+        except (TypeError, ValueError):
+            self.orders_rejected += 1
+            return INVALID_PARAM, "params error: qty/price", {}
+
+        if symbol not in self.market.symbols:
+            self.orders_rejected += 1
+            return INVALID_PARAM, f"params error: symbol invalid {symbol}", {}
+        if side not in ("Buy", "Sell") or qty <= 0:
+            self.orders_rejected += 1
+            return INVALID_PARAM, "params error: side/qty", {}
+        if order_type == "Limit" and price <= 0:
+            self.orders_rejected += 1
+            return INVALID_PARAM, "params error: price", {}
+
+        order_id = str(uuid.uuid4())
+        order = {
+            "orderId": order_id,
+            "orderLinkId": params.get("orderLinkId", ""),
+            "symbol": symbol,
+            "side": side,
+            "orderType": order_type,
+            "price": fmt_num(price),
+            "qty": fmt_num(qty),
+            "timeInForce": params.get("timeInForce", "IOC" if order_type == "Market" else "GTC"),
+            "orderStatus": "New",
+            "reduceOnly": bool(params.get("reduceOnly", False)),
+            "takeProfit": str(params.get("takeProfit", "")),
+            "stopLoss": str(params.get("stopLoss", "")),
+            "positionIdx": int(params.get("positionIdx", 0)),
+            "createdTime": f"{now_ms}",
+            "updatedTime": f"{now_ms}"
+        }
+
+        market_price = self._price(symbol)
+        crosses = order_type == "Market" or (
+            (side == "Buy" and price >= market_price) or (side == "Sell" and price <= market_price)
+        )
+        if crosses:
+            fill_price = market_price if order_type == "Market" else price
+            code, message = self._fill(order, fill_price, now_ms)
+            if code != OK:
+                self.orders_rejected += 1
+                return code, message, {}
+        else:
+            self.open_orders[order_id] = order
+
+        return OK, "OK", {"orderId": order_id, "orderLinkId": order["orderLinkId"]}
+
+    def cancel_order(self, params: Dict, now_ms: int) -> Tuple[int, str, Dict]:
+        """POST /v5/order/cancel"""
+        order = self.open_orders.pop(params.get("orderId", ""), None)
+        if order is None:
+            return ORDER_NOT_FOUND, "order not exists or too late to cancel", {}
+        return OK, "OK", {"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]}
+
+    def set_leverage(self, params: Dict, now_ms: int) -> Tuple[int, str, Dict]:
+        """POST /v5/position/set-leverage (같은 값이면 Bybit처럼 110043)"""
+        symbol = params.get("symbol", "")
+        if symbol not in self.market.symbols:
+            return INVALID_PARAM, f"params error: symbol invalid {symbol}", {}
+        try:
+            leverage = int(float(params.get("buyLeverage", self.default_leverage)))
+        except (TypeError, ValueError):
+            return INVALID_PARAM, "params error: buyLeverage", {}
+        position = self._position(symbol)
+        if position.leverage == leverage:
+            return LEVERAGE_NOT_MODIFIED, "leverage not modified", {}
+        position.leverage = leverage
+        position.updated_ms = now_ms
+        return OK, "OK", {}
+
+    def set_trading_stop(self, params: Dict, now_ms: int) -> Tuple[int, str, Dict]:
+        """POST /v5/position/trading-stop"""
+        symbol = params.get("symbol", "")
+        position = self.positions.get(symbol)
+        if position is None or not position.size:
+            return INVALID_PARAM, "can not set tp/sl/ts for zero position", {}
+        try:
+            if "takeProfit" in params:
+                position.take_profit = float(params["takeProfit"] or 0)
+            if "stopLoss" in params:
+                position.stop_loss = float(params["stopLoss"] or 0)
+        except (TypeError, ValueError):
+            return INVALID_PARAM, "params error: takeProfit/stopLoss", {}
+        position.updated_ms = now_ms
+        return OK, "OK", {}
+
+    # ------------------------------------------------------------------
+    # 체결
+    # ------------------------------------------------------------------
+
+    def _fill(self, order: Dict, price: float, now_ms: int) -> Tuple[int, str]:
+        """주문 체결 → 포지션 반영"""
+        symbol = order["symbol"]
+        qty = float(order["qty"])
+        position = self._position(symbol)
+        reduce_only = order["reduceOnly"]
+
+        if reduce_only and (not position.size or position.side == order["side"]):
+            return INVALID_PARAM, "current position is zero, cannot fix reduce-only order qty"
+
+        if not position.size or position.side == order["side"]:
+            if reduce_only:
+                return INVALID_PARAM, "reduce-only order would increase position"
+            margin = price * qty / position.leverage
+            if margin > self.wallet_available():
+                return INSUFFICIENT_BALANCE, "ab not enough for new order"
+            total = position.size + qty
+            position.avg_price = (position.avg_price * position.size + price * qty) / total
+            position.size = total
+            position.side = order["side"]
+            if not position.created_ms:
+                position.created_ms = now_ms
+        else:
+            closed = min(position.size, qty)
+            self._realise(position, price, closed)
+            remaining = qty - closed
+            if remaining > 0 and not reduce_only:
+                position.side = order["side"]
+                position.size = remaining
+                position.avg_price = price
+                position.created_ms = now_ms
+
+        self.balance -= price * qty * TAKER_FEE
+        if order.get("takeProfit"):
+            position.take_profit = float(order["takeProfit"])
+        if order.get("stopLoss"):
+            position.stop_loss = float(order["stopLoss"])
+        position.updated_ms = now_ms
+
+        order["orderStatus"] = "Filled"
+        order["avgPrice"] = fmt_num(price)
+        order["cumExecQty"] = order["qty"]
+        order["updatedTime"] = f"{now_ms}"
+        self.orders_filled += 1
+        self.fills.append(order)
+        if len(self.fills) > 1000:
+            del self.fills[:500]
+        return OK, "OK"
+
+    def _realise(self, position: FakePosition, price: float, qty: float):
+        """qty만큼 청산 손익 확정"""
+        direction = 1 if position.side == "Buy" else -1
+        pnl = (price - position.avg_price) * qty * direction
+        self.balance += pnl
+        position.realised_pnl += pnl
+        position.size -= qty
+        if position.size <= 1e-12:
+            position.size = 0.0
+            position.side = ""
+            position.avg_price = 0.0
+            position.take_profit = 0.0
+            position.stop_loss = 0.0
+
+    def wallet_available(self) -> float:
+        return float(self.wallet_balance()["list"][0]["totalAvailableBalance"])
+
+    def on_price(self, symbol: str, price: float, now_ms: Optional[int] = None):
+        """가격 갱신 → TP/SL 및 지정가 주문 체결 확인"""
+        now_ms = now_ms or int(time.time() * 1000)
+        position = self.positions.get(symbol)
+        if position is not None and position.size:
+            long = position.side == "Buy"
+            hit_tp = position.take_profit and (price >= position.take_profit if long else price <= position.take_profit)
+            hit_sl = position.stop_loss and (price <= position.stop_loss if long else price >= position.stop_loss)
+            if hit_tp or hit_sl:
+                exit_price = position.take_profit if hit_tp else position.stop_loss
+                self.balance -= exit_price * position.size * TAKER_FEE
+                self._realise(position, exit_price, position.size)
+                position.updated_ms = now_ms
+                self.tpsl_triggered += 1
+
+        if not self.open_orders:
+            return
+        for order_id, order in list(self.open_orders.items()):
+            if order["symbol"] != symbol:
+                continue
+            limit = float(order["price"])
+            if (order["side"] == "Buy" and price <= limit) or (order["side"] == "Sell" and price >= limit):
+                del self.open_orders[order_id]
+                self._fill(order, limit, now_ms)
+
+    def get_stats(self) -> Dict:
+        return {
+            "balance": round(self.balance, 4),
+            "open_positions": sum(1 for p in self.positions.values() if p.size),
+            "open_orders": len(self.open_orders),
+            "orders_placed": self.orders_placed,
+            "orders_filled": self.orders_filled,
+            "orders_rejected": self.orders_rejected,
+            "tpsl_triggered": self.tpsl_triggered
+        }
@@ -0,0 +1,690 @@
+"""
+Fake Bybit Exchange - 부하/지연 테스트용 로컬 거래소
+
+Bybit v5 REST + public linear WebSocket을 흉내 내는 로컬 서버.
+각 서비스의 BYBIT_REST_URL / BYBIT_WS_URL을 이 서버로 바꾸면 실제 거래소 없이
+Scanner → Finder → Executor 전체 파이프라인을 노트북에서 벤치마크할 수 있다.
+
+REST (응답 형식: {"retCode", "retMsg", "result", "retExtInfo", "time"}):
+    GET  /v5/market/kline, /v5/market/tickers, /v5/market/instruments-info, /v5/market/time
+    GET  /v5/position/list, /v5/order/realtime, /v5/account/wallet-balance
+    POST /v5/order/create, /v5/order/cancel, /v5/position/set-leverage, /v5/position/trading-stop
+
+WebSocket (/v5/public/linear):
+    op: subscribe / unsubscribe / ping
+    토픽: tickers.{symbol}, orderbook.{depth}.{symbol}, kline.{interval}.{symbol}
+
+시장 데이터 소스:
+    합성 (기본): 심볼별 랜덤 워크 (--seed로 재현)
+    녹화 (--replay DIR): WS_CAPTURE_DIR로 기록한 프레임 재전송 (REST 캔들/주문은 재생 가격 기준)
+
+실행:
+    python services/fake_exchange/fake_exchange.py --symbols 100 --ws-latency-ms 20 --ws-jitter-ms 10
+    python services/fake_exchange/fake_exchange.py --replay ./captures --speed 5 --loop
+
+    BYBIT_REST_URL=http://localhost:8080 BYBIT_WS_URL=ws://localhost:8080/v5/public/linear python services/scanner/main.py
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from aiohttp import WSMsgType, web
+
+FAKE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(FAKE_DIR, '..', 'scanner'))
+sys.path.append(os.path.join(FAKE_DIR, '..', 'scanner', 'processors'))
+
+from account import FakeAccount, INVALID_PARAM, OK
+from candle_aggregator import SUPPORTED_INTERVALS, bucket_bounds
+from market import SyntheticMarket, fmt_num
+from utils.ws_capture import capture_files, iter_frames
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("fake_exchange")
+
+WS_PATH = "/v5/public/linear"
+ORDERBOOK_DEPTHS = (1, 50, 200, 500)
+KLINE_LIMIT_MAX = 1000
+SEND_QUEUE_SIZE = 10_000  # 연결별 송신 대기 메시지 (넘치면 버림 = 느린 소비자)
+
+# 합성 시장 기본 심볼 (나머지는 FAKE###USDT로 채움)
+DEFAULT_SYMBOLS = [
+    "BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "DOGEUSDT", "ADAUSDT", "AVAXUSDT", "LINKUSDT",
+    "DOTUSDT", "LTCUSDT", "NEARUSDT", "APTUSDT", "ARBUSDT", "OPUSDT", "SUIUSDT", "TIAUSDT",
+    "INJUSDT", "SEIUSDT", "WIFUSDT", "PEPEUSDT"
+]
+
+
+def make_symbols(count: int) -> List[str]:
+    symbols = DEFAULT_SYMBOLS[:count]
+    symbols += [f"FAKE{i:03d}USDT" for i in range(count - len(symbols))]
+    return symbols
+
+
+def envelope(result, code: int = OK, message: str = "OK") -> Dict:
+    """Bybit v5 REST 응답"""
+    return {
+        "retCode": code,
+        "retMsg": message,
+        "result": result if result is not None else {},
+        "retExtInfo": {},
+        "time": int(time.time() * 1000)
+    }
+
+
+class Connection:
+    """WebSocket 연결 1개: 구독 토픽 + 지연 송신 큐"""
+
+    def __init__(self, ws: web.WebSocketResponse, latency_ms: float, jitter_ms: float):
+        self.ws = ws
+        self.conn_id = str(uuid.uuid4())
+        self.topics: Set[str] = set()
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.last_due = 0.0
+        self.sent = 0
+        self.dropped = 0
+
+    def send(self, message: str):
+        """지연 후 송신 예약 (순서 유지: 도착 예정 시각은 단조 증가)"""
+        due = time.monotonic() + self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        self.last_due = max(self.last_due, due)
+        try:
+            self.queue.put_nowait((self.last_due, message))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def run_sender(self):
+        while True:
+            due, message = await self.queue.get()
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.ws.closed:
+                return
+            try:
+                await self.ws.send_str(message)
+                self.sent += 1
+            except (ConnectionResetError, RuntimeError):
+                return
+
+
+class BookFeed:
+    """심볼 × depth 호가 스트림 상태 (델타의 u는 1씩 증가)"""
+
+    __slots__ = ("depth", "bids", "asks", "u", "seq")
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self.bids: Dict[str, str] = {}
+        self.asks: Dict[str, str] = {}
+        self.u = 0
+        self.seq = 0
+
+    def snapshot(self, symbol: str, ts: int) -> str:
+        return json.dumps({
+            "topic": f"orderbook.{self.depth}.{symbol}",
+            "type": "snapshot",
+            "ts": ts,
+            "data": {
+                "s": symbol,
+                "b": sorted(self.bids.items(), key=lambda level: -float(level[0])),
+                "a": sorted(self.asks.items(), key=lambda level: float(level[0])),
+                "u": self.u,
+                "seq": self.seq
+            },
+            "cts": ts
+        })
+
+    def update(self, bids: Dict[str, str], asks: Dict[str, str]) -> Tuple[List, List]:
+        """새 호가로 교체 → (bid 변경, ask 변경) (삭제는 수량 "0")"""
+        changed_bids = [[p, s] for p, s in bids.items() if self.bids.get(p) != s]
+        changed_bids += [[p, "0"] for p in self.bids if p not in bids]
+        changed_asks = [[p, s] for p, s in asks.items() if self.asks.get(p) != s]
+        changed_asks += [[p, "0"] for p in self.asks if p not in asks]
+        self.bids = bids
+        self.asks = asks
+        self.u += 1
+        self.seq += 1
+        return changed_bids, changed_asks
+
+
+class FakeExchange:
+    """REST + WebSocket 서버"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.market = SyntheticMarket(
+            make_symbols(args.symbols),
+            seed=args.seed,
+            volatility=args.volatility,
+            start_ms=int(time.time() * 1000)
+        )
+        self.account = FakeAccount(self.market, balance=args.balance, default_leverage=args.leverage)
+
+        self.connections: Set[Connection] = set()
+        self.subscribers: Dict[str, Set[Connection]] = {}  # 토픽 → 연결
+        self.tickers: Dict[str, Dict] = {}  # 심볼 → 마지막 송신 티커 (델타 기준)
+        self.books: Dict[Tuple[str, int], BookFeed] = {}
+        self.replay_books: Dict[str, Dict] = {}  # 녹화 재생: 토픽 → 병합 호가 (신규 구독 스냅샷용)
+
+        self.app = web.Application()
+        self.app.router.add_get(WS_PATH, self.handle_ws)
+        self.app.router.add_get("/v5/market/kline", self.rest_kline)
+        self.app.router.add_get("/v5/market/tickers", self.rest_tickers)
+        self.app.router.add_get("/v5/market/instruments-info", self.rest_instruments)
+        self.app.router.add_get("/v5/market/time", self.rest_time)
+        self.app.router.add_get("/v5/position/list", self.rest_positions)
+        self.app.router.add_get("/v5/order/realtime", self.rest_orders)
+        self.app.router.add_get("/v5/account/wallet-balance", self.rest_wallet)
+        self.app.router.add_post("/v5/order/create", self.rest_place_order)
+        self.app.router.add_post("/v5/order/cancel", self.rest_cancel_order)
+        self.app.router.add_post("/v5/position/set-leverage", self.rest_set_leverage)
+        self.app.router.add_post("/v5/position/trading-stop", self.rest_trading_stop)
+        self.app.on_startup.append(self._start_background)
+        self.app.on_cleanup.append(self._stop_background)
+        self.tasks: List[asyncio.Task] = []
+
+        # 통계
+        self.rest_requests = 0
+        self.ws_messages = 0
+        self.started = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # REST
+    # ------------------------------------------------------------------
+
+    async def _respond(self, result, code: int = OK, message: str = "OK") -> web.Response:
+        self.rest_requests += 1
+        if self.args.rest_latency_ms > 0:
+            await asyncio.sleep(self.args.rest_latency_ms / 1000)
+        return web.json_response(envelope(result, code, message))
+
+    def _unknown_symbol(self, symbol: str):
+        return symbol and symbol not in self.market.symbols
+
+    async def rest_kline(self, request: web.Request) -> web.Response:
+        query = request.query
+        symbol = query.get("symbol", "")
+        interval = query.get("interval", "1")
+        if self._unknown_symbol(symbol) or not symbol:
+            return await self._respond({}, INVALID_PARAM, "Not supported symbols")
+        if interval not in SUPPORTED_INTERVALS:
+            return await self._respond({}, INVALID_PARAM, "Invalid period!")
+        try:
+            limit = min(int(query.get("limit", 200)), KLINE_LIMIT_MAX)
+            start = int(query["start"]) if "start" in query else None
+            end = int(query["end"]) if "end" in query else None
+        except ValueError:
+            return await self._respond({}, INVALID_PARAM, "params error")
+
+        bars = self.market.klines(symbol, interval, limit, start_ms=start, end_ms=end)
+        return await self._respond({
+            "symbol": symbol,
+            "category": "linear",
+            "list": [[str(b[0]), *(fmt_num(v) for v in b[1:])] for b in reversed(bars)]
+        })
+
+    async def rest_tickers(self, request: web.Request) -> web.Response:
+        symbol = request.query.get("symbol", "")
+        if self._unknown_symbol(symbol):
+            return await self._respond({}, INVALID_PARAM, "Not supported symbols")
+        symbols = [symbol] if symbol else list(self.market.symbols)
+        now_ms = int(time.time() * 1000)
+        return await self._respond({
+            "category": "linear",
+            "list": [self.tickers.get(s) or self.market.ticker(s, now_ms) for s in symbols]
+        })
+
+    async def rest_instruments(self, request: web.Request) -> web.Response:
+        symbol = request.query.get("symbol", "")
+        if self._unknown_symbol(symbol):
+            return await self._respond({"category": "linear", "list": []})
+        symbols = [symbol] if symbol else list(self.market.symbols)
+        return await self._respond({
+            "category": "linear",
+            "list": [self.market.instrument(s) for s in symbols],
+            "nextPageCursor": ""
+        })
+
+    async def rest_time(self, request: web.Request) -> web.Response:
+        now_ns = time.time_ns()
+        return await self._respond({"timeSecond": str(now_ns // 1_000_000_000), "timeNano": str(now_ns)})
+
+    async def rest_positions(self, request: web.Request) -> web.Response:
+        return await self._respond(self.account.position_list(request.query.get("symbol", "")))
+
+    async def rest_orders(self, request: web.Request) -> web.Response:
+        return await self._respond(self.account.order_list(request.query.get("symbol", "")))
+
+    async def rest_wallet(self, request: web.Request) -> web.Response:
+        return await self._respond(self.account.wallet_balance())
+
+    async def _post(self, request: web.Request, action) -> web.Response:
+        try:
+            params = await request.json()
+        except (json.JSONDecodeError, ValueError):
+            return await self._respond({}, INVALID_PARAM, "params error: invalid json")
+        code, message, result = action(params, int(time.time() * 1000))
+        return await self._respond(result, code, message)
+
+    async def rest_place_order(self, request: web.Request) -> web.Response:
+        return await self._post(request, self.account.place_order)
+
+    async def rest_cancel_order(self, request: web.Request) -> web.Response:
+        return await self._post(request, self.account.cancel_order)
+
+    async def rest_set_leverage(self, request: web.Request) -> web.Response:
+        return await self._post(request, self.account.set_leverage)
+
+    async def rest_trading_stop(self, request: web.Request) -> web.Response:
+        return await self._post(request, self.account.set_trading_stop)
+
+    # ------------------------------------------------------------------
+    # WebSocket
+    # ------------------------------------------------------------------
+
+    async def handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        conn = Connection(ws, self.args.ws_latency_ms, self.args.ws_jitter_ms)
+        self.connections.add(conn)
+        sender = asyncio.create_task(conn.run_sender())
+        logger.info(f"🔌 WS 연결: {request.remote} ({len(self.connections)}개)")
+
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    request_data = json.loads(msg.data)
+                except json.JSONDecodeError:
+                    continue
+                self._handle_op(conn, request_data)
+        finally:
+            for topic in conn.topics:
+                self.subscribers.get(topic, set()).discard(conn)
+            self.connections.discard(conn)
+            sender.cancel()
+            logger.info(f"🔌 WS 종료: {request.remote} (송신 {conn.sent:,}, 버림 {conn.dropped:,})")
+        return ws
+
+    def _handle_op(self, conn: Connection, request_data: Dict):
+        op = request_data.get("op")
+        args = request_data.get("args") or []
+        response = {"success": True, "ret_msg": "", "conn_id": conn.conn_id,
+                    "req_id": request_data.get("req_id", ""), "op": op}
+
+        if op == "ping":
+            response["ret_msg"] = "pong"
+        elif op == "subscribe":
+            invalid = [topic for topic in args if not self._valid_topic(topic)]
+            if invalid:
+                response["success"] = False
+                response["ret_msg"] = f"error:handler not found,topic:{invalid[0]}"
+            conn.send(json.dumps(response))
+            for topic in args:
+                if topic in invalid or topic in conn.topics:
+                    continue
+                conn.topics.add(topic)
+                self.subscribers.setdefault(topic, set()).add(conn)
+                self._send_initial(conn, topic)
+            return
+        elif op == "unsubscribe":
+            for topic in args:
+                conn.topics.discard(topic)
+                self.subscribers.get(topic, set()).discard(conn)
+        else:
+            response["success"] = False
+            response["ret_msg"] = f"error:unknown op {op}"
+        conn.send(json.dumps(response))
+
+    def _valid_topic(self, topic: str) -> bool:
+        parts = topic.split(".")
+        if parts[0] == "tickers" and len(parts) == 2:
+            return True
+        if parts[0] == "orderbook" and len(parts) == 3:
+            return parts[1].isdigit() and int(parts[1]) in ORDERBOOK_DEPTHS
+        if parts[0] == "kline" and len(parts) == 3:
+            return parts[1] in SUPPORTED_INTERVALS
+        return False
+
+    def _send_initial(self, conn: Connection, topic: str):
+        """구독 직후 스냅샷 (티커 전체 필드 / 호가 스냅샷)"""
+        ts = int(time.time() * 1000)
+        parts = topic.split(".")
+        symbol = parts[-1]
+        if self.args.replay:
+            if parts[0] == "tickers" and symbol in self.tickers:
+                conn.send(json.dumps({"topic": topic, "type": "snapshot", "data": self.tickers[symbol], "ts": ts}))
+            elif parts[0] == "orderbook" and topic in self.replay_books:
+                book = self.replay_books[topic]
+                conn.send(json.dumps({"topic": topic, "type": "snapshot", "ts": ts, "data": {
+                    "s": symbol, "b": list(book["b"].items()), "a": list(book["a"].items()),
+                    "u": book["u"], "seq": book["seq"]
+                }}))
+            return
+
+        if symbol not in self.market.symbols:
+            return
+        if parts[0] == "tickers":
+            ticker = self.tickers.get(symbol) or self.market.ticker(symbol, ts)
+            conn.send(json.dumps({"topic": topic, "type": "snapshot", "data": ticker, "cs": 0, "ts": ts}))
+        elif parts[0] == "orderbook":
+            feed = self._book_feed(symbol, int(parts[1]))
+            conn.send(feed.snapshot(symbol, ts))
+
+    def _book_feed(self, symbol: str, depth: int) -> BookFeed:
+        key = (symbol, depth)
+        feed = self.books.get(key)
+        if feed is None:
+            feed = self.books[key] = BookFeed(depth)
+            feed.update(*self._book_levels(symbol, depth))
+        return feed
+
+    def _book_levels(self, symbol: str, depth: int) -> Tuple[Dict[str, str], Dict[str, str]]:
+        market = self.market.symbols[symbol]
+        if len(market.bids) < depth:
+            market.rebuild_book(depth)
+        bids = sorted(market.bids.items(), reverse=True)[:depth]
+        asks = sorted(market.asks.items())[:depth]
+        return ({fmt_num(p): fmt_num(s) for p, s in bids}, {fmt_num(p): fmt_num(s) for p, s in asks})
+
+    def broadcast(self, topic: str, message: str):
+        subscribers = self.subscribers.get(topic)
+        if not subscribers:
+            return
+        for conn in subscribers:
+            conn.send(message)
+        self.ws_messages += len(subscribers)
+
+    def _subscribed(self, topic: str) -> bool:
+        return bool(self.subscribers.get(topic))
+
+    # ------------------------------------------------------------------
+    # 합성 시장 발행
+    # ------------------------------------------------------------------
+
+    async def _every(self, interval_ms: float, action):
+        """interval_ms마다 action(now_ms) (밀린 주기는 건너뜀)"""
+        interval = interval_ms / 1000
+        next_run = time.monotonic()
+        while True:
+            next_run += interval
+            try:
+                action(int(time.time() * 1000))
+            except Exception as e:
+                logger.error(f"발행 오류 ({action.__name__}): {e}")
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                next_run = time.monotonic()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def _step_market(self, now_ms: int):
+        for symbol, interval, bar in self.market.step(now_ms, self.args.tick_ms):
+            topic = f"kline.{interval}.{symbol}"
+            if self._subscribed(topic):
+                self.broadcast(topic, self._kline_message(topic, interval, bar, True, now_ms))
+        if self.account.positions or self.account.open_orders:
+            for symbol in {p.symbol for p in self.account.positions.values() if p.size} | \
+                    {o["symbol"] for o in self.account.open_orders.values()}:
+                self.account.on_price(symbol, self.market.symbols[symbol].price, now_ms)
+
+    def _publish_tickers(self, now_ms: int):
+        for symbol in self.market.symbols:
+            ticker = self.market.ticker(symbol, now_ms)
+            last = self.tickers.get(symbol)
+            self.tickers[symbol] = ticker
+            topic = f"tickers.{symbol}"
+            if last is None or not self._subscribed(topic):
+                continue
+            delta = {k: v for k, v in ticker.items() if last.get(k) != v}
+            if delta:
+                delta["symbol"] = symbol
+                self.broadcast(topic, json.dumps({"topic": topic, "type": "delta", "data": delta, "cs": 0, "ts": now_ms}))
+
+    def _publish_orderbooks(self, now_ms: int):
+        # 구독 중인 최대 depth만큼만 심볼별 호가 재생성
+        levels: Dict[str, int] = {}
+        for (symbol, depth) in self.books:
+            if self._subscribed(f"orderbook.{depth}.{symbol}"):
+                levels[symbol] = max(levels.get(symbol, 0), depth)
+        for symbol, depth in levels.items():
+            self.market.symbols[symbol].rebuild_book(depth)
+
+        for (symbol, depth), feed in self.books.items():
+            topic = f"orderbook.{depth}.{symbol}"
+            if symbol not in levels or not self._subscribed(topic):
+                continue
+            bids, asks = feed.update(*self._book_levels(symbol, depth))
+            if depth == 1:
+                # depth 1은 항상 스냅샷 (Bybit와 동일)
+                self.broadcast(topic, feed.snapshot(symbol, now_ms))
+            elif bids or asks:
+                self.broadcast(topic, json.dumps({"topic": topic, "type": "delta", "ts": now_ms, "data": {
+                    "s": symbol, "b": bids, "a": asks, "u": feed.u, "seq": feed.seq
+                }, "cts": now_ms}))
+
+    def _publish_klines(self, now_ms: int):
+        for topic, subscribers in self.subscribers.items():
+            if not subscribers or not topic.startswith("kline."):
+                continue
+            _, interval, symbol = topic.split(".")
+            if symbol not in self.market.symbols:
+                continue
+            bars = self.market.klines(symbol, interval, 1)
+            if bars:
+                self.broadcast(topic, self._kline_message(topic, interval, bars[-1], False, now_ms))
+
+    def _kline_message(self, topic: str, interval: str, bar: Tuple, confirm: bool, now_ms: int) -> str:
+        start, open_, high, low, close, volume, turnover = bar
+        return json.dumps({
+            "topic": topic,
+            "data": [{
+                "start": start,
+                "end": bucket_bounds(start, interval)[1] - 1,
+                "interval": interval,
+                "open": fmt_num(open_),
+                "close": fmt_num(close),
+                "high": fmt_num(high),
+                "low": fmt_num(low),
+                "volume": fmt_num(volume),
+                "turnover": fmt_num(turnover),
+                "confirm": confirm,
+                "timestamp": now_ms
+            }],
+            "ts": now_ms,
+            "type": "snapshot"
+        })
+
+    # ------------------------------------------------------------------
+    # 녹화 재생
+    # ------------------------------------------------------------------
+
+    async def _run_replay(self):
+        """캡처 프레임 재전송 (ts는 현재 시각 기준으로 이동)"""
+        files = capture_files(self.args.replay)
+        if not files:
+            logger.error(f"❌ 캡처 파일 없음: {self.args.replay}")
+            return
+
+        while True:
+            first_ns = None
+            offset_ms = 0
+            started = time.monotonic()
+            frames = 0
+            for recv_ns, frame in iter_frames(files):
+                if first_ns is None:
+                    first_ns = recv_ns
+                    offset_ms = int(time.time() * 1000) - recv_ns // 1_000_000
+
+                if self.args.speed > 0:
+                    delay = (recv_ns - first_ns) / 1e9 / self.args.speed - (time.monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                elif frames % 1000 == 0:
+                    await asyncio.sleep(0)
+                frames += 1
+
+                try:
+                    self._replay_frame(frame, offset_ms)
+                except Exception as e:
+                    logger.error(f"재생 프레임 오류: {e}")
+
+            logger.info(f"📼 재생 완료: {frames:,} 프레임")
+            if not self.args.loop:
+                return
+
+    def _replay_frame(self, frame: str, offset_ms: int):
+        data = json.loads(frame)
+        topic = data.get("topic")
+        if not topic:
+            return
+        if "ts" in data:
+            data["ts"] += offset_ms
+        payload = data.get("data")
+        kind = topic.split(".", 1)[0]
+        now_ms = data.get("ts", int(time.time() * 1000))
+
+        if kind == "tickers":
+            symbol = payload.get("symbol") or topic.rsplit(".", 1)[-1]
+            merged = self.tickers.setdefault(symbol, {})
+            if data.get("type") == "snapshot":
+                merged.clear()
+            merged.update(payload)
+            if payload.get("lastPrice"):
+                market = self.market.ensure_symbol(symbol, float(payload["lastPrice"]))
+                market.price = float(payload["lastPrice"])
+                self.account.on_price(symbol, market.price, now_ms)
+        elif kind == "orderbook":
+            book = self.replay_books.get(topic)
+            if data.get("type") == "snapshot" or book is None:
+                book = self.replay_books[topic] = {"b": {}, "a": {}, "u": 0, "seq": 0}
+            for side in ("b", "a"):
+                levels = book[side]
+                for price, size in payload.get(side, ()):
+                    if float(size) == 0:
+                        levels.pop(price, None)
+                    else:
+                        levels[price] = size
+            book["u"] = payload.get("u", book["u"])
+            book["seq"] = payload.get("seq", book["seq"])
+        elif kind == "kline" and topic.split(".")[1] == "1":
+            symbol = topic.rsplit(".", 1)[-1]
+            for item in payload:
+                bar = (int(item["start"]), float(item["open"]), float(item["high"]), float(item["low"]),
+                       float(item["close"]), float(item["volume"]), float(item["turnover"]))
+                self.market.apply_kline(symbol, bar, bool(item.get("confirm")))
+
+        if self._subscribed(topic):
+            self.broadcast(topic, json.dumps(data))
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    async def _start_background(self, app: web.Application):
+        args = self.args
+        if args.replay:
+            self.tasks.append(asyncio.create_task(self._run_replay()))
+        else:
+            self.tasks.append(asyncio.create_task(self._every(args.tick_ms, self._step_market)))
+            self.tasks.append(asyncio.create_task(self._every(args.ticker_ms, self._publish_tickers)))
+            self.tasks.append(asyncio.create_task(self._every(args.orderbook_ms, self._publish_orderbooks)))
+            self.tasks.append(asyncio.create_task(self._every(args.kline_ms, self._publish_klines)))
+        self.tasks.append(asyncio.create_task(self._stats_loop()))
+
+    async def _stop_background(self, app: web.Application):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def _stats_loop(self):
+        last_ws = last_rest = 0
+        while True:
+            await asyncio.sleep(self.args.stats_interval)
+            interval = self.args.stats_interval
+            dropped = sum(conn.dropped for conn in self.connections)
+            backlog = max((conn.queue.qsize() for conn in self.connections), default=0)
+            logger.info(
+                f"📊 연결 {len(self.connections)} | "
+                f"WS {(self.ws_messages - last_ws) / interval:,.0f} msg/s (버림 {dropped:,}, 최대 대기 {backlog:,}) | "
+                f"REST {(self.rest_requests - last_rest) / interval:,.1f} req/s | "
+                f"계정 {self.account.get_stats()}"
+            )
+            last_ws, last_rest = self.ws_messages, self.rest_requests
+
+    def get_stats(self) -> Dict:
+        return {
+            "connections": len(self.connections),
+            "ws_messages": self.ws_messages,
+            "rest_requests": self.rest_requests,
+            "uptime_sec": round(time.monotonic() - self.started, 1),
+            "account": self.account.get_stats()
+        }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="로컬 Fake Bybit 거래소 (REST + public linear WS)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+
+    market = parser.add_argument_group("시장 데이터")
+    market.add_argument("--symbols", type=int, default=50, help="합성 심볼 수")
+    market.add_argument("--seed", type=int, default=42, help="합성 시장 시드")
+    market.add_argument("--volatility", type=float, default=0.002, help="1분 수익률 표준편차 (심볼별 0.5~2배)")
+    market.add_argument("--replay", default="", help="녹화 재생: WS_CAPTURE_DIR 캡처 경로")
+    market.add_argument("--speed", type=float, default=1.0, help="녹화 재생 배속 (0 = 최대 속도)")
+    market.add_argument("--loop", action="store_true", help="녹화 재생 반복")
+
+    rates = parser.add_argument_group("발행 주기 (ms)")
+    rates.add_argument("--tick-ms", type=float, default=100, help="가격 갱신 주기")
+    rates.add_argument("--ticker-ms", type=float, default=100, help="tickers 발행 주기")
+    rates.add_argument("--orderbook-ms", type=float, default=100, help="orderbook 발행 주기")
+    rates.add_argument("--kline-ms", type=float, default=1000, help="진행 중 kline 발행 주기")
+
+    latency = parser.add_argument_group("지연")
+    latency.add_argument("--ws-latency-ms", type=float, default=0, help="WS 메시지 고정 지연")
+    latency.add_argument("--ws-jitter-ms", type=float, default=0, help="WS 메시지 추가 지연 (0~N 균등)")
+    latency.add_argument("--rest-latency-ms", type=float, default=0, help="REST 응답 지연")
+
+    account = parser.add_argument_group("계정")
+    account.add_argument("--balance", type=float, default=10_000.0, help="시작 USDT 잔고")
+    account.add_argument("--leverage", type=int, default=10, help="심볼 기본 레버리지")
+
+    parser.add_argument("--stats-interval", type=float, default=10, help="통계 로그 간격 (초)")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    exchange = FakeExchange(args)
+
+    print("=" * 60)
+    print("🏦 Fake Bybit Exchange")
+    print(f"   • REST: http://{args.host}:{args.port}")
+    print(f"   • WS:   ws://{args.host}:{args.port}{WS_PATH}")
+    if args.replay:
+        print(f"   • 소스: 녹화 재생 {args.replay} ({args.speed}x{', 반복' if args.loop else ''})")
+    else:
+        print(f"   • 소스: 합성 {len(exchange.market.symbols)}개 심볼 (seed {args.seed})")
+    print(f"   • 지연: WS {args.ws_latency_ms}+{args.ws_jitter_ms}ms | REST {args.rest_latency_ms}ms")
+    print("=" * 60)
+
+    web.run_app(exchange.app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Fake Exchange - 시장 데이터 소스
+
+SyntheticMarket: 심볼별 랜덤 워크 가격 → 1분봉 / 상위 타임프레임 / 티커 / 호가장
+- 시드 고정 시 같은 시작 시각이면 같은 데이터
+- 과거 봉은 타임프레임별로 요청 시 생성 (시작 가격에서 거꾸로 걷기)
+- 실시간 1분봉은 Scanner CandleAggregator로 상위 타임프레임에 합성 (거래소와 같은 구간 경계)
+
+봉 형식은 Bybit REST kline 리스트와 같은 순서: (start_ms, open, high, low, close, volume, turnover)
+"""
+import math
+import random
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from candle_aggregator import CandleAggregator, SUPPORTED_INTERVALS, bucket_bounds, interval_ms
+
+MINUTE_MS = 60_000
+HISTORY_BARS = 1000  # 타임프레임별 생성 과거 봉 수 (Bybit kline 최대 limit)
+
+
+def fmt_num(value: float) -> str:
+    """Bybit 응답처럼 지수 표기 없는 숫자 문자열"""
+    text = f"{value:.10f}".rstrip("0").rstrip(".")
+    return text if text not in ("", "-0") else "0"
+
+
+def _tick_size(price: float) -> float:
+    """가격대별 tickSize (유효숫자 약 5자리)"""
+    return 10 ** (math.floor(math.log10(price)) - 4)
+
+
+class SymbolMarket:
+    """심볼 1개 시장 상태"""
+
+    def __init__(self, symbol: str, price: float, seed: int, volatility: float):
+        self.symbol = symbol
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.volatility = volatility  # 1분 수익률 표준편차
+        self.tick_size = _tick_size(price)
+        self.qty_step = 10 ** max(-3, min(3, -math.floor(math.log10(price)) + 1))
+
+        self.initial_price = price
+        self.price = price
+        self.open_24h = price
+        self.volume_24h = 0.0
+        self.turnover_24h = 0.0
+        self.funding_rate = self.rng.uniform(-0.0003, 0.0003)
+
+        # 진행 중 1분봉
+        self.bar_start = 0
+        self.bar = None  # [open, high, low, close, volume, turnover]
+
+        # 호가장 (가격 → 수량), update id
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        self.book_u = 0
+        self.book_seq = 0
+
+    def round_price(self, price: float) -> float:
+        decimals = max(0, -int(math.floor(math.log10(self.tick_size))))
+        return round(round(price / self.tick_size) * self.tick_size, decimals)
+
+    def step(self, dt_ms: float) -> float:
+        """dt_ms 동안 가격 이동 (1분 변동성 기준 스케일)"""
+        scale = math.sqrt(max(dt_ms, 1.0) / MINUTE_MS)
+        shock = self.rng.gauss(0.0, self.volatility * scale)
+        self.price = max(self.tick_size, self.round_price(self.price * math.exp(shock)))
+
+        volume = abs(self.rng.gauss(0.0, 1.0)) * 10_000 / self.price * scale
+        self.volume_24h += volume
+        self.turnover_24h += volume * self.price
+        if self.bar is not None:
+            bar = self.bar
+            bar[1] = max(bar[1], self.price)
+            bar[2] = min(bar[2], self.price)
+            bar[3] = self.price
+            bar[4] += volume
+            bar[5] += volume * self.price
+        return self.price
+
+    def rebuild_book(self, levels: int):
+        """현재가 기준 호가장 재생성 (levels단, 수량은 매번 랜덤)"""
+        rng = self.rng
+        tick = self.tick_size
+        mid = self.price
+        self.bids = {
+            self.round_price(mid - tick * (i + 1)): round(rng.uniform(0.1, 50.0) * (1 + i * 0.1), 3)
+            for i in range(levels)
+        }
+        self.asks = {
+            self.round_price(mid + tick * (i + 1)): round(rng.uniform(0.1, 50.0) * (1 + i * 0.1), 3)
+            for i in range(levels)
+        }
+        self.book_u += 1
+        self.book_seq += 1
+
+    def history(self, interval: str, end_start_ms: int, count: int = HISTORY_BARS) -> List[Tuple]:
+        """
+        end_start_ms 직전까지의 과거 봉 (오래된 순)
+
+        마지막 봉 종가가 시작 가격이 되도록 거꾸로 생성 (심볼/타임프레임별 고정 시드)
+        """
+        rng = random.Random(self.seed * 31 + zlib.crc32(interval.encode()))
+        length = interval_ms(interval)
+        sigma = self.volatility * math.sqrt(length / MINUTE_MS)
+
+        bars = []
+        close = self.initial_price
+        start = end_start_ms
+        for _ in range(count):
+            start = bucket_bounds(start - 1, interval)[0]
+            open_ = self.round_price(close * math.exp(-rng.gauss(0.0, sigma)))
+            high = self.round_price(max(open_, close) * (1 + abs(rng.gauss(0.0, sigma / 2))))
+            low = self.round_price(min(open_, close) * (1 - abs(rng.gauss(0.0, sigma / 2))))
+            volume = round(abs(rng.gauss(1.0, 0.5)) * 10_000 / close * length / MINUTE_MS, 3)
+            bars.append((start, open_, high, low, close, volume, round(volume * close, 4)))
+            close = open_
+        bars.reverse()
+        return bars
+
+
+class SyntheticMarket:
+    """합성 시장 (전 심볼)"""
+
+    def __init__(
+        self,
+        symbols: List[str],
+        seed: int = 42,
+        volatility: float = 0.002,
+        start_ms: int = 0,
+        candle_history: int = HISTORY_BARS
+    ):
+        self.start_ms = start_ms
+        self.symbols: Dict[str, SymbolMarket] = {}
+        rng = random.Random(seed)
+        for index, symbol in enumerate(symbols):
+            price = 60_000.0 if symbol == "BTCUSDT" else round(10 ** rng.uniform(-2, 3), 6)
+            self.symbols[symbol] = SymbolMarket(
+                symbol, price, seed * 1_000_003 + index, volatility * rng.uniform(0.5, 2.0)
+            )
+
+        # 실시간 1분봉 → 상위 타임프레임 (과거 봉은 요청 시 생성 후 캐시)
+        # 시작 시각이 구간 중간이면 집계기가 첫 봉을 버리므로, 타임프레임별 집계기에
+        # 구간 시작~시작 시각 부분을 시작 가격 1분봉 하나로 미리 넣어 둔다
+        self.candles: Dict[str, CandleAggregator] = {}
+        minute = start_ms - start_ms % MINUTE_MS
+        for interval in SUPPORTED_INTERVALS[1:]:
+            aggregator = self.candles[interval] = CandleAggregator([interval], history=candle_history)
+            begin = bucket_bounds(minute, interval)[0]
+            if begin < minute:
+                for symbol, market in self.symbols.items():
+                    price = market.initial_price
+                    aggregator.update(symbol, begin, price, price, price, price, 0.0, 0.0)
+        self.minute_bars: Dict[str, List[Tuple]] = {s: [] for s in symbols}
+        self._history: Dict[Tuple[str, str], List[Tuple]] = {}
+        self.candle_history = candle_history
+
+    def step(self, now_ms: int, dt_ms: float) -> List[Tuple[str, str, Tuple]]:
+        """
+        전 심볼 가격 이동 + 1분봉 마감 처리
+
+        Returns:
+            이번 스텝에서 확정된 (symbol, interval, 봉) 목록
+        """
+        confirmed = []
+        minute = now_ms - now_ms % MINUTE_MS
+        for symbol, market in self.symbols.items():
+            if market.bar is not None and minute != market.bar_start:
+                confirmed.extend(self.close_bar(symbol, (market.bar_start, *market.bar)))
+                market.bar = None
+
+            if market.bar is None:
+                market.bar_start = minute
+                market.bar = [market.price, market.price, market.price, market.price, 0.0, 0.0]
+            market.step(dt_ms)
+        return confirmed
+
+    def close_bar(self, symbol: str, bar: Tuple) -> List[Tuple[str, str, Tuple]]:
+        """확정 1분봉 반영 → (symbol, interval, 봉) 완성 목록 (1분봉 포함)"""
+        history = self.minute_bars[symbol]
+        history.append(bar)
+        if len(history) > self.candle_history:
+            del history[0]
+
+        completed = [(symbol, "1", bar)]
+        for aggregator in self.candles.values():
+            for interval, done in aggregator.update(symbol, *bar):
+                completed.append((symbol, interval, done))
+        return completed
+
+    def ensure_symbol(self, symbol: str, price: float) -> SymbolMarket:
+        """녹화 재생 중 처음 보는 심볼 추가 (시작 가격 = 처음 본 가격)"""
+        market = self.symbols.get(symbol)
+        if market is None:
+            seed = zlib.crc32(symbol.encode())
+            market = self.symbols[symbol] = SymbolMarket(symbol, price, seed, 0.002)
+            self.minute_bars[symbol] = []
+        return market
+
+    def apply_kline(self, symbol: str, bar: Tuple, confirm: bool):
+        """녹화 재생: 수신한 1분봉으로 가격/봉 상태 갱신 (합성 걷기 대신)"""
+        market = self.ensure_symbol(symbol, bar[4])
+        market.price = bar[4]
+        if confirm:
+            history = self.minute_bars[symbol]
+            if not history or history[-1][0] < bar[0]:  # 중복 확정 프레임 무시
+                self.close_bar(symbol, bar)
+            market.bar = None
+        else:
+            market.bar_start = bar[0]
+            market.bar = list(bar[1:])
+
+    def klines(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> List[Tuple]:
+        """완성 봉 + 진행 중 봉 (오래된 순, 최대 limit개, start/end는 봉 시작 기준)"""
+        market = self.symbols[symbol]
+        key = (symbol, interval)
+        if key not in self._history:
+            self._history[key] = market.history(interval, bucket_bounds(self.start_ms, interval)[0])
+
+        if interval == "1":
+            live = list(self.minute_bars[symbol])
+            partial = (market.bar_start, *market.bar) if market.bar is not None else None
+        else:
+            live = self.candles[interval].get_bars(symbol, interval)
+            partial = self._partial(symbol, interval)
+
+        bars = self._history[key] + live + ([partial] if partial else [])
+        if end_ms is not None:
+            bars = [bar for bar in bars if bar[0] <= end_ms]
+        if start_ms is not None:
+            bars = [bar for bar in bars if bar[0] >= start_ms]
+        return bars[-limit:]
+
+    def _partial(self, symbol: str, interval: str) -> Optional[Tuple]:
+        """상위 타임프레임 진행 중 봉 (확정 1분봉 합성분 + 진행 중 1분봉)"""
+        market = self.symbols[symbol]
+        partial = self.candles[interval].get_partial(symbol, interval)
+        if market.bar is None:
+            return partial
+        o, h, l, c, v, t = market.bar
+        if partial is None:
+            return (bucket_bounds(market.bar_start, interval)[0], o, h, l, c, v, t)
+        start, po, ph, pl, _, pv, pt = partial
+        return (start, po, max(ph, h), min(pl, l), c, pv + v, pt + t)
+
+    def ticker(self, symbol: str, now_ms: int) -> Dict:
+        """Bybit v5 linear 티커 (REST/WS 공용 필드)"""
+        market = self.symbols[symbol]
+        price = market.price
+        change = (price - market.open_24h) / market.open_24h
+        next_funding = now_ms - now_ms % (8 * 3600_000) + 8 * 3600_000
+        return {
+            "symbol": symbol,
+            "lastPrice": fmt_num(price),
+            "markPrice": fmt_num(price),
+            "indexPrice": fmt_num(price),
+            "bid1Price": fmt_num(market.round_price(price - market.tick_size)),
+            "bid1Size": "10",
+            "ask1Price": fmt_num(market.round_price(price + market.tick_size)),
+            "ask1Size": "10",
+            "prevPrice24h": fmt_num(market.open_24h),
+            "price24hPcnt": f"{change:.6f}",
+            "highPrice24h": fmt_num(max(price, market.open_24h)),
+            "lowPrice24h": fmt_num(min(price, market.open_24h)),
+            "volume24h": f"{market.volume_24h:.3f}",
+            "turnover24h": f"{market.turnover_24h:.4f}",
+            "fundingRate": f"{market.funding_rate:.6f}",
+            "nextFundingTime": f"{next_funding}",
+            "openInterest": "0"
+        }
+
+    def instrument(self, symbol: str) -> Dict:
+        """Bybit v5 instruments-info 항목"""
+        market = self.symbols[symbol]
+        return {
+            "symbol": symbol,
+            "contractType": "LinearPerpetual",
+            "status": "Trading",
+            "baseCoin": symbol[:-4],
+            "quoteCoin": "USDT",
+            "settleCoin": "USDT",
+            "priceScale": f"{max(0, -int(math.floor(math.log10(market.tick_size))))}",
+            "leverageFilter": {"minLeverage": "1", "maxLeverage": "50.00", "leverageStep": "0.01"},
+            "priceFilter": {
+                "minPrice": fmt_num(market.tick_size),
+                "maxPrice": fmt_num(market.tick_size * 10_000_000),
+                "tickSize": fmt_num(market.tick_size)
+            },
+            "lotSizeFilter": {
+                "maxOrderQty": fmt_num(market.qty_step * 1_000_000),
+                "minOrderQty": fmt_num(market.qty_step),
+                "qtyStep": fmt_num(market.qty_step),
+                "postOnlyMaxOrderQty": fmt_num(market.qty_step * 1_000_000)
+            },
+            "fundingInterval": 480
+        }
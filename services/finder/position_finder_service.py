@@ -13,8 +13,13 @@ from datetime import datetime, timezone
 from src.utils.bybit_client import BybitClient
 from src.strategies.entry_strategy import EntryStrategy
 from src.utils.indicators import Indicators
+from src.utils.stage_profiler import stage, profiled
+from src.utils import api_accounting, structured_log, trace_context
+from src.utils.trace_context import span
 from config.config import Config
 
+logger = structured_log.get_logger("finder")
+
 def convert_floats_to_decimal(obj):
     """재귀적으로 float를 Decimal로 변환"""
     if isinstance(obj, float):
@@ -35,11 +40,13 @@ class PositionFinderService:
         
         # Bybit API 세션 (포지션 조회용)
         from pybit.unified_trading import HTTP
-        self.session = HTTP(
+        self.session = api_accounting.metered(HTTP(
             testnet=os.getenv('BYBIT_TESTNET', 'False') == 'True',
             api_key=os.getenv('BYBIT_API_KEY'),
             api_secret=os.getenv('BYBIT_API_SECRET')
-        )
+        ))
+        if os.getenv('BYBIT_REST_URL'):
+            self.session.endpoint = os.getenv('BYBIT_REST_URL').rstrip('/')
         
         # RabbitMQ 연결
         self.rabbitmq_host = os.getenv('RABBITMQ_HOST', 'localhost')
@@ -50,6 +57,9 @@ class PositionFinderService:
         
         self.finder_id = os.getenv('HOSTNAME', 'finder-1')
         self.prefetch_count = int(os.getenv('PREFETCH_COUNT', '1'))
+        
+        # 메시지 결과 집계 (LOG_COUNTER_SEC마다 한 줄, 단계별 상세는 DEBUG)
+        self.message_counts = structured_log.counters("finder.messages")
     
     def connect_rabbitmq(self):
         """RabbitMQ 연결"""
@@ -79,19 +89,20 @@ class PositionFinderService:
         
         return connection, channel
     
+    @profiled("find_entry_signal")
     def find_entry_signal(self, message):
         """진입 신호 탐색"""
         symbol = message['symbol']
         timeframe = message['timeframe'].replace('m', '')  # '1m' -> '1'
         strategy_type = message['strategy']
         
-        print(f"\n{'='*80}")
-        print(f"🔍 진입 신호 탐색: {symbol} ({timeframe}분봉, {strategy_type})")
-        print(f"{'='*80}\n")
+        logger.info(f"\n{'='*80}")
+        logger.info(f"🔍 진입 신호 탐색: {symbol} ({timeframe}분봉, {strategy_type})")
+        logger.info(f"{'='*80}\n")
         
         try:
             # 1. 최신 캔들 데이터 가져오기 (백테스팅과 동일하게 1000개)
-            print(f"[1/4] 캔들 데이터 로딩...")
+            logger.debug(f"[1/4] 캔들 데이터 로딩...")
             
             # 타임프레임에 따라 필요한 일수 계산
             timeframe_int = int(timeframe)
@@ -104,62 +115,66 @@ class PositionFinderService:
             else:
                 days = 42  # 그 이상: 42일
             
-            candles = self.client.get_klines_for_days(symbol, timeframe, days)
+            with stage("load_candles"):
+                candles = self.client.get_klines_for_days(symbol, timeframe, days)
             
             if candles.empty or len(candles) < Config.BB_PERIOD + 10:
-                print(f"❌ 데이터 부족: {len(candles)}개 봉")
+                logger.error(f"❌ 데이터 부족: {len(candles)}개 봉")
                 return None
             
             # 최신 1000개만 사용 (백테스팅과 동일)
             if len(candles) > 1000:
                 candles = candles.tail(1000).reset_index(drop=True)
             
-            print(f"✅ {len(candles)}개 봉 로딩 완료")
+            logger.debug(f"✅ {len(candles)}개 봉 로딩 완료")
             
             # 2. 심볼 정보 조회 (tickSize, qtyStep)
-            print(f"[2/5] 심볼 정보 조회...")
-            instrument_info = self.client.get_instrument_info(symbol)
+            logger.debug(f"[2/5] 심볼 정보 조회...")
+            with stage("instrument_info"):
+                instrument_info = self.client.get_instrument_info(symbol)
             
             if not instrument_info:
-                print(f"❌ 심볼 정보 조회 실패")
+                logger.error(f"❌ 심볼 정보 조회 실패")
                 return None
             
-            print(f"✅ tickSize: {instrument_info['tick_size']}, qtyStep: {instrument_info['qty_step']}")
+            logger.debug(f"✅ tickSize: {instrument_info['tick_size']}, qtyStep: {instrument_info['qty_step']}")
             
             # 3. 멀티 타임프레임 피보나치 계산
-            print(f"[3/5] 피보나치 계산...")
-            mtf_fib = Indicators.calculate_multi_timeframe_fibonacci(
-                self.client,
-                symbol,
-                Config.FIBONACCI_TIMEFRAMES
-            )
+            logger.debug(f"[3/5] 피보나치 계산...")
+            with stage("fibonacci"):
+                mtf_fib = Indicators.calculate_multi_timeframe_fibonacci(
+                    self.client,
+                    symbol,
+                    Config.FIBONACCI_TIMEFRAMES
+                )
             
             if not mtf_fib:
-                print(f"❌ 피보나치 계산 실패")
+                logger.error(f"❌ 피보나치 계산 실패")
                 return None
             
-            print(f"✅ {len(mtf_fib)}개 타임프레임 피보나치 완료")
+            logger.debug(f"✅ {len(mtf_fib)}개 타임프레임 피보나치 완료")
             
             # 4. 진입 신호 분석
-            print(f"[4/5] 진입 신호 분석...")
-            signal = self.strategy.analyze_entry(candles, symbol, mtf_fib, instrument_info=instrument_info)
+            logger.debug(f"[4/5] 진입 신호 분석...")
+            with stage("analyze_entry"):
+                signal = self.strategy.analyze_entry(candles, symbol, mtf_fib, instrument_info=instrument_info)
             
             if not signal:
-                print(f"⚠️  진입 신호 없음")
+                logger.warning(f"⚠️  진입 신호 없음")
                 return None
             
             # 소수점 자릿수
             price_decimals = instrument_info['price_decimals']
             
-            print(f"✅ 진입 신호 발견!")
-            print(f"  - 타입: {signal['type']}")
-            print(f"  - 진입가: ${signal['entry_price']:.{price_decimals}f}")
-            print(f"  - 손절가: ${signal['stop_loss']:.{price_decimals}f}")
-            print(f"  - 익절가: ${signal['take_profit']:.{price_decimals}f}")
-            print(f"  - 신뢰도: {signal.get('confidence', 60)}점")
+            logger.info(f"✅ 진입 신호 발견!")
+            logger.info(f"  - 타입: {signal['type']}")
+            logger.info(f"  - 진입가: ${signal['entry_price']:.{price_decimals}f}")
+            logger.info(f"  - 손절가: ${signal['stop_loss']:.{price_decimals}f}")
+            logger.info(f"  - 익절가: ${signal['take_profit']:.{price_decimals}f}")
+            logger.info(f"  - 신뢰도: {signal.get('confidence', 60)}점")
             
             # 4. 추가 정보 수집
-            print(f"[5/5] 추가 정보 수집...")
+            logger.debug(f"[5/5] 추가 정보 수집...")
             
             # 피보나치 레벨 찾기
             all_fib_levels = {}
@@ -233,15 +248,14 @@ class PositionFinderService:
                 'version': 1
             }
             
-            print(f"✅ 포지션 정보 생성 완료")
+            logger.debug(f"✅ 포지션 정보 생성 완료")
             return position
             
         except Exception as e:
-            print(f"❌ 진입 신호 탐색 실패: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ 진입 신호 탐색 실패: {e}")
             return None
     
+    @profiled("check_bybit_position")
     def check_bybit_position_or_order(self, symbol):
         """Bybit에서 해당 심볼의 오픈 포지션 또는 활성 주문 확인"""
         try:
@@ -255,10 +269,10 @@ class PositionFinderService:
                 positions = position_result['result']['list']
                 for pos in positions:
                     if float(pos['size']) > 0:
-                        print(f"⚠️  {symbol}에 이미 오픈된 포지션이 있습니다:")
-                        print(f"  - 사이드: {pos['side']}")
-                        print(f"  - 수량: {pos['size']}")
-                        print(f"  - 진입가: ${float(pos['avgPrice']):.2f}")
+                        logger.warning(f"⚠️  {symbol}에 이미 오픈된 포지션이 있습니다:")
+                        logger.info(f"  - 사이드: {pos['side']}")
+                        logger.info(f"  - 수량: {pos['size']}")
+                        logger.info(f"  - 진입가: ${float(pos['avgPrice']):.2f}")
                         return True
             
             # 2. 활성 주문 확인
@@ -270,16 +284,16 @@ class PositionFinderService:
             if order_result['retCode'] == 0:
                 orders = order_result['result']['list']
                 if orders:
-                    print(f"⚠️  {symbol}에 활성 주문이 있습니다:")
+                    logger.warning(f"⚠️  {symbol}에 활성 주문이 있습니다:")
                     for order in orders[:3]:  # 최대 3개만 출력
-                        print(f"  - Order ID: {order['orderId']}")
-                        print(f"  - 타입: {order['side']} {order['orderType']}")
+                        logger.info(f"  - Order ID: {order['orderId']}")
+                        logger.info(f"  - 타입: {order['side']} {order['orderType']}")
                     return True
             
             return False
             
         except Exception as e:
-            print(f"⚠️  Bybit 포지션/주문 확인 실패: {e}")
+            logger.warning(f"⚠️  Bybit 포지션/주문 확인 실패: {e}")
             # 에러 발생 시 안전하게 False 반환 (포지션 생성 허용)
             return False
     
@@ -315,7 +329,7 @@ class PositionFinderService:
             return None, None
             
         except Exception as e:
-            print(f"⚠️  기존 포지션 확인 실패: {e}")
+            logger.warning(f"⚠️  기존 포지션 확인 실패: {e}")
             return None, None
     
     def positions_are_similar(self, pos1, pos2):
@@ -336,106 +350,124 @@ class PositionFinderService:
         
         return True
     
-    def save_position(self, position):
-        """DynamoDB에 포지션 저장 (중복 확인 포함)"""
+    @profiled("save_position")
+    def save_position(self, position, trace=None):
+        """DynamoDB에 포지션 저장 (중복 확인 포함, 트레이스는 아이템에 함께 저장 → Order Executor)"""
         symbol = position['symbol']
+        save_start = trace_context.now_ms()
         
         # 1. Bybit에서 오픈 포지션 또는 활성 주문 확인 (최우선)
-        print(f"\n[1/3] Bybit 포지션/주문 확인...")
+        logger.debug(f"\n[1/3] Bybit 포지션/주문 확인...")
         if self.check_bybit_position_or_order(symbol):
-            print(f"❌ {symbol}은(는) 이미 Bybit에 포지션/주문이 있습니다. 포지션 생성 스킵.\n")
+            logger.error(f"❌ {symbol}은(는) 이미 Bybit에 포지션/주문이 있습니다. 포지션 생성 스킵.\n")
             return False
         
-        print(f"✅ Bybit에 {symbol} 포지션/주문 없음")
+        logger.debug(f"✅ Bybit에 {symbol} 포지션/주문 없음")
         
         # 2. DynamoDB에서 기존 포지션 확인
-        print(f"[2/3] DynamoDB 포지션 확인...")
+        logger.debug(f"[2/3] DynamoDB 포지션 확인...")
         existing_status, existing_position = self.check_existing_position(symbol)
         
         if existing_status == 'executing':
-            print(f"⚠️  {symbol}은(는) DynamoDB에서 진입 중입니다. 스킵.")
-            print(f"  - 기존 진입가: ${existing_position['entry_price']:.2f}")
-            print(f"  - 기존 타입: {existing_position['position_type']}\n")
+            logger.warning(f"⚠️  {symbol}은(는) DynamoDB에서 진입 중입니다. 스킵.")
+            logger.info(f"  - 기존 진입가: ${existing_position['entry_price']:.2f}")
+            logger.info(f"  - 기존 타입: {existing_position['position_type']}\n")
             return False
         
         if existing_status == 'active':
             # 기존 포지션과 비교
             if self.positions_are_similar(position, existing_position):
-                print(f"⚠️  {symbol}의 포지션이 기존과 유사합니다. 업데이트 스킵.")
-                print(f"  - 기존 진입가: ${existing_position['entry_price']:.2f}")
-                print(f"  - 새 진입가: ${position['entry_price']:.2f}\n")
+                logger.warning(f"⚠️  {symbol}의 포지션이 기존과 유사합니다. 업데이트 스킵.")
+                logger.info(f"  - 기존 진입가: ${existing_position['entry_price']:.2f}")
+                logger.info(f"  - 새 진입가: ${position['entry_price']:.2f}\n")
                 return False
             else:
-                print(f"🔄 {symbol}의 포지션이 변경되었습니다. 업데이트 진행.")
-                print(f"  - 기존: ${existing_position['entry_price']:.2f} ({existing_position['position_type']})")
-                print(f"  - 새로: ${position['entry_price']:.2f} ({position['position_type']})")
+                logger.info(f"🔄 {symbol}의 포지션이 변경되었습니다. 업데이트 진행.")
+                logger.info(f"  - 기존: ${existing_position['entry_price']:.2f} ({existing_position['position_type']})")
+                logger.info(f"  - 새로: ${position['entry_price']:.2f} ({position['position_type']})")
         
-        print(f"✅ DynamoDB에 {symbol} 활성 포지션 없음")
+        logger.debug(f"✅ DynamoDB에 {symbol} 활성 포지션 없음")
         
         # 3. 포지션 저장
-        print(f"[3/3] 포지션 저장...")
+        logger.debug(f"[3/3] 포지션 저장...")
         try:
+            trace_context.add_span(trace, "finder.save", save_start)
+            trace_context.inject(position, trace)
+            
             # Float를 Decimal로 변환
             position = convert_floats_to_decimal(position)
             
             self.positions_table.put_item(Item=position)
             
-            print(f"\n💾 DynamoDB 저장 완료:")
-            print(f"  - 심볼: {position['symbol']}")
-            print(f"  - 타입: {position['position_type']}")
-            print(f"  - 진입가: ${float(position['entry_price']):.2f}")
-            print(f"  - 신뢰도: {position['confidence']}점")
-            print(f"  - 손익비: {float(position['risk_reward_ratio']):.2f}:1\n")
+            logger.info(f"\n💾 DynamoDB 저장 완료:")
+            logger.info(f"  - 심볼: {position['symbol']}")
+            logger.info(f"  - 타입: {position['position_type']}")
+            logger.info(f"  - 진입가: ${float(position['entry_price']):.2f}")
+            logger.info(f"  - 신뢰도: {position['confidence']}점")
+            logger.info(f"  - 손익비: {float(position['risk_reward_ratio']):.2f}:1\n")
             
             return True
             
         except Exception as e:
-            print(f"❌ DynamoDB 저장 실패: {e}")
+            logger.error(f"❌ DynamoDB 저장 실패: {e}")
             return False
     
+    @profiled("finder.process_message")
     def process_message(self, ch, method, properties, body):
         """메시지 처리 콜백"""
         try:
             message = json.loads(body)
             
-            print(f"\n{'='*80}")
-            print(f"📨 메시지 수신: {message['symbol']}")
-            print(f"{'='*80}")
+            logger.info(f"\n📨 메시지 수신: {message['symbol']} ({message.get('timeframe', '?')}, {message.get('strategy', '?')})")
+            
+            # Selector에서 넘어온 트레이스 (없으면 여기서 시작)
+            trace = trace_context.extract(message) or trace_context.new_trace()
             
-            # 진입 신호 탐색
-            position = self.find_entry_signal(message)
+            # 진입 신호 탐색 + 저장 (메시지 1건의 API 사용량)
+            with api_accounting.footprint(f"finder {message['symbol']}") as fp:
+                with span(trace, "finder.find"):
+                    position = self.find_entry_signal(message)
+                saved = self.save_position(position, trace) if position else False
+            logger.info(fp.summary())
             
             if position:
-                # DynamoDB에 저장
-                if self.save_position(position):
+                # DynamoDB 저장 결과
+                if saved:
                     # ACK (성공)
                     ch.basic_ack(delivery_tag=method.delivery_tag)
-                    print(f"✅ 처리 완료: {message['symbol']}\n")
+                    trace_context.report(trace, "saved", self.finder_id)
+                    self.message_counts.incr("saved")
+                    logger.info(f"✅ 처리 완료: {message['symbol']}\n")
                 else:
                     # NACK (저장 실패 - 재시도)
                     ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
-                    print(f"❌ 저장 실패 - 재시도: {message['symbol']}\n")
+                    trace_context.report(trace, "skipped", self.finder_id)
+                    self.message_counts.incr("skipped")
+                    logger.error(f"❌ 저장 실패 - 재시도: {message['symbol']}\n")
             else:
                 # 신호 없음 - ACK (재시도 불필요)
                 ch.basic_ack(delivery_tag=method.delivery_tag)
-                print(f"⚠️  신호 없음: {message['symbol']}\n")
+                trace_context.report(trace, "no_signal", self.finder_id)
+                self.message_counts.incr("no_signal")
+                logger.info(f"⚠️  신호 없음: {message['symbol']}\n")
             
         except Exception as e:
-            print(f"❌ 메시지 처리 실패: {e}")
+            self.message_counts.incr("failed")
+            logger.exception(f"❌ 메시지 처리 실패: {e}")
             # NACK (실패 - 재시도)
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
     
     def run(self):
         """메인 실행 로직"""
-        print(f"\n{'='*80}")
-        print(f"🚀 Position Finder Service 시작")
-        print(f"{'='*80}")
-        print(f"Finder ID: {self.finder_id}")
-        print(f"RabbitMQ: {self.rabbitmq_host}:{self.rabbitmq_port}")
-        print(f"Queue: {self.queue_name}")
-        print(f"Prefetch: {self.prefetch_count}")
-        print(f"DynamoDB: {self.positions_table.table_name}")
-        print(f"{'='*80}\n")
+        logger.info(f"\n{'='*80}")
+        logger.info(f"🚀 Position Finder Service 시작")
+        logger.info(f"{'='*80}")
+        logger.info(f"Finder ID: {self.finder_id}")
+        logger.info(f"RabbitMQ: {self.rabbitmq_host}:{self.rabbitmq_port}")
+        logger.info(f"Queue: {self.queue_name}")
+        logger.info(f"Prefetch: {self.prefetch_count}")
+        logger.info(f"DynamoDB: {self.positions_table.table_name}")
+        logger.info(f"{'='*80}\n")
         
         connection, channel = self.connect_rabbitmq()
         
@@ -447,18 +479,19 @@ class PositionFinderService:
                 auto_ack=False  # 수동 ACK
             )
             
-            print(f"✅ 메시지 대기 중... (Ctrl+C로 종료)\n")
+            logger.info(f"✅ 메시지 대기 중... (Ctrl+C로 종료)\n")
             channel.start_consuming()
             
         except KeyboardInterrupt:
-            print(f"\n\n{'='*80}")
-            print(f"⏹️  Position Finder Service 종료")
-            print(f"{'='*80}\n")
+            logger.info(f"\n\n{'='*80}")
+            logger.info(f"⏹️  Position Finder Service 종료")
+            logger.info(f"{'='*80}\n")
             channel.stop_consuming()
             
         finally:
             connection.close()
 
 if __name__ == "__main__":
+    structured_log.setup("finder")
     service = PositionFinderService()
     service.run()
@@ -0,0 +1,78 @@
+"""
+L2OrderBook 델타 처리량 벤치마크
+
+심볼 1개 호가장에 스냅샷 후 델타(메시지당 1~6개 레벨 변경)를 적용하고
+depth별 deltas/sec와 지표 계산(imbalance, microprice, spread) 포함 처리량을 측정한다.
+
+실행: python services/scanner/benchmarks/bench_orderbook_engine.py
+"""
+import os
+import random
+import sys
+import time
+
+SCANNER_DIR = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(SCANNER_DIR)
+sys.path.append(os.path.join(SCANNER_DIR, 'processors'))
+
+from orderbook_engine import L2OrderBook
+
+NUM_DELTAS = 100_000
+TICK = 0.1
+
+
+def build_messages(depth: int, seed: int = 7):
+    """스냅샷 1개 + 델타 NUM_DELTAS개 (u 연속)"""
+    rng = random.Random(seed)
+    mid = 30000.0
+    snapshot = {
+        "s": "BTCUSDT",
+        "b": [[f"{mid - TICK * (i + 1):.1f}", f"{rng.uniform(0.1, 5):.3f}"] for i in range(depth)],
+        "a": [[f"{mid + TICK * (i + 1):.1f}", f"{rng.uniform(0.1, 5):.3f}"] for i in range(depth)],
+        "u": 100,
+        "seq": 1000,
+    }
+
+    deltas = []
+    for n in range(NUM_DELTAS):
+        bids, asks = [], []
+        for _ in range(rng.randint(1, 6)):
+            offset = rng.randint(1, depth + 2)
+            size = "0" if rng.random() < 0.3 else f"{rng.uniform(0.1, 5):.3f}"
+            if rng.random() < 0.5:
+                bids.append([f"{mid - TICK * offset:.1f}", size])
+            else:
+                asks.append([f"{mid + TICK * offset:.1f}", size])
+        deltas.append({"s": "BTCUSDT", "b": bids, "a": asks, "u": 101 + n, "seq": 1001 + n})
+
+    return snapshot, deltas
+
+
+def run(depth: int, with_metrics: bool) -> float:
+    snapshot, deltas = build_messages(depth)
+    book = L2OrderBook("BTCUSDT", depth)
+    book.apply("snapshot", snapshot)
+
+    start = time.perf_counter()
+    for delta in deltas:
+        book.apply("delta", delta)
+        if with_metrics:
+            book.imbalance()
+            book.microprice()
+            book.spread()
+    elapsed = time.perf_counter() - start
+
+    assert book.synced and book.gaps == 0
+    return len(deltas) / elapsed
+
+
+def main():
+    print(f"델타 {NUM_DELTAS:,}개 / 심볼 1개")
+    for depth in (1, 50, 200):
+        apply_rate = run(depth, with_metrics=False)
+        full_rate = run(depth, with_metrics=True)
+        print(f"  depth={depth:4d}: {apply_rate:10,.0f} deltas/sec (적용만) | {full_rate:10,.0f} deltas/sec (+지표)")
+
+
+if __name__ == "__main__":
+    main()
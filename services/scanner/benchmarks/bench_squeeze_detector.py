@@ -0,0 +1,63 @@
+"""
+SqueezeDetector 처리량 벤치마크
+
+500개 심볼에 kline.1 스트림을 흉내낸 업데이트를 흘려보내고 updates/sec를 측정한다.
+캔들당 진행 중 업데이트 N회 + 확정 1회. window 크기와 무관하게 비슷한 수치가 나와야 한다.
+
+실행: python services/scanner/benchmarks/bench_squeeze_detector.py
+"""
+import os
+import random
+import sys
+import time
+
+SCANNER_DIR = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(SCANNER_DIR)
+sys.path.append(os.path.join(SCANNER_DIR, 'managers'))
+sys.path.append(os.path.join(SCANNER_DIR, 'processors'))
+
+from squeeze_detector import SqueezeDetector
+
+NUM_SYMBOLS = 500
+NUM_CANDLES = 60
+TICKS_PER_CANDLE = 10
+
+
+def build_stream(seed: int = 42):
+    """(symbol, price, confirm) 스트림 생성"""
+    rng = random.Random(seed)
+    symbols = [f"SYM{i:03d}USDT" for i in range(NUM_SYMBOLS)]
+    prices = {s: rng.uniform(0.01, 50000) for s in symbols}
+
+    stream = []
+    for _ in range(NUM_CANDLES):
+        for tick in range(TICKS_PER_CANDLE + 1):
+            confirm = tick == TICKS_PER_CANDLE
+            for symbol in symbols:
+                prices[symbol] *= 1 + rng.gauss(0, 0.0005)
+                stream.append((symbol, prices[symbol], confirm))
+    return stream
+
+
+def run(window: int, stream) -> float:
+    detector = SqueezeDetector(window=window)
+    update = detector.update
+
+    start = time.perf_counter()
+    for symbol, price, confirm in stream:
+        update(symbol, price, confirm)
+    elapsed = time.perf_counter() - start
+
+    return len(stream) / elapsed
+
+
+def main():
+    stream = build_stream()
+    print(f"심볼 {NUM_SYMBOLS}개 | 캔들 {NUM_CANDLES}개 | 캔들당 틱 {TICKS_PER_CANDLE}+1 | 총 {len(stream):,} 업데이트")
+    for window in (20, 50, 200):
+        rate = run(window, stream)
+        print(f"  window={window:4d}: {rate:12,.0f} updates/sec")
+
+
+if __name__ == "__main__":
+    main()
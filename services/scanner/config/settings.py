@@ -7,17 +7,43 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _interval_minutes(interval: str) -> int:
+    return 1440 if interval == "D" else int(interval)
+
+
 class Config:
     """Scanner 설정"""
     
     # Bybit WebSocket
     BYBIT_WS_URL = os.getenv("BYBIT_WS_URL", "wss://stream.bybit.com/v5/public/linear")
     
+    # Bybit REST (시작 시 캔들 백필)
+    BYBIT_REST_URL = os.getenv("BYBIT_REST_URL", "https://api.bybit.com")
+    
     # WebSocket 설정
     WS_TIMEOUT = 60  # 타임아웃 (초)
     WS_PING_INTERVAL = 20  # Ping 간격 (초)
     WS_RECONNECT_DELAY = 5  # 재연결 대기 (초)
     
+    # 수신 파이프라인 (recv → 제한 큐 → 처리 워커)
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+    INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "2000"))
+    # 토픽 클래스별 과부하 정책 (keep / latest / merge), 확정 kline은 항상 keep
+    INGEST_POLICIES = os.getenv("INGEST_POLICIES", "tickers:merge,orderbook:merge,kline:latest")
+    INGEST_LAG_WARN_MS = float(os.getenv("INGEST_LAG_WARN_MS", "2000"))
+    
+    # 원본 프레임 캡처 (비어 있으면 비활성, replay.py로 재생)
+    WS_CAPTURE_DIR = os.getenv("WS_CAPTURE_DIR", "")
+    WS_CAPTURE_SEGMENT_MB = int(os.getenv("WS_CAPTURE_SEGMENT_MB", "64"))  # 세그먼트 최대 크기 (비압축)
+    WS_CAPTURE_SEGMENT_SEC = int(os.getenv("WS_CAPTURE_SEGMENT_SEC", "3600"))  # 세그먼트 최대 길이
+    
+    # 피드 지연 (거래소 ts → 로컬 수신, ping/pong 시계 오프셋 보정)
+    FEED_LATENCY_BUDGET_MS = float(os.getenv("FEED_LATENCY_BUDGET_MS", "1000"))  # 심볼 p99 / 연결 p50 예산
+    FEED_STALE_BUDGETS = os.getenv("FEED_STALE_BUDGETS", "tickers:10000,orderbook:10000,kline:90000")  # 무수신 허용 (ms)
+    FEED_LATENCY_WINDOW_SEC = float(os.getenv("FEED_LATENCY_WINDOW_SEC", "60"))
+    FEED_CHECK_INTERVAL_SEC = float(os.getenv("FEED_CHECK_INTERVAL_SEC", "5"))
+    FEED_BLOCK_WHEN_BEHIND = os.getenv("FEED_BLOCK_WHEN_BEHIND", "false").lower() == "true"  # 뒤처진 심볼 신호로 거래 안 함
+    
     # Redis 설정
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
@@ -35,14 +61,66 @@ class Config:
     SCAN_INTERVAL_SEC = int(os.getenv("SCAN_INTERVAL_SEC", "1"))
     ACTIVE_SYMBOLS_LIMIT = int(os.getenv("ACTIVE_SYMBOLS_LIMIT", "50"))
     TICKER_UPDATE_INTERVAL = 30  # 티커 업데이트 간격 (초)
+    RANK_ALL_TICKERS = os.getenv("RANK_ALL_TICKERS", "false").lower() == "true"  # 전 심볼 티커로 변동성 랭킹
+    RANKER_TTL_SEC = int(os.getenv("RANKER_TTL_SEC", "300"))  # 티커가 끊긴 심볼 랭킹 제외 시간
+    
+    # 멀티 프로세스 모드 (1: 단일 프로세스, auto: 코어 수만큼 워커)
+    _SCANNER_PROCESSES = os.getenv("SCANNER_PROCESSES", "1")
+    SCANNER_PROCESSES = (os.cpu_count() or 1) if _SCANNER_PROCESSES == "auto" else int(_SCANNER_PROCESSES)
+    SHARED_SLOTS_PER_WORKER = int(os.getenv("SHARED_SLOTS_PER_WORKER", "256"))
+    SHARED_PUBLISH_INTERVAL = float(os.getenv("SHARED_PUBLISH_INTERVAL", "1.0"))  # 공유 상태 게시 간격 (초)
+    STATE_STORE_CAPACITY = int(os.getenv("STATE_STORE_CAPACITY", "128"))  # 초기 심볼 슬롯 수
+    
+    # 1분봉 → 상위 타임프레임 캔들 합성 (Redis candles:{symbol}:{interval})
+    CANDLE_TIMEFRAMES = os.getenv("CANDLE_TIMEFRAMES", "3,5,15,30,60,240,D")
+    _CANDLE_HISTORY = os.getenv("CANDLE_HISTORY", "auto")  # 타임프레임별 보관 봉 수 (auto: 아래 CANDLE_HISTORY)
+    
+    # 재시작 웜업 (감지기 상태 스냅샷 + 빠진 1분봉 REST 백필)
+    SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+    SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "")  # 비어 있으면 Redis (scanner:snapshot)
+    SNAPSHOT_INTERVAL_SEC = int(os.getenv("SNAPSHOT_INTERVAL_SEC", "60"))
+    BACKFILL_BARS = int(os.getenv("BACKFILL_BARS", "200"))  # 스냅샷이 없을 때 채울 1분봉 수 (최대 1000)
+    BACKFILL_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", "10"))
+    
+    # 스트리밍 진입 평가 (확정 봉마다 EntryStrategy 규칙 적용 → Redis entry:signals)
+    # 전략 파라미터는 루트 config/config.py와 같은 값 유지
+    STREAMING_ENTRY = os.getenv("STREAMING_ENTRY", "false").lower() == "true"
+    ENTRY_TIMEFRAME = os.getenv("ENTRY_TIMEFRAME", "3")
+    FIBONACCI_TIMEFRAMES = {'5': 1, '15': 2, '30': 5, '240': 7, 'D': 30}  # interval: days
+    # 합성 캔들 보관 수는 피보나치 윈도우 중 최대 (5분봉 1일 = 288봉) 이상이어야
+    # 소비자(get_klines_for_days)가 REST로 폴백하지 않음
+    CANDLE_HISTORY = max(
+        200, *(days * 1440 // _interval_minutes(interval) for interval, days in FIBONACCI_TIMEFRAMES.items())
+    ) if _CANDLE_HISTORY == "auto" else int(_CANDLE_HISTORY)
+    BB_PERIOD = 20
+    BB_STD = 2
+    FIB_TOLERANCE = 0.02
+    POSITION_SIZE = 100.0
+    MIN_PROFIT_TARGET = 7.0
+    STOP_LOSS_PERCENT = 1.0
+    TAKE_PROFIT_PERCENT = 2.0
+    TAKER_FEE = 0.0006
+    LEVERAGE = 10
+    ENTRY_SEED_BARS = int(os.getenv("ENTRY_SEED_BARS", "200"))  # 진입 타임프레임 시드 봉 수
     
     # 필터 기준
     MIN_VOLUME_24H = float(os.getenv("MIN_VOLUME_24H", "1000000"))
     MIN_VOLATILITY_PCT = float(os.getenv("MIN_VOLATILITY_PCT", "2.0"))
     BB_SQUEEZE_THRESHOLD = float(os.getenv("BB_SQUEEZE_THRESHOLD", "0.9"))
     OB_IMBALANCE_THRESHOLD = float(os.getenv("OB_IMBALANCE_THRESHOLD", "0.7"))
+    OB_IMBALANCE_EXIT_THRESHOLD = float(os.getenv("OB_IMBALANCE_EXIT_THRESHOLD", "0.5"))  # 재무장 기준
+    ORDERBOOK_DEPTH = int(os.getenv("ORDERBOOK_DEPTH", "1"))  # orderbook 구독 depth (1/50/200)
     VOLUME_SPIKE_MULTIPLIER = float(os.getenv("VOLUME_SPIKE_MULTIPLIER", "3.0"))
     
+    # 신호 발행 게이트
+    OB_IMBALANCE_COOLDOWN_SEC = float(os.getenv("OB_IMBALANCE_COOLDOWN_SEC", "60"))
+    BB_SQUEEZE_COOLDOWN_SEC = float(os.getenv("BB_SQUEEZE_COOLDOWN_SEC", "300"))
+    MAX_EMISSIONS_PER_MIN = int(os.getenv("MAX_EMISSIONS_PER_MIN", "30"))  # Scanner당 분당 최대 발행
+    
+    # 주문 실행 (이벤트 루프 밖 워커)
+    EXECUTOR_QUEUE_SIZE = int(os.getenv("EXECUTOR_QUEUE_SIZE", "100"))
+    EXECUTOR_WORKERS = int(os.getenv("EXECUTOR_WORKERS", "4"))
+    
     # Bollinger Bands 설정
     BB_WINDOW = int(os.getenv("BB_WINDOW", "20"))
     BB_STD_DEV = float(os.getenv("BB_STD_DEV", "2.0"))
@@ -54,3 +132,6 @@ class Config:
     # 메트릭스
     ENABLE_METRICS = os.getenv("ENABLE_METRICS", "true").lower() == "true"
     METRICS_INTERVAL = int(os.getenv("METRICS_INTERVAL", "60"))
+    # Prometheus 텍스트 형식 /metrics (ENABLE_METRICS=true일 때, 멀티 프로세스 모드는 워커마다 PORT + 인덱스)
+    METRICS_HOST = os.getenv("METRICS_HOST", "0.0.0.0")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
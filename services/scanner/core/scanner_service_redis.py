@@ -3,37 +3,51 @@ Scanner Service - 메인 서비스 (모듈화)
 """
 import asyncio
 import logging
-import sys
 import json
 import time
+import zlib
 from datetime import datetime
 from typing import List, Set
 
 import aiohttp
 from config.settings import Config
 from utils.websocket_client import BybitWebSocketClient
+from utils.metrics import REGISTRY, FunctionMetric, Histogram, MetricsServer
 from redis_manager import RedisManager
 from data_processor import DataProcessor
+from kline_backfill import KlineBackfill, backfill_requests
+from state_snapshot import load_file, save_file
+from src.utils import stage_profiler, structured_log, trace_context
+from src.utils.loop_watchdog import LoopWatchdog
 
-# 로깅 설정
-logging.basicConfig(
-    level=getattr(logging, Config.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+# 로깅 설정 (큐 핸들러 + 쓰기 스레드, LOG_LEVELS / LOG_RATE_LIMIT / LOG_SAMPLE)
+structured_log.setup("scanner", fmt="text", level=Config.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 
 class ScannerService:
     """모듈화된 Scanner Service"""
     
-    def __init__(self):
+    def __init__(self, shard_index: int = 0, shard_count: int = 1, board=None):
+        """
+        Args:
+            shard_index: 멀티 프로세스 모드에서 이 워커의 인덱스
+            shard_count: 워커 수 (1이면 단일 프로세스)
+            board: 감지기 상태를 게시할 SharedSymbolBoard (멀티 프로세스 모드)
+        """
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.board = board
+        
         self.ws_client = BybitWebSocketClient()
         self.redis_manager = RedisManager()
         self.data_processor = DataProcessor()
         
         self.session = None
+        self.backfill = None
+        self.file_snapshots = {}  # 로컬 파일 스냅샷 (SNAPSHOT_PATH 설정 시)
         self.active_symbols = set()
+        self.ranked_symbols = set()  # 티커를 구독하는 심볼 (담당 + 랭킹 전용)
         self.current_version = "v0"
         self.rank = 1
         self.total_scanners = 1
@@ -45,6 +59,89 @@ class ScannerService:
             "symbols_assigned": 0,
             "opportunities_sent": 0
         }
+        
+        self.metrics_server = None
+        self._register_metrics()
+        
+        # 이벤트 루프 지연 / 정지 감시 (LOOP_WATCHDOG)
+        self.watchdog = LoopWatchdog.from_env(f"scanner-{shard_index}", observe=self.loop_lag.observe)
+    
+    def _register_metrics(self):
+        """
+        /metrics 노출 항목 등록
+        
+        카운터/큐 깊이는 기존 통계 필드를 수집 시점에 읽는다 (핫패스 추가 비용 없음).
+        """
+        pipeline = self.ws_client.pipeline
+        gate = self.data_processor.gate
+        
+        def per_class(field):
+            return lambda: {(c,): getattr(s, field) for c, s in pipeline.stats.items()}
+        
+        def per_signal(field):
+            return lambda: {(t,): c[field] for t, c in gate.type_stats.items()}
+        
+        FunctionMetric("scanner_messages_received", "토픽 클래스별 수신 메시지", per_class("received"), "counter", ("topic_class",))
+        FunctionMetric("scanner_messages_processed", "토픽 클래스별 처리 메시지", per_class("processed"), "counter", ("topic_class",))
+        FunctionMetric("scanner_messages_coalesced", "토픽 클래스별 병합/교체된 메시지", per_class("coalesced"), "counter", ("topic_class",))
+        FunctionMetric("scanner_messages_dropped", "토픽 클래스별 버린 메시지 (큐 가득 참)", per_class("dropped"), "counter", ("topic_class",))
+        FunctionMetric("scanner_ingest_backpressure", "토픽 클래스별 수신 대기 (keep 정책 큐 가득 참)", per_class("backpressure"), "counter", ("topic_class",))
+        FunctionMetric("scanner_ingest_queue_depth", "수신 큐 현재 깊이", pipeline.depth)
+        FunctionMetric("scanner_ingest_queue_max_depth", "수신 큐 최대 깊이", lambda: pipeline.max_depth)
+        FunctionMetric("scanner_ws_connected", "WebSocket 연결 여부", lambda: int(self.ws_client.is_connected))
+        
+        FunctionMetric("scanner_detector_evaluations", "신호 유형별 감지기 평가", per_signal("evaluated"), "counter", ("signal_type",))
+        FunctionMetric("scanner_emissions", "신호 유형별 발행", per_signal("emitted"), "counter", ("signal_type",))
+        FunctionMetric(
+            "scanner_emissions_suppressed", "신호 유형/사유별 억제된 발행",
+            lambda: {
+                (t, reason): c[f"suppressed_{reason}"]
+                for t, c in gate.type_stats.items()
+                for reason in ("cooldown", "hysteresis", "rate_limit")
+            },
+            "counter", ("signal_type", "reason")
+        )
+        FunctionMetric(
+            "scanner_opportunities_sent", "Redis로 보낸 기회 신호",
+            lambda: self.data_processor.stats["total_opportunities_sent"], "counter"
+        )
+        FunctionMetric(
+            "scanner_entry_signals_sent", "보낸 진입 신호",
+            lambda: self.data_processor.stats["total_entry_signals_sent"], "counter"
+        )
+        FunctionMetric("scanner_active_symbols", "담당 심볼 수", lambda: len(self.active_symbols))
+        
+        latency = self.ws_client.latency
+        FunctionMetric(
+            "scanner_feed_latency_ms", "토픽 클래스별 거래소 ts → 수신 지연 (시계 오프셋 보정)",
+            lambda: {
+                (c, q): v for c, qs in latency.class_quantiles().items() for q, v in qs.items()
+            },
+            "gauge", ("topic_class", "quantile")
+        )
+        FunctionMetric("scanner_feed_clock_offset_ms", "거래소 - 로컬 시계 추정 (ms)", lambda: latency.offset.offset_ms)
+        FunctionMetric("scanner_feed_min_rtt_ms", "ping/pong 최소 왕복 (ms)", lambda: latency.offset.min_rtt_ms or 0)
+        FunctionMetric("scanner_feed_behind_symbols", "지연/정체 예산 밖 심볼 수", lambda: len([k for k in latency.behind if k != "*"]))
+        FunctionMetric("scanner_feed_behind_all", "연결 전체가 예산 밖인지", lambda: int("*" in latency.behind))
+        FunctionMetric("scanner_feed_alerts", "피드 지연/정체 경고", lambda: {(k,): v for k, v in latency.alerts.items()}, "counter", ("kind",))
+        FunctionMetric(
+            "scanner_feed_suppressed_signals", "피드 지연으로 보류한 신호 (FEED_BLOCK_WHEN_BEHIND)",
+            lambda: self.data_processor.stats["suppressed_feed_behind"], "counter"
+        )
+        
+        self.loop_lag = Histogram("scanner_event_loop_lag_seconds", "이벤트 루프 지연 (예정 대비 재개 지연)")
+        FunctionMetric("scanner_event_loop_stalls", "이벤트 루프 정지 (LOOP_STALL_MS 초과)", lambda: self.watchdog.stall_count, "counter")
+        FunctionMetric(
+            "scanner_event_loop_stall_seconds", "이벤트 루프 정지 누적 시간",
+            lambda: self.watchdog.stall_total_ms / 1000, "counter"
+        )
+    
+    async def _start_metrics(self):
+        """메트릭 엔드포인트 시작"""
+        if not Config.ENABLE_METRICS:
+            return
+        self.metrics_server = MetricsServer(REGISTRY, Config.METRICS_HOST, Config.METRICS_PORT + self.shard_index)
+        await self.metrics_server.start()
     
     async def start(self):
         """Scanner 시작"""
@@ -65,9 +162,19 @@ class ScannerService:
         
         # Data Processor에 Scanner ID 설정
         self.data_processor.set_scanner_id(self.redis_manager.scanner_id)
+        if Config.STREAMING_ENTRY:
+            self.data_processor.set_entry_sink(self.redis_manager.publish_entry_signal)
+        if Config.FEED_BLOCK_WHEN_BEHIND:
+            self.data_processor.set_feed_guard(self.ws_client.latency.is_behind)
         
         # HTTP 세션 생성
         self.session = aiohttp.ClientSession()
+        self.backfill = KlineBackfill(self.session, concurrency=Config.BACKFILL_CONCURRENCY)
+        
+        # 로컬 파일 스냅샷은 시작 시 한 번 로드 (심볼 할당 시 복원)
+        if Config.SNAPSHOT_ENABLED and Config.SNAPSHOT_PATH:
+            self.file_snapshots = await asyncio.to_thread(load_file, self._snapshot_path())
+            logger.info(f"💾 스냅샷 로드: {len(self.file_snapshots)}개 심볼")
         
         # 메인 루프 시작
         await self._main_loop()
@@ -81,6 +188,21 @@ class ScannerService:
             # 통계 출력 태스크
             stats_task = asyncio.create_task(self._stats_loop())
             
+            # 공유 메모리 상태 게시 태스크 (멀티 프로세스 모드)
+            publish_task = asyncio.create_task(self._publish_loop()) if self.board else None
+            
+            # 상태 스냅샷 태스크
+            snapshot_task = asyncio.create_task(self._snapshot_loop()) if Config.SNAPSHOT_ENABLED else None
+            
+            # 피드 지연 / 정체 점검 태스크
+            feed_task = asyncio.create_task(self._feed_check_loop())
+            
+            # /metrics 엔드포인트
+            await self._start_metrics()
+            
+            # 이벤트 루프 감시 (하트비트 태스크 + 정지 시 스택 샘플링 스레드)
+            watchdog_task = self.watchdog.start()
+            
             # WebSocket 연결 및 리스닝
             while True:
                 try:
@@ -111,6 +233,14 @@ class ScannerService:
             # 정리
             heartbeat_task.cancel()
             stats_task.cancel()
+            if publish_task:
+                publish_task.cancel()
+            if snapshot_task:
+                snapshot_task.cancel()
+            feed_task.cancel()
+            self.watchdog.stop()
+            if watchdog_task:
+                watchdog_task.cancel()
             await self._cleanup()
     
     async def _heartbeat_loop(self):
@@ -119,6 +249,8 @@ class ScannerService:
             try:
                 await self.redis_manager.update_heartbeat()
                 await self._check_version_update()
+                await self._resync_orderbooks()
+                await self.redis_manager.store_candles(self.data_processor.pop_completed_candles())
                 await asyncio.sleep(5)  # 5초마다
             except Exception as e:
                 logger.error(f"하트비트 오류: {e}")
@@ -130,14 +262,26 @@ class ScannerService:
             symbols = await self.redis_manager.get_symbol_assignments()
             rank, total = await self.redis_manager.get_scanner_rank()
             
-            # 새 버전 감지
-            if symbols and len(symbols) != len(self.active_symbols):
+            # 심볼 할당 (Scanner 구간 → 워커 샤드)
+            my_symbols = self._assign_symbols(symbols, rank, total) if symbols else []
+            if self.shard_count > 1:
+                my_symbols = [s for s in my_symbols if self._shard_of(s) == self.shard_index]
+            
+            # 랭킹 전용 티커 구독 (전 심볼, 멀티 프로세스 모드에서는 첫 워커만)
+            ranked_symbols = set(my_symbols)
+            if Config.RANK_ALL_TICKERS and symbols and self.shard_index == 0:
+                ranked_symbols.update(symbols)
+            
+            # 새 버전 감지 (담당 심볼 집합이 바뀐 경우)
+            if symbols and (set(my_symbols) != self.active_symbols or ranked_symbols != self.ranked_symbols):
                 new_version = f"v{int(time.time()) % 1000}"
                 logger.info(f"🔔 새 버전 감지: {new_version}")
                 
-                # 심볼 할당
-                my_symbols = self._assign_symbols(symbols, rank, total)
-                await self._update_subscriptions(my_symbols)
+                # Discovery 발행 → 이 워커 구독 반영까지 (discovery:latest 트레이스)
+                trace = self.redis_manager.discovery_trace
+                with trace_context.span(trace, "scanner.subscribe"):
+                    await self._update_subscriptions(my_symbols, ranked_symbols)
+                trace_context.report(trace, "assigned", f"{self.redis_manager.scanner_id}-{self.shard_index}")
                 
                 self.current_version = new_version
                 self.rank = rank
@@ -148,6 +292,26 @@ class ScannerService:
         except Exception as e:
             logger.error(f"버전 업데이트 체크 오류: {e}")
     
+    async def _feed_check_loop(self):
+        """피드 지연 / 정체 예산 점검 (뒤처진 심볼 표시 갱신 + 경고)"""
+        while True:
+            try:
+                await asyncio.sleep(Config.FEED_CHECK_INTERVAL_SEC)
+                self.ws_client.latency.check()
+            except Exception as e:
+                logger.error(f"피드 지연 점검 오류: {e}")
+    
+    async def _resync_orderbooks(self):
+        """시퀀스가 끊긴 호가장 재구독 (새 스냅샷 수신)"""
+        symbols = [s for s in self.data_processor.pop_resync_symbols() if s in self.active_symbols]
+        if not symbols:
+            return
+        
+        topics = [f"orderbook.{Config.ORDERBOOK_DEPTH}.{symbol}" for symbol in symbols]
+        await self.ws_client.unsubscribe(topics)
+        await self.ws_client.subscribe(topics)
+        logger.info(f"🔄 호가장 재동기화: {len(symbols)}개 심볼")
+    
     def _assign_symbols(self, symbols: List[str], rank: int, total: int) -> List[str]:
         """심볼 할당 계산"""
         symbols_per_scanner = len(symbols) // total
@@ -159,33 +323,144 @@ class ScannerService:
         
         return symbols[start_idx:end_idx]
     
-    async def _update_subscriptions(self, new_symbols: List[str]):
-        """구독 업데이트"""
+    def _shard_of(self, symbol: str) -> int:
+        """심볼 → 워커 샤드 (프로세스 간 동일한 해시)"""
+        return zlib.crc32(symbol.encode()) % self.shard_count
+    
+    async def _publish_loop(self):
+        """감지기 상태를 공유 메모리에 주기적으로 게시"""
+        while True:
+            try:
+                await asyncio.sleep(Config.SHARED_PUBLISH_INTERVAL)
+                self.board.publish(self.shard_index, self.data_processor.export_state())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"공유 상태 게시 오류: {e}")
+    
+    @staticmethod
+    def _topics_for(symbols: Set[str], ranked_symbols: Set[str]) -> Set[str]:
+        """담당 심볼은 전 토픽, 랭킹 전용 심볼은 티커만"""
+        topics = {f"tickers.{symbol}" for symbol in symbols | ranked_symbols}
+        for symbol in symbols:
+            topics.add(f"orderbook.{Config.ORDERBOOK_DEPTH}.{symbol}")
+            topics.add(f"kline.1.{symbol}")
+        # 스트리밍 진입 평가의 시장 추세 (담당 여부와 무관하게 BTC 1분봉 수신)
+        if Config.STREAMING_ENTRY and symbols:
+            from src.strategies.streaming_entry import BTC_SYMBOL
+            topics.add(f"kline.1.{BTC_SYMBOL}")
+        return topics
+    
+    def _snapshot_path(self) -> str:
+        """워커별 스냅샷 파일 경로"""
+        if self.shard_count > 1:
+            return f"{Config.SNAPSHOT_PATH}.{self.shard_index}"
+        return Config.SNAPSHOT_PATH
+    
+    async def _save_snapshots(self):
+        """담당 심볼 상태 스냅샷 저장"""
+        entries = self.data_processor.export_snapshots(self.active_symbols)
+        if Config.SNAPSHOT_PATH:
+            await asyncio.to_thread(save_file, self._snapshot_path(), entries)
+        else:
+            await self.redis_manager.save_snapshots(entries)
+        logger.debug(f"💾 스냅샷 저장: {len(entries)}개 심볼")
+    
+    async def _snapshot_loop(self):
+        """상태 스냅샷 주기 저장"""
+        while True:
+            try:
+                await asyncio.sleep(Config.SNAPSHOT_INTERVAL_SEC)
+                await self._save_snapshots()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"스냅샷 저장 오류: {e}")
+    
+    async def _warm_up(self, symbols: Set[str]):
+        """
+        새로 담당한 심볼 웜업: 스냅샷 복원 + 빠진 확정 1분봉 동시 백필
+        
+        kline 구독 전에 호출해야 실시간 봉과 백필 봉이 섞이지 않는다.
+        """
+        started = time.monotonic()
+        restored = {}
+        if Config.SNAPSHOT_ENABLED:
+            if Config.SNAPSHOT_PATH:
+                blobs = {s: self.file_snapshots.pop(s) for s in symbols if s in self.file_snapshots}
+            else:
+                blobs = await self.redis_manager.load_snapshots(symbols)
+            restored = self.data_processor.restore_snapshots(blobs)
+        
+        if Config.STREAMING_ENTRY:
+            await self._seed_entry(symbols)
+        
+        requests = backfill_requests(restored, symbols, Config.BACKFILL_BARS)
+        results = await self.backfill.fetch_many(requests)
+        
+        filled = sum(self.data_processor.warm_up(symbol, bars) for symbol, bars in results.items())
+        logger.info(
+            f"🔥 웜업 완료: {len(symbols)}개 심볼 | 스냅샷 복원 {len(restored)} | "
+            f"백필 {filled}봉 ({len(requests)}개 요청) | {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+    
+    async def _seed_entry(self, symbols: Set[str]):
+        """
+        스트리밍 진입 평가기 시드: 진입/피보나치 타임프레임 과거 봉 + 거래 규칙 (+ 최초 1회 BTC 1분봉)
+        
+        1분봉 백필보다 먼저 호출해 합성 봉과 겹치는 구간은 평가기가 무시하게 한다.
+        """
+        evaluator = self.data_processor.entry_evaluator
+        windows = {evaluator.entry_interval: Config.ENTRY_SEED_BARS}
+        for interval, size in evaluator.fib_windows.items():
+            windows[interval] = max(size, windows.get(interval, 0))
+        
+        jobs = [(symbol, interval, size) for symbol in symbols for interval, size in windows.items()]
+        results = await asyncio.gather(*(self.backfill.fetch(s, size, interval) for s, interval, size in jobs))
+        seeded = sum(
+            self.data_processor.seed_entry(symbol, interval, bars)
+            for (symbol, interval, _), bars in zip(jobs, results)
+        )
+        self.data_processor.set_instruments(await self.backfill.fetch_instruments(symbols))
+        
+        if evaluator.btc_last_start < 0:
+            from src.strategies.streaming_entry import BTC_TREND_BARS
+            for bar in await self.backfill.fetch(self.data_processor.btc_symbol, BTC_TREND_BARS):
+                evaluator.update_btc(bar)
+        logger.info(f"🎯 진입 평가기 시드: {len(symbols)}개 심볼 | {seeded}봉 ({len(jobs)}개 요청)")
+    
+    async def _update_subscriptions(self, new_symbols: List[str], ranked_symbols: Set[str] = None):
+        """구독 업데이트 (바뀐 토픽만 해제/구독)"""
         try:
-            # 기존 구독 해제
-            if self.active_symbols:
-                old_topics = []
-                for symbol in self.active_symbols:
-                    old_topics.extend([
-                        f"tickers.{symbol}",
-                        f"orderbook.1.{symbol}",
-                        f"kline.1.{symbol}"
-                    ])
-                await self.ws_client.unsubscribe(old_topics)
+            new_active = set(new_symbols)
+            new_ranked = ranked_symbols if ranked_symbols is not None else new_active
             
-            # 새 구독
-            if new_symbols:
-                new_topics = []
-                for symbol in new_symbols:
-                    new_topics.extend([
-                        f"tickers.{symbol}",
-                        f"orderbook.1.{symbol}",
-                        f"kline.1.{symbol}"
-                    ])
-                await self.ws_client.subscribe(new_topics)
+            old_topics = self._topics_for(self.active_symbols, self.ranked_symbols)
+            new_topics = self._topics_for(new_active, new_ranked)
             
-            self.active_symbols = set(new_symbols)
-            logger.info(f"📈 새 구독: {len(new_symbols)}개")
+            removed = sorted(old_topics - new_topics)
+            added = sorted(new_topics - old_topics)
+            
+            # 새 담당 심볼은 구독 전에 웜업
+            warm_symbols = new_active - self.active_symbols
+            if warm_symbols:
+                await self._warm_up(warm_symbols)
+            if Config.STREAMING_ENTRY:
+                self.data_processor.set_trend_symbols({self.data_processor.btc_symbol} - new_active)
+            if removed:
+                await self.ws_client.unsubscribe(removed)
+            if added:
+                await self.ws_client.subscribe(added)
+            
+            # 더 이상 담당하지 않는 심볼 상태 해제 (랭킹 대상이면 티커 상태 유지)
+            self.data_processor.release_symbols(
+                (self.active_symbols | self.ranked_symbols) - new_active,
+                keep_ranking=new_ranked
+            )
+            
+            self.active_symbols = new_active
+            self.ranked_symbols = new_ranked
+            logger.info(f"📈 새 구독: {len(new_symbols)}개 (랭킹 {len(new_ranked)}개)")
             logger.info(f"✅ 업데이트 완료: {self.current_version}")
         
         except Exception as e:
@@ -202,10 +477,76 @@ class ScannerService:
                 logger.info("=" * 60)
                 logger.info("📊 Scanner 통계")
                 logger.info(f"   • Scanner ID: {self.redis_manager.scanner_id}")
+                if self.shard_count > 1:
+                    logger.info(f"   • 워커: {self.shard_index + 1}/{self.shard_count}")
+                    if self.board is not None and self.board.truncated:
+                        logger.info(f"   • 공유 보드 제외: {self.board.truncated}개 (슬롯 {self.board.slots_per_worker})")
                 logger.info(f"   • Rank: {self.rank}/{self.total_scanners}")
                 logger.info(f"   • 담당 심볼: {len(self.active_symbols)}")
+                logger.info(
+                    f"   • 변동성 랭킹: {processor_stats['ranked_symbols']}개 | "
+                    f"Top: {', '.join(processor_stats['top_volatility'])}"
+                )
                 logger.info(f"   • 발행 기회: {processor_stats['total_opportunities_sent']}")
+                if Config.STREAMING_ENTRY:
+                    logger.info(
+                        f"   • 진입 평가: {processor_stats['entry_symbols']}개 심볼 | "
+                        f"평가 {processor_stats['entry_bars_evaluated']}봉 | "
+                        f"신호 {processor_stats['total_entry_signals_sent']} | "
+                        f"BTC {processor_stats['entry_btc_trend']}"
+                    )
+                logger.info(
+                    f"   • 억제된 발행: {processor_stats['gate_suppressed_total']} "
+                    f"(쿨다운 {processor_stats['gate_suppressed_cooldown']}, "
+                    f"히스테리시스 {processor_stats['gate_suppressed_hysteresis']}, "
+                    f"발행량 제한 {processor_stats['gate_suppressed_rate_limit']})"
+                )
+                ingest_stats = self.ws_client.get_stats()
+                logger.info(
+                    f"   • 수신 큐: {ingest_stats['queue_depth']} (최대 {ingest_stats['max_queue_depth']})"
+                )
+                feed = self.ws_client.latency.get_stats()
+                worst = ", ".join(f"{s} {v:.0f}ms" for s, v in self.ws_client.latency.worst_symbols(3))
+                logger.info(
+                    f"   • 피드 지연 p50/p99: "
+                    + " | ".join(
+                        f"{c} {feed.get(c + '_p50_ms', 0)}/{feed.get(c + '_p99_ms', 0)}ms"
+                        for c in ("tickers", "orderbook", "kline") if c + "_p50_ms" in feed
+                    )
+                    + f" | 오프셋 {feed['clock_offset_ms']}ms, RTT p50 {feed['rtt_p50_ms']}ms"
+                )
+                logger.info(
+                    f"     - 뒤처짐 {feed['behind_symbols']}개{' (연결 전체)' if feed['behind_all'] else ''} | "
+                    f"경고 지연 {feed['alerts_latency']}, 정체 {feed['alerts_stale']} | "
+                    f"보류 신호 {processor_stats['suppressed_feed_behind']} | 최대 p99: {worst or '-'}"
+                )
+                for topic_class in ("tickers", "orderbook", "kline"):
+                    cls = ingest_stats.get(topic_class)
+                    if cls:
+                        logger.info(
+                            f"     - {topic_class}: 처리 {cls['processed']}/{cls['received']} | "
+                            f"병합 {cls['coalesced']} | 버림 {cls['dropped']} | 대기 {cls['backpressure']} | "
+                            f"지연 p50/p99 {cls['lag_p50_ms']}/{cls['lag_p99_ms']}ms"
+                        )
+                logger.info(
+                    f"   • 주문 큐: {processor_stats['executor_queue_depth']} "
+                    f"(최대 {processor_stats['executor_max_queue_depth']}, 버림 {processor_stats['executor_dropped']}) | "
+                    f"대기 p50/p99 {processor_stats['executor_wait_p50_ms']}/{processor_stats['executor_wait_p99_ms']}ms | "
+                    f"실행 p50/p99 {processor_stats['executor_exec_p50_ms']}/{processor_stats['executor_exec_p99_ms']}ms"
+                )
+                logger.info(
+                    f"   • 상태 메모리: {processor_stats['state_symbols']}개 심볼 × "
+                    f"{processor_stats['state_bytes_per_symbol']:,}B "
+                    f"(전체 {processor_stats['state_total_bytes'] / 1024:.1f}KB)"
+                )
+                if self.watchdog.enabled:
+                    for i, line in enumerate(self.watchdog.format_report(limit=3)):
+                        logger.info(f"   • {line}" if i == 0 else f"     {line}")
                 logger.info(f"   • 버전: {self.current_version}")
+                if stage_profiler.enabled():
+                    logger.info("   • 구간 프로파일 (STAGE_PROFILE):")
+                    for line in stage_profiler.format_report(limit=15):
+                        logger.info(f"     {line}")
                 logger.info("=" * 60)
                 
             except Exception as e:
@@ -216,11 +557,23 @@ class ScannerService:
         logger.info("🧹 정리 작업 시작")
         
         await self.ws_client.disconnect()
+        if Config.SNAPSHOT_ENABLED:
+            try:
+                await self._save_snapshots()
+            except Exception as e:
+                logger.error(f"최종 스냅샷 저장 오류: {e}")
+        await self.data_processor.close()
+        # 멀티 프로세스 모드의 멤버십(컨테이너 단위)은 supervisor가 종료 시 해제
+        if self.shard_count == 1:
+            await self.redis_manager.unregister_scanner()
         await self.redis_manager.close()
         
         if self.session:
             await self.session.close()
         
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        
         logger.info("✅ 정리 완료")
 
 
@@ -0,0 +1,147 @@
+"""
+Scanner Supervisor - 멀티 프로세스 모드
+
+코어당 워커 프로세스 1개를 fork하고, 각 워커는 담당 심볼의 해시 샤드를
+자기 WebSocket 연결로 처리한다. 워커는 감지기 상태를 공유 메모리 보드에 게시하고,
+supervisor는 IPC 직렬화 없이 보드를 읽어 전 심볼 랭킹을 집계한다.
+
+Redis 멤버십은 컨테이너(hostname) 단위이므로 워커들은 같은 scanner_id로 하트비트한다.
+워커 하나가 종료(재시작)돼도 멤버십은 유지되고, 해제는 supervisor 종료 시 한 번만 한다.
+"""
+import asyncio
+import logging
+import multiprocessing as mp
+import signal
+import socket
+import time
+from typing import Dict
+
+import numpy as np
+
+from config.settings import Config
+from shared_board import SharedSymbolBoard
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main(index: int, count: int, board: SharedSymbolBoard):
+    """워커 프로세스 진입점 (fork로 보드 매핑을 상속)"""
+    from core.scanner_service_redis import ScannerService
+
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    scanner = ScannerService(shard_index=index, shard_count=count, board=board)
+    try:
+        asyncio.run(scanner.start())
+    except KeyboardInterrupt:
+        pass
+
+
+class ScannerSupervisor:
+    """워커 프로세스 관리 및 공유 상태 집계"""
+
+    def __init__(self, num_workers: int):
+        self.num_workers = num_workers
+        self.ctx = mp.get_context("fork")
+        self.board = SharedSymbolBoard.create(num_workers, Config.SHARED_SLOTS_PER_WORKER)
+        self.workers: Dict[int, mp.Process] = {}
+        self.running = True
+        self.restarts = 0
+
+    def _spawn(self, index: int):
+        process = self.ctx.Process(
+            target=_worker_main,
+            args=(index, self.num_workers, self.board),
+            name=f"scanner-worker-{index}",
+            daemon=False
+        )
+        process.start()
+        self.workers[index] = process
+        logger.info(f"👷 워커 시작: {index + 1}/{self.num_workers} (pid {process.pid})")
+
+    def _stop(self, *_):
+        self.running = False
+
+    def run(self):
+        """워커 실행 및 감시 루프"""
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        logger.info(f"🚀 Scanner Supervisor 시작: 워커 {self.num_workers}개")
+        for index in range(self.num_workers):
+            self._spawn(index)
+
+        last_report = time.monotonic()
+        try:
+            while self.running:
+                time.sleep(1)
+
+                # 종료된 워커 재시작
+                for index, process in list(self.workers.items()):
+                    if not process.is_alive() and self.running:
+                        logger.warning(f"⚠️ 워커 {index + 1} 종료 (exit {process.exitcode}) - 재시작")
+                        self.restarts += 1
+                        self._spawn(index)
+
+                if time.monotonic() - last_report >= Config.METRICS_INTERVAL:
+                    last_report = time.monotonic()
+                    self.report()
+        finally:
+            self._shutdown()
+
+    def get_rankings(self, n: int = 10) -> np.ndarray:
+        """전 워커 심볼을 변동성 기준으로 정렬한 상위 N개"""
+        rows = self.board.snapshot()
+        if len(rows) == 0:
+            return rows
+        order = np.lexsort((-rows["volume_24h"], -rows["change_pct"]))
+        return rows[order[:n]]
+
+    def report(self):
+        """집계 통계 출력"""
+        rows = self.board.snapshot()
+        squeezing = int(np.count_nonzero(rows["width_ratio"] < 0.2)) if len(rows) else 0
+
+        logger.info("=" * 60)
+        logger.info("📊 Supervisor 통계")
+        logger.info(f"   • 워커: {sum(p.is_alive() for p in self.workers.values())}/{self.num_workers} (재시작 {self.restarts})")
+        logger.info(f"   • 전체 심볼: {len(rows)} | 밴드 수축: {squeezing}")
+        for row in self.get_rankings(5):
+            logger.info(
+                f"   • {row['symbol'].decode():12s} 변동 {row['change_pct']:6.2f}% | "
+                f"불균형 {row['imbalance']:+.2f} | 폭 비율 {row['width_ratio']:.2f}"
+            )
+        logger.info("=" * 60)
+
+    def _shutdown(self):
+        logger.info("🧹 워커 종료 중...")
+        for process in self.workers.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.workers.values():
+            process.join(timeout=15)
+            if process.is_alive():
+                process.kill()
+
+        self.board.close()
+        self.board.unlink()
+        self._leave_membership()
+        logger.info("✅ Supervisor 종료")
+
+    def _leave_membership(self):
+        """컨테이너 멤버십 해제 (워커들은 해제하지 않음)"""
+        import redis
+        from src.utils.scanner_membership import ScannerMembership
+
+        scanner_id = socket.gethostname()
+        try:
+            client = redis.Redis(host=Config.REDIS_HOST, port=Config.REDIS_PORT, socket_timeout=5)
+            ScannerMembership(client).leave(scanner_id)
+            client.close()
+            logger.info(f"👋 Scanner 등록 해제: {scanner_id}")
+        except Exception as e:
+            logger.error(f"Scanner 등록 해제 실패: {e}")
+
+
+def run_supervisor(num_workers: int):
+    """멀티 프로세스 모드 실행"""
+    ScannerSupervisor(num_workers).run()
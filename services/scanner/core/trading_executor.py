@@ -1,90 +1,222 @@
 """
 Trading Executor - 실시간 주문 실행
 Scanner에서 감지한 기회를 즉시 주문으로 실행
+
+pybit HTTP 호출은 블로킹이므로 이벤트 루프에서 직접 실행하지 않는다.
+submit()은 제한된 asyncio 큐에 넣고 바로 반환하며, 워커 태스크가 큐를 비우면서
+스레드 풀에서 주문을 실행한다. 같은 심볼의 주문은 심볼별 Lock으로 직렬화한다.
 """
 import asyncio
-import json
 import logging
 import os
-import ssl
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, ROUND_DOWN
-from datetime import datetime
-import boto3
-from pybit.unified_trading import HTTP
+from typing import Dict, List, Optional
+
+from config.settings import Config
+from src.utils.stats import percentile
 
 logger = logging.getLogger(__name__)
 
+
 class TradingExecutor:
     def __init__(self):
         self.bybit_session = None
         self.position_size_usd = 10.0  # $10 포지션
         self.leverage = 10
         self.enabled = os.getenv('TRADING_ENABLED', 'false').lower() == 'true'
-        
+
+        # 주문 큐 / 워커
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.thread_pool = ThreadPoolExecutor(
+            max_workers=Config.EXECUTOR_WORKERS,
+            thread_name_prefix="order"
+        )
+        self.symbol_locks: Dict[str, asyncio.Lock] = {}
+
+        # 메트릭
+        self.wait_ms = deque(maxlen=1000)  # 큐 대기 시간
+        self.exec_ms = deque(maxlen=1000)  # 주문 실행 시간
+        self.stats = {
+            "submitted": 0,
+            "dropped": 0,
+            "completed": 0,
+            "failed": 0,
+            "max_queue_depth": 0
+        }
+
     async def initialize(self):
         """Executor 초기화"""
+        self.start()
+
         if not self.enabled:
             logger.info("🔒 Trading 비활성화 (TRADING_ENABLED=false)")
             return
-            
-        await self._setup_bybit()
+
+        # boto3 / pybit 연결 테스트도 블로킹이므로 스레드에서 실행
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.thread_pool, self._setup_bybit)
         logger.info("🚀 Trading Executor 초기화 완료")
-        
-    async def _setup_bybit(self):
+
+    def _setup_bybit(self):
         """Bybit API 연결"""
+        # boto3 / pybit는 거래 활성화 시에만 로드 (TRADING_ENABLED=false면 import 비용 없음)
+        import boto3
+        from pybit.unified_trading import HTTP
+
         secrets_client = boto3.client('secretsmanager', region_name='ap-northeast-2')
-        
+
         try:
             api_key_secret = secrets_client.get_secret_value(SecretId='crypto-backtest/bybit-api-key')
             api_secret_secret = secrets_client.get_secret_value(SecretId='crypto-backtest/bybit-api-secret')
-            
+
             api_key = api_key_secret['SecretString']
             api_secret = api_secret_secret['SecretString']
-            
+
             self.bybit_session = HTTP(
                 testnet=False,
                 api_key=api_key,
                 api_secret=api_secret
             )
-            
+            self.bybit_session.endpoint = Config.BYBIT_REST_URL.rstrip('/')
+
             # 연결 테스트
             account_info = self.bybit_session.get_wallet_balance(accountType="UNIFIED")
             logger.info("✅ Bybit 연결 성공")
-            
+
         except Exception as e:
             logger.error(f"❌ Bybit 연결 실패: {e}")
             self.enabled = False
-            
-    async def execute_trade(self, symbol: str, signal_type: str, score: float):
-        """거래 실행"""
+
+    def start(self):
+        """주문 큐 및 워커 태스크 시작"""
+        if self.workers:
+            return
+
+        self.queue = asyncio.Queue(maxsize=Config.EXECUTOR_QUEUE_SIZE)
+        self.workers = [
+            asyncio.create_task(self._worker(i))
+            for i in range(Config.EXECUTOR_WORKERS)
+        ]
+        logger.info(
+            f"🧵 주문 워커 시작: {Config.EXECUTOR_WORKERS}개 "
+            f"(큐 크기 {Config.EXECUTOR_QUEUE_SIZE})"
+        )
+
+    def submit(self, symbol: str, signal_type: str, score: float) -> bool:
+        """
+        주문 요청 등록 (논블로킹)
+
+        Returns:
+            큐 등록 여부 (큐가 가득 차면 False, 요청은 버려짐)
+        """
+        if self.queue is None:
+            logger.warning("주문 큐가 시작되지 않음")
+            return False
+
+        try:
+            self.queue.put_nowait((symbol, signal_type, score, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning(f"⚠️ 주문 큐 포화 - 요청 버림: {symbol} {signal_type}")
+            return False
+
+        self.stats["submitted"] += 1
+        depth = self.queue.qsize()
+        if depth > self.stats["max_queue_depth"]:
+            self.stats["max_queue_depth"] = depth
+        return True
+
+    async def _worker(self, worker_id: int):
+        """큐에서 주문 요청을 꺼내 스레드 풀에서 실행"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            symbol, signal_type, score, enqueued_at = await self.queue.get()
+            try:
+                lock = self.symbol_locks.get(symbol)
+                if lock is None:
+                    lock = self.symbol_locks[symbol] = asyncio.Lock()
+
+                # 같은 심볼은 직렬 실행
+                async with lock:
+                    started_at = time.perf_counter()
+                    self.wait_ms.append((started_at - enqueued_at) * 1000)
+
+                    await loop.run_in_executor(
+                        self.thread_pool, self.execute_trade, symbol, signal_type, score
+                    )
+
+                    self.exec_ms.append((time.perf_counter() - started_at) * 1000)
+                    self.stats["completed"] += 1
+
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"주문 워커 {worker_id} 오류 {symbol}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def close(self, timeout: float = 10.0):
+        """남은 주문 처리 후 워커 종료"""
+        if self.queue is not None:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ 미처리 주문 {self.queue.qsize()}개 남기고 종료")
+
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self.thread_pool.shutdown(wait=False)
+
+    def get_stats(self) -> Dict:
+        """큐 깊이 / 지연 메트릭"""
+        wait_ms = sorted(self.wait_ms)
+        exec_ms = sorted(self.exec_ms)
+        stats = self.stats.copy()
+        stats.update({
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "wait_p50_ms": round(percentile(wait_ms, 0.5), 2),
+            "wait_p99_ms": round(percentile(wait_ms, 0.99), 2),
+            "exec_p50_ms": round(percentile(exec_ms, 0.5), 2),
+            "exec_p99_ms": round(percentile(exec_ms, 0.99), 2)
+        })
+        return stats
+
+    def execute_trade(self, symbol: str, signal_type: str, score: float):
+        """거래 실행 (블로킹 - 워커 스레드에서 호출)"""
         if not self.enabled:
             logger.info(f"📊 거래 시뮬레이션: {symbol} {signal_type} (score: {score:.2f})")
             return
-            
+
         try:
             # 현재 가격 조회
-            current_price = await self.get_current_price(symbol)
+            current_price = self.get_current_price(symbol)
             if not current_price:
                 return
-                
+
             # 주문 수량 계산
-            qty = await self.calculate_order_qty(symbol, current_price)
+            qty = self.calculate_order_qty(symbol, current_price)
             if not qty:
                 return
-                
+
             # 롱 포지션 진입
-            order_result = await self.place_market_order(symbol, "Buy", qty)
-            
+            order_result = self.place_market_order(symbol, "Buy", qty)
+
             if order_result:
                 logger.info(f"🚀 주문 실행: {symbol} BUY {qty} @ ${current_price:.4f}")
-                
+
                 # 손절/익절 주문 설정
-                await self.set_stop_loss_take_profit(symbol, current_price)
-                
+                self.set_stop_loss_take_profit(symbol, current_price)
+
         except Exception as e:
             logger.error(f"거래 실행 오류 {symbol}: {e}")
-            
-    async def get_current_price(self, symbol):
+
+    def get_current_price(self, symbol):
         """현재 가격 조회"""
         try:
             response = self.bybit_session.get_tickers(
@@ -95,8 +227,8 @@ class TradingExecutor:
         except Exception as e:
             logger.error(f"가격 조회 실패 {symbol}: {e}")
             return None
-            
-    async def calculate_order_qty(self, symbol, entry_price):
+
+    def calculate_order_qty(self, symbol, entry_price):
         """주문 수량 계산"""
         try:
             response = self.bybit_session.get_instruments_info(
@@ -105,23 +237,23 @@ class TradingExecutor:
             )
             instrument_info = response['result']['list'][0]
             qty_step = float(instrument_info['lotSizeFilter']['qtyStep'])
-            
+
             # $10 포지션, 10x 레버리지
             raw_qty = (self.position_size_usd * self.leverage) / entry_price
-            
+
             # qtyStep에 맞춰 반올림
             rounded_qty = Decimal(str(raw_qty)).quantize(
-                Decimal(str(qty_step)), 
+                Decimal(str(qty_step)),
                 rounding=ROUND_DOWN
             )
-            
+
             return float(rounded_qty)
-            
+
         except Exception as e:
             logger.error(f"수량 계산 실패 {symbol}: {e}")
             return None
-            
-    async def place_market_order(self, symbol, side, qty):
+
+    def place_market_order(self, symbol, side, qty):
         """시장가 주문"""
         try:
             response = self.bybit_session.place_order(
@@ -132,23 +264,23 @@ class TradingExecutor:
                 qty=str(qty),
                 timeInForce="IOC"
             )
-            
+
             if response['retCode'] == 0:
                 return response['result']
             else:
                 logger.error(f"주문 실패: {response['retMsg']}")
                 return None
-                
+
         except Exception as e:
             logger.error(f"주문 실행 오류: {e}")
             return None
-            
-    async def set_stop_loss_take_profit(self, symbol, entry_price):
+
+    def set_stop_loss_take_profit(self, symbol, entry_price):
         """손절/익절 설정 (2% 손절, 4% 익절)"""
         try:
             stop_loss = entry_price * 0.98  # 2% 손절
             take_profit = entry_price * 1.04  # 4% 익절
-            
+
             # 손절 주문
             self.bybit_session.set_trading_stop(
                 category="linear",
@@ -157,8 +289,8 @@ class TradingExecutor:
                 takeProfit=str(take_profit),
                 positionIdx=0
             )
-            
+
             logger.info(f"📊 SL/TP 설정: {symbol} SL=${stop_loss:.4f} TP=${take_profit:.4f}")
-            
+
         except Exception as e:
             logger.error(f"SL/TP 설정 오류: {e}")
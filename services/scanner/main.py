@@ -8,9 +8,20 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
 sys.path.append(os.path.join(os.path.dirname(__file__), 'managers'))
 sys.path.append(os.path.join(os.path.dirname(__file__), 'processors'))
+# 공통 라이브러리 (src/) - 컨테이너에서는 /app/src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from core.scanner_service_redis import main
+from config.settings import Config
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
+    # 모드별로 필요한 모듈만 로드 (무거운 의존성은 각 모듈이 첫 사용 시 로드)
+    if Config.SCANNER_PROCESSES > 1:
+        # 멀티 프로세스 모드: 워커별 심볼 샤드 + 공유 메모리 상태 보드
+        # 스캐너 모듈은 fork 전에 한 번만 로드 → 워커는 import 없이 상속
+        import core.scanner_service_redis
+        from core.supervisor import run_supervisor
+        run_supervisor(Config.SCANNER_PROCESSES)
+    else:
+        import asyncio
+        from core.scanner_service_redis import main
+        asyncio.run(main())
@@ -0,0 +1,140 @@
+"""
+Kline Backfill
+시작/재배치 시 빠진 확정 1분봉을 REST로 한 번에 채우기 (심볼별 동시 요청)
+스트리밍 진입 평가기 시드용 상위 타임프레임 봉 / 심볼 거래 규칙 조회도 담당
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from config.settings import Config
+from candle_aggregator import interval_ms
+
+logger = logging.getLogger(__name__)
+
+MINUTE_MS = 60_000
+MAX_LIMIT = 1000  # Bybit v5 kline 최대 limit
+
+Bar = Tuple[int, float, float, float, float, float, float]
+
+
+class KlineBackfill:
+    """Bybit v5 /market/kline 동시 조회"""
+
+    def __init__(self, session: aiohttp.ClientSession, concurrency: int = 10):
+        self.session = session
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.url = f"{Config.BYBIT_REST_URL}/v5/market/kline"
+        self.instruments_url = f"{Config.BYBIT_REST_URL}/v5/market/instruments-info"
+
+    async def fetch(self, symbol: str, limit: int, interval: str = "1") -> List[Bar]:
+        """
+        최근 확정 봉 조회 (오래된 순, 진행 중 봉 제외)
+
+        Returns:
+            (start_ms, open, high, low, close, volume, turnover) 목록, 실패 시 빈 리스트
+        """
+        length = interval_ms(interval)
+        params = {"category": "linear", "symbol": symbol, "interval": interval, "limit": min(limit + 1, MAX_LIMIT)}
+        try:
+            async with self.semaphore:
+                async with self.session.get(self.url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                    payload = await resp.json()
+
+            if payload.get("retCode") != 0:
+                logger.warning(f"⚠️ 백필 실패: {symbol} {payload.get('retMsg')}")
+                return []
+
+            # 응답은 최신순 → 오래된 순으로 뒤집고 진행 중 봉 제외
+            now_ms = int(time.time() * 1000)
+            bars = []
+            for row in reversed(payload["result"]["list"]):
+                start = int(row[0])
+                if start + length > now_ms:
+                    continue
+                bars.append((start, float(row[1]), float(row[2]), float(row[3]), float(row[4]),
+                             float(row[5]), float(row[6])))
+            return bars[-limit:]
+
+        except Exception as e:
+            logger.error(f"백필 오류 ({symbol}): {e}")
+            return []
+
+    async def fetch_many(self, requests: Dict[str, int]) -> Dict[str, List[Bar]]:
+        """심볼 → 필요한 봉 수, 동시 조회"""
+        symbols = list(requests)
+        results = await asyncio.gather(*(self.fetch(s, requests[s]) for s in symbols))
+        return dict(zip(symbols, results))
+
+    async def fetch_instrument(self, symbol: str) -> Optional[Dict]:
+        """심볼 거래 규칙 (BybitClient.get_instrument_info와 같은 키, 실패 시 None)"""
+        params = {"category": "linear", "symbol": symbol}
+        try:
+            async with self.semaphore:
+                async with self.session.get(
+                    self.instruments_url, params=params, timeout=aiohttp.ClientTimeout(total=10)
+                ) as resp:
+                    payload = await resp.json()
+
+            if payload.get("retCode") != 0 or not payload["result"]["list"]:
+                logger.warning(f"⚠️ 심볼 정보 조회 실패: {symbol} {payload.get('retMsg')}")
+                return None
+
+            instrument = payload["result"]["list"][0]
+            price_filter = instrument["priceFilter"]
+            lot_size_filter = instrument["lotSizeFilter"]
+            tick_size = float(price_filter["tickSize"])
+            qty_step = float(lot_size_filter["qtyStep"])
+            return {
+                "symbol": symbol,
+                "tick_size": tick_size,
+                "min_price": float(price_filter["minPrice"]),
+                "max_price": float(price_filter["maxPrice"]),
+                "min_order_qty": float(lot_size_filter["minOrderQty"]),
+                "max_order_qty": float(lot_size_filter["maxOrderQty"]),
+                "qty_step": qty_step,
+                "price_decimals": _decimals(tick_size),
+                "qty_decimals": _decimals(qty_step)
+            }
+
+        except Exception as e:
+            logger.error(f"심볼 정보 조회 오류 ({symbol}): {e}")
+            return None
+
+    async def fetch_instruments(self, symbols: Iterable[str]) -> Dict[str, Dict]:
+        """심볼 거래 규칙 동시 조회 (실패한 심볼 제외)"""
+        symbols = list(symbols)
+        results = await asyncio.gather(*(self.fetch_instrument(s) for s in symbols))
+        return {symbol: info for symbol, info in zip(symbols, results) if info}
+
+
+def _decimals(step: float) -> int:
+    """tickSize/qtyStep 소수점 자릿수 (1e-05 → 5, 0.01 → 2)"""
+    if step >= 1:
+        return 0
+    return len(f"{step:.10f}".rstrip('0').split('.')[-1])
+
+
+def missing_bars(last_start_ms: int, now_ms: int = None) -> int:
+    """마지막 확정 봉 이후 빠진 확정 1분봉 수"""
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    latest_closed = now_ms // MINUTE_MS * MINUTE_MS - MINUTE_MS
+    return max(0, (latest_closed - last_start_ms) // MINUTE_MS)
+
+
+def backfill_requests(last_starts: Dict[str, int], symbols: Iterable[str], full: int) -> Dict[str, int]:
+    """
+    심볼별 백필 봉 수 계산
+
+    스냅샷이 없으면 full개, 있으면 빠진 만큼 (최대 full개, 이어지지 않으면 DataProcessor가 새로 채움)
+    """
+    requests = {}
+    for symbol in symbols:
+        last_start = last_starts.get(symbol)
+        gap = missing_bars(last_start) if last_start else full
+        if gap > 0:
+            requests[symbol] = min(gap, full)
+    return requests
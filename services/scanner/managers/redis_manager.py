@@ -4,21 +4,32 @@ Redis 연결 및 상태 관리
 import json
 import logging
 import socket
-from datetime import datetime
-from typing import List, Set
+from typing import Dict, Iterable, List
 
 import redis.asyncio as aioredis
 from config.settings import Config
+from src.utils.scanner_membership import AsyncScannerMembership
+from src.utils.local_candles import candle_key, encode_bar
+from src.utils import trace_context
+from candle_aggregator import interval_ms
+from state_snapshot import SNAPSHOT_KEY
 
 logger = logging.getLogger(__name__)
 
+ENTRY_SIGNALS_CHANNEL = "entry:signals"  # PUBLISH 채널
+ENTRY_SIGNALS_KEY = "entry:signals:recent"  # 최근 신호 LIST (구독자 재시작 대비)
+ENTRY_SIGNALS_HISTORY = 500
+
 
 class RedisManager:
     """Redis 연결 및 상태 관리"""
     
     def __init__(self):
         self.redis_client = None
+        self.binary_client = None  # 스냅샷 blob용 (decode 없음)
+        self.membership = None
         self.scanner_id = socket.gethostname()
+        self.discovery_trace = None  # 마지막으로 읽은 discovery:latest 트레이스
         
     async def connect(self) -> bool:
         """Redis 연결"""
@@ -28,6 +39,8 @@ class RedisManager:
                 decode_responses=True
             )
             await self.redis_client.ping()
+            self.binary_client = aioredis.from_url(f"redis://{Config.REDIS_HOST}:{Config.REDIS_PORT}")
+            self.membership = AsyncScannerMembership(self.redis_client)
             logger.info(f"✅ Redis 연결 성공: {Config.REDIS_HOST}:{Config.REDIS_PORT}")
             return True
         except Exception as e:
@@ -37,21 +50,7 @@ class RedisManager:
     async def register_scanner(self) -> bool:
         """Scanner 등록"""
         try:
-            scanner_data = {
-                "scanner_id": self.scanner_id,
-                "status": "active",
-                "last_heartbeat": datetime.utcnow().isoformat(),
-                "assigned_symbols": [],
-                "rank": 0,
-                "version": "v0"
-            }
-            
-            await self.redis_client.hset(
-                "scanners", 
-                self.scanner_id, 
-                json.dumps(scanner_data)
-            )
-            
+            await self.membership.heartbeat(self.scanner_id)
             logger.info(f"📝 Scanner 등록: {self.scanner_id}")
             return True
         except Exception as e:
@@ -61,11 +60,7 @@ class RedisManager:
     async def update_heartbeat(self):
         """하트비트 업데이트"""
         try:
-            await self.redis_client.hset(
-                f"scanner:{self.scanner_id}",
-                "last_heartbeat",
-                datetime.utcnow().isoformat()
-            )
+            await self.membership.heartbeat(self.scanner_id)
         except Exception as e:
             logger.error(f"하트비트 업데이트 실패: {e}")
     
@@ -77,6 +72,7 @@ class RedisManager:
                 return []
             
             data = json.loads(symbols_data)
+            self.discovery_trace = trace_context.extract(data)
             return data.get("symbols", [])
         except Exception as e:
             logger.error(f"심볼 할당 조회 실패: {e}")
@@ -85,27 +81,85 @@ class RedisManager:
     async def get_scanner_rank(self) -> tuple:
         """Scanner 순위 조회"""
         try:
-            scanners_data = await self.redis_client.hgetall("scanners")
-            active_scanners = []
-            
-            for scanner_id, data_str in scanners_data.items():
-                data = json.loads(data_str)
-                if data.get("status") == "active":
-                    active_scanners.append(scanner_id)
-            
-            active_scanners.sort()
-            
-            if self.scanner_id in active_scanners:
-                rank = active_scanners.index(self.scanner_id) + 1
-                total = len(active_scanners)
-                return rank, total
-            
-            return 1, 1
+            return await self.membership.get_rank(self.scanner_id)
         except Exception as e:
             logger.error(f"Scanner 순위 조회 실패: {e}")
             return 1, 1
     
+    async def store_candles(self, completed: List) -> int:
+        """
+        완성 봉 저장 (타임프레임별 LIST, 최근 CANDLE_HISTORY개 유지)
+
+        Args:
+            completed: (symbol, interval, bar) 목록
+        """
+        if not completed:
+            return 0
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for symbol, interval, bar in completed:
+                key = candle_key(symbol, interval)
+                pipe.rpush(key, encode_bar(bar))
+                pipe.ltrim(key, -Config.CANDLE_HISTORY, -1)
+                # 봉이 두 번 연속 끊기면 만료 (최소 1시간)
+                pipe.expire(key, max(3600, 2 * interval_ms(interval) // 1000))
+            await pipe.execute()
+            return len(completed)
+        except Exception as e:
+            logger.error(f"캔들 저장 실패: {e}")
+            return 0
+    
+    async def publish_entry_signal(self, signal: Dict) -> bool:
+        """스트리밍 진입 신호 발행 (PUBLISH + 최근 목록)"""
+        try:
+            payload = json.dumps(signal, default=str)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.publish(ENTRY_SIGNALS_CHANNEL, payload)
+            pipe.lpush(ENTRY_SIGNALS_KEY, payload)
+            pipe.ltrim(ENTRY_SIGNALS_KEY, 0, ENTRY_SIGNALS_HISTORY - 1)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"진입 신호 발행 실패: {e}")
+            return False
+    
+    async def save_snapshots(self, entries: Dict[str, bytes]) -> bool:
+        """심볼별 상태 스냅샷 저장 (HASH, 1일 보관)"""
+        if not entries:
+            return True
+        try:
+            pipe = self.binary_client.pipeline(transaction=False)
+            pipe.hset(SNAPSHOT_KEY, mapping=entries)
+            pipe.expire(SNAPSHOT_KEY, 86400)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"스냅샷 저장 실패: {e}")
+            return False
+    
+    async def load_snapshots(self, symbols: Iterable[str]) -> Dict[str, bytes]:
+        """심볼별 상태 스냅샷 조회 (없는 심볼은 제외)"""
+        symbols = list(symbols)
+        if not symbols:
+            return {}
+        try:
+            blobs = await self.binary_client.hmget(SNAPSHOT_KEY, symbols)
+            return {symbol: blob for symbol, blob in zip(symbols, blobs) if blob}
+        except Exception as e:
+            logger.error(f"스냅샷 조회 실패: {e}")
+            return {}
+    
+    async def unregister_scanner(self):
+        """Scanner 등록 해제"""
+        try:
+            await self.membership.leave(self.scanner_id)
+            logger.info(f"👋 Scanner 등록 해제: {self.scanner_id}")
+        except Exception as e:
+            logger.error(f"Scanner 등록 해제 실패: {e}")
+    
     async def close(self):
         """Redis 연결 종료"""
         if self.redis_client:
             await self.redis_client.close()
+        if self.binary_client:
+            await self.binary_client.close()
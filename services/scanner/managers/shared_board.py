@@ -0,0 +1,124 @@
+"""
+Shared Symbol Board
+멀티 프로세스 Scanner의 워커별 감지기 상태를 공유 메모리에 게시
+
+레이아웃 (multiprocessing.shared_memory 한 블록):
+    [seq: uint64 × W][count: int64 × W][rows: ROW_DTYPE × (W × slots_per_worker)]
+
+- 워커 i는 자기 구간 rows[i * slots : (i + 1) * slots]에만 기록
+- 워커별 seqlock (홀수 = 기록 중)으로 찢어진 읽기를 재시도
+- 집계기는 pickle/IPC 없이 NumPy 뷰로 바로 전 심볼 랭킹을 계산
+- 워커 심볼이 slots_per_worker를 넘으면 변동률 상위만 게시하고 제외 수를 기록/경고
+  (SHARED_SLOTS_PER_WORKER를 워커당 심볼 수 이상으로)
+"""
+import logging
+import time
+from multiprocessing import shared_memory
+from typing import Dict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ROW_DTYPE = np.dtype([
+    ("symbol", "S24"),
+    ("width_ratio", "f8"),
+    ("imbalance", "f8"),
+    ("change_pct", "f8"),
+    ("volume_24h", "f8"),
+    ("last_price", "f8"),
+    ("squeeze_score", "f8"),
+    ("updated_ns", "i8"),
+])
+
+
+class SharedSymbolBoard:
+    """워커별 구간을 가진 공유 메모리 상태 보드"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, num_workers: int, slots_per_worker: int):
+        self.shm = shm
+        self.num_workers = num_workers
+        self.slots_per_worker = slots_per_worker
+        self.truncated = 0  # 마지막 게시에서 제외된 심볼 수 (게시한 워커 프로세스 기준)
+        self._last_truncation_warning = 0.0
+
+        header = num_workers * 8
+        self.seq = np.ndarray((num_workers,), dtype=np.uint64, buffer=shm.buf, offset=0)
+        self.counts = np.ndarray((num_workers,), dtype=np.int64, buffer=shm.buf, offset=header)
+        self.rows = np.ndarray(
+            (num_workers * slots_per_worker,), dtype=ROW_DTYPE, buffer=shm.buf, offset=header * 2
+        )
+
+    @classmethod
+    def create(cls, num_workers: int, slots_per_worker: int) -> "SharedSymbolBoard":
+        """공유 메모리 블록 생성 (supervisor에서 fork 전에 호출)"""
+        size = num_workers * 16 + num_workers * slots_per_worker * ROW_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        board = cls(shm, num_workers, slots_per_worker)
+        board.seq[:] = 0
+        board.counts[:] = 0
+        logger.info(f"🧠 공유 상태 보드 생성: {shm.name} ({size / 1024:.1f}KB)")
+        return board
+
+    def _region(self, worker: int) -> np.ndarray:
+        start = worker * self.slots_per_worker
+        return self.rows[start:start + self.slots_per_worker]
+
+    def publish(self, worker: int, state: Dict[str, np.ndarray]):
+        """
+        워커 상태 게시 (워커 프로세스에서 호출)
+
+        Args:
+            worker: 워커 인덱스
+            state: ROW_DTYPE 필드명 → 배열 (symbol은 문자열 리스트)
+        """
+        total = len(state["symbol"])
+        n = min(total, self.slots_per_worker)
+        self.truncated = total - n
+        if self.truncated:
+            # 집계 랭킹(변동률 순)에 들어갈 심볼을 남김
+            keep = np.argsort(-np.asarray(state["change_pct"]), kind="stable")[:n]
+            state = {name: np.asarray(values)[keep] for name, values in state.items()}
+            self._warn_truncated(worker, total)
+        region = self._region(worker)
+
+        self.seq[worker] += 1  # 홀수: 기록 중
+        region["symbol"][:n] = [s.encode() for s in state["symbol"][:n]]
+        for name in ROW_DTYPE.names[1:]:
+            region[name][:n] = state[name][:n]
+        region[n:] = np.zeros(1, dtype=ROW_DTYPE)
+        self.counts[worker] = n
+        self.seq[worker] += 1  # 짝수: 기록 완료
+
+    def _warn_truncated(self, worker: int, total: int):
+        now = time.monotonic()
+        if now - self._last_truncation_warning < 60:
+            return
+        self._last_truncation_warning = now
+        logger.warning(
+            f"⚠️ 공유 보드 슬롯 부족: 워커 {worker + 1} 심볼 {total}개 중 {self.truncated}개 제외 "
+            f"(SHARED_SLOTS_PER_WORKER={self.slots_per_worker})"
+        )
+
+    def read(self, worker: int, retries: int = 10) -> np.ndarray:
+        """워커 구간 일관된 복사본 (seqlock 재시도)"""
+        region = self._region(worker)
+        for _ in range(retries):
+            before = int(self.seq[worker])
+            if before % 2:
+                time.sleep(0)
+                continue
+            rows = region[:int(self.counts[worker])].copy()
+            if int(self.seq[worker]) == before:
+                return rows
+        return np.zeros(0, dtype=ROW_DTYPE)
+
+    def snapshot(self) -> np.ndarray:
+        """전 워커 상태 (집계용)"""
+        return np.concatenate([self.read(w) for w in range(self.num_workers)])
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
@@ -0,0 +1,139 @@
+"""
+State Snapshot
+재시작 시 감지기 웜업을 생략하기 위한 심볼별 상태 스냅샷 (바이너리)
+
+심볼 1개 = blob 1개:
+    [magic 4B][version u16][schema crc32 u32][last_start_ms i64][saved_ms i64][필드 raw bytes ...]
+
+- 필드는 SymbolStateStore 슬롯 배열을 스키마 순서대로 그대로 복사 (직렬화 비용 ≈ memcpy)
+- 스키마(필드 이름/dtype/shape) crc가 다르거나 버전이 다르면 무시 → 포맷 변경 시 상태 오염 없음
+- monotonic 타임스탬프(*_ns)는 프로세스마다 기준이 다르므로 대상에서 제외할 것
+
+저장소:
+- Redis HASH ``scanner:snapshot`` (필드 = 심볼) → 재배치로 다른 Scanner가 받은 심볼도 복원 가능
+- 로컬 파일 (SNAPSHOT_PATH 설정 시): 심볼별 blob을 길이 접두사로 이어 붙인 단일 파일
+"""
+import logging
+import os
+import struct
+import time
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from symbol_state_store import SymbolStateStore
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "scanner:snapshot"
+SNAPSHOT_MAGIC = b"SCNS"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHIqq")
+_FILE_HEADER = struct.Struct("<4sHI")
+_ENTRY = struct.Struct("<HI")
+
+
+class StateSnapshot:
+    """SymbolStateStore 필드 일부의 심볼별 바이너리 스냅샷"""
+
+    def __init__(self, store: SymbolStateStore, fields: Iterable[str]):
+        self.store = store
+        self.fields = tuple(fields)
+
+        schema = ";".join(
+            f"{name}:{store.field_spec(name)[0].str}:{store.field_spec(name)[1]}" for name in self.fields
+        )
+        self.schema_crc = zlib.crc32(schema.encode())
+        self.row_bytes = sum(
+            store.field_spec(name)[0].itemsize * int(np.prod(store.field_spec(name)[1], dtype=np.int64))
+            for name in self.fields
+        )
+
+    def encode(self, symbol: str, last_start_ms: int) -> Optional[bytes]:
+        """심볼 상태 → blob (슬롯이 없으면 None)"""
+        slot = self.store.slot(symbol)
+        if slot is None:
+            return None
+
+        parts = [_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.schema_crc, int(last_start_ms), int(time.time() * 1000)
+        )]
+        for name in self.fields:
+            parts.append(getattr(self.store, name)[slot].tobytes())
+        return b"".join(parts)
+
+    def decode(self, symbol: str, blob: bytes) -> Optional[Tuple[int, int]]:
+        """
+        blob → 심볼 슬롯에 복원
+
+        Returns:
+            (last_start_ms, saved_ms), 버전/스키마 불일치나 손상이면 None
+        """
+        if len(blob) != _HEADER.size + self.row_bytes:
+            return None
+
+        magic, version, schema_crc, last_start_ms, saved_ms = _HEADER.unpack_from(blob)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or schema_crc != self.schema_crc:
+            return None
+
+        slot = self.store.acquire(symbol)
+        offset = _HEADER.size
+        for name in self.fields:
+            dtype, shape = self.store.field_spec(name)
+            count = int(np.prod(shape, dtype=np.int64))
+            values = np.frombuffer(blob, dtype=dtype, count=count, offset=offset)
+            getattr(self.store, name)[slot] = values.reshape(shape) if shape else values[0]
+            offset += dtype.itemsize * count
+        return last_start_ms, saved_ms
+
+
+def pack_file(entries: Dict[str, bytes]) -> bytes:
+    """심볼별 blob → 단일 파일 바이트"""
+    parts = [_FILE_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(entries))]
+    for symbol, blob in entries.items():
+        name = symbol.encode()
+        parts.append(_ENTRY.pack(len(name), len(blob)))
+        parts.append(name)
+        parts.append(blob)
+    return b"".join(parts)
+
+
+def unpack_file(data: bytes) -> Dict[str, bytes]:
+    """단일 파일 바이트 → 심볼별 blob (버전 불일치/손상 시 빈 dict)"""
+    if len(data) < _FILE_HEADER.size:
+        return {}
+    magic, version, count = _FILE_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        return {}
+
+    entries = {}
+    offset = _FILE_HEADER.size
+    try:
+        for _ in range(count):
+            name_len, blob_len = _ENTRY.unpack_from(data, offset)
+            offset += _ENTRY.size
+            symbol = data[offset:offset + name_len].decode()
+            offset += name_len
+            entries[symbol] = data[offset:offset + blob_len]
+            offset += blob_len
+    except (struct.error, UnicodeDecodeError):
+        logger.warning("⚠️ 스냅샷 파일 손상 - 읽은 항목까지만 사용")
+    return entries
+
+
+def save_file(path: str, entries: Dict[str, bytes]):
+    """원자적 파일 저장 (임시 파일 → rename)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pack_file(entries))
+    os.replace(tmp_path, path)
+
+
+def load_file(path: str) -> Dict[str, bytes]:
+    """파일 로드 (없으면 빈 dict)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb") as f:
+        return unpack_file(f.read())
@@ -0,0 +1,132 @@
+"""
+Symbol State Store
+심볼별 상태를 슬롯(정수 인덱스) 기반 Struct-of-Arrays로 관리
+
+- 심볼 → 슬롯 매핑, 구독 해제 시 슬롯 O(1) 재사용 (free list)
+- 필드는 프로세서가 register()로 선언, 모든 필드는 (capacity, *shape) NumPy 배열
+- 타임스탬프는 time.monotonic_ns() 기반 int64 (리플레이 시 가상 시계 주입)
+- 모든 심볼 상태가 연속 배열이므로 감지기를 전 심볼에 대해 벡터화 가능
+"""
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SymbolStateStore:
+    """심볼 슬롯 기반 상태 저장소"""
+
+    def __init__(self, capacity: int = 128, clock_ns=time.monotonic_ns):
+        self.capacity = capacity
+        self.clock_ns = clock_ns
+        self.slots: Dict[str, int] = {}
+        self.symbols: List[Optional[str]] = [None] * capacity
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        self._fields: Dict[str, Tuple[np.dtype, tuple, object]] = {}
+
+        # 공통 필드
+        self.register("active", np.bool_, fill=False)
+        self.register("updated_ns", np.int64, fill=0)
+
+    def register(self, name: str, dtype=np.float64, shape: tuple = (), fill=0.0) -> None:
+        """
+        필드 선언 (이미 있으면 동일 스펙인지 확인)
+
+        Args:
+            name: 필드 이름 (store.<name>으로 접근)
+            dtype: NumPy dtype
+            shape: 심볼당 shape (예: 링 버퍼 길이)
+            fill: 초기값 / 슬롯 해제 시 리셋 값
+        """
+        spec = (np.dtype(dtype), tuple(shape), fill)
+        if name in self._fields:
+            if self._fields[name][:2] != spec[:2]:
+                raise ValueError(f"필드 스펙 충돌: {name} {self._fields[name][:2]} != {spec[:2]}")
+            return
+
+        self._fields[name] = spec
+        setattr(self, name, np.full((self.capacity,) + spec[1], fill, dtype=spec[0]))
+
+    def field_spec(self, name: str) -> Tuple[np.dtype, tuple]:
+        """필드 (dtype, 심볼당 shape)"""
+        dtype, shape, _ = self._fields[name]
+        return dtype, shape
+
+    def slot(self, symbol: str) -> Optional[int]:
+        """심볼 슬롯 조회 (없으면 None)"""
+        return self.slots.get(symbol)
+
+    def acquire(self, symbol: str) -> int:
+        """심볼 슬롯 조회, 없으면 할당 (O(1), 용량 부족 시 2배 확장)"""
+        slot = self.slots.get(symbol)
+        if slot is not None:
+            return slot
+
+        if not self._free:
+            self._grow(self.capacity * 2)
+
+        slot = self._free.pop()
+        self.slots[symbol] = slot
+        self.symbols[slot] = symbol
+        self.active[slot] = True
+        self.updated_ns[slot] = self.clock_ns()
+        return slot
+
+    def release(self, symbol: str) -> bool:
+        """심볼 슬롯 해제 및 상태 리셋 (O(필드 수))"""
+        slot = self.slots.pop(symbol, None)
+        if slot is None:
+            return False
+
+        for name, (_, _, fill) in self._fields.items():
+            getattr(self, name)[slot] = fill
+        self.symbols[slot] = None
+        self._free.append(slot)
+        return True
+
+    def clear(self, slot: int, names: Tuple[str, ...]):
+        """슬롯의 일부 필드만 초기값으로 리셋"""
+        for name in names:
+            getattr(self, name)[slot] = self._fields[name][2]
+
+    def touch(self, slot: int) -> int:
+        """슬롯 갱신 시각 기록"""
+        now = self.clock_ns()
+        self.updated_ns[slot] = now
+        return now
+
+    def active_slots(self) -> np.ndarray:
+        """사용 중인 슬롯 인덱스 배열"""
+        return np.flatnonzero(self.active)
+
+    def _grow(self, new_capacity: int):
+        """용량 확장 (기존 슬롯 번호 유지)"""
+        for name, (dtype, shape, fill) in self._fields.items():
+            old = getattr(self, name)
+            grown = np.full((new_capacity,) + shape, fill, dtype=dtype)
+            grown[:self.capacity] = old
+            setattr(self, name, grown)
+
+        self.symbols.extend([None] * (new_capacity - self.capacity))
+        self._free = list(range(new_capacity - 1, self.capacity - 1, -1)) + self._free
+        logger.info(f"📦 상태 저장소 확장: {self.capacity} → {new_capacity} 슬롯")
+        self.capacity = new_capacity
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.slots
+
+    @property
+    def bytes_per_symbol(self) -> int:
+        """심볼당 고정 메모리 (bytes)"""
+        return sum(getattr(self, name)[0:1].nbytes for name in self._fields)
+
+    @property
+    def nbytes(self) -> int:
+        """전체 배열 메모리 (bytes)"""
+        return sum(getattr(self, name).nbytes for name in self._fields)
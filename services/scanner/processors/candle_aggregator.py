@@ -0,0 +1,206 @@
+"""
+Candle Aggregator
+확정 1분봉을 상위 타임프레임 캔들로 합성
+
+- 구간 경계는 거래소(Bybit)와 동일: 분 단위/D는 UTC epoch 정렬, W는 월요일 00:00 UTC, M은 매월 1일
+- 구간의 마지막 1분봉이 확정되는 즉시 완성 봉을 반환 (다음 봉을 기다리지 않음)
+- 1분봉이 빠진 채 다음 구간으로 넘어가면 진행 중이던 봉을 그대로 마감
+- 구간 중간에 시작한 첫 봉(시작 직후 등)은 앞부분이 없으므로 버림
+- 타임프레임별 완성 봉은 고정 길이 deque로 보관
+
+봉 형식은 Bybit REST kline 리스트와 같은 순서:
+    (start_ms, open, high, low, close, volume, turnover)
+"""
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MINUTE_MS = 60_000
+DAY_MS = 1440 * MINUTE_MS
+WEEK_MS = 7 * DAY_MS
+WEEK_OFFSET_MS = 4 * DAY_MS  # 1970-01-01은 목요일 → 첫 월요일까지 4일
+
+SUPPORTED_INTERVALS = ("1", "3", "5", "15", "30", "60", "120", "240", "360", "720", "D", "W", "M")
+
+Bar = Tuple[int, float, float, float, float, float, float]
+
+
+def interval_ms(interval: str) -> int:
+    """타임프레임 길이 (ms, M은 31일로 근사)"""
+    if interval == "D":
+        return DAY_MS
+    if interval == "W":
+        return WEEK_MS
+    if interval == "M":
+        return 31 * DAY_MS
+    return int(interval) * MINUTE_MS
+
+
+def bucket_bounds(start_ms: int, interval: str) -> Tuple[int, int]:
+    """1분봉 시작 시각이 속한 구간 [시작, 끝) (ms)"""
+    if interval == "M":
+        dt = datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc)
+        begin = datetime(dt.year, dt.month, 1, tzinfo=timezone.utc)
+        end = datetime(dt.year + dt.month // 12, dt.month % 12 + 1, 1, tzinfo=timezone.utc)
+        return int(begin.timestamp() * 1000), int(end.timestamp() * 1000)
+
+    if interval == "W":
+        begin = start_ms - (start_ms - WEEK_OFFSET_MS) % WEEK_MS
+        return begin, begin + WEEK_MS
+
+    length = interval_ms(interval)
+    begin = start_ms - start_ms % length
+    return begin, begin + length
+
+
+def parse_intervals(spec: str) -> List[str]:
+    """'3,5,15,D' → ['3', '5', '15', 'D']"""
+    intervals = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if item not in SUPPORTED_INTERVALS:
+            raise ValueError(f"지원하지 않는 타임프레임: {item} (가능: {SUPPORTED_INTERVALS})")
+        intervals.append(item)
+    return intervals
+
+
+class _Series:
+    """심볼 × 타임프레임 합성 상태"""
+
+    __slots__ = ("interval", "bars", "start", "end", "open", "high", "low", "close", "volume", "turnover", "whole")
+
+    def __init__(self, interval: str, history: int):
+        self.interval = interval
+        self.bars: Deque[Bar] = deque(maxlen=history)
+        self.start = 0  # 진행 중 봉 시작 (0이면 없음)
+        self.end = 0
+
+    def open_bar(self, begin: int, end: int, first: int, o: float, h: float, l: float, c: float, v: float, t: float):
+        self.start = begin
+        self.end = end
+        self.whole = first == begin  # 구간 첫 1분봉부터 합성했는지
+        self.open = o
+        self.high = h
+        self.low = l
+        self.close = c
+        self.volume = v
+        self.turnover = t
+
+    def merge(self, h: float, l: float, c: float, v: float, t: float):
+        if h > self.high:
+            self.high = h
+        if l < self.low:
+            self.low = l
+        self.close = c
+        self.volume += v
+        self.turnover += t
+
+    def partial(self) -> Optional[Bar]:
+        if not self.start:
+            return None
+        return (self.start, self.open, self.high, self.low, self.close, self.volume, self.turnover)
+
+    def finish(self) -> Optional[Bar]:
+        """진행 중 봉 마감 (구간 앞부분이 빠진 봉은 None)"""
+        bar = self.partial() if self.whole else None
+        if bar:
+            self.bars.append(bar)
+        self.start = 0
+        return bar
+
+
+class CandleAggregator:
+    """확정 1분봉 → 멀티 타임프레임 캔들"""
+
+    def __init__(self, intervals: Iterable[str], history: int = 200):
+        self.intervals = list(intervals)
+        for interval in self.intervals:
+            if interval not in SUPPORTED_INTERVALS:
+                raise ValueError(f"지원하지 않는 타임프레임: {interval} (가능: {SUPPORTED_INTERVALS})")
+        self.history = history
+        self.series: Dict[str, Dict[str, _Series]] = {}
+        self.last_start: Dict[str, int] = {}  # 심볼별 마지막 1분봉 시작 (중복/역순 방지)
+
+        # 통계
+        self.bars_in = 0
+        self.bars_out = 0
+
+    def update(
+        self,
+        symbol: str,
+        start_ms: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        turnover: float = 0.0
+    ) -> List[Tuple[str, Bar]]:
+        """
+        확정 1분봉 반영
+
+        Returns:
+            이번 1분봉으로 완성된 (타임프레임, 봉) 목록
+        """
+        if start_ms <= self.last_start.get(symbol, -1):
+            return []
+        self.last_start[symbol] = start_ms
+        self.bars_in += 1
+
+        series_map = self.series.get(symbol)
+        if series_map is None:
+            series_map = self.series[symbol] = {i: _Series(i, self.history) for i in self.intervals}
+
+        completed = []
+        minute_end = start_ms + MINUTE_MS
+        for interval, series in series_map.items():
+            # 1분봉이 빠진 채 다음 구간으로 넘어간 경우 이전 봉 마감
+            if series.start and start_ms >= series.end:
+                bar = series.finish()
+                if bar:
+                    completed.append((interval, bar))
+
+            if not series.start:
+                begin, end = bucket_bounds(start_ms, interval)
+                series.open_bar(begin, end, start_ms, open_, high, low, close, volume, turnover)
+            else:
+                series.merge(high, low, close, volume, turnover)
+
+            if minute_end >= series.end:
+                bar = series.finish()
+                if bar:
+                    completed.append((interval, bar))
+
+        self.bars_out += len(completed)
+        return completed
+
+    def get_bars(self, symbol: str, interval: str, limit: Optional[int] = None) -> List[Bar]:
+        """완성 봉 (오래된 순)"""
+        series = self.series.get(symbol, {}).get(interval)
+        if series is None:
+            return []
+        bars = list(series.bars)
+        return bars[-limit:] if limit else bars
+
+    def get_partial(self, symbol: str, interval: str) -> Optional[Bar]:
+        """진행 중인 봉 (확정 1분봉까지 반영)"""
+        series = self.series.get(symbol, {}).get(interval)
+        return series.partial() if series else None
+
+    def reset(self, symbol: str):
+        """특정 심볼 데이터 초기화"""
+        self.series.pop(symbol, None)
+        self.last_start.pop(symbol, None)
+
+    def get_stats(self) -> Dict:
+        return {
+            "symbols": len(self.series),
+            "intervals": self.intervals,
+            "bars_in": self.bars_in,
+            "bars_out": self.bars_out
+        }
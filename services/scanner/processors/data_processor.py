@@ -2,52 +2,157 @@
 실시간 데이터 처리 및 신호 감지
 """
 import logging
+import time
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
-from squeeze_detector import SqueezeDetector
+from config.settings import Config
+from symbol_state_store import SymbolStateStore
+from state_snapshot import StateSnapshot
+from squeeze_detector import SqueezeDetector, FIELDS as SQUEEZE_FIELDS
 from orderbook_analyzer import OrderbookAnalyzer
 from volatility_ranker import VolatilityRanker
 from signal_emitter import SignalEmitter
+from emission_gate import EmissionGate
+from candle_aggregator import CandleAggregator, parse_intervals, interval_ms
+from src.utils.stage_profiler import profiled
+from src.utils import structured_log, trace_context
 
 logger = logging.getLogger(__name__)
 
+# 재시작 시 복원할 필드 (확정 캔들 링/감지기 상태, 진행 중 값과 monotonic 시각 제외)
+SNAPSHOT_FIELDS = tuple(f for f in SQUEEZE_FIELDS if f != "live_price") + (
+    "volumes", "volume_head", "volume_count", "volume_sum"
+)
+
 
 class DataProcessor:
     """실시간 데이터 처리 및 신호 감지"""
     
-    def __init__(self):
-        self.squeeze_detector = SqueezeDetector()
-        self.ob_analyzer = OrderbookAnalyzer()
-        self.ranker = VolatilityRanker()
-        self.signal_emitter = SignalEmitter()
+    def __init__(self, clock=time.monotonic, signal_emitter=None):
+        """
+        Args:
+            clock: monotonic 시계 (초, 리플레이 시 캡처 수신 시각 기반 가상 시계)
+            signal_emitter: 기회 신호 발행기 (기본 SignalEmitter)
+        """
+        # 심볼별 상태는 공유 저장소 슬롯에 보관
+        self.state_store = SymbolStateStore(
+            capacity=Config.STATE_STORE_CAPACITY,
+            clock_ns=time.monotonic_ns if clock is time.monotonic else lambda: int(clock() * 1_000_000_000)
+        )
+        self.squeeze_detector = SqueezeDetector(store=self.state_store)
+        self.ob_analyzer = OrderbookAnalyzer(store=self.state_store)
+        self.ranker = VolatilityRanker(store=self.state_store, ttl_sec=Config.RANKER_TTL_SEC)
+        self.signal_emitter = signal_emitter if signal_emitter is not None else SignalEmitter()
+        
+        # 확정 1분봉 → 상위 타임프레임 캔들 (Redis로 주기적 flush)
+        intervals = parse_intervals(Config.CANDLE_TIMEFRAMES)
+        if Config.STREAMING_ENTRY:
+            # 진입/피보나치 타임프레임은 항상 합성
+            for interval in (Config.ENTRY_TIMEFRAME, *Config.FIBONACCI_TIMEFRAMES):
+                if interval not in intervals:
+                    intervals.append(interval)
+        self.candles = CandleAggregator(intervals, Config.CANDLE_HISTORY)
+        self.completed_candles = []  # (symbol, interval, bar)
+        
+        # 스트리밍 진입 평가 (완성 봉마다 EntryStrategy 규칙)
+        self.entry_evaluator = None
+        self.btc_symbol = None  # 평가기의 시장 추세 심볼 (비활성이면 None)
+        if Config.STREAMING_ENTRY:
+            # pandas/지표 모듈은 평가기를 쓸 때만 로드 (기본 비활성)
+            from src.strategies.streaming_entry import StreamingEntryEvaluator, BTC_SYMBOL
+            self.entry_evaluator = StreamingEntryEvaluator(Config, partial_source=self.candles.get_partial)
+            self.btc_symbol = BTC_SYMBOL
+        self.instruments = {}  # 심볼 → 거래 규칙 (tickSize 등)
+        self.trend_symbols = set()  # 담당하지 않지만 시장 추세용으로 받는 심볼 (BTCUSDT)
+        self.entry_sink = None  # async (signal) → bool
+        self.feed_guard = None  # (symbol) → True면 피드가 뒤처져 거래하지 않음
+        
+        # 재시작 웜업용 상태 스냅샷
+        self.snapshot = StateSnapshot(self.state_store, SNAPSHOT_FIELDS)
+        
+        # 신호 디바운싱 / 쿨다운 / 발행량 제한
+        self.gate = EmissionGate(max_per_minute=Config.MAX_EMISSIONS_PER_MIN, clock=clock)
+        self.gate.configure(
+            "ORDERBOOK_IMBALANCE",
+            enter=Config.OB_IMBALANCE_THRESHOLD,
+            exit=Config.OB_IMBALANCE_EXIT_THRESHOLD,
+            cooldown_sec=Config.OB_IMBALANCE_COOLDOWN_SEC
+        )
+        # 슈쿼즈 신뢰도는 감지 시 0.8 초과, 미감지 시 0으로 전달
+        self.gate.configure(
+            "BB_SQUEEZE",
+            enter=0.5,
+            exit=0.5,
+            cooldown_sec=Config.BB_SQUEEZE_COOLDOWN_SEC
+        )
         self.scanner_id = None
+        self.resync_symbols = set()  # 호가 시퀀스 단절로 스냅샷이 필요한 심볼
         self.stats = {
             "total_opportunities_sent": 0,
             "total_tickers_processed": 0,
-            "total_candles_processed": 0
+            "total_candles_processed": 0,
+            "total_entry_signals_sent": 0,
+            "suppressed_feed_behind": 0
         }
+        # 메시지 수신은 건별 로그 대신 집계 (LOG_COUNTER_SEC마다 한 줄)
+        self.message_counts = structured_log.counters("scanner.messages")
     
     async def initialize(self):
         """데이터 프로세서 초기화"""
         await self.signal_emitter.initialize()
     
+    async def close(self):
+        """데이터 프로세서 정리 (대기 중인 주문 처리)"""
+        await self.signal_emitter.close()
+    
     def set_scanner_id(self, scanner_id: str):
         """Scanner ID 설정"""
         self.scanner_id = scanner_id
     
+    def set_entry_sink(self, sink):
+        """진입 신호 발행 콜백 설정 (async (signal) → bool)"""
+        self.entry_sink = sink
+    
+    def set_feed_guard(self, guard):
+        """피드 지연 가드 설정 ((symbol) → bool, True면 발행 보류)"""
+        self.feed_guard = guard
+    
+    def set_trend_symbols(self, symbols: Iterable[str]):
+        """감지기 없이 시장 추세에만 쓰는 심볼 설정"""
+        self.trend_symbols = set(symbols)
+    
+    def set_instruments(self, instruments: Dict[str, Dict]):
+        """심볼 거래 규칙 반영 (진입가 tickSize 반올림용)"""
+        self.instruments.update(instruments)
+    
+    @profiled("ticker")
     async def process_ticker(self, topic: str, data: dict):
         """티커 데이터 처리"""
         try:
-            logger.info(f"🔔 TICKER 메시지 수신: {topic}")
+            self.message_counts.incr("ticker")
             ticker = data.get("data", {})
             if not ticker:
                 return
             
-            symbol = ticker.get("symbol", "")
-            price = float(ticker.get("lastPrice", 0))
-            volume_24h = float(ticker.get("volume24h", 0))
-            change_pct = float(ticker.get("price24hPcnt", 0)) * 100
+            symbol = ticker.get("symbol") or topic.rsplit(".", 1)[-1]
+            
+            # 델타에는 변경된 필드만 포함 (없는 값은 이전 값 유지)
+            price = ticker.get("lastPrice")
+            volume_24h = ticker.get("volume24h")
+            change_pct = ticker.get("price24hPcnt")
+            
+            # 랭킹 갱신 (O(log n))
+            self.ranker.update(
+                symbol,
+                change_pct=float(change_pct) * 100 if change_pct is not None else None,
+                volume_24h=float(volume_24h) if volume_24h is not None else None,
+                price=float(price) if price is not None else None
+            )
+            
+            funding_rate = ticker.get("fundingRate")
+            if self.entry_evaluator and funding_rate:
+                self.entry_evaluator.set_funding(symbol, float(funding_rate))
             
             # 가격 업데이트
             # self.hawk_detector.update_price(symbol, price)
@@ -60,42 +165,76 @@ class DataProcessor:
         except Exception as e:
             logger.error(f"티커 처리 오류: {e}")
     
+    @profiled("orderbook")
     async def process_bookticker(self, topic: str, data: dict):
-        """호가 데이터 처리"""
+        """호가 데이터 처리 (orderbook.{depth} 스냅샷/델타)"""
         try:
-            logger.info(f"🔔 BOOKTICKER 메시지 수신: {topic}")
-            ticker_data = data.get("data", {})
-            symbol = ticker_data.get("s", "")
+            self.message_counts.incr("orderbook")
+            symbol = data.get("data", {}).get("s") or topic.rsplit(".", 1)[-1]
             
-            # 호가 데이터 업데이트
-            self.ob_analyzer.update(symbol, ticker_data)
+            # 호가장 갱신 (시퀀스 단절 시 재구독 대상)
+            if not self.ob_analyzer.update(symbol, data):
+                self.resync_symbols.add(symbol)
+                return
             
             # 호가 불균형 체크
-            imbalance = self.ob_analyzer.get_imbalance(symbol)
-            if abs(imbalance) > 0.7:  # 70% 이상 불균형
-                await self._emit_opportunity(symbol, "ORDERBOOK_IMBALANCE", abs(imbalance))
+            imbalance = abs(self.ob_analyzer.get_imbalance(symbol))
+            if self.gate.observe(symbol, "ORDERBOOK_IMBALANCE", imbalance):
+                await self._emit_opportunity(symbol, "ORDERBOOK_IMBALANCE", imbalance)
             
         except Exception as e:
             logger.error(f"Bookticker 처리 오류: {e}")
     
+    @profiled("kline")
     async def process_candle(self, topic: str, data: dict):
         """캔들 데이터 처리"""
         try:
-            logger.info(f"🔔 CANDLE 메시지 수신: {topic}")
+            self.message_counts.incr("kline")
             candle_data = data.get("data", [])
             if not candle_data:
                 return
             
+            # kline 페이로드에는 심볼이 없으므로 토픽(kline.1.BTCUSDT)에서 추출
+            topic_symbol = topic.rsplit(".", 1)[-1]
+            
             for candle in candle_data:
-                symbol = candle.get("symbol", "")
+                symbol = candle.get("symbol", topic_symbol)
                 close_price = float(candle.get("close", 0))
                 volume = float(candle.get("volume", 0))
+                confirm = bool(candle.get("confirm", False))
+                start_ms = int(candle.get("start", 0))
+                bar = (
+                    start_ms,
+                    float(candle.get("open", close_price)),
+                    float(candle.get("high", close_price)),
+                    float(candle.get("low", close_price)),
+                    close_price,
+                    volume,
+                    float(candle.get("turnover", 0))
+                )
+                
+                # 시장 추세 (BTCUSDT 확정 1분봉)
+                if confirm and symbol == self.btc_symbol:
+                    self.entry_evaluator.update_btc(bar)
+                if symbol in self.trend_symbols:
+                    continue
                 
-                # BB 슈쿼즈 체크
-                is_squeeze = self.squeeze_detector.update(symbol, close_price)
-                if is_squeeze:
-                    confidence = self.squeeze_detector.get_confidence(symbol)
-                    await self._emit_opportunity(symbol, "BB_SQUEEZE", confidence)
+                if confirm and start_ms and start_ms <= self.candles.last_start.get(symbol, -1):
+                    continue  # 이미 반영된 확정 봉 (백필/중복 수신)
+                
+                # BB 슈쿼즈 체크 (진행 중 캔들은 제자리 갱신, 확정 시에만 판정)
+                is_squeeze = self.squeeze_detector.update(symbol, close_price, confirm)
+                if confirm:
+                    completed = self.candles.update(symbol, *bar)
+                    self.completed_candles.extend((symbol, interval, done) for interval, done in completed)
+                    
+                    if self.entry_evaluator and completed:
+                        for signal in self._evaluate_entry(symbol, completed):
+                            await self._emit_entry(signal)
+                    
+                    confidence = self.squeeze_detector.get_confidence(symbol) if is_squeeze else 0.0
+                    if self.gate.observe(symbol, "BB_SQUEEZE", confidence):
+                        await self._emit_opportunity(symbol, "BB_SQUEEZE", confidence)
                 
                 # Hawk 신호 체크 (주석 처리됨)
                 # hawk_signal = self.hawk_detector.check_signal(symbol, price)
@@ -105,9 +244,15 @@ class DataProcessor:
         except Exception as e:
             logger.error(f"캔들 처리 오류: {e}")
     
+    @profiled("emit_opportunity")
     async def _emit_opportunity(self, symbol: str, signal_type: str, score: float):
         """기회 신호 발행"""
         try:
+            if self.feed_guard and self.feed_guard(symbol):
+                self.stats["suppressed_feed_behind"] += 1
+                logger.debug(f"⏱️ 피드 지연으로 기회 발행 보류: {symbol} | {signal_type}")
+                return
+            
             opportunity = {
                 "symbol": symbol,
                 "signal_type": signal_type,
@@ -125,6 +270,188 @@ class DataProcessor:
         except Exception as e:
             logger.error(f"기회 발행 오류: {e}")
     
+    @profiled("evaluate_entry")
+    def _evaluate_entry(self, symbol: str, completed: List, evaluate: bool = True) -> List[Dict]:
+        """완성 봉 → 진입 평가기 (피보나치 윈도우 먼저 갱신 후 진입 타임프레임 판단)"""
+        evaluator = self.entry_evaluator
+        for interval, bar in completed:
+            if interval in evaluator.fib_windows:
+                evaluator.update_fib(symbol, interval, bar)
+        
+        signals = []
+        for interval, bar in completed:
+            if interval == evaluator.entry_interval:
+                started = trace_context.now_ms()
+                signal = evaluator.on_bar(symbol, bar, self.instruments.get(symbol), evaluate=evaluate)
+                if signal:
+                    # 트레이스 시작 = 거래소 봉 마감 시각 (→ 평가까지 간격에 피드 지연 + 확정 대기 포함)
+                    trace = trace_context.new_trace(origin_ms=bar[0] + interval_ms(interval))
+                    trace_context.add_span(trace, "scanner.evaluate", started)
+                    signal["trace"] = trace
+                    signals.append(signal)
+        return signals
+    
+    @profiled("emit_entry")
+    async def _emit_entry(self, signal: Dict):
+        """진입 신호 발행"""
+        try:
+            if self.feed_guard and self.feed_guard(signal["symbol"]):
+                self.stats["suppressed_feed_behind"] += 1
+                logger.debug(f"⏱️ 피드 지연으로 진입 신호 보류: {signal['symbol']}")
+                return
+            
+            signal["scanner_id"] = self.scanner_id
+            trace = signal.get("trace")
+            with trace_context.span(trace, "scanner.publish"):
+                success = await self.entry_sink(signal) if self.entry_sink else False
+            trace_context.report(trace, "published" if success else "failed", self.scanner_id)
+            
+            if success:
+                self.stats["total_entry_signals_sent"] += 1
+                logger.info(
+                    f"🎯 진입 신호: {signal['symbol']} | {signal['type']} | "
+                    f"진입 {signal['entry_price']} 손절 {signal['stop_loss']} 익절 {signal['take_profit']} | "
+                    f"신뢰도 {signal.get('confidence', 60)}"
+                )
+            
+        except Exception as e:
+            logger.error(f"진입 신호 발행 오류: {e}")
+    
+    def seed_entry(self, symbol: str, interval: str, bars: List) -> int:
+        """REST로 받은 과거 확정 봉으로 진입 평가기 채우기"""
+        if not self.entry_evaluator or not bars:
+            return 0
+        self.entry_evaluator.seed(symbol, interval, bars)
+        return len(bars)
+    
+    def release_symbols(self, symbols: Iterable[str], keep_ranking: Iterable[str] = ()):
+        """
+        구독 해제된 심볼 상태 정리 (슬롯 재사용)
+
+        Args:
+            symbols: 더 이상 담당하지 않는 심볼
+            keep_ranking: 그중 티커 랭킹은 계속 유지할 심볼 (감지기 상태만 초기화)
+        """
+        keep_ranking = set(keep_ranking)
+        released = 0
+        for symbol in symbols:
+            self.ob_analyzer.reset(symbol)
+            self.candles.reset(symbol)
+            if self.entry_evaluator:
+                self.entry_evaluator.reset(symbol)
+                self.instruments.pop(symbol, None)
+            self.gate.forget(symbol)
+            self.resync_symbols.discard(symbol)
+            if symbol in keep_ranking:
+                self.squeeze_detector.reset(symbol)
+                continue
+            self.ranker.reset(symbol)
+            released += self.state_store.release(symbol)
+        if released:
+            logger.info(f"🧹 심볼 상태 해제: {released}개")
+    
+    def export_state(self) -> Dict:
+        """
+        전 심볼 감지기 상태 (공유 메모리 게시용, 벡터 연산)
+
+        Returns:
+            SharedSymbolBoard ROW_DTYPE 필드명 → 배열
+        """
+        s = self.state_store
+        slots = s.active_slots()
+        return {
+            "symbol": [s.symbols[slot] for slot in slots],
+            "width_ratio": self.squeeze_detector.get_width_ratios()[slots],
+            "imbalance": self.ob_analyzer.get_imbalances()[slots],
+            "change_pct": s.change_pct[slots],
+            "volume_24h": s.volume_24h[slots],
+            "last_price": s.last_price[slots],
+            "squeeze_score": s.squeeze_score[slots],
+            "updated_ns": s.updated_ns[slots]
+        }
+    
+    def export_snapshots(self, symbols: Iterable[str]) -> Dict[str, bytes]:
+        """확정 봉이 반영된 심볼의 상태 스냅샷 (심볼 → blob)"""
+        entries = {}
+        for symbol in symbols:
+            last_start = self.candles.last_start.get(symbol)
+            if last_start is None:
+                continue
+            blob = self.snapshot.encode(symbol, last_start)
+            if blob:
+                entries[symbol] = blob
+        return entries
+    
+    def restore_snapshots(self, blobs: Dict[str, bytes]) -> Dict[str, int]:
+        """
+        스냅샷 복원
+        
+        Returns:
+            복원된 심볼 → 마지막 확정 1분봉 시작 (ms)
+        """
+        restored = {}
+        for symbol, blob in blobs.items():
+            result = self.snapshot.decode(symbol, blob)
+            if result is None:
+                logger.warning(f"⚠️ 스냅샷 버전/스키마 불일치 - 무시: {symbol}")
+                continue
+            last_start, _ = result
+            self.candles.last_start[symbol] = last_start
+            restored[symbol] = last_start
+        return restored
+    
+    def warm_up(self, symbol: str, bars: List) -> int:
+        """
+        백필한 확정 1분봉 반영 (신호 발행 없음)
+        
+        Args:
+            bars: (start_ms, open, high, low, close, volume, turnover) 오래된 순
+        
+        Returns:
+            반영한 봉 수
+        """
+        last_start = self.candles.last_start.get(symbol)
+        if last_start is not None:
+            bars = [bar for bar in bars if bar[0] > last_start]
+        if not bars:
+            return 0
+        
+        # 스냅샷 이후 공백이 백필 범위보다 길면 이어 붙일 수 없으므로 새로 채움
+        if last_start is not None and bars[0][0] != last_start + 60_000:
+            self.squeeze_detector.reset(symbol)
+            self.candles.reset(symbol)
+        
+        for bar in bars:
+            self.squeeze_detector.update(symbol, bar[4], True)
+            completed = self.candles.update(symbol, *bar)
+            self.completed_candles.extend((symbol, interval, done) for interval, done in completed)
+            if self.entry_evaluator and completed:
+                self._evaluate_entry(symbol, completed, evaluate=False)
+        return len(bars)
+    
+    def pop_completed_candles(self) -> List:
+        """Redis 미반영 완성 봉 목록 (조회 후 초기화)"""
+        completed = self.completed_candles
+        self.completed_candles = []
+        return completed
+    
+    def pop_resync_symbols(self) -> List[str]:
+        """호가 스냅샷 재수신이 필요한 심볼 목록 (조회 후 초기화)"""
+        symbols = list(self.resync_symbols)
+        self.resync_symbols.clear()
+        return symbols
+    
     def get_stats(self) -> Dict:
         """통계 조회"""
-        return self.stats.copy()
+        stats = self.stats.copy()
+        stats.update({f"gate_{k}": v for k, v in self.gate.get_stats().items()})
+        stats.update({f"executor_{k}": v for k, v in self.signal_emitter.get_stats().items()})
+        stats["candle_bars_out"] = self.candles.bars_out
+        if self.entry_evaluator:
+            stats.update({f"entry_{k}": v for k, v in self.entry_evaluator.get_stats().items()})
+        stats["ranked_symbols"] = self.ranker.get_total_symbols()
+        stats["top_volatility"] = self.ranker.get_top_n(5)
+        stats["state_symbols"] = len(self.state_store)
+        stats["state_bytes_per_symbol"] = self.state_store.bytes_per_symbol
+        stats["state_total_bytes"] = self.state_store.nbytes
+        return stats
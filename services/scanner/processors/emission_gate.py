@@ -0,0 +1,168 @@
+"""
+Emission Gate
+신호 발행 디바운싱 / 쿨다운 / 발행량 제한
+
+- (symbol, signal_type)별 히스테리시스: enter 이상에서 발행 후 exit 미만으로 내려가야 재무장
+- (symbol, signal_type)별 쿨다운: 만료 시각을 타이머 힙으로 관리 (만료 처리 O(log n))
+- Scanner 전체 발행량 토큰 버킷 (분당 최대 발행 수)
+- 억제 사유별 카운터
+"""
+import heapq
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EmissionGate:
+    """신호 발행 게이트"""
+
+    def __init__(self, max_per_minute: int, clock=time.monotonic):
+        self.policies: Dict[str, dict] = {}
+        self.clock = clock
+
+        # 토큰 버킷
+        self.capacity = float(max_per_minute)
+        self.tokens = float(max_per_minute)
+        self.refill_per_sec = max_per_minute / 60.0
+        self.last_refill = clock()
+
+        # 쿨다운: key → 만료 시각, 힙에는 (만료 시각, key)
+        self.cooldowns: Dict[Tuple[str, str], float] = {}
+        self.timers: List[Tuple[float, Tuple[str, str]]] = []
+
+        # 히스테리시스: 발행 후 재무장 전인 key
+        self.disarmed = set()
+
+        self.stats = {
+            "emitted": 0,
+            "suppressed_cooldown": 0,
+            "suppressed_hysteresis": 0,
+            "suppressed_rate_limit": 0
+        }
+        # 신호 유형별: 평가(observe 호출) / 발행 / 억제 사유별
+        self.type_stats: Dict[str, Dict[str, int]] = {}
+
+    def configure(self, signal_type: str, enter: float, exit: float, cooldown_sec: float):
+        """
+        신호 유형별 정책 등록
+
+        Args:
+            signal_type: 신호 유형
+            enter: 이 점수 이상이면 발행 후보
+            exit: 이 점수 미만으로 내려가면 재무장
+            cooldown_sec: 발행 후 같은 (symbol, signal_type) 발행 금지 시간
+        """
+        if exit > enter:
+            raise ValueError(f"exit({exit})는 enter({enter}) 이하여야 함: {signal_type}")
+        self.policies[signal_type] = {
+            "enter": enter,
+            "exit": exit,
+            "cooldown_sec": cooldown_sec
+        }
+        self.type_stats.setdefault(signal_type, {
+            "evaluated": 0,
+            "emitted": 0,
+            "suppressed_cooldown": 0,
+            "suppressed_hysteresis": 0,
+            "suppressed_rate_limit": 0
+        })
+
+    def observe(self, symbol: str, signal_type: str, score: float) -> bool:
+        """
+        관측값 전달 및 발행 여부 결정
+
+        Args:
+            symbol: 심볼
+            signal_type: 신호 유형 (configure로 등록된 값)
+            score: 현재 점수 (조건 미충족이면 0)
+
+        Returns:
+            지금 발행해야 하는지 여부
+        """
+        policy = self.policies[signal_type]
+        counts = self.type_stats[signal_type]
+        counts["evaluated"] += 1
+        key = (symbol, signal_type)
+        now = self.clock()
+
+        if score < policy["exit"]:
+            self.disarmed.discard(key)
+        if score < policy["enter"]:
+            return False
+
+        if key in self.disarmed:
+            self.stats["suppressed_hysteresis"] += 1
+            counts["suppressed_hysteresis"] += 1
+            return False
+
+        self._expire(now)
+        if key in self.cooldowns:
+            self.stats["suppressed_cooldown"] += 1
+            counts["suppressed_cooldown"] += 1
+            return False
+
+        if not self._take_token(now):
+            self.stats["suppressed_rate_limit"] += 1
+            counts["suppressed_rate_limit"] += 1
+            return False
+
+        # 발행: 재무장 전까지 잠금 + 쿨다운 시작
+        self.disarmed.add(key)
+        if policy["cooldown_sec"] > 0:
+            expires_at = now + policy["cooldown_sec"]
+            self.cooldowns[key] = expires_at
+            heapq.heappush(self.timers, (expires_at, key))
+
+        self.stats["emitted"] += 1
+        counts["emitted"] += 1
+        return True
+
+    def _expire(self, now: float):
+        """만료된 쿨다운 정리 (항목당 O(log n))"""
+        timers = self.timers
+        while timers and timers[0][0] <= now:
+            expires_at, key = heapq.heappop(timers)
+            # forget() 등으로 교체/삭제된 항목은 무시
+            if self.cooldowns.get(key) == expires_at:
+                del self.cooldowns[key]
+
+    def _take_token(self, now: float) -> bool:
+        """토큰 버킷에서 1개 차감"""
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_sec)
+            self.last_refill = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+    def forget(self, symbol: str):
+        """심볼 상태 제거 (구독 해제 시)"""
+        for signal_type in self.policies:
+            key = (symbol, signal_type)
+            self.disarmed.discard(key)
+            self.cooldowns.pop(key, None)
+
+    def cooldown_remaining(self, symbol: str, signal_type: str) -> Optional[float]:
+        """남은 쿨다운 (초), 쿨다운 중이 아니면 None"""
+        self._expire(self.clock())
+        expires_at = self.cooldowns.get((symbol, signal_type))
+        if expires_at is None:
+            return None
+        return expires_at - self.clock()
+
+    def get_stats(self) -> Dict:
+        """발행/억제 카운터"""
+        stats = self.stats.copy()
+        stats["suppressed_total"] = (
+            stats["suppressed_cooldown"]
+            + stats["suppressed_hysteresis"]
+            + stats["suppressed_rate_limit"]
+        )
+        stats["cooling_keys"] = len(self.cooldowns)
+        return stats
@@ -1,95 +1,192 @@
 """
 Orderbook Analyzer
 호가장 불균형 분석
+
+orderbook.{depth} 메시지를 심볼별 L2OrderBook에 적용하고,
+최우선 호가 / 전체 depth 수량 / microprice를 상태 저장소에 반영한다.
 """
 import logging
-from typing import Dict
-from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+from config.settings import Config
+from orderbook_engine import L2OrderBook
+from symbol_state_store import SymbolStateStore
 
 logger = logging.getLogger(__name__)
 
+FIELDS = (
+    "bid_price", "bid_qty", "ask_price", "ask_qty",
+    "depth_bid_qty", "depth_ask_qty", "microprice", "book_ns",
+)
+
 
 class OrderbookAnalyzer:
     """호가장 불균형 분석기"""
-    
-    def __init__(self):
-        self.orderbooks: Dict[str, dict] = {}
-        
-    def update(self, symbol: str, bookticker_data: dict):
-        """Bookticker 데이터 업데이트"""
+
+    def __init__(self, store: Optional[SymbolStateStore] = None, depth: int = Config.ORDERBOOK_DEPTH):
+        self.store = store if store is not None else SymbolStateStore()
+        self.depth = depth
+        self.books: Dict[str, L2OrderBook] = {}
+
+        s = self.store
+        s.register("bid_price", np.float64)
+        s.register("bid_qty", np.float64)
+        s.register("ask_price", np.float64)
+        s.register("ask_qty", np.float64)
+        s.register("depth_bid_qty", np.float64)  # 유지 중인 depth 전체 매수 잔량
+        s.register("depth_ask_qty", np.float64)
+        s.register("microprice", np.float64)
+        s.register("book_ns", np.int64, fill=0)  # 마지막 호가 갱신 (monotonic ns)
+
+    def update(self, symbol: str, message: dict) -> bool:
+        """
+        호가 메시지(스냅샷/델타) 적용
+
+        Args:
+            symbol: 심볼
+            message: Bybit orderbook WS 메시지 ({"type", "ts", "data": {"b", "a", "u", "seq"}})
+
+        Returns:
+            적용 성공 여부 (False면 시퀀스 단절 - 재구독으로 스냅샷 필요)
+        """
         try:
-            bid_price = float(bookticker_data.get("bp", 0))
-            bid_qty = float(bookticker_data.get("bq", 0))
-            ask_price = float(bookticker_data.get("ap", 0))
-            ask_qty = float(bookticker_data.get("aq", 0))
-            
-            self.orderbooks[symbol] = {
-                "bid_price": bid_price,
-                "bid_qty": bid_qty,
-                "ask_price": ask_price,
-                "ask_qty": ask_qty,
-                "timestamp": datetime.now()
-            }
-            
+            book = self.books.get(symbol)
+            if book is None:
+                book = L2OrderBook(symbol, self.depth)
+                self.books[symbol] = book
+
+            if not book.apply(message.get("type", "delta"), message.get("data", {}), message.get("ts", 0)):
+                return False
+
+            bid_price, bid_qty = book.best_bid()
+            ask_price, ask_qty = book.best_ask()
+
+            s = self.store
+            slot = s.acquire(symbol)
+            s.bid_price[slot] = bid_price
+            s.bid_qty[slot] = bid_qty
+            s.ask_price[slot] = ask_price
+            s.ask_qty[slot] = ask_qty
+            s.depth_bid_qty[slot] = book.bids.total_qty
+            s.depth_ask_qty[slot] = book.asks.total_qty
+            s.microprice[slot] = book.microprice()
+            s.book_ns[slot] = s.touch(slot)
+            return True
+
         except Exception as e:
-            logger.error(f"Bookticker 업데이트 오류 ({symbol}): {e}")
-    
+            logger.error(f"호가 업데이트 오류 ({symbol}): {e}")
+            return False
+
+    def _book_slot(self, symbol: str) -> Optional[int]:
+        """동기화된 호가 데이터가 있는 슬롯 조회"""
+        book = self.books.get(symbol)
+        if book is None or not book.synced:
+            return None
+
+        slot = self.store.slot(symbol)
+        if slot is None or self.store.book_ns[slot] == 0:
+            return None
+        return slot
+
     def get_imbalance(self, symbol: str) -> float:
         """
-        호가 불균형 지수 계산
-        
+        호가 불균형 지수 계산 (구독 depth 전체 잔량 기준)
+
         Returns:
             -1.0 ~ 1.0
             양수: 매수 우위
             음수: 매도 우위
         """
-        if symbol not in self.orderbooks:
+        slot = self._book_slot(symbol)
+        if slot is None:
             return 0.0
-        
-        ob = self.orderbooks[symbol]
-        bid_qty = ob["bid_qty"]
-        ask_qty = ob["ask_qty"]
-        
+
+        bid_qty = float(self.store.depth_bid_qty[slot])
+        ask_qty = float(self.store.depth_ask_qty[slot])
+
         total = bid_qty + ask_qty
         if total == 0:
             return 0.0
-        
+
         # 매수 비율 - 매도 비율
         imbalance = (bid_qty - ask_qty) / total
-        
+
         return round(imbalance, 3)
-    
+
+    def get_imbalances(self) -> np.ndarray:
+        """전 슬롯 호가 불균형 (벡터 연산, 데이터 없는 슬롯은 0)"""
+        s = self.store
+        total = s.depth_bid_qty + s.depth_ask_qty
+        with np.errstate(divide="ignore", invalid="ignore"):
+            imbalance = (s.depth_bid_qty - s.depth_ask_qty) / total
+        return np.where((total > 0) & (s.book_ns > 0), imbalance, 0.0)
+
     def get_spread_pct(self, symbol: str) -> float:
         """스프레드 비율 계산"""
-        if symbol not in self.orderbooks:
+        slot = self._book_slot(symbol)
+        if slot is None:
             return 0.0
-        
-        ob = self.orderbooks[symbol]
-        bid_price = ob["bid_price"]
-        ask_price = ob["ask_price"]
-        
+
+        bid_price = float(self.store.bid_price[slot])
+        ask_price = float(self.store.ask_price[slot])
+
         if bid_price == 0:
             return 0.0
-        
+
         spread_pct = ((ask_price - bid_price) / bid_price) * 100
         return round(spread_pct, 4)
-    
+
+    def get_microprice(self, symbol: str) -> float:
+        """수량 가중 중간가"""
+        slot = self._book_slot(symbol)
+        if slot is None:
+            return 0.0
+
+        return float(self.store.microprice[slot])
+
     def get_mid_price(self, symbol: str) -> float:
         """중간 가격 계산"""
-        if symbol not in self.orderbooks:
+        slot = self._book_slot(symbol)
+        if slot is None:
             return 0.0
-        
-        ob = self.orderbooks[symbol]
-        return (ob["bid_price"] + ob["ask_price"]) / 2
-    
+
+        return (float(self.store.bid_price[slot]) + float(self.store.ask_price[slot])) / 2
+
     def is_liquid(self, symbol: str, min_qty: float = 1000) -> bool:
         """유동성 체크"""
-        if symbol not in self.orderbooks:
+        slot = self._book_slot(symbol)
+        if slot is None:
             return False
-        
-        ob = self.orderbooks[symbol]
-        return ob["bid_qty"] >= min_qty and ob["ask_qty"] >= min_qty
-    
+
+        return self.store.bid_qty[slot] >= min_qty and self.store.ask_qty[slot] >= min_qty
+
     def get_orderbook_info(self, symbol: str) -> dict:
         """호가장 정보 조회"""
-        return self.orderbooks.get(symbol, {})
+        slot = self._book_slot(symbol)
+        if slot is None:
+            return {}
+
+        s = self.store
+        return {
+            "bid_price": float(s.bid_price[slot]),
+            "bid_qty": float(s.bid_qty[slot]),
+            "ask_price": float(s.ask_price[slot]),
+            "ask_qty": float(s.ask_qty[slot]),
+            "depth_bid_qty": float(s.depth_bid_qty[slot]),
+            "depth_ask_qty": float(s.depth_ask_qty[slot]),
+            "microprice": float(s.microprice[slot]),
+            "timestamp_ns": int(s.book_ns[slot])
+        }
+
+    def get_book(self, symbol: str) -> Optional[L2OrderBook]:
+        """심볼 호가장 엔진 조회"""
+        return self.books.get(symbol)
+
+    def reset(self, symbol: str):
+        """특정 심볼 데이터 초기화"""
+        self.books.pop(symbol, None)
+        slot = self.store.slot(symbol)
+        if slot is not None:
+            self.store.clear(slot, FIELDS)
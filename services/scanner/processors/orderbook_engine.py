@@ -0,0 +1,221 @@
+"""
+L2 Orderbook Engine
+Bybit orderbook.{depth} 스냅샷/델타를 적용하는 증분 호가장
+
+- 가격 레벨은 bisect로 정렬 유지 (bids는 -price 키로 내림차순)
+- 델타마다 변경된 레벨 수만큼만 작업, 누적 수량/명목가는 증분 갱신
+- u(update id) 연속성, seq 역행을 검증하고 끊기면 다음 스냅샷까지 비동기화 상태
+"""
+import logging
+from bisect import bisect_left, insort
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DEPTHS = (1, 50, 200)
+
+
+class _BookSide:
+    """호가 한쪽 (정렬 키 리스트 + 가격→수량 dict)"""
+
+    __slots__ = ("descending", "keys", "sizes", "total_qty", "total_notional")
+
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self.keys: List[float] = []
+        self.sizes = {}
+        self.total_qty = 0.0
+        self.total_notional = 0.0
+
+    def clear(self):
+        self.keys.clear()
+        self.sizes.clear()
+        self.total_qty = 0.0
+        self.total_notional = 0.0
+
+    def set(self, price: float, size: float):
+        """레벨 갱신 (size=0이면 삭제)"""
+        old = self.sizes.get(price)
+        key = -price if self.descending else price
+
+        if size == 0:
+            if old is None:
+                return
+            del self.sizes[price]
+            del self.keys[bisect_left(self.keys, key)]
+            self.total_qty -= old
+            self.total_notional -= old * price
+            return
+
+        if old is None:
+            insort(self.keys, key)
+            old = 0.0
+        self.sizes[price] = size
+        self.total_qty += size - old
+        self.total_notional += (size - old) * price
+
+    def trim(self, depth: int):
+        """구독 depth 초과 레벨 제거 (가장 먼 가격부터)"""
+        while len(self.keys) > depth:
+            key = self.keys.pop()
+            price = -key if self.descending else key
+            size = self.sizes.pop(price)
+            self.total_qty -= size
+            self.total_notional -= size * price
+
+    def best(self) -> Tuple[float, float]:
+        """최우선 호가 (price, size), 없으면 (0, 0)"""
+        if not self.keys:
+            return 0.0, 0.0
+        key = self.keys[0]
+        price = -key if self.descending else key
+        return price, self.sizes[price]
+
+    def top_qty(self, levels: int) -> float:
+        """상위 N 레벨 수량 합 (O(levels))"""
+        total = 0.0
+        for key in self.keys[:levels]:
+            total += self.sizes[-key if self.descending else key]
+        return total
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class L2OrderBook:
+    """심볼별 증분 L2 호가장"""
+
+    def __init__(self, symbol: str, depth: int = 50):
+        if depth not in SUPPORTED_DEPTHS:
+            raise ValueError(f"지원하지 않는 depth: {depth} (가능: {SUPPORTED_DEPTHS})")
+
+        self.symbol = symbol
+        self.depth = depth
+        self.bids = _BookSide(descending=True)
+        self.asks = _BookSide(descending=False)
+        self.update_id = 0
+        self.seq = 0
+        self.ts = 0
+        self.synced = False
+
+        # 통계
+        self.snapshots = 0
+        self.deltas = 0
+        self.gaps = 0
+
+    def apply(self, message_type: str, data: dict, ts: int = 0) -> bool:
+        """
+        스냅샷/델타 적용
+
+        Args:
+            message_type: "snapshot" 또는 "delta"
+            data: Bybit 페이로드 ``data`` ({"s", "b", "a", "u", "seq"})
+            ts: 메시지 ``ts`` (ms)
+
+        Returns:
+            적용 성공 여부 (False면 스냅샷 재수신 필요)
+        """
+        update_id = int(data.get("u", 0))
+        seq = int(data.get("seq", 0))
+
+        # u=1 델타는 서버 재시작 후 스냅샷으로 취급
+        if message_type == "snapshot" or update_id == 1:
+            self.bids.clear()
+            self.asks.clear()
+            self._apply_levels(data)
+            self.update_id = update_id
+            self.seq = seq
+            self.ts = ts
+            self.synced = True
+            self.snapshots += 1
+            return True
+
+        if not self.synced:
+            return False
+
+        # 수신 파이프라인에서 병합된 델타는 u0(첫 update id)부터 이어져야 함
+        first_id = int(data.get("u0", update_id))
+        if first_id != self.update_id + 1 or (seq and seq < self.seq):
+            self.gaps += 1
+            self.synced = False
+            logger.warning(
+                f"⚠️ 호가 시퀀스 단절: {self.symbol} "
+                f"(u: {self.update_id} → {update_id}, seq: {self.seq} → {seq})"
+            )
+            return False
+
+        self._apply_levels(data)
+        self.update_id = update_id
+        self.seq = seq or self.seq
+        self.ts = ts
+        self.deltas += 1
+        return True
+
+    def _apply_levels(self, data: dict):
+        for price, size in data.get("b", ()):
+            self.bids.set(float(price), float(size))
+        for price, size in data.get("a", ()):
+            self.asks.set(float(price), float(size))
+
+        self.bids.trim(self.depth)
+        self.asks.trim(self.depth)
+
+    def best_bid(self) -> Tuple[float, float]:
+        return self.bids.best()
+
+    def best_ask(self) -> Tuple[float, float]:
+        return self.asks.best()
+
+    def spread(self) -> float:
+        """최우선 호가 스프레드"""
+        bid_price, _ = self.bids.best()
+        ask_price, _ = self.asks.best()
+        if bid_price == 0 or ask_price == 0:
+            return 0.0
+        return ask_price - bid_price
+
+    def mid_price(self) -> float:
+        bid_price, _ = self.bids.best()
+        ask_price, _ = self.asks.best()
+        if bid_price == 0 or ask_price == 0:
+            return 0.0
+        return (bid_price + ask_price) / 2
+
+    def microprice(self) -> float:
+        """
+        수량 가중 중간가: (bid * askQty + ask * bidQty) / (bidQty + askQty)
+
+        매수 잔량이 많을수록 ask 쪽으로 기운다.
+        """
+        bid_price, bid_qty = self.bids.best()
+        ask_price, ask_qty = self.asks.best()
+        total = bid_qty + ask_qty
+        if total == 0 or bid_price == 0 or ask_price == 0:
+            return 0.0
+        return (bid_price * ask_qty + ask_price * bid_qty) / total
+
+    def imbalance(self, levels: Optional[int] = None) -> float:
+        """
+        깊이 가중 호가 불균형 (-1.0 ~ 1.0)
+
+        Args:
+            levels: 상위 N 레벨만 사용 (None이면 유지 중인 전체 depth, O(1))
+        """
+        if levels is None:
+            bid_qty = self.bids.total_qty
+            ask_qty = self.asks.total_qty
+        else:
+            bid_qty = self.bids.top_qty(levels)
+            ask_qty = self.asks.top_qty(levels)
+
+        total = bid_qty + ask_qty
+        if total <= 0:
+            return 0.0
+        return (bid_qty - ask_qty) / total
+
+    def notional_imbalance(self) -> float:
+        """명목가(price * qty) 기준 전체 depth 불균형 (O(1))"""
+        total = self.bids.total_notional + self.asks.total_notional
+        if total <= 0:
+            return 0.0
+        return (self.bids.total_notional - self.asks.total_notional) / total
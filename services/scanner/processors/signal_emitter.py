@@ -26,7 +26,7 @@ class SignalEmitter:
             self.initialized = False
     
     async def send_opportunity(self, opportunity: dict) -> bool:
-        """기회 감지 시 즉시 거래 실행"""
+        """기회 감지 시 주문 큐에 등록 (주문 I/O는 기다리지 않음)"""
         if not self.initialized:
             logger.warning("거래 실행기 초기화되지 않음")
             return False
@@ -36,15 +36,17 @@ class SignalEmitter:
             signal_type = opportunity.get('signal_type')
             score = opportunity.get('score', 0.0)
             
-            # 즉시 거래 실행
-            await self.executor.execute_trade(symbol, signal_type, score)
-            
-            return True
+            # 주문 워커 큐에 등록 (큐 포화 시 False)
+            return self.executor.submit(symbol, signal_type, score)
             
         except Exception as e:
             logger.error(f"거래 실행 오류: {e}")
             return False
     
-    def close(self):
+    def get_stats(self) -> dict:
+        """주문 실행기 메트릭"""
+        return self.executor.get_stats()
+    
+    async def close(self):
         """정리"""
-        pass
+        await self.executor.close()
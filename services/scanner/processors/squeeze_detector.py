@@ -1,127 +1,254 @@
 """
 Bollinger Band Squeeze Detector
 볼린저 밴드 슈쿼즈 감지
+
+- 심볼별 고정 크기 링 버퍼 + 누적합(sum, sum of squares)으로 O(1) 갱신
+- 진행 중 캔들(confirm=false)은 제자리 갱신, 확정(confirm=true) 시에만 커밋
+- 상태는 SymbolStateStore 슬롯 배열에 저장 (전 심볼 벡터 연산 가능)
 """
 import logging
+import math
+from typing import Optional
+
 import numpy as np
-from collections import deque
-from typing import Dict, Optional
 
 from config.settings import Config
+from symbol_state_store import SymbolStateStore
 
 logger = logging.getLogger(__name__)
 
+WIDTH_HISTORY = 5
+
+FIELDS = (
+    "prices", "price_head", "price_count", "price_ref", "price_sum", "price_sum_sq",
+    "price_resync", "live_price", "widths", "width_count", "max_width", "squeeze_score",
+)
+
 
 class SqueezeDetector:
     """볼린저 밴드 슈쿼즈 감지기"""
-    
-    def __init__(self, window: int = Config.BB_WINDOW, std_dev: float = Config.BB_STD_DEV):
+
+    def __init__(
+        self,
+        window: int = Config.BB_WINDOW,
+        std_dev: float = Config.BB_STD_DEV,
+        store: Optional[SymbolStateStore] = None
+    ):
         self.window = window
         self.std_dev = std_dev
-        self.prices: Dict[str, deque] = {}
-        self.squeeze_scores: Dict[str, float] = {}
-        self.max_widths: Dict[str, float] = {}
-        self.prev_widths: Dict[str, deque] = {}
-        
-    def update(self, symbol: str, price: float) -> bool:
-        """가격 업데이트 및 슈쿼즈 감지"""
-        # 초기화
-        if symbol not in self.prices:
-            self.prices[symbol] = deque(maxlen=self.window * 2)
-            self.squeeze_scores[symbol] = 0.0
-            self.max_widths[symbol] = 0.0
-            self.prev_widths[symbol] = deque(maxlen=5)
-        
-        self.prices[symbol].append(price)
-        
+        self.store = store if store is not None else SymbolStateStore()
+
+        s = self.store
+        s.register("prices", np.float64, (window,))          # 확정 종가 링 (price_ref 기준 편차)
+        s.register("price_head", np.int32, fill=0)           # 다음 기록 위치 (= 가장 오래된 값)
+        s.register("price_count", np.int32, fill=0)
+        s.register("price_ref", np.float64)                  # 수치 안정성용 기준가
+        s.register("price_sum", np.float64)
+        s.register("price_sum_sq", np.float64)
+        s.register("price_resync", np.int32, fill=0)
+        s.register("live_price", np.float64, fill=np.nan)    # 진행 중 캔들 현재가
+        s.register("widths", np.float64, (WIDTH_HISTORY,))   # 밴드 폭 링
+        s.register("width_count", np.int64, fill=0)
+        s.register("max_width", np.float64)
+        s.register("squeeze_score", np.float64)
+
+    def update(self, symbol: str, price: float, confirm: bool = True) -> bool:
+        """
+        가격 업데이트 및 슈쿼즈 감지
+
+        Args:
+            symbol: 심볼
+            price: 캔들 종가 (진행 중이면 현재가)
+            confirm: 캔들 확정 여부 (Bybit kline ``confirm``)
+
+        Returns:
+            슈쿼즈 해제 감지 여부 (확정 캔들에서만 판정)
+        """
+        s = self.store
+        slot = s.acquire(symbol)
+        s.touch(slot)
+
+        if not confirm:
+            # 진행 중 캔들: 제자리 갱신만
+            s.live_price[slot] = price
+            return False
+
+        s.live_price[slot] = np.nan
+        count = self._commit(slot, price)
+
         # 최소 데이터 필요
-        if len(self.prices[symbol]) < self.window:
+        if count < self.window:
             return False
-        
-        # 볼린저 밴드 계산
-        prices_array = np.array(list(self.prices[symbol]))
-        recent_prices = prices_array[-self.window:]
-        
-        middle = np.mean(recent_prices)
-        std = np.std(recent_prices)
-        
-        if middle == 0:
+
+        width = self._width(float(s.price_sum[slot]), float(s.price_sum_sq[slot]), float(s.price_ref[slot]))
+        if width is None:
             return False
-        
-        upper = middle + self.std_dev * std
-        lower = middle - self.std_dev * std
-        width = (upper - lower) / middle
-        
+
         # 최대 폭 업데이트
-        if width > self.max_widths[symbol]:
-            self.max_widths[symbol] = width
-        
+        max_width = float(s.max_width[slot])
+        if width > max_width:
+            max_width = width
+            s.max_width[slot] = width
+
         # 폭 히스토리 저장
-        self.prev_widths[symbol].append(width)
-        
+        widths = s.widths[slot]
+        width_count = int(s.width_count[slot])
+        widths[width_count % WIDTH_HISTORY] = width
+        width_count += 1
+        s.width_count[slot] = width_count
+
         # 슈쿼즈 비율 계산
-        max_width = self.max_widths[symbol]
         if max_width == 0:
             return False
-        
+
         squeeze_ratio = width / max_width
-        
+
         # 확장 추세 감지
         is_expanding = False
-        if len(self.prev_widths[symbol]) >= 3:
-            recent_widths = list(self.prev_widths[symbol])
-            is_expanding = recent_widths[-1] > recent_widths[-2] > recent_widths[-3]
-        
+        if width_count >= 3:
+            w1 = widths[(width_count - 1) % WIDTH_HISTORY]
+            w2 = widths[(width_count - 2) % WIDTH_HISTORY]
+            w3 = widths[(width_count - 3) % WIDTH_HISTORY]
+            is_expanding = w1 > w2 > w3
+
         # 슈쿼즈 해제 조건
         # 1. 밴드가 매우 좁았음 (squeeze_ratio < 0.2)
         # 2. 지금 확장 중
         is_squeezed = squeeze_ratio < 0.2
-        
+
         if is_squeezed and is_expanding:
             confidence = (1 - squeeze_ratio)
-            self.squeeze_scores[symbol] = confidence
-            
-            logger.info(
+            s.squeeze_score[slot] = confidence
+
+            # 조건이 유지되는 동안 매 평가마다 참 → 발행은 EmissionGate가 거르고 data_processor가 기록
+            logger.debug(
                 f"🎯 슈쿼즈 해제 감지: {symbol} "
                 f"(ratio: {squeeze_ratio:.3f}, conf: {confidence:.3f})"
             )
             return True
-        
+
         return False
-    
+
+    def _commit(self, slot: int, price: float) -> int:
+        """확정 종가를 링 버퍼에 기록 (O(1)), 커밋 후 개수 반환"""
+        s = self.store
+        prices = s.prices[slot]
+        count = int(s.price_count[slot])
+        head = int(s.price_head[slot])
+
+        if count == 0:
+            s.price_ref[slot] = price
+
+        x = price - float(s.price_ref[slot])
+        total = float(s.price_sum[slot])
+        total_sq = float(s.price_sum_sq[slot])
+
+        if count == self.window:
+            old = float(prices[head])
+            total -= old
+            total_sq -= old * old
+        else:
+            count += 1
+
+        prices[head] = x
+        s.price_sum[slot] = total + x
+        s.price_sum_sq[slot] = total_sq + x * x
+        s.price_head[slot] = (head + 1) % self.window
+        s.price_count[slot] = count
+
+        # 누적 오차 방지: window마다 재계산 (분할 상환 O(1))
+        resync = int(s.price_resync[slot]) + 1
+        if resync >= self.window:
+            self._resync(slot, count)
+            resync = 0
+        s.price_resync[slot] = resync
+
+        return count
+
+    def _resync(self, slot: int, count: int):
+        """기준가 재설정 및 누적합 재계산"""
+        s = self.store
+        values = s.prices[slot, :count]
+        shift = values.mean()
+        values -= shift
+        s.price_ref[slot] += shift
+        s.price_sum[slot] = values.sum()
+        s.price_sum_sq[slot] = np.dot(values, values)
+
+    def _width(self, total: float, total_sq: float, ref: float) -> Optional[float]:
+        """누적합으로 밴드 폭 계산: (upper - lower) / middle"""
+        n = self.window
+        mean = total / n
+        middle = mean + ref
+        if middle == 0:
+            return None
+
+        variance = max(total_sq / n - mean * mean, 0.0)
+        return (2 * self.std_dev * math.sqrt(variance)) / middle
+
     def get_confidence(self, symbol: str) -> float:
         """슈쿼즈 신뢰도 반환 (0~1)"""
-        return self.squeeze_scores.get(symbol, 0.0)
-    
+        slot = self.store.slot(symbol)
+        return float(self.store.squeeze_score[slot]) if slot is not None else 0.0
+
     def get_current_width_ratio(self, symbol: str) -> Optional[float]:
-        """현재 밴드 폭 비율"""
-        if symbol not in self.prices or len(self.prices[symbol]) < self.window:
+        """현재 밴드 폭 비율 (진행 중 캔들 반영)"""
+        s = self.store
+        slot = s.slot(symbol)
+        if slot is None:
             return None
-        
-        prices_array = np.array(list(self.prices[symbol]))
-        recent_prices = prices_array[-self.window:]
-        
-        middle = np.mean(recent_prices)
-        std = np.std(recent_prices)
-        
-        if middle == 0:
+
+        count = int(s.price_count[slot])
+        total = float(s.price_sum[slot])
+        total_sq = float(s.price_sum_sq[slot])
+        live_price = float(s.live_price[slot])
+
+        if not math.isnan(live_price):
+            # 진행 중 캔들이 가장 오래된 확정값을 대체한다고 보고 계산
+            if count < self.window - 1:
+                return None
+            x = live_price - float(s.price_ref[slot])
+            if count == self.window:
+                old = float(s.prices[slot, int(s.price_head[slot])])
+                total -= old
+                total_sq -= old * old
+            total += x
+            total_sq += x * x
+        elif count < self.window:
             return None
-        
-        width = (2 * self.std_dev * std) / middle
-        max_width = self.max_widths.get(symbol, width)
-        
+
+        width = self._width(total, total_sq, float(s.price_ref[slot]))
+        if width is None:
+            return None
+
+        max_width = float(s.max_width[slot]) or width
         if max_width == 0:
             return None
-        
+
         return width / max_width
-    
+
+    def get_width_ratios(self) -> np.ndarray:
+        """
+        전 슬롯 확정 캔들 기준 밴드 폭 비율 (벡터 연산)
+
+        Returns:
+            (capacity,) 배열, 데이터 부족 슬롯은 NaN
+        """
+        s = self.store
+        n = self.window
+        mean = s.price_sum / n
+        middle = mean + s.price_ref
+        variance = np.maximum(s.price_sum_sq / n - mean * mean, 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            width = (2 * self.std_dev * np.sqrt(variance)) / middle
+            ratio = width / s.max_width
+
+        ready = (s.price_count >= n) & (middle != 0) & (s.max_width > 0)
+        return np.where(ready, ratio, np.nan)
+
     def reset(self, symbol: str):
         """특정 심볼 데이터 초기화"""
-        if symbol in self.prices:
-            del self.prices[symbol]
-        if symbol in self.squeeze_scores:
-            del self.squeeze_scores[symbol]
-        if symbol in self.max_widths:
-            del self.max_widths[symbol]
-        if symbol in self.prev_widths:
-            del self.prev_widths[symbol]
+        slot = self.store.slot(symbol)
+        if slot is not None:
+            self.store.clear(slot, FIELDS)
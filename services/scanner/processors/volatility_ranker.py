@@ -1,111 +1,198 @@
 """
 Volatility Ranker
 실시간 변동성 랭킹 관리
+
+- 랭킹은 정렬 키 리스트 (-변동률, -거래량, 심볼)를 bisect로 유지: 갱신 O(log n) 탐색, 상위 K개 O(k), 순위 O(log n)
+- 거래량 히스토리는 고정 길이 링 + 누적 합으로 평균 O(1) (한 바퀴마다 누적 오차 재계산)
+- TTL 만료는 갱신 순서 (OrderedDict) 앞에서부터 지연 제거: 전체 스캔 없음
 """
 import logging
-from typing import Dict, List, Tuple
-from datetime import datetime
-from collections import defaultdict
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from symbol_state_store import SymbolStateStore
 
 logger = logging.getLogger(__name__)
 
+VOLUME_HISTORY = 100
+
+FIELDS = (
+    "change_pct", "volume_24h", "last_price", "ticker_ns",
+    "volumes", "volume_head", "volume_count", "volume_sum"
+)
+
 
 class VolatilityRanker:
     """변동성 기반 코인 랭킹"""
-    
-    def __init__(self):
-        self.symbols: Dict[str, dict] = {}
-        self.volume_history: Dict[str, List[float]] = defaultdict(list)
-        self.last_update = datetime.now()
-        
-    def update(self, symbol: str, change_pct: float, volume_24h: float, price: float):
-        """심볼 정보 업데이트"""
-        self.symbols[symbol] = {
-            "change_pct": abs(change_pct),
-            "volume_24h": volume_24h,
-            "price": price,
-            "last_update": datetime.now()
-        }
-        
-        # 거래량 히스토리 저장 (최근 100개)
-        self.volume_history[symbol].append(volume_24h)
-        if len(self.volume_history[symbol]) > 100:
-            self.volume_history[symbol].pop(0)
-    
+
+    def __init__(self, store: Optional[SymbolStateStore] = None, ttl_sec: float = 300):
+        self.store = store if store is not None else SymbolStateStore()
+        self.ttl_ns = int(ttl_sec * 1_000_000_000)
+
+        s = self.store
+        s.register("change_pct", np.float64)
+        s.register("volume_24h", np.float64)
+        s.register("last_price", np.float64)
+        s.register("ticker_ns", np.int64, fill=0)            # 마지막 티커 갱신 (monotonic ns)
+        s.register("volumes", np.float64, (VOLUME_HISTORY,))  # 거래량 히스토리 링
+        s.register("volume_head", np.int32, fill=0)
+        s.register("volume_count", np.int32, fill=0)
+        s.register("volume_sum", np.float64)                 # 링 누적 합
+
+        # 변동률 내림차순 (동률이면 거래량 내림차순) 정렬 키
+        self._keys: List[Tuple[float, float, str]] = []
+        self._key_of: Dict[str, Tuple[float, float, str]] = {}
+        # 심볼 → 마지막 갱신 시각 (오래된 순)
+        self._seen: "OrderedDict[str, int]" = OrderedDict()
+
+    def update(
+        self,
+        symbol: str,
+        change_pct: Optional[float] = None,
+        volume_24h: Optional[float] = None,
+        price: Optional[float] = None
+    ):
+        """
+        심볼 정보 업데이트
+
+        티커 델타에는 바뀐 필드만 오므로 None인 값은 이전 값을 유지한다.
+        """
+        s = self.store
+        slot = s.acquire(symbol)
+        if change_pct is not None:
+            s.change_pct[slot] = abs(change_pct)
+        if volume_24h is not None:
+            s.volume_24h[slot] = volume_24h
+            self._push_volume(slot, volume_24h)
+        if price is not None:
+            s.last_price[slot] = price
+
+        now = s.touch(slot)
+        s.ticker_ns[slot] = now
+        self._seen[symbol] = now
+        self._seen.move_to_end(symbol)
+
+        # 정렬 키 갱신 (변경 시에만)
+        key = (-float(s.change_pct[slot]), -float(s.volume_24h[slot]), symbol)
+        old = self._key_of.get(symbol)
+        if old != key:
+            if old is not None:
+                del self._keys[bisect_left(self._keys, old)]
+            insort(self._keys, key)
+            self._key_of[symbol] = key
+
+    def _push_volume(self, slot: int, volume: float):
+        """거래량 링에 기록 (누적 합 O(1) 갱신)"""
+        s = self.store
+        head = int(s.volume_head[slot])
+        count = int(s.volume_count[slot])
+
+        evicted = s.volumes[slot, head] if count == VOLUME_HISTORY else 0.0
+        s.volumes[slot, head] = volume
+        head = (head + 1) % VOLUME_HISTORY
+        s.volume_head[slot] = head
+        if count < VOLUME_HISTORY:
+            s.volume_count[slot] = count + 1
+
+        if head == 0:
+            # 한 바퀴마다 누적 합 재계산 (부동소수 오차 제거, 상환 O(1))
+            s.volume_sum[slot] = s.volumes[slot, :int(s.volume_count[slot])].sum()
+        else:
+            s.volume_sum[slot] += volume - evicted
+
+    def _remove(self, symbol: str):
+        key = self._key_of.pop(symbol, None)
+        if key is not None:
+            del self._keys[bisect_left(self._keys, key)]
+        self._seen.pop(symbol, None)
+
+    def _evict_expired(self, ttl_ns: Optional[int] = None) -> int:
+        """TTL(기본 self.ttl_ns)이 지난 심볼 제거 (오래된 순으로 만료 구간만 확인)"""
+        if not self._seen:
+            return 0
+
+        cutoff = self.store.clock_ns() - (self.ttl_ns if ttl_ns is None else ttl_ns)
+        s = self.store
+        evicted = 0
+        while self._seen:
+            symbol, seen_ns = next(iter(self._seen.items()))
+            if seen_ns > cutoff:
+                break
+            self._remove(symbol)
+            slot = s.slot(symbol)
+            if slot is not None:
+                s.clear(slot, FIELDS)
+            evicted += 1
+        return evicted
+
     def get_top_n(self, n: int = 50) -> List[str]:
         """상위 N개 심볼 반환 (변동성 기준)"""
-        if not self.symbols:
-            return []
-        
-        # 변동성 기준 정렬
-        sorted_symbols = sorted(
-            self.symbols.items(),
-            key=lambda x: (x[1]["change_pct"], x[1]["volume_24h"]),
-            reverse=True
-        )
-        
-        top_symbols = [symbol for symbol, _ in sorted_symbols[:n]]
-        
-        logger.info(f"🔝 Top {len(top_symbols)} 선정 완료")
+        self._evict_expired()
+        top_symbols = [key[2] for key in self._keys[:n]]
+
+        logger.debug(f"🔝 Top {len(top_symbols)} 선정 완료")
         return top_symbols
-    
+
     def get_rank(self, symbol: str) -> int:
-        """특정 심볼의 순위 반환"""
-        if symbol not in self.symbols:
+        """특정 심볼의 순위 반환 (1부터, 없으면 -1)"""
+        self._evict_expired()
+        key = self._key_of.get(symbol)
+        if key is None:
             return -1
-        
-        sorted_symbols = sorted(
-            self.symbols.items(),
-            key=lambda x: x[1]["change_pct"],
-            reverse=True
-        )
-        
-        for rank, (sym, _) in enumerate(sorted_symbols, 1):
-            if sym == symbol:
-                return rank
-        
-        return -1
-    
+        return bisect_left(self._keys, key) + 1
+
     def get_volume_spike(self, symbol: str) -> float:
         """거래량 스파이크 배수 계산"""
-        if symbol not in self.symbols:
+        s = self.store
+        slot = s.slot(symbol)
+        if slot is None or s.ticker_ns[slot] == 0:
             return 0.0
-        
-        history = self.volume_history.get(symbol, [])
-        if len(history) < 10:
+
+        count = int(s.volume_count[slot])
+        if count < 10:
             return 1.0
-        
-        current_volume = self.symbols[symbol]["volume_24h"]
-        avg_volume = sum(history[:-1]) / len(history[:-1])
-        
-        if avg_volume == 0:
+
+        # 현재 값을 제외한 평균
+        current_volume = float(s.volume_24h[slot])
+        avg_volume = (float(s.volume_sum[slot]) - current_volume) / (count - 1)
+
+        if avg_volume <= 0:
             return 1.0
-        
+
         spike = current_volume / avg_volume
         return round(spike, 2)
-    
+
     def get_symbol_info(self, symbol: str) -> dict:
         """심볼 정보 조회"""
-        return self.symbols.get(symbol, {})
-    
+        s = self.store
+        slot = s.slot(symbol)
+        if slot is None or s.ticker_ns[slot] == 0:
+            return {}
+
+        return {
+            "change_pct": float(s.change_pct[slot]),
+            "volume_24h": float(s.volume_24h[slot]),
+            "price": float(s.last_price[slot]),
+            "last_update_ns": int(s.ticker_ns[slot])
+        }
+
     def get_total_symbols(self) -> int:
         """전체 심볼 수"""
-        return len(self.symbols)
-    
-    def cleanup_old_symbols(self, max_age_seconds: int = 300):
-        """오래된 심볼 정리"""
-        now = datetime.now()
-        to_remove = []
-        
-        for symbol, info in self.symbols.items():
-            age = (now - info["last_update"]).total_seconds()
-            if age > max_age_seconds:
-                to_remove.append(symbol)
-        
-        for symbol in to_remove:
-            del self.symbols[symbol]
-            if symbol in self.volume_history:
-                del self.volume_history[symbol]
-        
-        if to_remove:
-            logger.info(f"🧹 {len(to_remove)}개 오래된 심볼 정리")
+        return len(self._key_of)
+
+    def cleanup_old_symbols(self, max_age_seconds: Optional[int] = None):
+        """오래된 심볼 정리 (기본은 생성 시 TTL, max_age_seconds는 이번 호출에만 적용)"""
+        ttl_ns = None if max_age_seconds is None else int(max_age_seconds * 1_000_000_000)
+        evicted = self._evict_expired(ttl_ns)
+        if evicted:
+            logger.info(f"🧹 {evicted}개 오래된 심볼 정리")
+
+    def reset(self, symbol: str):
+        """특정 심볼 데이터 초기화"""
+        self._remove(symbol)
+        slot = self.store.slot(symbol)
+        if slot is not None:
+            self.store.clear(slot, FIELDS)
@@ -0,0 +1,110 @@
+"""
+캡처 리플레이 / DataProcessor 처리량 벤치마크 / 감지기 회귀 테스트
+
+WS_CAPTURE_DIR로 기록한 원본 프레임을 네트워크 없이 DataProcessor에 재생한다.
+주문/RabbitMQ/Redis 대신 발행 신호를 기록하고 digest(해시)를 출력한다.
+같은 캡처는 배속과 무관하게 같은 digest를 만든다 (--pipeline 제외).
+
+실행:
+    python services/scanner/replay.py ./captures                  # 최대 속도
+    python services/scanner/replay.py ./captures --speed 1        # 실시간
+    python services/scanner/replay.py ./captures --speed 10       # 10배속
+    python services/scanner/replay.py ./captures --expect <digest> # 회귀 테스트 (불일치 시 종료 코드 1)
+    python services/scanner/replay.py ./captures --pipeline       # 실제 수신 큐 경유 (처리량 측정)
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+SCANNER_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(SCANNER_DIR, 'core'))
+sys.path.append(os.path.join(SCANNER_DIR, 'managers'))
+sys.path.append(os.path.join(SCANNER_DIR, 'processors'))
+sys.path.append(os.path.join(SCANNER_DIR, '..', '..'))
+
+from utils.websocket_client import BybitWebSocketClient
+from utils.ws_capture import capture_files
+from utils.ws_replay import ReplayClock, RecordingEmitter, ReplayDriver
+from data_processor import DataProcessor
+
+logger = logging.getLogger("replay")
+
+
+async def replay(path: str, speed: float, pipeline: bool, limit: int) -> dict:
+    """캡처 재생 → 통계 + 신호 digest"""
+    clock = ReplayClock()
+    recorder = RecordingEmitter(clock)
+    processor = DataProcessor(clock=clock, signal_emitter=recorder)
+    processor.set_scanner_id("replay")
+    processor.set_entry_sink(recorder.send_entry)
+    await processor.initialize()
+
+    client = BybitWebSocketClient()
+    client.capture = None  # 재생 중 다시 캡처하지 않음
+    client.register_handler("tickers", processor.process_ticker)
+    client.register_handler("orderbook", processor.process_bookticker)
+    client.register_handler("kline", processor.process_candle)
+
+    completed = [0]
+
+    def drain(index):
+        # 실제 서비스의 하트비트 flush 대신 주기적으로 비움 (메모리 유지)
+        if index % 10_000 == 0:
+            completed[0] += len(processor.pop_completed_candles())
+
+    driver = ReplayDriver(client, clock=clock, speed=speed, pipeline=pipeline)
+    files = capture_files(path)
+    stats = await driver.run(files, limit=limit, on_frame=drain)
+    completed[0] += len(processor.pop_completed_candles())
+    await processor.close()
+
+    processor_stats = processor.get_stats()
+    stats.update({
+        "segments": len(files),
+        "tickers": processor_stats["total_tickers_processed"],
+        "candles": processor_stats["total_candles_processed"],
+        "completed_bars": completed[0],
+        "signals": len(recorder.records),
+        "digest": recorder.digest()
+    })
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket 캡처 리플레이")
+    parser.add_argument("path", help="캡처 디렉터리 또는 세그먼트 파일")
+    parser.add_argument("--speed", type=float, default=0.0, help="배속 (0 = 최대 속도)")
+    parser.add_argument("--pipeline", action="store_true", help="수신 큐 경유 (비결정적)")
+    parser.add_argument("--limit", type=int, default=0, help="최대 프레임 수")
+    parser.add_argument("--expect", default="", help="기대 digest (다르면 종료 코드 1)")
+    parser.add_argument("--json", default="", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    # 프레임마다 찍히는 INFO 로그는 처리량 측정을 왜곡하므로 경고 이상만
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    stats = asyncio.run(replay(args.path, args.speed, args.pipeline, args.limit))
+
+    print("=" * 60)
+    print("📼 리플레이 결과")
+    print(f"   • 프레임: {stats['frames']:,} ({stats['segments']}개 세그먼트, 오류 {stats['errors']})")
+    print(f"   • 캡처 구간: {stats['captured_sec']:.1f}s | 재생: {stats['elapsed_sec']:.2f}s")
+    print(f"   • 처리량: {stats['frames_per_sec']:,.0f} frames/s")
+    print(f"   • 티커 {stats['tickers']:,} | 캔들 {stats['candles']:,} | 완성 봉 {stats['completed_bars']:,}")
+    print(f"   • 신호: {stats['signals']} | digest: {stats['digest']}")
+    print("=" * 60)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(stats, f, indent=2)
+
+    if args.expect and args.expect != stats["digest"]:
+        print(f"❌ digest 불일치 (기대: {args.expect})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+합성 시장 캡처 생성
+
+src/utils/synthetic_market의 시드 고정 합성 시장으로 Scanner가 받는 WS 프레임을 만들어
+WS_CAPTURE_DIR 캡처와 같은 형식으로 기록한다 (replay.py / fake_exchange --replay 입력).
+같은 옵션이면 항상 같은 캡처 → 같은 리플레이 digest.
+
+실행:
+    python services/scanner/synthesize.py ./synthetic --symbols 20 --minutes 30
+    python services/scanner/replay.py ./synthetic
+"""
+import argparse
+import os
+import sys
+import time
+
+SCANNER_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(SCANNER_DIR, '..', '..'))
+
+from utils.ws_capture import write_capture
+from src.utils.synthetic_market import MINUTE_MS, SyntheticMarketGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 시장 WS 캡처 생성")
+    parser.add_argument("directory", help="출력 디렉터리")
+    parser.add_argument("--symbols", type=int, default=20, help="심볼 수")
+    parser.add_argument("--seed", type=int, default=42, help="합성 시장 시드")
+    parser.add_argument("--minutes", type=int, default=10, help="생성 구간 (분)")
+    parser.add_argument("--start-ms", type=int, default=0, help="시작 시각 (기본: 합성 현재 시각 - 구간)")
+    parser.add_argument("--ticker-ms", type=int, default=100, help="티커 발행 주기")
+    parser.add_argument("--orderbook-ms", type=int, default=100, help="호가 발행 주기")
+    parser.add_argument("--depth", type=int, default=50, help="호가 깊이 (1/50/200/500)")
+    parser.add_argument("--kline-ms", type=int, default=1000, help="진행 중 봉 발행 주기")
+    parser.add_argument("--segment-mb", type=int, default=64, help="세그먼트 크기 (비압축 MB)")
+    args = parser.parse_args()
+
+    generator = SyntheticMarketGenerator(symbols=args.symbols, seed=args.seed)
+    end_ms = args.start_ms + args.minutes * MINUTE_MS if args.start_ms else generator.now_ms
+    start_ms = end_ms - args.minutes * MINUTE_MS
+    generator.now_ms = max(generator.now_ms, end_ms)
+
+    frames = generator.ws_frames(
+        start_ms, end_ms,
+        ticker_ms=args.ticker_ms,
+        orderbook_ms=args.orderbook_ms,
+        depth=args.depth,
+        kline_ms=args.kline_ms
+    )
+    count = [0]
+
+    def counted():
+        for ts, frame in frames:
+            count[0] += 1
+            yield ts * 1_000_000, frame
+
+    started = time.perf_counter()
+    paths = write_capture(
+        args.directory,
+        counted(),
+        url=f"synthetic://seed={args.seed}",
+        segment_bytes=args.segment_mb * 1024 * 1024,
+        prefix=f"ws-synthetic-{args.seed}-{start_ms}"
+    )
+    elapsed = time.perf_counter() - started
+
+    print("=" * 60)
+    print("🧪 합성 캡처 생성 완료")
+    print(f"   • 심볼: {args.symbols} | 구간: {args.minutes}분 | 시드: {args.seed}")
+    print(f"   • 프레임: {count[0]:,} | 세그먼트: {len(paths)}개 | {elapsed:.1f}s")
+    print(f"   • 출력: {args.directory}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
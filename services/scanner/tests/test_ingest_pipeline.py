@@ -0,0 +1,110 @@
+"""
+IngestPipeline 회귀 테스트 (토픽별 병합/순서 보장)
+
+python -m pytest services/scanner/tests
+"""
+import asyncio
+import os
+import sys
+
+SCANNER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, SCANNER_DIR)  # 루트 config보다 Scanner config 우선
+sys.path.append(os.path.join(SCANNER_DIR, 'processors'))
+sys.path.append(os.path.join(SCANNER_DIR, '..', '..'))
+
+from orderbook_engine import L2OrderBook
+from utils.ingest_pipeline import IngestPipeline, merge_orderbook
+
+TOPIC = "orderbook.50.BTCUSDT"
+
+
+def _orderbook(message_type: str, u: int, bids=(), asks=()) -> dict:
+    return {
+        "topic": TOPIC,
+        "type": message_type,
+        "ts": 0,
+        "data": {"s": "BTCUSDT", "b": [list(level) for level in bids], "a": [list(level) for level in asks], "u": u, "seq": u},
+    }
+
+
+async def _drain(pipeline: IngestPipeline, messages):
+    pipeline.start()
+    for topic, message in messages:
+        await pipeline.put(topic, message)
+    await asyncio.gather(*(q.join() for q in pipeline.queues))
+    await pipeline.stop()
+
+
+def _run_book(messages) -> L2OrderBook:
+    book = L2OrderBook("BTCUSDT")
+
+    async def dispatch(topic, message):
+        book.apply(message["type"], message["data"], message["ts"])
+
+    pipeline = IngestPipeline(dispatch, workers=1, policies={"orderbook": "merge"})
+    asyncio.run(_drain(pipeline, [(TOPIC, m) for m in messages]))
+    return book
+
+
+def test_merge_orderbook_refuses_gap():
+    pending = _orderbook("delta", 5, bids=[("100", "1")])
+    assert merge_orderbook(pending, _orderbook("delta", 7, bids=[("101", "1")])) is None
+
+    merged = merge_orderbook(pending, _orderbook("delta", 6, bids=[("101", "1")]))
+    assert merged["data"]["u0"] == 5 and merged["data"]["u"] == 6
+
+
+def test_gapped_deltas_trigger_resync():
+    """스냅샷 u=4 → 델타 u=5, u=7: 병합되더라도 단절을 감지해야 함"""
+    book = _run_book([
+        _orderbook("snapshot", 4, bids=[("100", "1")], asks=[("101", "1")]),
+        _orderbook("delta", 5, bids=[("100", "2")]),
+        _orderbook("delta", 7, bids=[("100", "3")]),
+    ])
+    assert not book.synced
+    assert book.gaps == 1
+    assert book.update_id == 5
+
+
+def test_pending_snapshot_does_not_absorb_gapped_delta():
+    book = _run_book([
+        _orderbook("snapshot", 4, bids=[("100", "1")], asks=[("101", "1")]),
+        _orderbook("delta", 6, bids=[("100", "3")]),
+    ])
+    assert book.snapshots == 1
+    assert not book.synced
+    assert book.gaps == 1
+
+
+def test_contiguous_deltas_still_coalesce():
+    book = _run_book([
+        _orderbook("snapshot", 4, bids=[("100", "1")], asks=[("101", "1")]),
+        _orderbook("delta", 5, bids=[("100", "2")]),
+        _orderbook("delta", 6, bids=[("99", "1")]),
+    ])
+    assert book.synced
+    assert book.update_id == 6
+    assert book.best_bid() == (100.0, 2.0)
+
+
+def _kline(start: int, close: str, confirm: bool) -> dict:
+    return {"topic": "kline.1.BTCUSDT", "type": "snapshot", "ts": 0,
+            "data": [{"start": start, "close": close, "confirm": confirm}]}
+
+
+def test_confirmed_kline_keeps_candle_order():
+    """진행 → 확정 → 다음 봉 진행: 다음 봉이 확정 캔들보다 먼저 처리되면 안 됨"""
+    topic = "kline.1.BTCUSDT"
+    seen = []
+
+    async def dispatch(topic, message):
+        candle = message["data"][0]
+        seen.append((candle["start"], candle["confirm"]))
+
+    pipeline = IngestPipeline(dispatch, workers=1, policies={"kline": "latest"})
+    asyncio.run(_drain(pipeline, [
+        (topic, _kline(0, "100", False)),
+        (topic, _kline(0, "101", True)),
+        (topic, _kline(60000, "102", False)),
+    ]))
+    assert seen == [(0, True), (60000, False)]
@@ -0,0 +1,326 @@
+"""
+Feed Latency
+거래소 → 로컬 피드 지연 모니터
+
+- 지연 = 로컬 수신 시각 - 거래소 ts (+ 시계 오프셋 보정)
+- 시계 오프셋: ping/pong 왕복(RTT)과 최소 지연 필터로 추정
+    · pong에 서버 시각이 있으면 (args[0], ms) NTP 방식: offset = server - (송신 + 수신) / 2 (최소 RTT 샘플)
+    · 없으면 (Bybit public pong) 인과 관계 범위: 0 ≤ 최소 편도 지연 ≤ 최소 RTT 이므로
+      offset ∈ [-min(수신 - ts), 최소 RTT - min(수신 - ts)]. 0이 범위 안이면 로컬 시계(NTP)를 믿고 보정 안 함,
+      밖이면 가장 가까운 경계로 보정 (경로 비대칭을 가정하지 않는 최소 보정)
+- 연결(토픽 클래스)별 / 심볼별 분위수 스케치 (로그 버킷, 상대 오차 ALPHA, 최근 2개 윈도우)
+- 지연/정체(staleness) 예산 초과 시 경고 + 심볼을 "뒤처짐"으로 표시 (신호로 거래할지 판단용)
+"""
+import logging
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ALPHA = 0.02          # 분위수 상대 오차
+MIN_VALUE_MS = 0.05   # 이하 (음수 포함)는 0 버킷
+ALERT_REPEAT_SEC = 60  # 같은 경고 반복 간격
+
+
+def parse_budgets(spec: str) -> Dict[str, float]:
+    """'tickers:5000,orderbook:5000,kline:65000' → dict (ms)"""
+    budgets = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        topic_class, value = item.split(":")
+        budgets[topic_class.strip()] = float(value)
+    return budgets
+
+
+class LatencySketch:
+    """로그 버킷 분위수 스케치 (병합 가능, 메모리는 값 범위의 로그에 비례)"""
+
+    __slots__ = ("buckets", "zero", "count", "max")
+
+    _LOG_GAMMA = math.log((1 + ALPHA) / (1 - ALPHA))
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        if value > self.max:
+            self.max = value
+        if value <= MIN_VALUE_MS:
+            self.zero += 1
+            return
+        index = math.ceil(math.log(value) / self._LOG_GAMMA)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "LatencySketch"):
+        self.count += other.count
+        self.zero += other.zero
+        self.max = max(self.max, other.max)
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # 버킷 (gamma^(i-1), gamma^i]의 대표값
+                return 2 * math.exp(index * self._LOG_GAMMA) / (1 + math.exp(self._LOG_GAMMA))
+        return self.max
+
+
+class WindowedSketch:
+    """현재 + 직전 윈도우 (분위수는 최근 1~2 윈도우 기준)"""
+
+    __slots__ = ("window_sec", "current", "previous", "started")
+
+    def __init__(self, window_sec: float, now: float):
+        self.window_sec = window_sec
+        self.current = LatencySketch()
+        self.previous = LatencySketch()
+        self.started = now
+
+    def add(self, value: float, now: float):
+        if now - self.started >= self.window_sec:
+            self._rotate(now)
+        self.current.add(value)
+
+    def _rotate(self, now: float):
+        # 2 윈도우 이상 비었으면 직전 윈도우도 비움
+        self.previous = self.current if now - self.started < 2 * self.window_sec else LatencySketch()
+        self.current = LatencySketch()
+        self.started = now
+
+    def snapshot(self, now: float) -> LatencySketch:
+        if now - self.started >= self.window_sec:
+            self._rotate(now)
+        merged = LatencySketch()
+        merged.merge(self.previous)
+        merged.merge(self.current)
+        return merged
+
+
+class ClockOffsetEstimator:
+    """거래소 시계 - 로컬 시계 (ms) 추정"""
+
+    def __init__(self, window: int = 32, window_sec: float = 300.0):
+        self.pings: deque = deque(maxlen=window)  # (rtt_ms, server 기반 offset 또는 None)
+        self.window_sec = window_sec
+        self.raw_min = math.inf        # 현재 윈도우 min(수신 - ts)
+        self.prev_raw_min = math.inf   # 직전 윈도우
+        self.started = time.monotonic()
+        self.offset_ms = 0.0
+        self.min_rtt_ms: Optional[float] = None
+
+    def on_pong(self, sent_ms: float, recv_ms: float, server_ms: Optional[float] = None):
+        rtt = recv_ms - sent_ms
+        if rtt < 0:
+            return
+        offset = server_ms - (sent_ms + recv_ms) / 2 if server_ms else None
+        self.pings.append((rtt, offset))
+        self.min_rtt_ms = min(r for r, _ in self.pings)
+        self._update()
+
+    def observe(self, raw_ms: float):
+        """데이터 메시지 1개의 (수신 - 거래소 ts)"""
+        if raw_ms < self.raw_min:
+            self.raw_min = raw_ms
+            self._update()
+        now = time.monotonic()
+        if now - self.started >= self.window_sec:
+            self.prev_raw_min, self.raw_min = self.raw_min, math.inf
+            self.started = now
+            self._update()
+
+    def _update(self):
+        with_server = [(rtt, offset) for rtt, offset in self.pings if offset is not None]
+        if with_server:
+            self.offset_ms = min(with_server)[1]
+            return
+        raw_min = min(self.raw_min, self.prev_raw_min)
+        if raw_min == math.inf:
+            return
+        low = -raw_min
+        high = self.min_rtt_ms - raw_min if self.min_rtt_ms is not None else math.inf
+        self.offset_ms = low if low > 0 else (high if high < 0 else 0.0)
+
+
+class _FeedState:
+    """토픽 1개 정체 추적"""
+
+    __slots__ = ("last_recv_ms", "last_ts")
+
+    def __init__(self):
+        self.last_recv_ms = 0.0
+        self.last_ts = 0
+
+
+class FeedLatencyMonitor:
+    """WebSocket 연결 1개의 피드 지연 / 정체 감시"""
+
+    def __init__(
+        self,
+        latency_budget_ms: float = 1000,
+        stale_budgets: Optional[Dict[str, float]] = None,
+        window_sec: float = 60.0,
+        clock=time.monotonic
+    ):
+        """
+        Args:
+            latency_budget_ms: 심볼/연결 p99 지연 예산
+            stale_budgets: 토픽 클래스별 무수신 허용 시간 (ms, 없는 클래스는 감시 안 함)
+            window_sec: 분위수 윈도우
+            clock: monotonic 시계 (초)
+        """
+        self.latency_budget_ms = latency_budget_ms
+        self.stale_budgets = stale_budgets or {}
+        self.window_sec = window_sec
+        self.clock = clock
+
+        self.offset = ClockOffsetEstimator()
+        self.by_class: Dict[str, WindowedSketch] = {}
+        self.by_symbol: Dict[str, WindowedSketch] = {}
+        self.book_engine = WindowedSketch(window_sec, clock())  # 호가 ts - cts (거래소 내부)
+        self.rtt = WindowedSketch(window_sec, clock())
+        self.feeds: Dict[str, _FeedState] = {}
+
+        self.behind: Dict[str, str] = {}  # 심볼 → 사유 ("*"는 연결 전체)
+        self.alerts = {"latency": 0, "stale": 0}
+        self._last_alert: Dict[Tuple[str, str], float] = {}
+
+    def record(self, topic: str, data: dict, recv_ms: float):
+        """데이터 메시지 1개 (recv 루프에서 디코드 직후)"""
+        ts = data.get("ts")
+        if not ts:
+            return
+        now = self.clock()
+        feed = self.feeds.get(topic)
+        if feed is None:
+            feed = self.feeds[topic] = _FeedState()
+        feed.last_recv_ms = recv_ms
+        feed.last_ts = ts
+
+        raw = recv_ms - ts
+        self.offset.observe(raw)
+        latency = raw + self.offset.offset_ms
+
+        topic_class, _, rest = topic.partition(".")
+        symbol = rest.rsplit(".", 1)[-1]
+        sketch = self.by_class.get(topic_class)
+        if sketch is None:
+            sketch = self.by_class[topic_class] = WindowedSketch(self.window_sec, now)
+        sketch.add(latency, now)
+        sketch = self.by_symbol.get(symbol)
+        if sketch is None:
+            sketch = self.by_symbol[symbol] = WindowedSketch(self.window_sec, now)
+        sketch.add(latency, now)
+
+        cts = data.get("cts")
+        if cts:
+            self.book_engine.add(ts - cts, now)
+
+    def on_pong(self, sent_ms: float, recv_ms: float, server_ms: Optional[float] = None):
+        self.offset.on_pong(sent_ms, recv_ms, server_ms)
+        self.rtt.add(recv_ms - sent_ms, self.clock())
+
+    def forget(self, topics):
+        """구독 해제된 토픽 정리 (남은 토픽이 없는 심볼은 스케치도 정리)"""
+        for topic in topics:
+            self.feeds.pop(topic, None)
+        remaining = {t.rsplit(".", 1)[-1] for t in self.feeds}
+        for symbol in [s for s in self.by_symbol if s not in remaining]:
+            del self.by_symbol[symbol]
+            self.behind.pop(symbol, None)
+
+    def check(self, now_ms: Optional[float] = None) -> List[Dict]:
+        """
+        예산 점검 (주기적으로 호출) → 새로 발생한 경고 목록
+
+        뒤처짐 표시는 매번 다시 계산한다 (예산 안으로 돌아오면 해제).
+        """
+        now_ms = now_ms if now_ms is not None else time.time() * 1000
+        now = self.clock()
+        behind = {}
+
+        for topic, feed in self.feeds.items():
+            budget = self.stale_budgets.get(topic.split(".", 1)[0])
+            stale = now_ms - feed.last_recv_ms
+            if budget and stale > budget:
+                behind.setdefault(topic.rsplit(".", 1)[-1], f"stale {topic} {stale:.0f}ms")
+
+        for symbol, sketch in self.by_symbol.items():
+            p99 = sketch.snapshot(now).quantile(0.99)
+            if p99 > self.latency_budget_ms:
+                behind.setdefault(symbol, f"p99 {p99:.0f}ms")
+
+        for topic_class, sketch in self.by_class.items():
+            p50 = sketch.snapshot(now).quantile(0.5)
+            if p50 > self.latency_budget_ms:
+                behind.setdefault("*", f"{topic_class} p50 {p50:.0f}ms")
+
+        new_alerts = []
+        for key, reason in behind.items():
+            kind = "stale" if reason.startswith("stale") else "latency"
+            last = self._last_alert.get((key, kind))
+            if last is not None and now - last < ALERT_REPEAT_SEC:
+                continue
+            self._last_alert[(key, kind)] = now
+            self.alerts[kind] += 1
+            new_alerts.append({"symbol": key, "kind": kind, "reason": reason})
+            logger.warning(f"⏱️ 피드 뒤처짐: {'연결 전체' if key == '*' else key} ({reason})")
+
+        for key in set(self.behind) - set(behind):
+            logger.info(f"✅ 피드 회복: {'연결 전체' if key == '*' else key}")
+        self.behind = behind
+        return new_alerts
+
+    def is_behind(self, symbol: str) -> bool:
+        """이 심볼 (또는 연결 전체) 피드가 예산 밖인지"""
+        return "*" in self.behind or symbol in self.behind
+
+    def class_quantiles(self) -> Dict[str, Dict[str, float]]:
+        """토픽 클래스별 p50/p99/max (ms)"""
+        now = self.clock()
+        result = {}
+        for topic_class, sketch in self.by_class.items():
+            merged = sketch.snapshot(now)
+            result[topic_class] = {
+                "p50": merged.quantile(0.5),
+                "p99": merged.quantile(0.99),
+                "max": merged.max
+            }
+        return result
+
+    def worst_symbols(self, n: int = 3) -> List[Tuple[str, float]]:
+        """p99 지연 상위 심볼"""
+        now = self.clock()
+        ranked = [(symbol, sketch.snapshot(now).quantile(0.99)) for symbol, sketch in self.by_symbol.items()]
+        return sorted(ranked, key=lambda item: item[1], reverse=True)[:n]
+
+    def get_stats(self) -> Dict:
+        now = self.clock()
+        rtt = self.rtt.snapshot(now)
+        stats = {
+            "clock_offset_ms": round(self.offset.offset_ms, 1),
+            "rtt_p50_ms": round(rtt.quantile(0.5), 1),
+            "book_engine_p99_ms": round(self.book_engine.snapshot(now).quantile(0.99), 1),
+            "behind_symbols": len([k for k in self.behind if k != "*"]),
+            "behind_all": "*" in self.behind,
+            "alerts_latency": self.alerts["latency"],
+            "alerts_stale": self.alerts["stale"]
+        }
+        for topic_class, q in self.class_quantiles().items():
+            stats[f"{topic_class}_p50_ms"] = round(q["p50"], 1)
+            stats[f"{topic_class}_p99_ms"] = round(q["p99"], 1)
+        return stats
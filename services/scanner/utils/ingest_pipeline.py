@@ -0,0 +1,295 @@
+"""
+Ingest Pipeline
+WebSocket 수신과 메시지 처리를 분리하는 제한 큐 파이프라인
+
+recv 태스크 → put() → 워커별 제한 큐 (토픽 해시 샤딩, 토픽 내 순서 보장) → N개 처리 태스크
+
+토픽 클래스별 과부하 정책:
+- keep:   절대 버리지 않음. 큐가 가득 차면 recv를 대기시킴 (backpressure)
+- latest: 처리 대기 중인 같은 토픽 메시지를 최신 메시지로 교체
+- merge:  처리 대기 중인 같은 토픽 메시지에 델타를 병합 (tickers, orderbook)
+
+확정 kline(confirm=true)은 정책과 무관하게 항상 keep.
+처리 시점에 거래소 ts 기준 지연(lag)과 큐 대기 시간을 기록한다.
+"""
+import asyncio
+import logging
+import time
+import zlib
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.utils.stats import percentile
+from utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("keep", "latest", "merge")
+
+HANDLER_SECONDS = Histogram(
+    "scanner_handler_seconds", "토픽 클래스별 핸들러 처리 시간 (큐에서 꺼낸 뒤)", ("topic_class",)
+)
+
+
+def parse_policies(spec: str) -> Dict[str, str]:
+    """'tickers:merge,orderbook:merge,kline:latest' → dict"""
+    policies = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        topic_class, policy = item.split(":")
+        policy = policy.strip()
+        if policy not in POLICIES:
+            raise ValueError(f"알 수 없는 ingest 정책: {policy} (가능: {POLICIES})")
+        policies[topic_class.strip()] = policy
+    return policies
+
+
+def _is_confirmed_kline(data: dict) -> bool:
+    candles = data.get("data")
+    return isinstance(candles, list) and any(c.get("confirm") for c in candles)
+
+
+def _merge_levels(old_levels, new_levels, drop_zero: bool) -> list:
+    levels = {price: size for price, size in old_levels}
+    for price, size in new_levels:
+        levels[price] = size
+    if drop_zero:
+        return [[p, s] for p, s in levels.items() if float(s) != 0]
+    return [[p, s] for p, s in levels.items()]
+
+
+def merge_orderbook(pending: dict, new: dict) -> dict:
+    """
+    대기 중인 호가 메시지에 새 메시지 병합
+
+    스냅샷이 오면 교체. 델타는 가격별 최신 수량으로 합치고,
+    병합된 델타는 u0(첫 update id)를 남겨 엔진이 연속성을 검증할 수 있게 한다.
+    새 델타가 대기 메시지의 u 바로 다음이 아니면 병합하지 않고 None 반환
+    (유실된 업데이트를 병합으로 덮으면 엔진이 단절을 감지하지 못함).
+    """
+    if new.get("type") == "snapshot":
+        return new
+
+    pending_data = pending.get("data", {})
+    new_data = new.get("data", {})
+    if "u" in pending_data and int(new_data.get("u", 0)) != int(pending_data["u"]) + 1:
+        return None
+    is_snapshot = pending.get("type") == "snapshot"
+
+    for side in ("b", "a"):
+        pending_data[side] = _merge_levels(pending_data.get(side, ()), new_data.get(side, ()), is_snapshot)
+
+    if not is_snapshot:
+        pending_data.setdefault("u0", pending_data.get("u", 0))
+    pending_data["u"] = new_data.get("u", pending_data.get("u"))
+    pending_data["seq"] = new_data.get("seq", pending_data.get("seq"))
+    pending["ts"] = new.get("ts", pending.get("ts"))
+    pending["cts"] = new.get("cts", pending.get("cts"))
+    return pending
+
+
+def merge_ticker(pending: dict, new: dict) -> dict:
+    """대기 중인 티커 메시지에 변경 필드 병합 (필드별 최신값)"""
+    if new.get("type") == "snapshot":
+        return new
+
+    pending.setdefault("data", {}).update(new.get("data", {}))
+    pending["ts"] = new.get("ts", pending.get("ts"))
+    return pending
+
+
+# merger(pending, new) → 병합된 메시지, 병합할 수 없으면 None (새 메시지를 따로 처리)
+MERGERS = {
+    "orderbook": merge_orderbook,
+    "tickers": merge_ticker,
+}
+
+
+class _Pending:
+    """병합/교체 대상 토픽의 처리 대기 메시지 (큐에는 이 슬롯이 들어감, data=None이면 취소됨)"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: dict):
+        self.data = data
+
+
+class _ClassStats:
+    """토픽 클래스별 통계"""
+
+    __slots__ = ("received", "processed", "coalesced", "dropped", "backpressure", "lag_ms", "wait_ms", "handler_seconds")
+
+    def __init__(self, topic_class: str):
+        self.received = 0
+        self.processed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.backpressure = 0
+        self.lag_ms = deque(maxlen=2048)   # 거래소 ts → 처리 시작
+        self.wait_ms = deque(maxlen=2048)  # 수신 → 처리 시작 (큐 대기)
+        self.handler_seconds = HANDLER_SECONDS.labels(topic_class)
+
+
+class IngestPipeline:
+    """수신/처리 분리 파이프라인"""
+
+    def __init__(
+        self,
+        dispatch: Callable[[str, dict], Awaitable],
+        workers: int = 2,
+        queue_size: int = 2000,
+        policies: Optional[Dict[str, str]] = None,
+        lag_warn_ms: float = 2000
+    ):
+        self.dispatch = dispatch
+        self.num_workers = workers
+        self.queue_size = queue_size
+        self.policies = policies or {}
+        self.lag_warn_ms = lag_warn_ms
+
+        self.queues: List[asyncio.Queue] = []
+        self.tasks: List[asyncio.Task] = []
+        # 병합/교체 대상 토픽의 아직 병합 가능한 대기 슬롯 (같은 슬롯이 큐에도 들어감)
+        self.pending: Dict[str, _Pending] = {}
+        self.stats: Dict[str, _ClassStats] = {}
+        self.max_depth = 0
+        self._last_lag_warning = 0.0
+
+    def start(self):
+        """처리 태스크 시작"""
+        if self.tasks:
+            return
+
+        per_queue = max(1, self.queue_size // self.num_workers)
+        self.queues = [asyncio.Queue(maxsize=per_queue) for _ in range(self.num_workers)]
+        self.tasks = [asyncio.create_task(self._worker(q)) for q in self.queues]
+        logger.info(f"🧵 Ingest 워커 시작: {self.num_workers}개 (큐 {per_queue}개씩)")
+
+    async def stop(self):
+        """처리 태스크 종료 (대기 메시지는 버림)"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self.queues = []
+        self.pending.clear()
+
+    def _class_stats(self, topic_class: str) -> _ClassStats:
+        stats = self.stats.get(topic_class)
+        if stats is None:
+            stats = self.stats[topic_class] = _ClassStats(topic_class)
+        return stats
+
+    async def put(self, topic: str, data: dict):
+        """
+        수신 메시지 등록 (recv 태스크에서 호출)
+
+        keep 정책 메시지는 큐가 가득 차면 자리가 날 때까지 대기한다.
+        """
+        topic_class = topic.split(".", 1)[0]
+        stats = self._class_stats(topic_class)
+        stats.received += 1
+        recv_ns = time.monotonic_ns()
+
+        policy = self.policies.get(topic_class, "keep")
+        if topic_class == "kline" and _is_confirmed_kline(data):
+            policy = "keep"
+            # 확정 캔들이 같은 토픽의 대기 중 진행 캔들을 대체 (큐에 남은 슬롯은 건너뜀)
+            slot = self.pending.pop(topic, None)
+            if slot is not None:
+                slot.data = None
+                stats.coalesced += 1
+
+        queue = self.queues[zlib.crc32(topic.encode()) % len(self.queues)]
+
+        if policy == "keep":
+            if queue.full():
+                stats.backpressure += 1
+            await queue.put((topic, data, recv_ns))
+        else:
+            slot = self.pending.get(topic)
+            if slot is not None:
+                merger = MERGERS.get(topic_class) if policy == "merge" else None
+                merged = merger(slot.data, data) if merger else data
+                if merged is not None:
+                    slot.data = merged
+                    stats.coalesced += 1
+                    return
+                # 병합 불가 (시퀀스 단절 등): 기존 슬롯은 큐 순서대로 처리되고, 새 메시지는 새 슬롯으로
+                del self.pending[topic]
+
+            slot = _Pending(data)
+            try:
+                queue.put_nowait((topic, slot, recv_ns))
+            except asyncio.QueueFull:
+                stats.dropped += 1
+                return
+            self.pending[topic] = slot
+
+        depth = queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    async def _worker(self, queue: asyncio.Queue):
+        """큐에서 메시지를 꺼내 핸들러로 전달"""
+        while True:
+            topic, data, recv_ns = await queue.get()
+            try:
+                if isinstance(data, _Pending):
+                    if self.pending.get(topic) is data:
+                        del self.pending[topic]
+                    data = data.data
+                    if data is None:
+                        continue  # 확정 캔들로 대체됨
+
+                stats = self._record_lag(topic, data, recv_ns)
+                started = time.perf_counter()
+                await self.dispatch(topic, data)
+                stats.handler_seconds.observe(time.perf_counter() - started)
+
+            except Exception as e:
+                logger.error(f"Ingest 처리 오류 ({topic}): {e}")
+            finally:
+                queue.task_done()
+
+    def _record_lag(self, topic: str, data: dict, recv_ns: int) -> _ClassStats:
+        stats = self._class_stats(topic.split(".", 1)[0])
+        stats.processed += 1
+        stats.wait_ms.append((time.monotonic_ns() - recv_ns) / 1e6)
+
+        ts = data.get("ts")
+        if not ts:
+            return stats
+
+        lag_ms = time.time() * 1000 - ts
+        stats.lag_ms.append(lag_ms)
+
+        if lag_ms > self.lag_warn_ms:
+            now = time.monotonic()
+            if now - self._last_lag_warning > 10:
+                self._last_lag_warning = now
+                logger.warning(f"⚠️ 처리 지연: {topic} {lag_ms:.0f}ms (큐 {self.depth()}개)")
+        return stats
+
+    def depth(self) -> int:
+        """현재 전체 큐 깊이"""
+        return sum(q.qsize() for q in self.queues)
+
+    def get_stats(self) -> Dict:
+        """토픽 클래스별 처리/병합/버림 수와 지연 분포"""
+        result = {"queue_depth": self.depth(), "max_queue_depth": self.max_depth}
+        for topic_class, stats in self.stats.items():
+            lag = sorted(stats.lag_ms)
+            wait = sorted(stats.wait_ms)
+            result[topic_class] = {
+                "received": stats.received,
+                "processed": stats.processed,
+                "coalesced": stats.coalesced,
+                "dropped": stats.dropped,
+                "backpressure": stats.backpressure,
+                "lag_p50_ms": round(percentile(lag, 0.5), 1),
+                "lag_p99_ms": round(percentile(lag, 0.99), 1),
+                "wait_p99_ms": round(percentile(wait, 0.99), 2)
+            }
+        return result
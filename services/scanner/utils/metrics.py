@@ -0,0 +1,296 @@
+"""
+Metrics
+프로세스 내 메트릭 레지스트리 + Prometheus 텍스트 형식 /metrics 엔드포인트
+
+- Counter / Gauge / Histogram (라벨 지원, 라벨 값별 child를 미리 잡아 두면 핫패스는 필드 증가 1회)
+- FunctionMetric: 수집(scrape) 시점에 콜백으로 값을 읽음 → 기존 통계 필드를 핫패스 비용 없이 노출
+- MetricsServer: aiohttp로 /metrics, /healthz 제공
+- 모듈 전역 REGISTRY (메트릭 정의는 사용하는 모듈에서 import 시 등록)
+"""
+import bisect
+import logging
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 지연 기본 버킷 (50us ~ 10s)
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), registry: "MetricsRegistry" = None):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, *values):
+        """라벨 값별 child (핫패스에서는 미리 잡아 두고 재사용)"""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {self.labelnames} 필요, {values} 전달")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name}: 라벨이 있는 메트릭은 labels()로 사용")
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(이름 접미사, 라벨 텍스트, 값)"""
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def samples(self):
+        for key, child in sorted(self._children.items()):
+            yield "_total", _label_text(self.labelnames, key), child.value
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    """현재 값"""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+    def samples(self):
+        for key, child in sorted(self._children.items()):
+            yield "", _label_text(self.labelnames, key), child.value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: "MetricsRegistry" = None
+    ):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def samples(self):
+        for key, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), child.counts):
+                cumulative += count
+                yield "_bucket", _label_text(self.labelnames, key, f'le="{_format_value(bound)}"'), cumulative
+            labels = _label_text(self.labelnames, key)
+            yield "_sum", labels, child.sum
+            yield "_count", labels, child.count
+
+
+class FunctionMetric(_Metric):
+    """
+    수집 시점 콜백 메트릭
+
+    fn은 라벨이 없으면 숫자, 있으면 {라벨 값 튜플: 숫자}를 반환한다.
+    kind가 counter이면 이름 뒤에 _total을 붙여 노출한다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        fn: Callable[[], object],
+        kind: str = "gauge",
+        labelnames: Sequence[str] = (),
+        registry: "MetricsRegistry" = None
+    ):
+        self.fn = fn
+        self.kind = kind
+        super().__init__(name, help_text, labelnames, registry)
+
+    def samples(self):
+        suffix = "_total" if self.kind == "counter" else ""
+        value = self.fn()
+        if not self.labelnames:
+            yield suffix, "", float(value)
+            return
+        for key, v in sorted(value.items()):
+            key = key if isinstance(key, tuple) else (key,)
+            yield suffix, _label_text(self.labelnames, key), float(v)
+
+
+class MetricsRegistry:
+    """메트릭 모음 (이름 중복 등록 시 교체 - 서비스 재생성/리플레이 대응)"""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric):
+        self.metrics[metric.name] = metric
+
+    def unregister(self, name: str):
+        self.metrics.pop(name, None)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        lines: List[str] = []
+        for name, metric in sorted(self.metrics.items()):
+            try:
+                samples = list(metric.samples())
+            except Exception as e:
+                logger.debug(f"메트릭 수집 실패 ({name}): {e}")
+                continue
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+PROCESS_START = time.time()
+FunctionMetric("process_start_time_seconds", "프로세스 시작 시각 (epoch)", lambda: PROCESS_START)
+
+
+class MetricsServer:
+    """/metrics (Prometheus 텍스트), /healthz"""
+
+    def __init__(self, registry: MetricsRegistry = None, host: str = "0.0.0.0", port: int = 9100):
+        self.registry = registry if registry is not None else REGISTRY
+        self.host = host
+        self.port = port
+        self.runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> bool:
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        app.router.add_get("/healthz", self._healthz)
+        self.runner = web.AppRunner(app, access_log=None)
+        try:
+            await self.runner.setup()
+            await web.TCPSite(self.runner, self.host, self.port).start()
+            logger.info(f"📈 메트릭 엔드포인트: http://{self.host}:{self.port}/metrics")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 메트릭 서버 시작 실패 ({self.host}:{self.port}): {e}")
+            await self.runner.cleanup()
+            self.runner = None
+            return False
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    async def _healthz(self, request: web.Request) -> web.Response:
+        return web.Response(text="ok")
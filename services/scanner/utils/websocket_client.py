@@ -6,15 +6,24 @@ import asyncio
 import json
 import ssl
 import logging
+import time
 from typing import Callable, List, Optional
 from datetime import datetime
 import websockets
 from websockets.exceptions import ConnectionClosed
 
 from config.settings import Config
+from utils.ingest_pipeline import IngestPipeline, parse_policies
+from utils.ws_capture import CaptureWriter
+from utils.feed_latency import FeedLatencyMonitor, parse_budgets
+from utils.metrics import Counter, Histogram
+from src.utils.stage_profiler import profiled
 
 logger = logging.getLogger(__name__)
 
+DECODE_SECONDS = Histogram("scanner_ws_decode_seconds", "WebSocket 프레임 JSON 디코드 시간")
+RECONNECTS = Counter("scanner_ws_reconnects", "WebSocket 재연결 성공 횟수")
+
 
 class BybitWebSocketClient:
     """Bybit WebSocket 연결 관리"""
@@ -26,11 +35,40 @@ class BybitWebSocketClient:
         self.is_connected = False
         self.ping_task: Optional[asyncio.Task] = None
         self.last_message_time = datetime.now()
+        self.topics = set()  # 구독 중인 토픽 (재연결 시 복원)
+        self.connect_count = 0
+        
+        # 수신과 처리를 분리: recv 루프는 큐에 넣기만 하고 워커가 핸들러 실행
+        self.pipeline = IngestPipeline(
+            self._dispatch_message,
+            workers=Config.INGEST_WORKERS,
+            queue_size=Config.INGEST_QUEUE_SIZE,
+            policies=parse_policies(Config.INGEST_POLICIES),
+            lag_warn_ms=Config.INGEST_LAG_WARN_MS
+        )
+        
+        # 거래소 ts → 로컬 수신 지연 / 정체 감시 (실시간 수신에서만 기록)
+        self.latency = FeedLatencyMonitor(
+            latency_budget_ms=Config.FEED_LATENCY_BUDGET_MS,
+            stale_budgets=parse_budgets(Config.FEED_STALE_BUDGETS),
+            window_sec=Config.FEED_LATENCY_WINDOW_SEC
+        )
+        
+        # 원본 프레임 캡처 (리플레이/벤치마크용, WS_CAPTURE_DIR 설정 시)
+        self.capture = None
+        if Config.WS_CAPTURE_DIR:
+            self.capture = CaptureWriter(
+                Config.WS_CAPTURE_DIR,
+                url=url,
+                segment_bytes=Config.WS_CAPTURE_SEGMENT_MB * 1024 * 1024,
+                segment_seconds=Config.WS_CAPTURE_SEGMENT_SEC
+            )
         
     async def connect(self) -> bool:
         """WebSocket 연결"""
         try:
-            ssl_context = ssl.create_default_context()
+            # ws:// (로컬 fake 거래소 등)에는 TLS 컨텍스트를 넘기지 않음
+            ssl_context = ssl.create_default_context() if self.url.startswith("wss://") else None
             self.ws = await websockets.connect(
                 self.url,
                 ssl=ssl_context,
@@ -39,11 +77,21 @@ class BybitWebSocketClient:
             )
             self.is_connected = True
             self.last_message_time = datetime.now()
+            self.connect_count += 1
+            if self.connect_count > 1:
+                RECONNECTS.inc()
             logger.info(f"✅ WebSocket 연결 성공: {self.url}")
             
             # Ping 태스크 시작
             self.ping_task = asyncio.create_task(self._send_ping())
             
+            # 처리 워커 시작 (재연결 시에는 기존 워커 유지)
+            self.pipeline.start()
+            
+            # 재연결이면 기존 구독 복원
+            if self.topics:
+                await self.subscribe(sorted(self.topics))
+            
             return True
             
         except Exception as e:
@@ -57,13 +105,19 @@ class BybitWebSocketClient:
         
         if self.ping_task:
             self.ping_task.cancel()
+        
+        await self.pipeline.stop()
+        
+        if self.capture:
+            await asyncio.to_thread(self.capture.close)
             
         if self.ws:
             await self.ws.close()
             logger.info("WebSocket 연결 종료")
     
     async def subscribe(self, topics: List[str]):
-        """토픽 구독"""
+        """토픽 구독 (연결 전이면 다음 연결 시 구독)"""
+        self.topics.update(topics)
         if not self.ws or not self.is_connected:
             logger.error("WebSocket이 연결되지 않음")
             return False
@@ -88,15 +142,18 @@ class BybitWebSocketClient:
     
     async def unsubscribe(self, topics: List[str]):
         """토픽 구독 해제"""
+        self.topics.difference_update(topics)
+        self.latency.forget(topics)
         if not self.ws or not self.is_connected:
             return False
         
         try:
-            message = {
-                "op": "unsubscribe",
-                "args": topics
-            }
-            await self.ws.send(json.dumps(message))
+            for i in range(0, len(topics), 48):
+                message = {
+                    "op": "unsubscribe",
+                    "args": topics[i:i+48]
+                }
+                await self.ws.send(json.dumps(message))
             logger.info(f"구독 해제: {len(topics)}개 토픽")
             return True
             
@@ -125,29 +182,12 @@ class BybitWebSocketClient:
                         timeout=Config.WS_TIMEOUT
                     )
                     self.last_message_time = datetime.now()
+                    recv_ms = time.time() * 1000
                     
-                    data = json.loads(message)
+                    if self.capture:
+                        self.capture.write(message)
                     
-                    # Pong 응답 처리
-                    if data.get("op") == "pong":
-                        logger.debug("📡 Pong 수신")
-                        continue
-                    
-                    # 구독 확인 메시지
-                    if data.get("op") == "subscribe":
-                        if data.get("success"):
-                            logger.info(f"✅ 구독 성공: {data.get('ret_msg', '')}")
-                        else:
-                            logger.warning(f"⚠️ 구독 실패: {data}")
-                        continue
-                    
-                    # 데이터 메시지 처리
-                    topic = data.get("topic", "")
-                    if topic:
-                        logger.debug(f"📨 메시지 수신: {topic}")
-                        await self._dispatch_message(topic, data)
-                    else:
-                        logger.debug(f"🔍 토픽 없는 메시지: {data}")
+                    await self.handle_frame(message, recv_ms=recv_ms)
                     
                 except asyncio.TimeoutError:
                     # 타임아웃 체크
@@ -166,6 +206,47 @@ class BybitWebSocketClient:
         finally:
             self.is_connected = False
     
+    async def handle_frame(self, message: str, inline: bool = False, recv_ms: Optional[float] = None):
+        """
+        원본 프레임 1개 처리 (실시간 수신과 캡처 리플레이 공용)
+        
+        Args:
+            message: 수신한 원본 JSON 문자열
+            inline: 수신 큐를 거치지 않고 바로 핸들러 실행 (결정적 리플레이)
+            recv_ms: 로컬 수신 시각 (epoch ms, 있으면 피드 지연 기록 - 리플레이는 None)
+        """
+        started = time.perf_counter()
+        data = json.loads(message)
+        DECODE_SECONDS.observe(time.perf_counter() - started)
+        
+        # Pong 응답 처리 (public: op=ping/ret_msg=pong, private: op=pong/args=[서버 ms])
+        if data.get("op") == "pong" or data.get("ret_msg") == "pong":
+            logger.debug("📡 Pong 수신")
+            if recv_ms is not None:
+                self._on_pong(data, recv_ms)
+            return
+        
+        # 구독 확인 메시지
+        if data.get("op") == "subscribe":
+            if data.get("success"):
+                logger.info(f"✅ 구독 성공: {data.get('ret_msg', '')}")
+            else:
+                logger.warning(f"⚠️ 구독 실패: {data}")
+            return
+        
+        # 데이터 메시지 처리
+        topic = data.get("topic", "")
+        if topic:
+            if recv_ms is not None:
+                self.latency.record(topic, data, recv_ms)
+            if inline:
+                await self._dispatch_message(topic, data)
+            else:
+                await self.pipeline.put(topic, data)
+        else:
+            logger.debug(f"🔍 토픽 없는 메시지: {data}")
+    
+    @profiled("scanner.dispatch")
     async def _dispatch_message(self, topic: str, data: dict):
         """메시지를 적절한 핸들러로 전달"""
         handled = False
@@ -187,13 +268,29 @@ class BybitWebSocketClient:
             except Exception as e:
                 logger.error(f"와일드카드 핸들러 오류: {e}")
     
+    def get_stats(self) -> dict:
+        """수신 파이프라인 통계"""
+        return self.pipeline.get_stats()
+    
+    def _on_pong(self, data: dict, recv_ms: float):
+        """ping req_id(송신 ms)로 RTT, 서버 시각이 있으면 함께 시계 오프셋 추정"""
+        try:
+            sent_ms = float(data.get("req_id") or 0)
+            args = data.get("args") or []
+            server_ms = float(args[0]) if args else None
+        except (TypeError, ValueError):
+            return
+        if sent_ms:
+            self.latency.on_pong(sent_ms, recv_ms, server_ms)
+    
     async def _send_ping(self):
         """주기적으로 ping 전송"""
         while self.is_connected:
             try:
                 await asyncio.sleep(Config.WS_PING_INTERVAL)
                 if self.ws and self.is_connected:
-                    await self.ws.send(json.dumps({"op": "ping"}))
+                    # req_id = 송신 시각 (pong에 그대로 돌아옴 → RTT)
+                    await self.ws.send(json.dumps({"op": "ping", "req_id": str(int(time.time() * 1000))}))
                     logger.debug("📡 Ping 전송")
             except Exception as e:
                 logger.error(f"Ping 전송 실패: {e}")
@@ -0,0 +1,222 @@
+"""
+WebSocket Capture
+수신한 원본 프레임을 수신 시각과 함께 압축 세그먼트 파일로 기록하고 다시 읽기
+
+파일: ``{dir}/ws-{시작 시각}-{pid}-{순번}.log.gz`` (gzip 텍스트)
+    첫 줄: ``#capture {"version": 1, "url": ..., "pid": ..., "started_ns": ...}``
+    이후: ``{수신 시각 epoch ns}\\t{원본 프레임}``
+
+- 기록은 별도 스레드에서 수행 (이벤트 루프는 큐에 넣기만 함, 큐 포화 시 버림)
+- 세그먼트는 비압축 크기 또는 경과 시간 기준으로 교체
+- write_capture: 합성 프레임 등을 같은 형식으로 바로 기록 (스레드/큐 없음)
+- 읽기는 프로세스(pid)별 세그먼트를 순서대로 잇고 여러 프로세스는 수신 시각으로 병합
+"""
+import glob
+import gzip
+import heapq
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_VERSION = 1
+HEADER_PREFIX = "#capture "
+FLUSH_INTERVAL_SEC = 5.0
+
+
+class CaptureWriter:
+    """원본 프레임 캡처 (세그먼트 gzip 파일)"""
+
+    def __init__(
+        self,
+        directory: str,
+        url: str = "",
+        segment_bytes: int = 64 * 1024 * 1024,
+        segment_seconds: float = 3600,
+        queue_size: int = 100_000
+    ):
+        self.directory = directory
+        self.url = url
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.prefix = f"ws-{datetime.utcnow():%Y%m%d-%H%M%S}-{os.getpid()}"
+
+        # 통계
+        self.frames = 0
+        self.dropped = 0
+        self.bytes_written = 0
+        self.segments = 0
+
+        self._file = None
+        self._file_bytes = 0
+        self._file_deadline = 0.0
+        self._closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="ws-capture", daemon=True)
+        self._thread.start()
+        logger.info(f"📼 WebSocket 캡처 시작: {directory}/{self.prefix}-*.log.gz")
+
+    def write(self, frame: str, recv_ns: int = None):
+        """프레임 기록 요청 (논블로킹)"""
+        if self._closed:
+            return
+        try:
+            self.queue.put_nowait((recv_ns if recv_ns is not None else time.time_ns(), frame))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """남은 프레임 기록 후 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(None)
+        self._thread.join()
+        logger.info(
+            f"📼 WebSocket 캡처 종료: {self.frames}개 프레임 | 세그먼트 {self.segments}개 | "
+            f"{self.bytes_written / 1024 / 1024:.1f}MB (비압축) | 버림 {self.dropped}"
+        )
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self.queue.get(timeout=1.0)
+            except queue.Empty:
+                item = False
+
+            if item is None:
+                break
+            if item:
+                try:
+                    self._append(*item)
+                except Exception as e:
+                    self.dropped += 1
+                    logger.error(f"캡처 기록 오류: {e}")
+
+            # 비정상 종료 대비 주기적 flush (gzip sync flush)
+            if self._file and time.monotonic() - last_flush >= FLUSH_INTERVAL_SEC:
+                self._file.flush()
+                last_flush = time.monotonic()
+
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _append(self, recv_ns: int, frame: str):
+        if "\n" in frame:
+            frame = json.dumps(json.loads(frame), separators=(",", ":"))
+        line = f"{recv_ns}\t{frame}\n"
+
+        if (
+            self._file is None
+            or self._file_bytes >= self.segment_bytes
+            or time.monotonic() >= self._file_deadline
+        ):
+            self._rotate(recv_ns)
+
+        self._file.write(line)
+        self._file_bytes += len(line)
+        self.bytes_written += len(line)
+        self.frames += 1
+
+    def _rotate(self, recv_ns: int):
+        if self._file:
+            self._file.close()
+        self.segments += 1
+        path = os.path.join(self.directory, f"{self.prefix}-{self.segments:04d}.log.gz")
+        self._file = gzip.open(path, "wt", encoding="utf-8", compresslevel=5)
+        header = {"version": CAPTURE_VERSION, "url": self.url, "pid": os.getpid(), "started_ns": recv_ns}
+        self._file.write(HEADER_PREFIX + json.dumps(header) + "\n")
+        self._file_bytes = 0
+        self._file_deadline = time.monotonic() + self.segment_seconds
+
+
+def write_capture(
+    directory: str,
+    frames: Iterable[Tuple[int, str]],
+    url: str = "",
+    segment_bytes: int = 64 * 1024 * 1024,
+    prefix: str = None
+) -> List[str]:
+    """
+    (수신 시각 ns, 프레임) 목록을 캡처 세그먼트로 바로 기록 (오프라인 생성용, 버림 없음)
+
+    Returns:
+        기록한 세그먼트 파일 목록
+    """
+    os.makedirs(directory, exist_ok=True)
+    prefix = prefix or f"ws-{datetime.utcnow():%Y%m%d-%H%M%S}-{os.getpid()}"
+    paths: List[str] = []
+    f = None
+    file_bytes = 0
+    try:
+        for recv_ns, frame in frames:
+            if f is None or file_bytes >= segment_bytes:
+                if f:
+                    f.close()
+                path = os.path.join(directory, f"{prefix}-{len(paths) + 1:04d}.log.gz")
+                f = gzip.open(path, "wt", encoding="utf-8", compresslevel=5)
+                header = {"version": CAPTURE_VERSION, "url": url, "pid": os.getpid(), "started_ns": recv_ns}
+                f.write(HEADER_PREFIX + json.dumps(header) + "\n")
+                paths.append(path)
+                file_bytes = 0
+            line = f"{recv_ns}\t{frame}\n"
+            f.write(line)
+            file_bytes += len(line)
+    finally:
+        if f:
+            f.close()
+    return paths
+
+
+def capture_files(path: str) -> List[str]:
+    """캡처 경로 (디렉터리 또는 파일) → 세그먼트 파일 목록 (이름순)"""
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "ws-*.log.gz")))
+    return [path]
+
+
+def read_segment(path: str) -> Iterator[Tuple[int, str]]:
+    """세그먼트 1개 → (수신 시각 ns, 원본 프레임)"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(HEADER_PREFIX):
+                header = json.loads(line[len(HEADER_PREFIX):])
+                if header.get("version") != CAPTURE_VERSION:
+                    raise ValueError(f"지원하지 않는 캡처 버전: {header.get('version')} ({path})")
+                continue
+            recv_ns, _, frame = line.rstrip("\n").partition("\t")
+            if frame:
+                yield int(recv_ns), frame
+
+
+def iter_frames(paths: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """
+    세그먼트 목록 → 수신 순서 프레임
+
+    같은 프로세스의 세그먼트는 순번대로 잇고, 여러 프로세스 캡처는 수신 시각으로 병합한다
+    (동시각이면 파일 이름 순 → 실행마다 같은 순서).
+    """
+    groups = {}
+    for path in sorted(paths):
+        name = os.path.basename(path)
+        key = name.rsplit("-", 1)[0] if name.startswith("ws-") else name
+        groups.setdefault(key, []).append(path)
+
+    streams = [
+        itertools.chain.from_iterable(read_segment(p) for p in files)
+        for _, files in sorted(groups.items())
+    ]
+    if len(streams) == 1:
+        return streams[0]
+    return heapq.merge(*streams, key=lambda item: item[0])
@@ -0,0 +1,161 @@
+"""
+WebSocket Replay
+캡처한 원본 프레임을 실시간 수신과 같은 경로(BybitWebSocketClient.handle_frame)로 재생
+
+- 속도: 1× (수신 간격 그대로), N× (간격 1/N), 0 = 최대 속도 (대기 없음)
+- 결정성: 감지기/게이트 시계를 캡처 수신 시각 기반 가상 시계로 교체하고,
+  기본적으로 수신 큐를 거치지 않고 프레임 순서대로 핸들러를 실행한다.
+  → 속도와 무관하게 같은 캡처는 항상 같은 신호 (digest)를 만든다.
+- pipeline=True면 실제 수신 큐(병합/버림 정책 포함)를 거친다 (처리량 측정용, 비결정적)
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from utils.ws_capture import iter_frames
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayClock:
+    """캡처 수신 시각을 따르는 가상 monotonic 시계 (초)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RecordingEmitter:
+    """SignalEmitter 대체: 발행 신호를 주문 대신 기록"""
+
+    def __init__(self, clock: ReplayClock):
+        self.clock = clock
+        self.records: List[Tuple] = []
+
+    async def initialize(self):
+        pass
+
+    async def send_opportunity(self, opportunity: dict) -> bool:
+        self.records.append((
+            "opportunity",
+            round(self.clock(), 6),
+            opportunity.get("symbol"),
+            opportunity.get("signal_type"),
+            round(float(opportunity.get("score", 0.0)), 9)
+        ))
+        return True
+
+    async def send_entry(self, signal: dict) -> bool:
+        self.records.append((
+            "entry",
+            round(self.clock(), 6),
+            signal.get("symbol"),
+            signal.get("type"),
+            signal.get("entry_price"),
+            signal.get("confidence")
+        ))
+        return True
+
+    def digest(self) -> str:
+        """기록된 신호 순서/내용 해시 (회귀 비교용)"""
+        h = hashlib.sha256()
+        for record in self.records:
+            h.update(repr(record).encode())
+        return h.hexdigest()
+
+    def get_stats(self) -> dict:
+        return {}
+
+    async def close(self):
+        pass
+
+
+class ReplayDriver:
+    """캡처 재생"""
+
+    def __init__(self, client, clock: ReplayClock = None, speed: float = 0.0, pipeline: bool = False):
+        """
+        Args:
+            client: 핸들러가 등록된 BybitWebSocketClient (연결 불필요)
+            clock: DataProcessor 등에 주입한 가상 시계
+            speed: 재생 배속 (0이면 최대 속도)
+            pipeline: 수신 큐 경유 여부
+        """
+        self.client = client
+        self.clock = clock
+        self.speed = speed
+        self.pipeline = pipeline
+
+        # 통계
+        self.frames = 0
+        self.errors = 0
+        self.elapsed_sec = 0.0
+        self.captured_sec = 0.0
+
+    async def run(self, paths: Iterable[str], limit: int = 0, on_frame=None) -> Dict:
+        """
+        재생 실행
+
+        Args:
+            paths: 세그먼트 파일 목록
+            limit: 최대 프레임 수 (0이면 전체)
+            on_frame: 프레임마다 호출할 콜백 (index)
+
+        Returns:
+            통계 dict
+        """
+        if self.pipeline:
+            self.client.pipeline.start()
+
+        first_ns = None
+        started = time.perf_counter()
+        for recv_ns, frame in iter_frames(paths):
+            if first_ns is None:
+                first_ns = recv_ns
+
+            # 배속 재생: 캡처 간격 / speed 만큼 대기
+            if self.speed > 0:
+                delay = (recv_ns - first_ns) / 1e9 / self.speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            if self.clock is not None:
+                self.clock.now = recv_ns / 1e9
+            try:
+                await self.client.handle_frame(frame, inline=not self.pipeline)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"리플레이 프레임 오류 (#{self.frames}): {e}")
+
+            self.frames += 1
+            if on_frame:
+                on_frame(self.frames)
+            if limit and self.frames >= limit:
+                break
+
+            # 최대 속도에서도 다른 태스크(수신 큐 워커 등)가 돌 수 있게 양보
+            if self.frames % 1000 == 0:
+                await asyncio.sleep(0)
+
+        if self.pipeline:
+            # 큐가 빌 때까지 대기 후 워커 종료
+            while self.client.pipeline.depth() > 0:
+                await asyncio.sleep(0.01)
+            await self.client.pipeline.stop()
+
+        self.elapsed_sec = time.perf_counter() - started
+        self.captured_sec = (recv_ns - first_ns) / 1e9 if first_ns is not None else 0.0
+        return self.get_stats()
+
+    def get_stats(self) -> Dict:
+        return {
+            "frames": self.frames,
+            "errors": self.errors,
+            "elapsed_sec": round(self.elapsed_sec, 3),
+            "captured_sec": round(self.captured_sec, 3),
+            "frames_per_sec": round(self.frames / self.elapsed_sec, 1) if self.elapsed_sec else 0.0
+        }
@@ -6,9 +6,9 @@ import os
 import json
 import time
 import boto3
-import pika
 from datetime import datetime, timezone
 from decimal import Decimal
+from src.utils import trace_context
 
 class DecimalEncoder(json.JSONEncoder):
     """DynamoDB Decimal을 JSON으로 변환"""
@@ -39,6 +39,7 @@ class StrategySelectorService:
     def connect_rabbitmq(self):
         """RabbitMQ 연결"""
         import ssl
+        import pika  # 발행할 전략이 있을 때만 로드 (스케줄 실행마다 콜드 스타트)
         credentials = pika.PlainCredentials(self.rabbitmq_user, self.rabbitmq_pass)
         
         # Amazon MQ는 SSL 필요
@@ -68,6 +69,8 @@ class StrategySelectorService:
         print(f"{'='*80}\n")
         
         try:
+            query_start = trace_context.now_ms()
+            
             # StatusIndex를 사용하여 활성 코인 조회
             response = self.results_table.query(
                 IndexName='StatusIndex',
@@ -107,6 +110,10 @@ class StrategySelectorService:
                     optimal_pnl >= self.min_pnl and 
                     total_trades >= self.min_trades):
                     
+                    # Analyzer가 결과 아이템에 남긴 트레이스 이어받기 (없으면 조회 시점부터)
+                    trace = trace_context.extract(item) or trace_context.new_trace(origin_ms=query_start)
+                    trace_context.add_span(trace, "selector.query", query_start)
+                    
                     strategies.append({
                         'symbol': symbol,
                         'timeframe': optimal_timeframe,
@@ -117,7 +124,8 @@ class StrategySelectorService:
                         'confidence_avg': confidence_avg,
                         'scan_id': item.get('scan_id', ''),
                         'volatility_24h': float(item.get('volatility_24h', 0)),
-                        'price': float(item.get('price', 0))
+                        'price': float(item.get('price', 0)),
+                        'trace': trace
                     })
                     
                     print(f"✅ {symbol}: {optimal_timeframe} ({best_strategy}) - "
@@ -141,6 +149,7 @@ class StrategySelectorService:
         
         print(f"\n📤 트레이딩 신호 발행 중...")
         
+        import pika
         connection, channel = self.connect_rabbitmq()
         published_count = 0
         
@@ -159,6 +168,9 @@ class StrategySelectorService:
                     'price': strategy['price'],
                     'timestamp': datetime.now(timezone.utc).isoformat()
                 }
+                trace = strategy.get('trace')
+                publish_start = trace_context.now_ms()
+                trace_context.inject(message, trace)
                 
                 channel.basic_publish(
                     exchange='',
@@ -169,6 +181,8 @@ class StrategySelectorService:
                         content_type='application/json'
                     )
                 )
+                trace_context.add_span(trace, "selector.publish", publish_start)
+                trace_context.report(trace, "published", self.selector_id)
                 
                 published_count += 1
                 print(f"  ✅ {strategy['symbol']}: {strategy['timeframe']} ({strategy['strategy']})")
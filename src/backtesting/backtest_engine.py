@@ -2,38 +2,90 @@ from src.utils.bybit_client import BybitClient
 from src.strategies.entry_strategy import EntryStrategy
 from src.scanning.volatility_scanner import VolatilityScanner
 from src.utils.indicators import Indicators
+from src.utils.stage_profiler import stage
+from src.utils import api_accounting, structured_log
+from src.utils.api_accounting import ApiBudgetExceeded
 from config.config import Config
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
 import time
 
+logger = structured_log.get_logger(__name__)
+
+
+@contextmanager
+def _timed(timings, key):
+    """단계 시간 기록 (출력용 timings[key], 초) + 프로파일러 구간"""
+    start = time.time()
+    try:
+        with stage(key):
+            yield
+    finally:
+        timings[key] = time.time() - start
+
+
+class MarketData:
+    """심볼 1개 백테스트의 시장 데이터 (조회 단계 결과, 계산 단계는 API 호출 없음)"""
+
+    __slots__ = ("symbol", "candles", "timeframe", "mtf_fib", "entry_df", "btc_df",
+                 "btc_trend", "funding_info", "instrument_info", "timings")
+
+    def __init__(self, symbol, candles, timeframe):
+        self.symbol = symbol
+        self.candles = candles
+        self.timeframe = timeframe
+        self.mtf_fib = None
+        self.entry_df = None
+        self.btc_df = None
+        self.btc_trend = None
+        self.funding_info = None
+        self.instrument_info = None
+        self.timings = {}  # 조회 구간별 시간 (초) - 시간 분석에 합산
+
+    def fetch_seconds(self):
+        return sum(self.timings.values())
+
+
 class BacktestEngine:
-    def __init__(self):
-        self.client = BybitClient()
+    def __init__(self, client=None):
+        """
+        Args:
+            client: BybitClient (기본: Bybit 연결). 재현 가능한 벤치마크는
+                BybitClient(session=SyntheticSession(SyntheticMarketGenerator(seed=...)))
+        """
+        self.client = client or BybitClient()
         self.strategy = EntryStrategy(self.client)
-        self.scanner = VolatilityScanner()
+        self.scanner = VolatilityScanner(self.client)
         self.trades = []
         self.total_pnl = 0.0  # 누적 손익 (자본 차감 없음)
         self.timing_stats = {}  # 시간 측정용
+        self.api_stats = {}  # 심볼별 API 사용량 (api_accounting.Footprint.to_dict)
+        self.budget_exceeded = {}  # 마지막 run_backtest에서 API 예산 초과로 중단된 심볼 → ApiBudgetExceeded
     
-    def run_backtest(self, symbols=None, candles=None, timeframe=None):
-        """백테스팅 실행"""
+    def run_backtest(self, symbols=None, candles=None, timeframe=None, market_data=None, report=True):
+        """백테스팅 실행
+
+        Args:
+            market_data: 심볼 → 미리 조회한 MarketData (없는 심볼은 여기서 조회)
+            report: 전체 결과 리포트 출력 + 거래 내역 CSV 저장
+        """
         if candles is None:
             candles = Config.BACKTEST_CANDLES
         if timeframe is None:
             timeframe = Config.ENTRY_TIMEFRAME
             
-        print(f"\n{'='*80}")
-        print(f"백테스팅 시작 - {candles}개 캔들 ({timeframe}분봉, UTC 시간)")
-        print(f"거래당 포지션 크기: ${Config.POSITION_SIZE} (레버리지 {Config.LEVERAGE}x)")
-        print(f"※ 매 거래마다 ${Config.POSITION_SIZE}로 진입, 손익만 누적")
-        print(f"{'='*80}\n")
+        logger.info(f"\n{'='*80}")
+        logger.info(f"백테스팅 시작 - {candles}개 캔들 ({timeframe}분봉, UTC 시간)")
+        logger.info(f"거래당 포지션 크기: ${Config.POSITION_SIZE} (레버리지 {Config.LEVERAGE}x)")
+        logger.info(f"※ 매 거래마다 ${Config.POSITION_SIZE}로 진입, 손익만 누적")
+        logger.info(f"{'='*80}\n")
         
         # 심볼이 지정되지 않으면 스캔
         if symbols is None:
             scanned_coins = self.scanner.scan_coins()
             if scanned_coins.empty:
-                print("코인을 찾지 못했습니다.")
+                logger.info("코인을 찾지 못했습니다.")
                 return
             
             # 변동성 필터: MIN ~ MAX 범위 내
@@ -43,104 +95,136 @@ class BacktestEngine:
             ]
             
             if filtered_coins.empty:
-                print(f"변동성 {Config.MIN_VOLATILITY}~{Config.MAX_VOLATILITY}% 범위 코인이 없습니다.")
+                logger.info(f"변동성 {Config.MIN_VOLATILITY}~{Config.MAX_VOLATILITY}% 범위 코인이 없습니다.")
                 return
             
             # 변동성 기준으로 정렬하여 상위 선택
             symbols = filtered_coins.nlargest(Config.TOP_BACKTEST_COINS, 'volatility_24h')['symbol'].tolist()
-            print(f"변동성 필터: {Config.MIN_VOLATILITY}~{Config.MAX_VOLATILITY}% (너무 높은 변동성 제외)")
+            logger.info(f"변동성 필터: {Config.MIN_VOLATILITY}~{Config.MAX_VOLATILITY}% (너무 높은 변동성 제외)")
         
-        print(f"\n백테스팅 대상 ({len(symbols)}개): {symbols}\n")
+        logger.info(f"\n백테스팅 대상 ({len(symbols)}개): {symbols}\n")
         
+        self.budget_exceeded = {}
         for symbol in symbols:
-            print(f"\n{'='*80}")
-            print(f"심볼: {symbol}")
-            print(f"{'='*80}")
-            self._backtest_symbol(symbol, candles, timeframe)
-        
-        self._print_results()
+            logger.info(f"\n{'='*80}")
+            logger.info(f"심볼: {symbol}")
+            logger.info(f"{'='*80}")
+            with stage("backtest.symbol"), api_accounting.footprint(f"backtest {symbol} {timeframe}m") as fp:
+                try:
+                    self._backtest_symbol(symbol, candles, timeframe, (market_data or {}).get(symbol))
+                except ApiBudgetExceeded as e:
+                    # 중단된 심볼은 거래 0건 결과가 아님 → 호출자가 budget_exceeded로 구분
+                    logger.warning(f"\n❌ {e} - {symbol} 중단")
+                    self.budget_exceeded[symbol] = e
+            self.api_stats[symbol] = fp.to_dict()
+            logger.info(f"   {fp.summary()}")
+        
+        if report:
+            self._print_results()
+    
+    def fetch_market_data(self, symbol, candles, timeframe):
+        """
+        심볼 1개 백테스트에 필요한 API 조회를 모두 수행 (엔진 상태를 바꾸지 않음 - 다른 스레드에서 미리 조회 가능)
+        
+        데이터 부족 단계에서 멈추고 나머지는 None (계산 단계가 같은 순서로 확인)
+        """
+        data = MarketData(symbol, candles, timeframe)
+        timings = data.timings
+        
+        with _timed(timings, 'fibonacci'):
+            data.mtf_fib = Indicators.calculate_multi_timeframe_fibonacci(
+                self.client, 
+                symbol, 
+                Config.FIBONACCI_TIMEFRAMES
+            )
+        if not data.mtf_fib:
+            return data
+        
+        with _timed(timings, 'load_candles'):
+            data.entry_df = self.client.get_klines(symbol, interval=timeframe, limit=candles)
+        if data.entry_df.empty or len(data.entry_df) < Config.BB_PERIOD + 10:
+            return data
+        
+        with _timed(timings, 'load_btc'):
+            data.btc_df = self.client.get_klines('BTCUSDT', interval=timeframe, limit=candles)
+        if data.btc_df.empty:
+            return data
+        
+        with _timed(timings, 'btc_trend_calc'):
+            data.btc_trend = self.strategy.trend_analyzer.get_btc_trend(self.client, timeframe_minutes=60)
+        
+        with _timed(timings, 'funding_rate'):
+            data.funding_info = self.strategy.advanced_analyzer.get_funding_rate(self.client, symbol)
+        
+        # 심볼 거래 규칙 (봉마다 조회하지 않도록 1회)
+        with _timed(timings, 'instrument_info'):
+            data.instrument_info = self.client.get_instrument_info(symbol)
+        
+        return data
     
-    def _backtest_symbol(self, symbol, candles, timeframe):
-        """개별 심볼 백테스팅 (시간 측정 포함)"""
+    def _backtest_symbol(self, symbol, candles, timeframe, data=None):
+        """개별 심볼 백테스팅 (시간 측정 포함, data: 미리 조회한 MarketData)"""
+        if data is None:
+            data = self.fetch_market_data(symbol, candles, timeframe)
         symbol_start = time.time()
-        timings = {}
+        timings = dict(data.timings)
         
         # 1. 멀티 타임프레임 피보나치 계산
-        print(f"\n[1/5] 멀티 타임프레임 피보나치 계산...", end='', flush=True)
-        step_start = time.time()
-        mtf_fib = Indicators.calculate_multi_timeframe_fibonacci(
-            self.client, 
-            symbol, 
-            Config.FIBONACCI_TIMEFRAMES
-        )
-        timings['fibonacci'] = time.time() - step_start
+        mtf_fib = data.mtf_fib
         
         if not mtf_fib:
-            print(f" ❌ 데이터 부족")
+            logger.warning(f"\n[1/5] 멀티 타임프레임 피보나치 계산... ❌ 데이터 부족")
             return
         
-        print(f" ✅ {len(mtf_fib)}개 타임프레임 ({timings['fibonacci']:.2f}초)")
+        logger.info(f"\n[1/5] 멀티 타임프레임 피보나치 계산... ✅ {len(mtf_fib)}개 타임프레임 ({timings['fibonacci']:.2f}초)")
         
-        # 2. 진입 타임프레임 데이터 가져오기
-        print(f"[2/5] {timeframe}분봉 데이터 로딩 ({candles}개)...", end='', flush=True)
-        step_start = time.time()
-        entry_df = self.client.get_klines(symbol, interval=timeframe, limit=candles)
-        timings['load_candles'] = time.time() - step_start
+        # 2. 진입 타임프레임 데이터
+        entry_df = data.entry_df
         
         if entry_df.empty or len(entry_df) < Config.BB_PERIOD + 10:
-            print(f" ❌ 데이터 부족 ({len(entry_df)}개 봉)")
+            logger.warning(f"[2/5] {timeframe}분봉 데이터 로딩 ({candles}개)... ❌ 데이터 부족 ({len(entry_df)}개 봉)")
             return
         
-        print(f" ✅ {len(entry_df)}개 봉 ({timings['load_candles']:.2f}초)")
-        
-        # 3. 비트코인 데이터 로딩 및 추세 사전 계산
-        print(f"[3/5] 비트코인 추세 데이터 로딩 및 사전 계산...", end='', flush=True)
-        step_start = time.time()
-        btc_df = self.client.get_klines('BTCUSDT', interval=timeframe, limit=candles)
+        logger.info(f"[2/5] {timeframe}분봉 데이터 로딩 ({candles}개)... ✅ {len(entry_df)}개 봉 ({timings['load_candles']:.2f}초)")
         
+        # 3. 비트코인 데이터 및 추세 사전 계산 (load_btc = 조회 + 사전 계산)
+        btc_df = data.btc_df
         if btc_df.empty:
-            print(f" ❌ 비트코인 데이터 없음")
+            logger.warning(f"[3/5] 비트코인 추세 데이터 로딩 및 사전 계산... ❌ 비트코인 데이터 없음")
             return
         
-        # 🔥 BTC 추세 사전 계산 (모든 시점에 대해)
-        from src.utils.trend_analyzer import TrendAnalyzer
-        btc_trends_cache = {}
-        
-        for i in range(60, len(btc_df)):  # 최소 60개 필요 (1시간)
-            window_btc = btc_df.iloc[:i+1].copy()
-            # 이미 계산된 데이터로 추세 분석 (API 호출 없음)
-            btc_trends_cache[i] = TrendAnalyzer.get_coin_trend(window_btc, timeframe_minutes=60)
-            btc_trends_cache[i]['trend_type'] = 'BTC'
+        with _timed(timings, 'btc_precompute'):
+            # 🔥 BTC 추세 사전 계산 (모든 시점에 대해)
+            from src.utils.trend_analyzer import TrendAnalyzer
+            btc_trends_cache = {}
+            
+            for i in range(60, len(btc_df)):  # 최소 60개 필요 (1시간)
+                window_btc = btc_df.iloc[:i+1].copy()
+                # 이미 계산된 데이터로 추세 분석 (API 호출 없음)
+                btc_trends_cache[i] = TrendAnalyzer.get_coin_trend(window_btc, timeframe_minutes=60)
+                btc_trends_cache[i]['trend_type'] = 'BTC'
+        timings['load_btc'] += timings.pop('btc_precompute')
         
-        timings['load_btc'] = time.time() - step_start
-        print(f" ✅ {len(btc_df)}개 봉, {len(btc_trends_cache)}개 추세 캐시 ({timings['load_btc']:.2f}초)")
+        logger.info(f"[3/5] 비트코인 추세 데이터 로딩 및 사전 계산... ✅ {len(btc_df)}개 봉, {len(btc_trends_cache)}개 추세 캐시 ({timings['load_btc']:.2f}초)")
         
         # 4. 지표 사전 계산
-        print(f"[4/5] 지표 계산 (볼린저, RSI)...", end='', flush=True)
-        step_start = time.time()
-        entry_df = Indicators.calculate_bollinger_bands(entry_df, Config.BB_PERIOD, Config.BB_STD)
-        entry_df = Indicators.calculate_rsi(entry_df, period=14)
-        timings['indicators'] = time.time() - step_start
-        print(f" ✅ 완료 ({timings['indicators']:.2f}초)")
+        with _timed(timings, 'indicators'):
+            entry_df = Indicators.calculate_bollinger_bands(entry_df, Config.BB_PERIOD, Config.BB_STD)
+            entry_df = Indicators.calculate_rsi(entry_df, period=14)
+        logger.info(f"[4/5] 지표 계산 (볼린저, RSI)... ✅ 완료 ({timings['indicators']:.2f}초)")
         
         # 4.5. BTC 추세 미리 계산 (최적화!)
-        print(f"[4.5/5] BTC 추세 사전 계산 (60분 윈도우)...", end='', flush=True)
-        step_start = time.time()
-        # BTC 데이터로 60분 윈도우 추세 계산 (한 번만!)
-        btc_trend = self.strategy.trend_analyzer.get_btc_trend(self.client, timeframe_minutes=60)
-        timings['btc_trend_calc'] = time.time() - step_start
-        print(f" ✅ 완료 ({timings['btc_trend_calc']:.2f}초)")
+        # BTC 데이터로 60분 윈도우 추세 계산 (한 번만! - 조회 단계)
+        btc_trend = data.btc_trend
+        logger.info(f"[4.5/5] BTC 추세 사전 계산 (60분 윈도우)... ✅ 완료 ({timings['btc_trend_calc']:.2f}초)")
         
-        # 4.6. 펀딩비 미리 조회 (최적화!)
-        print(f"[4.6/5] 펀딩비 조회...", end='', flush=True)
-        step_start = time.time()
-        funding_info = self.strategy.advanced_analyzer.get_funding_rate(self.client, symbol)
-        timings['funding_rate'] = time.time() - step_start
-        print(f" ✅ 완료 ({timings['funding_rate']:.2f}초)")
+        # 4.6. 펀딩비 미리 조회 (최적화! - 조회 단계)
+        funding_info = data.funding_info
+        logger.info(f"[4.6/5] 펀딩비 조회... ✅ 완료 ({timings['funding_rate']:.2f}초)")
         
         # 5. 슬라이딩 윈도우로 진입 신호 찾기
         total_candles = len(entry_df) - Config.BB_PERIOD - 10
-        print(f"[5/5] 진입 신호 탐색 ({total_candles}개 봉, 누적 손익: ${self.total_pnl:.2f})...")
+        logger.info(f"[5/5] 진입 신호 탐색 ({total_candles}개 봉, 누적 손익: ${self.total_pnl:.2f})...")
         step_start = time.time()
         signals_found = 0
         trades_before = len(self.trades)
@@ -158,15 +242,19 @@ class BacktestEngine:
                 elapsed = time.time() - step_start
                 estimated_total = elapsed / (idx + 1) * total_candles
                 remaining = estimated_total - elapsed
-                print(f"    진행: {progress}% ({idx+1}/{total_candles}) | 경과: {elapsed:.1f}초 | 예상 남은 시간: {remaining:.1f}초", flush=True)
+                logger.info(f"    진행: {progress}% ({idx+1}/{total_candles}) | 경과: {elapsed:.1f}초 | 예상 남은 시간: {remaining:.1f}초")
                 checkpoint_idx += 1
             
             # 현재까지의 데이터로 분석
             signal_start = time.time()
-            window_df = entry_df.iloc[:i+1].copy()
-            
-            # 진입 신호 분석 (BTC 추세 + 펀딩비 캐시 전달)
-            signal = self.strategy.analyze_entry(window_df, symbol, mtf_fib, btc_trend=btc_trend, funding_info=funding_info)
+            with stage("analyze_entry"):
+                window_df = entry_df.iloc[:i+1].copy()
+                
+                # 진입 신호 분석 (BTC 추세 + 펀딩비 + 심볼 정보 캐시 전달)
+                signal = self.strategy.analyze_entry(
+                    window_df, symbol, mtf_fib,
+                    btc_trend=btc_trend, funding_info=funding_info, instrument_info=data.instrument_info
+                )
             signal_analysis_times.append(time.time() - signal_start)
             
             if signal:
@@ -176,15 +264,16 @@ class BacktestEngine:
                 if signals_found == 1 and 'trend_reason' in signal:
                     strategy_type = signal.get('strategy', 'BASIC')
                     confidence = signal.get('confidence', 60)
-                    print(f"\n    📊 전략: {strategy_type} (신뢰도 {confidence}점)")
-                    print(f"       {signal['trend_reason']}")
-                    print(f"       BTC: {signal['btc_trend']['trend']} ({signal['btc_trend']['price_change_pct']:.2f}%)")
-                    print(f"       코인: {signal['coin_trend']['trend']} ({signal['coin_trend']['price_change_pct']:.2f}%)")
+                    logger.info(f"\n    📊 전략: {strategy_type} (신뢰도 {confidence}점)")
+                    logger.info(f"       {signal['trend_reason']}")
+                    logger.info(f"       BTC: {signal['btc_trend']['trend']} ({signal['btc_trend']['price_change_pct']:.2f}%)")
+                    logger.info(f"       코인: {signal['coin_trend']['trend']} ({signal['coin_trend']['price_change_pct']:.2f}%)")
                     if 'funding_info' in signal:
-                        print(f"       펀딩비: {signal['funding_info']['sentiment']} ({signal['funding_info']['funding_rate_pct']:.3f}%)")
+                        logger.info(f"       펀딩비: {signal['funding_info']['sentiment']} ({signal['funding_info']['funding_rate_pct']:.3f}%)")
                 
                 # 진입 후 결과 시뮬레이션
-                trade_result = self._simulate_trade(entry_df, i, signal)
+                with stage("simulate_trade"):
+                    trade_result = self._simulate_trade(entry_df, i, signal)
                 
                 if trade_result:
                     # 거래에 추가 정보 기록 (분석용)
@@ -213,33 +302,33 @@ class BacktestEngine:
             timings['avg_signal_analysis'] = 0
             timings['total_signal_analysis'] = 0
         
-        print(f" ✅ {signals_found}개 신호, {trades_completed}개 거래 완료 ({timings['signal_search']:.2f}초)")
+        logger.info(f"    ✅ {signals_found}개 신호, {trades_completed}개 거래 완료 ({timings['signal_search']:.2f}초)")
         
-        # 전체 시간
-        timings['total'] = time.time() - symbol_start
+        # 전체 시간 (조회 + 계산)
+        timings['total'] = time.time() - symbol_start + data.fetch_seconds()
         
         # 시간 통계 저장
         self.timing_stats[symbol] = timings
         
         # 시간 분석 출력
-        print(f"\n⏱️  시간 분석:")
-        print(f"   1. 피보나치 계산: {timings['fibonacci']:.2f}초 ({timings['fibonacci']/timings['total']*100:.1f}%)")
-        print(f"   2. 캔들 데이터 로딩: {timings['load_candles']:.2f}초 ({timings['load_candles']/timings['total']*100:.1f}%)")
-        print(f"   3. BTC 데이터 로딩: {timings['load_btc']:.2f}초 ({timings['load_btc']/timings['total']*100:.1f}%)")
-        print(f"   4. 지표 계산: {timings['indicators']:.2f}초 ({timings['indicators']/timings['total']*100:.1f}%)")
-        print(f"   4.5. BTC 추세 계산: {timings['btc_trend_calc']:.2f}초 ({timings['btc_trend_calc']/timings['total']*100:.1f}%)")
-        print(f"   4.6. 펀딩비 조회: {timings['funding_rate']:.2f}초 ({timings['funding_rate']/timings['total']*100:.1f}%)")
-        print(f"   5. 신호 탐색: {timings['signal_search']:.2f}초 ({timings['signal_search']/timings['total']*100:.1f}%)")
+        logger.info(f"\n⏱️  시간 분석:")
+        logger.info(f"   1. 피보나치 계산: {timings['fibonacci']:.2f}초 ({timings['fibonacci']/timings['total']*100:.1f}%)")
+        logger.info(f"   2. 캔들 데이터 로딩: {timings['load_candles']:.2f}초 ({timings['load_candles']/timings['total']*100:.1f}%)")
+        logger.info(f"   3. BTC 데이터 로딩: {timings['load_btc']:.2f}초 ({timings['load_btc']/timings['total']*100:.1f}%)")
+        logger.info(f"   4. 지표 계산: {timings['indicators']:.2f}초 ({timings['indicators']/timings['total']*100:.1f}%)")
+        logger.info(f"   4.5. BTC 추세 계산: {timings['btc_trend_calc']:.2f}초 ({timings['btc_trend_calc']/timings['total']*100:.1f}%)")
+        logger.info(f"   4.6. 펀딩비 조회: {timings['funding_rate']:.2f}초 ({timings['funding_rate']/timings['total']*100:.1f}%)")
+        logger.info(f"   5. 신호 탐색: {timings['signal_search']:.2f}초 ({timings['signal_search']/timings['total']*100:.1f}%)")
         if signal_analysis_times:
-            print(f"      - 평균 신호 분석: {timings['avg_signal_analysis']*1000:.1f}ms")
-            print(f"      - 총 신호 분석: {timings['total_signal_analysis']:.2f}초")
-        print(f"   📊 전체 시간: {timings['total']:.2f}초")
+            logger.info(f"      - 평균 신호 분석: {timings['avg_signal_analysis']*1000:.1f}ms")
+            logger.info(f"      - 총 신호 분석: {timings['total_signal_analysis']:.2f}초")
+        logger.info(f"   📊 전체 시간: {timings['total']:.2f}초")
         
         if trades_completed > 0:
             symbol_trades = [t for t in self.trades if t['symbol'] == symbol]
             wins = len([t for t in symbol_trades if t['result'] == 'WIN'])
             symbol_pnl = sum([t['net_pnl'] for t in symbol_trades])
-            print(f"    승률: {wins}/{trades_completed} ({wins/trades_completed*100:.1f}%), 수익: ${symbol_pnl:.2f}, 누적 손익: ${self.total_pnl:.2f}")
+            logger.info(f"    승률: {wins}/{trades_completed} ({wins/trades_completed*100:.1f}%), 수익: ${symbol_pnl:.2f}, 누적 손익: ${self.total_pnl:.2f}")
     
     def _simulate_trade(self, df, entry_idx, signal):
         """거래 시뮬레이션 (수수료 포함) - 롱/숏 모두 지원"""
@@ -378,19 +467,19 @@ class BacktestEngine:
     
     def _analyze_failure_patterns(self, df):
         """실패 패턴 분석"""
-        print(f"\n{'='*80}")
-        print("🔍 실패 원인 분석")
-        print(f"{'='*80}\n")
+        logger.info(f"\n{'='*80}")
+        logger.info("🔍 실패 원인 분석")
+        logger.info(f"{'='*80}\n")
         
         losses = df[df['result'] == 'LOSS']
         wins = df[df['result'] == 'WIN']
         
         if losses.empty:
-            print("손실 거래가 없습니다!")
+            logger.info("손실 거래가 없습니다!")
             return
         
         # 1. 전략별 성과
-        print("📊 전략별 성과:")
+        logger.info("📊 전략별 성과:")
         if 'strategy' in df.columns:
             strategy_stats = df.groupby('strategy').agg({
                 'net_pnl': ['count', 'sum'],
@@ -398,10 +487,10 @@ class BacktestEngine:
             })
             strategy_stats.columns = ['거래수', '총수익', '승리수']
             strategy_stats['승률%'] = (strategy_stats['승리수'] / strategy_stats['거래수'] * 100).round(2)
-            print(strategy_stats.to_string())
+            logger.info(strategy_stats.to_string())
         
         # 2. BTC 추세별 성과
-        print(f"\n📊 BTC 추세별 성과:")
+        logger.info(f"\n📊 BTC 추세별 성과:")
         if 'btc_trend' in df.columns:
             btc_stats = df.groupby('btc_trend').agg({
                 'net_pnl': ['count', 'sum'],
@@ -409,10 +498,10 @@ class BacktestEngine:
             })
             btc_stats.columns = ['거래수', '총수익', '승리수']
             btc_stats['승률%'] = (btc_stats['승리수'] / btc_stats['거래수'] * 100).round(2)
-            print(btc_stats.to_string())
+            logger.info(btc_stats.to_string())
         
         # 3. 코인 추세별 성과
-        print(f"\n📊 코인 추세별 성과:")
+        logger.info(f"\n📊 코인 추세별 성과:")
         if 'coin_trend' in df.columns:
             coin_stats = df.groupby('coin_trend').agg({
                 'net_pnl': ['count', 'sum'],
@@ -420,10 +509,10 @@ class BacktestEngine:
             })
             coin_stats.columns = ['거래수', '총수익', '승리수']
             coin_stats['승률%'] = (coin_stats['승리수'] / coin_stats['거래수'] * 100).round(2)
-            print(coin_stats.to_string())
+            logger.info(coin_stats.to_string())
         
         # 4. 포지션 타입 × 추세 조합
-        print(f"\n📊 포지션 타입 × 코인 추세 조합:")
+        logger.info(f"\n📊 포지션 타입 × 코인 추세 조합:")
         if 'type' in df.columns and 'coin_trend' in df.columns:
             combo_stats = df.groupby(['type', 'coin_trend']).agg({
                 'net_pnl': ['count', 'sum'],
@@ -431,10 +520,10 @@ class BacktestEngine:
             })
             combo_stats.columns = ['거래수', '총수익', '승리수']
             combo_stats['승률%'] = (combo_stats['승리수'] / combo_stats['거래수'] * 100).round(2)
-            print(combo_stats.to_string())
+            logger.info(combo_stats.to_string())
         
         # 5. 신뢰도별 성과
-        print(f"\n📊 신뢰도별 성과:")
+        logger.info(f"\n📊 신뢰도별 성과:")
         if 'confidence' in df.columns:
             df['confidence_range'] = pd.cut(df['confidence'], bins=[0, 70, 80, 90, 100], 
                                            labels=['60-70', '70-80', '80-90', '90-100'])
@@ -444,10 +533,10 @@ class BacktestEngine:
             })
             conf_stats.columns = ['거래수', '총수익', '승리수']
             conf_stats['승률%'] = (conf_stats['승리수'] / conf_stats['거래수'] * 100).round(2)
-            print(conf_stats.to_string())
+            logger.info(conf_stats.to_string())
         
         # 6. 펀딩비 감정별 성과
-        print(f"\n📊 펀딩비 감정별 성과:")
+        logger.info(f"\n📊 펀딩비 감정별 성과:")
         if 'funding_sentiment' in df.columns:
             funding_stats = df.groupby('funding_sentiment').agg({
                 'net_pnl': ['count', 'sum'],
@@ -455,10 +544,10 @@ class BacktestEngine:
             })
             funding_stats.columns = ['거래수', '총수익', '승리수']
             funding_stats['승률%'] = (funding_stats['승리수'] / funding_stats['거래수'] * 100).round(2)
-            print(funding_stats.to_string())
+            logger.info(funding_stats.to_string())
         
         # 7. 보유 시간별 성과
-        print(f"\n📊 보유 시간별 성과:")
+        logger.info(f"\n📊 보유 시간별 성과:")
         df['hold_time_range'] = pd.cut(df['bars_held'], bins=[0, 5, 10, 20, 50, 1000], 
                                        labels=['1-5분', '6-10분', '11-20분', '21-50분', '50분+'])
         hold_stats = df.groupby('hold_time_range').agg({
@@ -467,32 +556,32 @@ class BacktestEngine:
         })
         hold_stats.columns = ['거래수', '총수익', '승리수']
         hold_stats['승률%'] = (hold_stats['승리수'] / hold_stats['거래수'] * 100).round(2)
-        print(hold_stats.to_string())
+        logger.info(hold_stats.to_string())
         
         # 8. 주요 실패 패턴 요약
-        print(f"\n💡 주요 인사이트:")
+        logger.info(f"\n💡 주요 인사이트:")
         
         # 가장 성과 좋은 조합
         if 'type' in df.columns and 'coin_trend' in df.columns:
             best_combo = df.groupby(['type', 'coin_trend'])['net_pnl'].sum().idxmax()
             best_pnl = df.groupby(['type', 'coin_trend'])['net_pnl'].sum().max()
-            print(f"  ✅ 최고 조합: {best_combo[0]} × {best_combo[1]} (수익: ${best_pnl:.2f})")
+            logger.info(f"  ✅ 최고 조합: {best_combo[0]} × {best_combo[1]} (수익: ${best_pnl:.2f})")
         
         # 가장 성과 나쁜 조합
         if 'type' in df.columns and 'coin_trend' in df.columns:
             worst_combo = df.groupby(['type', 'coin_trend'])['net_pnl'].sum().idxmin()
             worst_pnl = df.groupby(['type', 'coin_trend'])['net_pnl'].sum().min()
-            print(f"  ❌ 최악 조합: {worst_combo[0]} × {worst_combo[1]} (손실: ${worst_pnl:.2f})")
+            logger.info(f"  ❌ 최악 조합: {worst_combo[0]} × {worst_combo[1]} (손실: ${worst_pnl:.2f})")
         
         # BTC 추세 영향
         if 'btc_trend' in df.columns:
             btc_impact = df.groupby('btc_trend')['net_pnl'].sum()
             best_btc = btc_impact.idxmax()
-            print(f"  📈 BTC 추세: {best_btc} 일 때 가장 좋음 (${btc_impact[best_btc]:.2f})")
+            logger.info(f"  📈 BTC 추세: {best_btc} 일 때 가장 좋음 (${btc_impact[best_btc]:.2f})")
         
         # 최적 보유 시간
         optimal_hold = df.groupby('hold_time_range')['net_pnl'].sum().idxmax()
-        print(f"  ⏱️  최적 보유 시간: {optimal_hold}")
+        logger.info(f"  ⏱️  최적 보유 시간: {optimal_hold}")
         
         # 신뢰도 임계값 제안
         if 'confidence' in df.columns:
@@ -501,18 +590,18 @@ class BacktestEngine:
                 if len(high_conf) > 0:
                     win_rate = (high_conf['result'] == 'WIN').sum() / len(high_conf) * 100
                     total_pnl = high_conf['net_pnl'].sum()
-                    print(f"  🎯 신뢰도 {threshold}+ : 승률 {win_rate:.1f}%, 수익 ${total_pnl:.2f} ({len(high_conf)}개 거래)")
+                    logger.info(f"  🎯 신뢰도 {threshold}+ : 승률 {win_rate:.1f}%, 수익 ${total_pnl:.2f} ({len(high_conf)}개 거래)")
     
     def _print_results(self):
         """백테스팅 결과 출력"""
-        print(f"\n{'='*80}")
-        print("백테스팅 결과 요약")
-        print(f"{'='*80}\n")
+        logger.info(f"\n{'='*80}")
+        logger.info("백테스팅 결과 요약")
+        logger.info(f"{'='*80}\n")
         
         # 시간 통계 출력
         if self.timing_stats:
-            print(f"⏱️  전체 시간 분석")
-            print(f"{'='*80}")
+            logger.info(f"⏱️  전체 시간 분석")
+            logger.info(f"{'='*80}")
             
             total_time = sum(t['total'] for t in self.timing_stats.values())
             avg_time = total_time / len(self.timing_stats)
@@ -526,17 +615,17 @@ class BacktestEngine:
             avg_funding = sum(t['funding_rate'] for t in self.timing_stats.values()) / len(self.timing_stats)
             avg_signal_search = sum(t['signal_search'] for t in self.timing_stats.values()) / len(self.timing_stats)
             
-            print(f"\n코인당 평균 시간: {avg_time:.2f}초")
-            print(f"  1. 피보나치 계산: {avg_fibonacci:.2f}초 ({avg_fibonacci/avg_time*100:.1f}%)")
-            print(f"  2. 캔들 데이터 로딩: {avg_load_candles:.2f}초 ({avg_load_candles/avg_time*100:.1f}%)")
-            print(f"  3. BTC 데이터 로딩: {avg_load_btc:.2f}초 ({avg_load_btc/avg_time*100:.1f}%)")
-            print(f"  4. 지표 계산: {avg_indicators:.2f}초 ({avg_indicators/avg_time*100:.1f}%)")
-            print(f"  4.5. BTC 추세 계산: {avg_btc_trend:.2f}초 ({avg_btc_trend/avg_time*100:.1f}%)")
-            print(f"  4.6. 펀딩비 조회: {avg_funding:.2f}초 ({avg_funding/avg_time*100:.1f}%)")
-            print(f"  5. 신호 탐색: {avg_signal_search:.2f}초 ({avg_signal_search/avg_time*100:.1f}%)")
+            logger.info(f"\n코인당 평균 시간: {avg_time:.2f}초")
+            logger.info(f"  1. 피보나치 계산: {avg_fibonacci:.2f}초 ({avg_fibonacci/avg_time*100:.1f}%)")
+            logger.info(f"  2. 캔들 데이터 로딩: {avg_load_candles:.2f}초 ({avg_load_candles/avg_time*100:.1f}%)")
+            logger.info(f"  3. BTC 데이터 로딩: {avg_load_btc:.2f}초 ({avg_load_btc/avg_time*100:.1f}%)")
+            logger.info(f"  4. 지표 계산: {avg_indicators:.2f}초 ({avg_indicators/avg_time*100:.1f}%)")
+            logger.info(f"  4.5. BTC 추세 계산: {avg_btc_trend:.2f}초 ({avg_btc_trend/avg_time*100:.1f}%)")
+            logger.info(f"  4.6. 펀딩비 조회: {avg_funding:.2f}초 ({avg_funding/avg_time*100:.1f}%)")
+            logger.info(f"  5. 신호 탐색: {avg_signal_search:.2f}초 ({avg_signal_search/avg_time*100:.1f}%)")
             
-            print(f"\n총 백테스팅 시간: {total_time:.2f}초 ({total_time/60:.1f}분)")
-            print(f"코인 수: {len(self.timing_stats)}개")
+            logger.info(f"\n총 백테스팅 시간: {total_time:.2f}초 ({total_time/60:.1f}분)")
+            logger.info(f"코인 수: {len(self.timing_stats)}개")
             
             # 가장 느린 단계 찾기
             slowest_step = max([
@@ -549,12 +638,12 @@ class BacktestEngine:
                 ('신호 탐색', avg_signal_search)
             ], key=lambda x: x[1])
             
-            print(f"\n🐌 가장 느린 단계: {slowest_step[0]} ({slowest_step[1]:.2f}초, {slowest_step[1]/avg_time*100:.1f}%)")
+            logger.info(f"\n🐌 가장 느린 단계: {slowest_step[0]} ({slowest_step[1]:.2f}초, {slowest_step[1]/avg_time*100:.1f}%)")
             
-            print(f"{'='*80}\n")
+            logger.info(f"{'='*80}\n")
         
         if not self.trades:
-            print("거래 없음")
+            logger.info("거래 없음")
             return
         
         df = pd.DataFrame(self.trades)
@@ -578,28 +667,28 @@ class BacktestEngine:
         target_achieved = len(profitable_trades)
         target_rate = (target_achieved / total_trades * 100) if total_trades > 0 else 0
         
-        print(f"📊 거래 통계")
-        print(f"  총 거래 수: {total_trades}")
-        print(f"  승리: {wins} | 패배: {losses}")
-        print(f"  승률: {win_rate:.2f}%")
-        print(f"  평균 보유 시간: {df['bars_held'].mean():.1f} 봉 ({df['bars_held'].mean() * int(Config.ENTRY_TIMEFRAME):.0f}분)")
-        
-        print(f"\n💰 수익 통계")
-        print(f"  총 수익 (수수료 전): ${total_gross_pnl:.2f}")
-        print(f"  총 수수료: ${total_fees:.2f}")
-        print(f"  순수익: ${total_net_pnl:.2f}")
-        print(f"  평균 승리 수익: ${avg_win:.2f}")
-        print(f"  평균 손실: ${avg_loss:.2f}")
-        
-        print(f"\n🎯 목표 달성")
-        print(f"  ${Config.MIN_PROFIT_TARGET} 이상 수익 거래: {target_achieved}/{total_trades} ({target_rate:.2f}%)")
-        
-        print(f"\n💵 손익 결과")
-        print(f"  거래당 투자금: ${Config.POSITION_SIZE}")
-        print(f"  총 거래 수: {total_trades}")
-        print(f"  총 투자금 (가상): ${Config.POSITION_SIZE * total_trades:.2f}")
-        print(f"  누적 손익: ${total_net_pnl:.2f}")
-        print(f"  손익률: {(total_net_pnl / (Config.POSITION_SIZE * total_trades) * 100):.2f}%" if total_trades > 0 else "  손익률: 0.00%")
+        logger.info(f"📊 거래 통계")
+        logger.info(f"  총 거래 수: {total_trades}")
+        logger.info(f"  승리: {wins} | 패배: {losses}")
+        logger.info(f"  승률: {win_rate:.2f}%")
+        logger.info(f"  평균 보유 시간: {df['bars_held'].mean():.1f} 봉 ({df['bars_held'].mean() * int(Config.ENTRY_TIMEFRAME):.0f}분)")
+        
+        logger.info(f"\n💰 수익 통계")
+        logger.info(f"  총 수익 (수수료 전): ${total_gross_pnl:.2f}")
+        logger.info(f"  총 수수료: ${total_fees:.2f}")
+        logger.info(f"  순수익: ${total_net_pnl:.2f}")
+        logger.info(f"  평균 승리 수익: ${avg_win:.2f}")
+        logger.info(f"  평균 손실: ${avg_loss:.2f}")
+        
+        logger.info(f"\n🎯 목표 달성")
+        logger.info(f"  ${Config.MIN_PROFIT_TARGET} 이상 수익 거래: {target_achieved}/{total_trades} ({target_rate:.2f}%)")
+        
+        logger.info(f"\n💵 손익 결과")
+        logger.info(f"  거래당 투자금: ${Config.POSITION_SIZE}")
+        logger.info(f"  총 거래 수: {total_trades}")
+        logger.info(f"  총 투자금 (가상): ${Config.POSITION_SIZE * total_trades:.2f}")
+        logger.info(f"  누적 손익: ${total_net_pnl:.2f}")
+        logger.info(f"  손익률: {(total_net_pnl / (Config.POSITION_SIZE * total_trades) * 100):.2f}%" if total_trades > 0 else "  손익률: 0.00%")
         
         # 롱/숏 통계
         if 'type' in df.columns:
@@ -608,11 +697,11 @@ class BacktestEngine:
             long_wins = len(df[(df['type'] == 'LONG') & (df['result'] == 'WIN')])
             short_wins = len(df[(df['type'] == 'SHORT') & (df['result'] == 'WIN')])
             
-            print(f"\n📊 포지션 타입별 통계")
-            print(f"  롱 포지션: {long_trades}개 (승률 {long_wins/long_trades*100:.1f}%)" if long_trades > 0 else "  롱 포지션: 0개")
-            print(f"  숏 포지션: {short_trades}개 (승률 {short_wins/short_trades*100:.1f}%)" if short_trades > 0 else "  숏 포지션: 0개")
+            logger.info(f"\n📊 포지션 타입별 통계")
+            logger.info(f"  롱 포지션: {long_trades}개 (승률 {long_wins/long_trades*100:.1f}%)" if long_trades > 0 else "  롱 포지션: 0개")
+            logger.info(f"  숏 포지션: {short_trades}개 (승률 {short_wins/short_trades*100:.1f}%)" if short_trades > 0 else "  숏 포지션: 0개")
         
-        print(f"\n📋 전체 거래 내역:")
+        logger.info(f"\n📋 전체 거래 내역:")
         display_df = df[['symbol', 'type', 'entry_time', 'exit_time', 'entry_price', 'exit_price', 
                          'net_pnl', 'fees', 'result', 'bars_held']] if 'type' in df.columns else \
                     df[['symbol', 'entry_time', 'exit_time', 'entry_price', 'exit_price', 
@@ -621,32 +710,32 @@ class BacktestEngine:
         # CSV 파일로 저장
         csv_filename = f"backtest_trades_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         df.to_csv(csv_filename, index=False)
-        print(f"거래 내역이 {csv_filename}에 저장되었습니다.")
+        logger.info(f"거래 내역이 {csv_filename}에 저장되었습니다.")
         
         # 화면에는 요약만 출력
-        print(f"\n승리 거래 (최근 10개):")
+        logger.info(f"\n승리 거래 (최근 10개):")
         wins = df[df['result'] == 'WIN'].tail(10)
         if not wins.empty:
             cols = ['symbol', 'type', 'entry_time', 'entry_price', 'exit_price', 'net_pnl', 'bars_held'] if 'type' in wins.columns else \
                    ['symbol', 'entry_time', 'entry_price', 'exit_price', 'net_pnl', 'bars_held']
-            print(wins[cols].to_string(index=False))
+            logger.info(wins[cols].to_string(index=False))
         
-        print(f"\n손실 거래 (최근 10개):")
+        logger.info(f"\n손실 거래 (최근 10개):")
         losses = df[df['result'] == 'LOSS'].tail(10)
         if not losses.empty:
             cols = ['symbol', 'type', 'entry_time', 'entry_price', 'exit_price', 'net_pnl', 'bars_held'] if 'type' in losses.columns else \
                    ['symbol', 'entry_time', 'entry_price', 'exit_price', 'net_pnl', 'bars_held']
-            print(losses[cols].to_string(index=False))
+            logger.info(losses[cols].to_string(index=False))
         
         # 심볼별 통계
-        print(f"\n📈 심볼별 성과:")
+        logger.info(f"\n📈 심볼별 성과:")
         symbol_stats = df.groupby('symbol').agg({
             'net_pnl': ['count', 'sum', 'mean'],
             'result': lambda x: (x == 'WIN').sum()
         }).round(2)
         symbol_stats.columns = ['거래수', '총수익', '평균수익', '승리수']
         symbol_stats['승률%'] = (symbol_stats['승리수'] / symbol_stats['거래수'] * 100).round(2)
-        print(symbol_stats.to_string())
+        logger.info(symbol_stats.to_string())
         
         # === 실패 원인 분석 ===
         self._analyze_failure_patterns(df)
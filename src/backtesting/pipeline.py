@@ -0,0 +1,145 @@
+"""
+Backtest Pipeline
+조회(I/O) / 계산(CPU) / 저장(I/O) 단계를 겹쳐 실행하는 태스크 파이프라인 (Analyzer 파이프라인 모드)
+
+    pipeline = BacktestPipeline(prefetch, compute, write, finish, depth=4)
+    pipeline.start()
+    pipeline.submit(task)            # 버퍼가 차면 대기 (RabbitMQ prefetch_count = depth + 1로 맞추면 대기 없음)
+    ...
+    pipeline.stop()
+
+    prefetch(task) → data            조회 스레드 depth개 (다음 태스크들의 시장 데이터를 미리 조회)
+    compute(task, data) → result     계산 스레드 1개 (도착 순서대로, 엔진 상태 공유 가능)
+    write(task, result)              저장 스레드 1개 (계산 스레드는 저장을 기다리지 않음)
+    finish(task, error)              태스크마다 1회 (저장까지 성공하면 error=None, 실패한 단계의 예외)
+
+- 단계 사이 버퍼는 모두 크기 제한: 조회 대기/완료 depth개, 저장 대기 write_buffer개 → 메모리 일정
+- 계산 스레드가 데이터를 기다린 시간(wait)이 0에 가까우면 계산 한계 처리량
+- 주기마다 "📊 {name}.pipeline 60s: tasks .., compute_ms .., wait_ms .., ..." 한 줄 (structured_log 카운터)
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.utils import structured_log
+
+logger = structured_log.get_logger(__name__)
+
+_STOP = object()
+
+
+class BacktestPipeline:
+    """prefetch → compute → write 3단계 파이프라인"""
+
+    def __init__(self, prefetch: Callable[[Any], Any], compute: Callable[[Any, Any], Any],
+                 write: Callable[[Any, Any], None], finish: Callable[[Any, Optional[BaseException]], None],
+                 depth: int = 4, write_buffer: Optional[int] = None, name: str = "analyzer"):
+        """
+        Args:
+            prefetch / compute / write / finish: 단계 함수 (모듈 docstring)
+            depth: 미리 조회할 태스크 수 (조회 스레드 수)
+            write_buffer: 저장 대기 최대 수 (기본 depth, 가득 차면 계산 스레드 대기)
+            name: 스레드 / 카운터 이름
+        """
+        self.prefetch = prefetch
+        self.compute = compute
+        self.write = write
+        self.finish = finish
+        self.depth = max(1, depth)
+        self.name = name
+        self.pending: queue.Queue = queue.Queue(maxsize=self.depth)  # (task, future) 도착 순서
+        self.writes: queue.Queue = queue.Queue(maxsize=max(1, write_buffer or self.depth))
+        self.fetch_pool: Optional[ThreadPoolExecutor] = None
+        self.threads = []
+        self.counts = structured_log.counters(f"{name}.pipeline")
+
+    def start(self):
+        self.fetch_pool = ThreadPoolExecutor(max_workers=self.depth, thread_name_prefix=f"{self.name}-prefetch")
+        self.threads = [
+            threading.Thread(target=self._compute_loop, name=f"{self.name}-compute", daemon=True),
+            threading.Thread(target=self._write_loop, name=f"{self.name}-write", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, task):
+        """태스크 추가 - 바로 조회 시작 (조회 대기/완료 버퍼가 차면 대기)"""
+        self.pending.put((task, self.fetch_pool.submit(self._timed_prefetch, task)))
+
+    def _timed_prefetch(self, task):
+        started = time.perf_counter()
+        try:
+            return self.prefetch(task)
+        finally:
+            self.counts.incr("fetch_ms", int((time.perf_counter() - started) * 1000))
+
+    def _compute_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is _STOP:
+                self.writes.put(_STOP)
+                return
+            task, future = item
+
+            started = time.perf_counter()
+            try:
+                data = future.result()
+            except Exception as e:
+                self._fail(task, e, "prefetch")
+                continue
+            waited = time.perf_counter() - started
+
+            try:
+                result = self.compute(task, data)
+            except Exception as e:
+                self._fail(task, e, "compute")
+                continue
+            self.counts.incr("wait_ms", int(waited * 1000))
+            self.counts.incr("compute_ms", int((time.perf_counter() - started - waited) * 1000))
+
+            self.writes.put((task, result))
+
+    def _write_loop(self):
+        while True:
+            item = self.writes.get()
+            if item is _STOP:
+                return
+            task, result = item
+
+            started = time.perf_counter()
+            try:
+                self.write(task, result)
+            except Exception as e:
+                self._fail(task, e, "write")
+                continue
+            self.counts.incr("write_ms", int((time.perf_counter() - started) * 1000))
+            self.counts.incr("tasks")
+            self._finish(task, None)
+
+    def _fail(self, task, error: BaseException, stage: str):
+        logger.error(f"❌ 파이프라인 {stage} 실패: {error}")
+        self.counts.incr(f"{stage}_failed")
+        self._finish(task, error)
+
+    def _finish(self, task, error: Optional[BaseException]):
+        try:
+            self.finish(task, error)
+        except Exception as e:
+            logger.exception(f"❌ 파이프라인 완료 처리 실패: {e}")
+
+    def stop(self, timeout: float = 30.0):
+        """진행 중인 태스크(조회 대기 포함)를 끝까지 처리하고 종료 (timeout초까지 대기)"""
+        if self.fetch_pool is None:
+            return
+        try:
+            self.pending.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"⚠️  파이프라인 종료 대기 시간 초과 ({self.name})")
+            return
+        deadline = time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self.fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self.fetch_pool = None
@@ -5,8 +5,8 @@ import pandas as pd
 import sys
 
 class VolatilityScanner:
-    def __init__(self):
-        self.client = BybitClient()
+    def __init__(self, client=None):
+        self.client = client or BybitClient()
     
     def scan_coins(self):
         """거래량과 변동성 기준으로 코인 스캔 (Bybit API 티커 데이터 활용)"""
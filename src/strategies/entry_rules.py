@@ -0,0 +1,467 @@
+"""
+진입 판단 규칙 (지표 계산과 분리된 순수 함수)
+
+EntryStrategy.analyze_entry (DataFrame 일괄 계산)와 StreamingEntryEvaluator (봉 단위 증분 계산)가
+같은 규칙과 같은 신호 dict를 공유한다. 설정은 ``config`` 인자로 받는다
+(BB_PERIOD, FIB_TOLERANCE, STOP_LOSS_PERCENT, TAKE_PROFIT_PERCENT, POSITION_SIZE,
+LEVERAGE, TAKER_FEE, MIN_PROFIT_TARGET 속성이 있는 객체).
+
+``latest`` / ``prev``는 open, high, low, close, timestamp, rsi, bb_upper, bb_lower, bb_width 키를 가진
+pandas Series 또는 dict.
+"""
+from src.utils.indicators import Indicators
+from src.utils.trend_analyzer import TrendAnalyzer
+from src.utils.advanced_signal_analyzer import AdvancedSignalAnalyzer
+from src.utils import structured_log
+
+logger = structured_log.get_logger(__name__)
+
+
+def evaluate_entry(latest, prev, ma_5, ma_20, mtf_fib, btc_trend, coin_trend, funding_info,
+                   symbol, instrument_info, config):
+    """진입 신호 판단 (고급 분석 → 기본 전략 순)
+
+    Args:
+        ma_5, ma_20: 진입 타임프레임 종가 이동평균 (데이터 부족 시 None)
+
+    Returns:
+        신호 dict 또는 None
+    """
+    # 🔥 피보나치 레벨 통합 (모든 타임프레임)
+    all_fib_levels = {}
+    for timeframe, fib_data in mtf_fib.items():
+        all_fib_levels.update(fib_data['levels'])
+    
+    # === 고급 분석 1: 하락 추세 중 숏 진입 ===
+    if coin_trend['trend'] == 'DOWNTREND':
+        can_enter, reason, confidence = AdvancedSignalAnalyzer.should_enter_short_on_downtrend(
+            latest['close'], all_fib_levels, btc_trend, coin_trend, 
+            funding_info, latest['rsi']
+        )
+        if can_enter and confidence >= 80:  # 70 → 80 (더 엄격)
+            return create_short_signal(
+                latest, prev, mtf_fib, btc_trend, coin_trend, 
+                funding_info, reason, confidence, symbol, instrument_info, config
+            )
+    
+    # === 고급 분석 2: 상승 추세 중 롱 진입 ===
+    if coin_trend['trend'] == 'UPTREND':
+        can_enter, reason, confidence = AdvancedSignalAnalyzer.should_enter_long_on_uptrend(
+            latest['close'], all_fib_levels, btc_trend, coin_trend, 
+            funding_info, latest['rsi']
+        )
+        if can_enter and confidence >= 80:  # 70 → 80 (더 엄격)
+            return create_long_signal(
+                latest, prev, mtf_fib, btc_trend, coin_trend, 
+                funding_info, reason, confidence, symbol, instrument_info, config
+            )
+    
+    # === 고급 분석 3: 지지선 근처 반등 노리기 ===
+    bb_position = (latest['close'] - latest['bb_lower']) / (latest['bb_upper'] - latest['bb_lower'])
+    can_enter, reason, confidence = AdvancedSignalAnalyzer.should_enter_long_at_support(
+        latest['close'], all_fib_levels, btc_trend, coin_trend, 
+        funding_info, latest['rsi'], bb_position
+    )
+    if can_enter and confidence >= 85:  # 75 → 85 (더 엄격)
+        return create_long_signal(
+            latest, prev, mtf_fib, btc_trend, coin_trend, 
+            funding_info, reason, confidence, symbol, instrument_info, config
+        )
+    
+    # === 기본 전략 (기존 로직) ===
+    # 롱 신호 체크
+    long_signal = check_long_signal(latest, prev, ma_5, ma_20, mtf_fib, instrument_info, config)
+    if long_signal:
+        # 추세 필터 적용
+        can_enter, reason = TrendAnalyzer.should_enter_long(btc_trend, coin_trend)
+        if can_enter:
+            long_signal['symbol'] = symbol
+            long_signal['btc_trend'] = btc_trend
+            long_signal['coin_trend'] = coin_trend
+            long_signal['funding_info'] = funding_info
+            long_signal['trend_reason'] = reason
+            long_signal['confidence'] = 60  # 기본 신뢰도
+            return long_signal
+    
+    # 숏 신호 체크
+    short_signal = check_short_signal(latest, prev, ma_5, ma_20, mtf_fib, instrument_info, config)
+    if short_signal:
+        # 추세 필터 적용
+        can_enter, reason = TrendAnalyzer.should_enter_short(btc_trend, coin_trend)
+        if can_enter:
+            short_signal['symbol'] = symbol
+            short_signal['btc_trend'] = btc_trend
+            short_signal['coin_trend'] = coin_trend
+            short_signal['funding_info'] = funding_info
+            short_signal['trend_reason'] = reason
+            short_signal['confidence'] = 60  # 기본 신뢰도
+            return short_signal
+        
+    return None
+
+
+def check_long_signal(latest, prev, ma_5, ma_20, mtf_fib, instrument_info, config):
+    """롱 진입 신호 확인 (개선된 전략 - 추세 확인 + 반등 확인)"""
+    current_price = latest['close']
+    tick_size = instrument_info['tick_size']
+    price_decimals = instrument_info['price_decimals']
+    
+    # 조건 1: 볼린저 밴드 - 하단 근처
+    bb_lower_break = current_price <= latest['bb_lower'] * 1.015  # 1.5% 이내
+    bb_width_ok = latest['bb_width'] > 1.5  # 변동성 최소 기준
+    
+    # 조건 2: RSI - 과매도 구간에서 반등 확인 (개선!)
+    rsi_oversold = latest['rsi'] < 35  # 35 미만 (더 엄격)
+    rsi_bouncing = latest['rsi'] > prev['rsi']  # RSI 상승 중 (반등 확인!)
+    rsi_signal = rsi_oversold and rsi_bouncing
+    
+    # 조건 3: 추세 필터 - 이동평균선 확인 (신규!)
+    if ma_20 is not None:
+        uptrend = ma_5 > ma_20  # 상승 추세
+    else:
+        uptrend = True  # 데이터 부족시 통과
+    
+    # 조건 4: 멀티 타임프레임 피보나치 - 최소 1개 이상의 타임프레임에서 지지
+    fib_supports = []
+    
+    for timeframe, fib_data in mtf_fib.items():
+        is_near, level_name, level_price = Indicators.is_near_fibonacci_level(
+            current_price, 
+            fib_data['levels'], 
+            config.FIB_TOLERANCE
+        )
+        if is_near:
+            fib_supports.append({
+                'timeframe': timeframe,
+                'level': level_name,
+                'price': level_price
+            })
+    
+    # 최소 1개 타임프레임에서 지지 필요
+    fib_signal = len(fib_supports) >= 1
+    
+    # 조건 5: 강한 반등 신호 (개선!)
+    strong_bounce = (
+        latest['close'] > prev['low'] and  # 이전 저점보다 높음
+        latest['close'] > latest['open'] and  # 양봉
+        (latest['close'] - latest['open']) / latest['open'] > 0.002  # 최소 0.2% 상승
+    )
+    
+    # 조건 6: 캔들 패턴 - 해머 패턴 확인 (신규!)
+    body = abs(latest['close'] - latest['open'])
+    lower_shadow = min(latest['open'], latest['close']) - latest['low']
+    upper_shadow = latest['high'] - max(latest['open'], latest['close'])
+    
+    is_hammer = (
+        lower_shadow > body * 2 and  # 아래 꼬리가 몸통의 2배 이상
+        upper_shadow < body * 0.5  # 위 꼬리가 작음
+    )
+    
+    # 진입 조건 (개선!):
+    # (볼린저 밴드 AND 변동성) AND 
+    # (RSI 반등 OR 피보나치) AND 
+    # 상승 추세 AND 
+    # (강한 반등 OR 해머 패턴)
+    if bb_lower_break and bb_width_ok and (rsi_signal or fib_signal) and uptrend and (strong_bounce or is_hammer):
+        entry_price = current_price
+        
+        # 레버리지 적용된 손익 계산
+        stop_loss_pct = config.STOP_LOSS_PERCENT / 100
+        take_profit_pct = config.TAKE_PROFIT_PERCENT / 100
+        
+        # tickSize에 맞게 가격 반올림
+        rounded_entry = round(entry_price / tick_size) * tick_size
+        rounded_stop = round((entry_price * (1 - stop_loss_pct)) / tick_size) * tick_size
+        rounded_take = round((entry_price * (1 + take_profit_pct)) / tick_size) * tick_size
+        
+        stop_loss = round(rounded_stop, price_decimals)
+        take_profit = round(rounded_take, price_decimals)
+        entry_price = round(rounded_entry, price_decimals)
+        
+        # 예상 손익 (레버리지 적용)
+        expected_profit = config.POSITION_SIZE * take_profit_pct * config.LEVERAGE
+        expected_loss = config.POSITION_SIZE * stop_loss_pct * config.LEVERAGE
+        
+        # 수수료 계산 (진입 + 청산)
+        entry_fee = config.POSITION_SIZE * config.LEVERAGE * config.TAKER_FEE
+        exit_fee = config.POSITION_SIZE * config.LEVERAGE * config.TAKER_FEE
+        total_fee = entry_fee + exit_fee
+        
+        # 순수익 (수수료 제외)
+        net_profit = expected_profit - total_fee
+        
+        # 최소 수익 조건 확인
+        if net_profit >= config.MIN_PROFIT_TARGET:
+            return {
+                'type': 'LONG',
+                'entry_price': entry_price,
+                'stop_loss': stop_loss,
+                'take_profit': take_profit,
+                'timestamp': latest['timestamp'],
+                'rsi': latest['rsi'],
+                'bb_position': (current_price - latest['bb_lower']) / (latest['bb_upper'] - latest['bb_lower']),
+                'bb_width': latest['bb_width'],
+                'fib_supports': fib_supports,
+                'expected_profit': expected_profit,
+                'expected_loss': expected_loss,
+                'total_fee': total_fee,
+                'net_profit': net_profit,
+                'position_size': config.POSITION_SIZE,
+                'leverage': config.LEVERAGE
+            }
+    
+    return None
+
+
+def check_short_signal(latest, prev, ma_5, ma_20, mtf_fib, instrument_info, config):
+    """숏 진입 신호 확인 (롱의 반대 전략)"""
+    current_price = latest['close']
+    tick_size = instrument_info['tick_size']
+    price_decimals = instrument_info['price_decimals']
+    
+    # 조건 1: 볼린저 밴드 - 상단 근처
+    bb_upper_break = current_price >= latest['bb_upper'] * 0.985  # 1.5% 이내
+    bb_width_ok = latest['bb_width'] > 1.5  # 변동성 최소 기준
+    
+    # 조건 2: RSI - 과매수 구간에서 하락 확인
+    rsi_overbought = latest['rsi'] > 65  # 65 초과
+    rsi_falling = latest['rsi'] < prev['rsi']  # RSI 하락 중
+    rsi_signal = rsi_overbought and rsi_falling
+    
+    # 조건 3: 추세 필터 - 이동평균선 확인
+    if ma_20 is not None:
+        downtrend = ma_5 < ma_20  # 하락 추세
+    else:
+        downtrend = True  # 데이터 부족시 통과
+    
+    # 조건 4: 멀티 타임프레임 피보나치 - 최소 1개 이상의 타임프레임에서 저항
+    fib_resistances = []
+    
+    for timeframe, fib_data in mtf_fib.items():
+        is_near, level_name, level_price = Indicators.is_near_fibonacci_level(
+            current_price, 
+            fib_data['levels'], 
+            config.FIB_TOLERANCE
+        )
+        if is_near:
+            fib_resistances.append({
+                'timeframe': timeframe,
+                'level': level_name,
+                'price': level_price
+            })
+    
+    # 최소 1개 타임프레임에서 저항 필요
+    fib_signal = len(fib_resistances) >= 1
+    
+    # 조건 5: 강한 하락 신호
+    strong_drop = (
+        latest['close'] < prev['high'] and  # 이전 고점보다 낮음
+        latest['close'] < latest['open'] and  # 음봉
+        (latest['open'] - latest['close']) / latest['open'] > 0.002  # 최소 0.2% 하락
+    )
+    
+    # 조건 6: 캔들 패턴 - 역해머/슈팅스타 패턴 확인
+    body = abs(latest['close'] - latest['open'])
+    lower_shadow = min(latest['open'], latest['close']) - latest['low']
+    upper_shadow = latest['high'] - max(latest['open'], latest['close'])
+    
+    is_shooting_star = (
+        upper_shadow > body * 2 and  # 위 꼬리가 몸통의 2배 이상
+        lower_shadow < body * 0.5  # 아래 꼬리가 작음
+    )
+    
+    # 진입 조건:
+    # (볼린저 밴드 AND 변동성) AND 
+    # (RSI 하락 OR 피보나치) AND 
+    # 하락 추세 AND 
+    # (강한 하락 OR 슈팅스타 패턴)
+    if bb_upper_break and bb_width_ok and (rsi_signal or fib_signal) and downtrend and (strong_drop or is_shooting_star):
+        entry_price = current_price
+        
+        # 레버리지 적용된 손익 계산 (숏은 반대)
+        stop_loss_pct = config.STOP_LOSS_PERCENT / 100
+        take_profit_pct = config.TAKE_PROFIT_PERCENT / 100
+        
+        # tickSize에 맞게 가격 반올림
+        rounded_entry = round(entry_price / tick_size) * tick_size
+        rounded_stop = round((entry_price * (1 + stop_loss_pct)) / tick_size) * tick_size  # 숏은 위로
+        rounded_take = round((entry_price * (1 - take_profit_pct)) / tick_size) * tick_size  # 숏은 아래로
+        
+        stop_loss = round(rounded_stop, price_decimals)
+        take_profit = round(rounded_take, price_decimals)
+        entry_price = round(rounded_entry, price_decimals)
+        
+        # 예상 손익 (레버리지 적용)
+        expected_profit = config.POSITION_SIZE * take_profit_pct * config.LEVERAGE
+        expected_loss = config.POSITION_SIZE * stop_loss_pct * config.LEVERAGE
+        
+        # 수수료 계산 (진입 + 청산)
+        entry_fee = config.POSITION_SIZE * config.LEVERAGE * config.TAKER_FEE
+        exit_fee = config.POSITION_SIZE * config.LEVERAGE * config.TAKER_FEE
+        total_fee = entry_fee + exit_fee
+        
+        # 순수익 (수수료 제외)
+        net_profit = expected_profit - total_fee
+        
+        # 최소 수익 조건 확인
+        if net_profit >= config.MIN_PROFIT_TARGET:
+            return {
+                'type': 'SHORT',
+                'entry_price': entry_price,
+                'stop_loss': stop_loss,
+                'take_profit': take_profit,
+                'timestamp': latest['timestamp'],
+                'rsi': latest['rsi'],
+                'bb_position': (current_price - latest['bb_lower']) / (latest['bb_upper'] - latest['bb_lower']),
+                'bb_width': latest['bb_width'],
+                'fib_resistances': fib_resistances,
+                'expected_profit': expected_profit,
+                'expected_loss': expected_loss,
+                'total_fee': total_fee,
+                'net_profit': net_profit,
+                'position_size': config.POSITION_SIZE,
+                'leverage': config.LEVERAGE
+            }
+    
+    return None
+
+
+def create_long_signal(latest, prev, mtf_fib, btc_trend, coin_trend,
+                   funding_info, reason, confidence, symbol, instrument_info, config):
+    """롱 신호 생성 (고급 분석용)"""
+    raw_entry_price = latest['close']
+    
+    # 가격이 0이면 에러
+    if raw_entry_price == 0:
+        logger.warning(f"⚠️  {symbol} 진입가가 0입니다 (latest['close'] = 0)")
+        return None
+    
+    # 레버리지 적용된 손익 계산
+    stop_loss_pct = config.STOP_LOSS_PERCENT / 100
+    take_profit_pct = config.TAKE_PROFIT_PERCENT / 100
+    
+    # tickSize에 맞게 가격 반올림
+    tick_size = instrument_info['tick_size']
+    price_decimals = instrument_info['price_decimals']
+    
+    entry_price = round(raw_entry_price / tick_size) * tick_size
+    entry_price = round(entry_price, price_decimals)
+    
+    # 반올림 후에도 0이면 에러
+    if entry_price == 0:
+        logger.warning(f"⚠️  {symbol} 반올림 후 진입가가 0입니다 (raw: {raw_entry_price}, tick: {tick_size})")
+        return None
+    
+    stop_loss = round((entry_price * (1 - stop_loss_pct)) / tick_size) * tick_size
+    stop_loss = round(stop_loss, price_decimals)
+    
+    take_profit = round((entry_price * (1 + take_profit_pct)) / tick_size) * tick_size
+    take_profit = round(take_profit, price_decimals)
+    
+    # 예상 손익 (레버리지 적용)
+    expected_profit = config.POSITION_SIZE * take_profit_pct * config.LEVERAGE
+    expected_loss = config.POSITION_SIZE * stop_loss_pct * config.LEVERAGE
+    
+    # 수수료 계산 (진입 + 청산)
+    entry_fee = config.POSITION_SIZE * config.LEVERAGE * config.TAKER_FEE
+    exit_fee = config.POSITION_SIZE * config.LEVERAGE * config.TAKER_FEE
+    total_fee = entry_fee + exit_fee
+    
+    # 순수익 (수수료 제외)
+    net_profit = expected_profit - total_fee
+    
+    if net_profit >= config.MIN_PROFIT_TARGET:
+        return {
+            'type': 'LONG',
+            'symbol': symbol,
+            'entry_price': entry_price,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'timestamp': latest['timestamp'],
+            'rsi': latest['rsi'],
+            'bb_position': (entry_price - latest['bb_lower']) / (latest['bb_upper'] - latest['bb_lower']),
+            'bb_width': latest['bb_width'],
+            'expected_profit': expected_profit,
+            'expected_loss': expected_loss,
+            'total_fee': total_fee,
+            'net_profit': net_profit,
+            'position_size': config.POSITION_SIZE,
+            'leverage': config.LEVERAGE,
+            'btc_trend': btc_trend,
+            'coin_trend': coin_trend,
+            'funding_info': funding_info,
+            'trend_reason': reason,
+            'confidence': confidence,
+            'strategy': 'ADVANCED'
+        }
+    return None
+
+def create_short_signal(latest, prev, mtf_fib, btc_trend, coin_trend,
+                    funding_info, reason, confidence, symbol, instrument_info, config):
+    """숏 신호 생성 (고급 분석용)"""
+    raw_entry_price = latest['close']
+    
+    # 가격이 0이면 에러
+    if raw_entry_price == 0:
+        logger.warning(f"⚠️  {symbol} 진입가가 0입니다 (latest['close'] = 0)")
+        return None
+    
+    # 레버리지 적용된 손익 계산 (숏은 반대)
+    stop_loss_pct = config.STOP_LOSS_PERCENT / 100
+    take_profit_pct = config.TAKE_PROFIT_PERCENT / 100
+    
+    # tickSize에 맞게 가격 반올림
+    tick_size = instrument_info['tick_size']
+    price_decimals = instrument_info['price_decimals']
+    
+    entry_price = round(raw_entry_price / tick_size) * tick_size
+    entry_price = round(entry_price, price_decimals)
+    
+    # 반올림 후에도 0이면 에러
+    if entry_price == 0:
+        logger.warning(f"⚠️  {symbol} 반올림 후 진입가가 0입니다 (raw: {raw_entry_price}, tick: {tick_size})")
+        return None
+    
+    stop_loss = round((entry_price * (1 + stop_loss_pct)) / tick_size) * tick_size  # 숏은 위로
+    stop_loss = round(stop_loss, price_decimals)
+    
+    take_profit = round((entry_price * (1 - take_profit_pct)) / tick_size) * tick_size  # 숏은 아래로
+    take_profit = round(take_profit, price_decimals)
+    
+    # 예상 손익 (레버리지 적용)
+    expected_profit = config.POSITION_SIZE * take_profit_pct * config.LEVERAGE
+    expected_loss = config.POSITION_SIZE * stop_loss_pct * config.LEVERAGE
+    
+    # 수수료 계산 (진입 + 청산)
+    entry_fee = config.POSITION_SIZE * config.LEVERAGE * config.TAKER_FEE
+    exit_fee = config.POSITION_SIZE * config.LEVERAGE * config.TAKER_FEE
+    total_fee = entry_fee + exit_fee
+    
+    # 순수익 (수수료 제외)
+    net_profit = expected_profit - total_fee
+    
+    if net_profit >= config.MIN_PROFIT_TARGET:
+        return {
+            'type': 'SHORT',
+            'symbol': symbol,
+            'entry_price': entry_price,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'timestamp': latest['timestamp'],
+            'rsi': latest['rsi'],
+            'bb_position': (entry_price - latest['bb_lower']) / (latest['bb_upper'] - latest['bb_lower']),
+            'bb_width': latest['bb_width'],
+            'expected_profit': expected_profit,
+            'expected_loss': expected_loss,
+            'total_fee': total_fee,
+            'net_profit': net_profit,
+            'position_size': config.POSITION_SIZE,
+            'leverage': config.LEVERAGE,
+            'btc_trend': btc_trend,
+            'coin_trend': coin_trend,
+            'funding_info': funding_info,
+            'trend_reason': reason,
+            'confidence': confidence,
+            'strategy': 'ADVANCED'
+        }
+    return None
@@ -0,0 +1,376 @@
+"""
+스트리밍 진입 평가기 - 확정 봉 단위 증분 계산
+
+EntryStrategy.analyze_entry는 매번 1000개 봉을 REST로 받아 전체 지표를 다시 계산한다.
+이 평가기는 Scanner 피드의 확정 봉이 들어올 때마다 심볼별 상태만 갱신하고
+같은 규칙(entry_rules)으로 같은 신호 dict를 만든다.
+
+봉당 비용 (기간은 설정 상수):
+- 볼린저 밴드 / MA5 / MA20 / RSI: 고정 길이 윈도우의 누적 합 (O(1))
+- 코인 추세: 최근 30봉
+- 멀티 타임프레임 피보나치: 타임프레임별 단조 deque 슬라이딩 최고/최저 (분할 상환 O(1))
+- BTC 추세: BTCUSDT 확정 1분봉 60개
+- 펀딩비: 티커 스트림 fundingRate
+
+봉 형식은 Bybit REST kline과 같은 순서: (start_ms, open, high, low, close, volume, turnover)
+"""
+import math
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.indicators import Indicators
+from src.utils.trend_analyzer import TrendAnalyzer
+from src.utils.advanced_signal_analyzer import AdvancedSignalAnalyzer
+from src.strategies import entry_rules
+
+RSI_PERIOD = 14
+COIN_TREND_BARS = 30  # TrendAnalyzer.get_coin_trend 기본값
+BTC_TREND_BARS = 60  # TrendAnalyzer.get_btc_trend 기본값 (1분봉)
+BTC_SYMBOL = "BTCUSDT"
+MAX_FIB_BARS = 1000  # BybitClient.get_klines_for_days 최대 봉 수
+
+UNKNOWN_BTC_TREND = {
+    'trend': 'UNKNOWN',
+    'strength': 0,
+    'price_change_pct': 0,
+    'ma_5': 0,
+    'ma_20': 0
+}
+NEUTRAL_FUNDING = {
+    'funding_rate': 0,
+    'funding_rate_pct': 0,
+    'sentiment': 'NEUTRAL'
+}
+
+
+def interval_minutes(interval: str) -> int:
+    """타임프레임 → 분 (BybitClient._interval_to_minutes와 동일)"""
+    if interval == 'D':
+        return 1440
+    if interval == 'W':
+        return 10080
+    if interval == 'M':
+        return 43200
+    return int(interval)
+
+
+def fib_window_bars(interval: str, days: float) -> int:
+    """FIBONACCI_TIMEFRAMES (interval: days) → 윈도우 봉 수"""
+    return max(1, min(int(days * 1440 / interval_minutes(interval)), MAX_FIB_BARS))
+
+
+class _RollingSum:
+    """고정 길이 윈도우 누적 합 (한 바퀴마다 재계산해 오차 누적 방지)"""
+
+    __slots__ = ("values", "total", "nonzero", "pushes")
+
+    def __init__(self, size: int):
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.nonzero = 0  # 0이 아닌 값 개수 (합이 정확히 0인지 판별)
+        self.pushes = 0
+
+    def push(self, value: float):
+        values = self.values
+        if len(values) == values.maxlen:
+            old = values[0]
+            self.total -= old
+            if old != 0.0:
+                self.nonzero -= 1
+        values.append(value)
+        self.total += value
+        if value != 0.0:
+            self.nonzero += 1
+
+        self.pushes += 1
+        if self.pushes % values.maxlen == 0:
+            self.total = math.fsum(values)
+
+    def full(self) -> bool:
+        return len(self.values) == self.values.maxlen
+
+    def mean(self) -> float:
+        if self.nonzero == 0:
+            return 0.0
+        return self.total / len(self.values)
+
+
+class _Extremes:
+    """최근 size개 봉 최고가/최저가 (단조 deque)"""
+
+    __slots__ = ("size", "count", "highs", "lows", "last_start")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.highs = deque()  # (index, high) 감소 순
+        self.lows = deque()  # (index, low) 증가 순
+        self.last_start = -1
+
+    def push(self, start_ms: int, high: float, low: float):
+        if start_ms <= self.last_start:
+            return  # 중복/역순 (REST 시드와 합성 봉 겹침)
+        self.last_start = start_ms
+
+        index = self.count
+        self.count += 1
+        highs, lows = self.highs, self.lows
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((index, high))
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((index, low))
+
+        expired = index - self.size
+        while highs[0][0] <= expired:
+            highs.popleft()
+        while lows[0][0] <= expired:
+            lows.popleft()
+
+    def levels(self, partial=None) -> Optional[Dict]:
+        """피보나치 데이터 (Indicators.calculate_multi_timeframe_fibonacci 항목과 같은 형식)"""
+        if not self.highs:
+            return None
+        high = self.highs[0][1]
+        low = self.lows[0][1]
+        if partial is not None and partial[0] > self.last_start:
+            high = max(high, partial[2])
+            low = min(low, partial[3])
+        return {
+            'levels': Indicators.calculate_fibonacci_levels(high, low),
+            'high': high,
+            'low': low,
+            'range': high - low
+        }
+
+
+class _SymbolState:
+    """심볼별 진입 타임프레임 지표 상태"""
+
+    __slots__ = (
+        "closes", "closes_sq", "ma_5", "ma_20", "gains", "losses",
+        "recent_closes", "recent_volumes", "ref", "last_close", "prev", "bars",
+        "last_start", "fib"
+    )
+
+    def __init__(self, bb_period: int, fib_windows: Dict[str, int]):
+        self.closes = _RollingSum(bb_period)  # ref 기준 편차 (분산 계산 정밀도)
+        self.closes_sq = _RollingSum(bb_period)
+        self.ma_5 = _RollingSum(5)
+        self.ma_20 = _RollingSum(20)
+        self.gains = _RollingSum(RSI_PERIOD)
+        self.losses = _RollingSum(RSI_PERIOD)
+        self.recent_closes = deque(maxlen=COIN_TREND_BARS)
+        self.recent_volumes = deque(maxlen=COIN_TREND_BARS)
+        self.ref = None
+        self.last_close = None
+        self.prev = None  # 직전 봉 지표 dict
+        self.bars = 0
+        self.last_start = -1
+        self.fib = {interval: _Extremes(size) for interval, size in fib_windows.items()}
+
+
+class StreamingEntryEvaluator:
+    """확정 봉 → 진입 신호 (EntryStrategy.analyze_entry와 같은 규칙/신호 형식)"""
+
+    def __init__(self, config, partial_source: Callable = None):
+        """
+        Args:
+            config: BB_PERIOD, BB_STD, FIBONACCI_TIMEFRAMES, ENTRY_TIMEFRAME 및
+                entry_rules가 요구하는 속성을 가진 설정 객체
+            partial_source: (symbol, interval) → 진행 중 봉 (피보나치 윈도우에 포함, 선택)
+        """
+        self.config = config
+        self.partial_source = partial_source
+        self.entry_interval = str(config.ENTRY_TIMEFRAME)
+        self.fib_windows = {
+            str(interval): fib_window_bars(str(interval), days)
+            for interval, days in config.FIBONACCI_TIMEFRAMES.items()
+        }
+        self.states: Dict[str, _SymbolState] = {}
+        self.funding: Dict[str, Dict] = {}
+        self.btc_closes = deque(maxlen=BTC_TREND_BARS)
+        self.btc_last_start = -1
+        self.btc_trend = UNKNOWN_BTC_TREND
+
+        # 통계
+        self.bars_evaluated = 0
+        self.signals = 0
+
+    def _state(self, symbol: str) -> _SymbolState:
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = _SymbolState(self.config.BB_PERIOD, self.fib_windows)
+        return state
+
+    # ==================== 입력 ====================
+
+    def update_btc(self, bar):
+        """BTCUSDT 확정 1분봉 → 시장 추세 (get_btc_trend와 같은 계산)"""
+        if bar[0] <= self.btc_last_start:
+            return
+        self.btc_last_start = bar[0]
+        closes = self.btc_closes
+        closes.append(bar[4])
+        if len(closes) < 20:
+            self.btc_trend = UNKNOWN_BTC_TREND
+            return
+
+        ma_5 = sum(closes[i] for i in range(-5, 0)) / 5
+        ma_20 = sum(closes[i] for i in range(-20, 0)) / 20
+        price_change_pct = ((closes[-1] - closes[0]) / closes[0]) * 100
+        self.btc_trend = TrendAnalyzer.classify_btc_trend(ma_5, ma_20, price_change_pct)
+
+    def set_funding(self, symbol: str, funding_rate: float):
+        """티커 fundingRate 반영"""
+        self.funding[symbol] = AdvancedSignalAnalyzer.classify_funding(funding_rate)
+
+    def update_fib(self, symbol: str, interval: str, bar):
+        """피보나치 타임프레임 확정 봉 반영"""
+        extremes = self._state(symbol).fib.get(interval)
+        if extremes is not None:
+            extremes.push(bar[0], bar[2], bar[3])
+
+    def seed(self, symbol: str, interval: str, bars):
+        """REST로 받은 과거 확정 봉으로 윈도우 채우기 (신호 없음)"""
+        if interval in self.fib_windows:
+            for bar in bars:
+                self.update_fib(symbol, interval, bar)
+        if interval == self.entry_interval:
+            for bar in bars:
+                self.on_bar(symbol, bar, evaluate=False)
+
+    # ==================== 평가 ====================
+
+    def on_bar(self, symbol: str, bar, instrument_info: Dict = None, evaluate: bool = True) -> Optional[Dict]:
+        """
+        진입 타임프레임 확정 봉 반영 후 진입 판단
+
+        Returns:
+            신호 dict (analyze_entry와 같은 형식) 또는 None
+        """
+        state = self._state(symbol)
+        start_ms, open_, high, low, close, volume = bar[:6]
+        if start_ms <= state.last_start:
+            return None
+        state.last_start = start_ms
+
+        # 볼린저 밴드 (첫 종가 기준 편차로 누적 → 큰 가격에서도 분산 정밀도 유지)
+        if state.ref is None:
+            state.ref = close
+        deviation = close - state.ref
+        state.closes.push(deviation)
+        state.closes_sq.push(deviation * deviation)
+        state.ma_5.push(close)
+        state.ma_20.push(close)
+
+        # RSI (diff 첫 값은 NaN → 상승/하락 모두 0으로 집계, pandas와 동일)
+        delta = close - state.last_close if state.last_close is not None else 0.0
+        state.gains.push(delta if delta > 0 else 0.0)
+        state.losses.push(-delta if delta < 0 else 0.0)
+        state.last_close = close
+
+        state.recent_closes.append(close)
+        state.recent_volumes.append(volume)
+        state.bars += 1
+
+        latest = self._indicators(state, start_ms, open_, high, low, close)
+        prev, state.prev = state.prev, latest
+        if not evaluate or prev is None or state.bars < self.config.BB_PERIOD + 5 or not instrument_info:
+            return None
+
+        mtf_fib = self._mtf_fib(symbol, state)
+        if not mtf_fib:
+            return None  # Finder와 동일: 피보나치 없으면 판단하지 않음
+
+        self.bars_evaluated += 1
+        signal = entry_rules.evaluate_entry(
+            latest, prev,
+            state.ma_5.mean() if state.bars >= 20 else None,
+            state.ma_20.mean() if state.bars >= 20 else None,
+            mtf_fib, self.btc_trend, self._coin_trend(state),
+            self.funding.get(symbol, NEUTRAL_FUNDING), symbol, instrument_info, self.config
+        )
+        if signal:
+            self.signals += 1
+        return signal
+
+    def _indicators(self, state: _SymbolState, start_ms: int, open_: float, high: float, low: float, close: float) -> Dict:
+        """analyze_entry의 latest/prev 행과 같은 키 (numpy float: 0 나눗셈 시 pandas처럼 inf/nan)"""
+        nan = np.float64('nan')
+        bb_upper = bb_lower = bb_width = rsi = nan
+
+        period = self.config.BB_PERIOD
+        if state.closes.full():
+            mean_dev = state.closes.total / period
+            variance = max(0.0, (state.closes_sq.total - period * mean_dev * mean_dev) / (period - 1))
+            middle = np.float64(state.ref + mean_dev)
+            band = math.sqrt(variance) * self.config.BB_STD
+            bb_upper = middle + band
+            bb_lower = middle - band
+            bb_width = (bb_upper - bb_lower) / middle * 100
+
+        if state.gains.full():
+            gain = state.gains.mean()
+            loss = state.losses.mean()
+            if loss > 0:
+                rsi = np.float64(100 - (100 / (1 + gain / loss)))
+            elif gain > 0:
+                rsi = np.float64(100.0)
+
+        return {
+            'timestamp': pd.Timestamp(start_ms, unit='ms', tz='UTC'),
+            'open': np.float64(open_),
+            'high': np.float64(high),
+            'low': np.float64(low),
+            'close': np.float64(close),
+            'bb_upper': bb_upper,
+            'bb_lower': bb_lower,
+            'bb_width': bb_width,
+            'rsi': rsi
+        }
+
+    def _coin_trend(self, state: _SymbolState) -> Dict:
+        """TrendAnalyzer.get_coin_trend(df, 30)과 같은 계산"""
+        closes = state.recent_closes
+        volumes = state.recent_volumes
+        half = len(volumes) // 2
+        first_half = sum(volumes[i] for i in range(half)) / half
+        second_half = sum(volumes[i] for i in range(half, len(volumes))) / (len(volumes) - half)
+        volume_trend = 'INCREASING' if second_half > first_half else 'DECREASING'
+
+        price_change_pct = ((closes[-1] - closes[0]) / closes[0]) * 100
+        ma_5 = state.ma_5.mean()
+        ma_20 = state.ma_20.mean() if len(closes) >= 20 else float('nan')
+        return TrendAnalyzer.classify_coin_trend(ma_5, ma_20, price_change_pct, volume_trend)
+
+    def _mtf_fib(self, symbol: str, state: _SymbolState) -> Dict:
+        mtf_fib = {}
+        for interval, extremes in state.fib.items():
+            partial = self.partial_source(symbol, interval) if self.partial_source else None
+            fib = extremes.levels(partial)
+            if fib is not None:
+                mtf_fib[interval] = fib
+        return mtf_fib
+
+    # ==================== 관리 ====================
+
+    def has_state(self, symbol: str) -> bool:
+        return symbol in self.states
+
+    def reset(self, symbol: str):
+        """특정 심볼 상태 초기화"""
+        self.states.pop(symbol, None)
+        self.funding.pop(symbol, None)
+
+    def get_stats(self) -> Dict:
+        return {
+            "symbols": len(self.states),
+            "bars_evaluated": self.bars_evaluated,
+            "signals": self.signals,
+            "btc_trend": self.btc_trend['trend']
+        }
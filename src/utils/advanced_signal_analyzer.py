@@ -6,7 +6,10 @@
 4. 추세 + 지표 종합
 """
 import pandas as pd
-from config.config import Config
+from src.utils import structured_log
+from src.utils.api_accounting import ApiBudgetExceeded
+
+logger = structured_log.get_logger(__name__)
 
 class AdvancedSignalAnalyzer:
     
@@ -81,24 +84,11 @@ class AdvancedSignalAnalyzer:
             
             if response['retCode'] == 0 and response['result']['list']:
                 ticker = response['result']['list'][0]
-                funding_rate = float(ticker.get('fundingRate', 0))
-                funding_rate_pct = funding_rate * 100
-                
-                # 펀딩비 기준 시장 심리 판단
-                if funding_rate > 0.0001:  # 0.01% 이상
-                    sentiment = 'LONG_HEAVY'  # 롱 과열
-                elif funding_rate < -0.0001:  # -0.01% 이하
-                    sentiment = 'SHORT_HEAVY'  # 숏 과열
-                else:
-                    sentiment = 'NEUTRAL'
-                
-                return {
-                    'funding_rate': funding_rate,
-                    'funding_rate_pct': round(funding_rate_pct, 4),
-                    'sentiment': sentiment
-                }
+                return AdvancedSignalAnalyzer.classify_funding(float(ticker.get('fundingRate', 0)))
+        except ApiBudgetExceeded:
+            raise
         except Exception as e:
-            print(f"펀딩비 조회 실패: {e}")
+            logger.warning(f"펀딩비 조회 실패: {e}")
         
         return {
             'funding_rate': 0,
@@ -106,6 +96,25 @@ class AdvancedSignalAnalyzer:
             'sentiment': 'NEUTRAL'
         }
     
+    @staticmethod
+    def classify_funding(funding_rate):
+        """펀딩비 → 펀딩 정보 dict (get_funding_rate와 티커 스트림 공용)"""
+        funding_rate_pct = funding_rate * 100
+        
+        # 펀딩비 기준 시장 심리 판단
+        if funding_rate > 0.0001:  # 0.01% 이상
+            sentiment = 'LONG_HEAVY'  # 롱 과열
+        elif funding_rate < -0.0001:  # -0.01% 이하
+            sentiment = 'SHORT_HEAVY'  # 숏 과열
+        else:
+            sentiment = 'NEUTRAL'
+        
+        return {
+            'funding_rate': funding_rate,
+            'funding_rate_pct': round(funding_rate_pct, 4),
+            'sentiment': sentiment
+        }
+    
     @staticmethod
     def should_enter_short_on_downtrend(
         current_price, 
@@ -0,0 +1,321 @@
+"""
+API Accounting
+Bybit REST 호출 집계 - 엔드포인트 / 호출 구간 / 심볼별 호출 수, 응답 바이트, 지연 + 실행 단위 호출 예산
+
+    from src.utils import api_accounting
+
+    session = api_accounting.metered(HTTP(...))        # pybit HTTP / SyntheticSession 래핑 (BybitClient는 자동)
+
+    with api_accounting.footprint(f"analyzer {symbol}") as fp:
+        ...
+    print(fp.summary())        # 📡 API analyzer BTCUSDT: 63회 | 2.1MB | 4.52s | get_kline 60, ...
+
+    with api_accounting.caller("finder.fibonacci"):    # 구간 이름 지정 (기본: BybitClient를 부른 함수)
+        ...
+
+- footprint는 중첩 가능 (바깥 footprint에도 함께 집계), 프로세스 전체 누적은 LEDGER
+- 응답 바이트: pybit HTTP는 requests 응답 훅으로 실제 본문 크기 (재시도 포함), 그 외 세션은 JSON 직렬화 크기 추정
+- 예산은 조회(get_*) 호출에만 적용 - 주문/레버리지 등 거래 호출은 막지 않음
+- 스레드 안전: 집계(LEDGER 포함)와 cache 모드 응답 캐시는 각각 락으로 보호 (Analyzer 조회 스레드 공유)
+
+환경 변수:
+    API_BUDGET=0            footprint당 최대 조회 호출 수 (0 = 무제한)
+    API_BUDGET_MODE=fail    fail (ApiBudgetExceeded로 즉시 실패) | cache (같은 요청의 최근 응답 재사용, 없으면 실패)
+    API_CACHE_SIZE=512      cache 모드 응답 보관 수
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+_footprints: ContextVar[Tuple["Footprint", ...]] = ContextVar("api_footprints", default=())
+_caller: ContextVar[Optional[str]] = ContextVar("api_caller", default=None)
+_local = threading.local()
+
+# 자동 구간 이름에서 건너뛸 파일 (래퍼 계층)
+_SKIP_FILES = (os.path.abspath(__file__), os.path.join("src", "utils", "bybit_client.py"))
+
+
+class ApiBudgetExceeded(RuntimeError):
+    """footprint 호출 예산 초과 (BybitClient는 삼키지 않고 다시 올림)"""
+
+
+class _Tally:
+    __slots__ = ("calls", "cached", "blocked", "errors", "bytes", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.cached = 0
+        self.blocked = 0
+        self.errors = 0
+        self.bytes = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float, nbytes: int, ok: bool):
+        self.calls += 1
+        self.bytes += nbytes
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        if not ok:
+            self.errors += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "cached": self.cached,
+            "blocked": self.blocked,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "total_ms": round(self.total_ms, 1),
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 1)
+        }
+
+
+def _format_bytes(n: int) -> str:
+    if n >= 1 << 20:
+        return f"{n / (1 << 20):.1f}MB"
+    if n >= 1 << 10:
+        return f"{n / (1 << 10):.1f}KB"
+    return f"{n}B"
+
+
+class Footprint:
+    """실행 단위 (백테스트 1회, 메시지 1건, 실행 주기 1회) API 사용량"""
+
+    def __init__(self, label: str, budget: int = 0, mode: str = "fail"):
+        """
+        Args:
+            label: 출력 이름
+            budget: 최대 조회 호출 수 (0 = 무제한)
+            mode: 예산 초과 시 fail | cache
+        """
+        self.label = label
+        self.budget = budget
+        self.mode = mode
+        self.started = time.time()
+        self.total = _Tally()
+        self.by_endpoint: Dict[str, _Tally] = {}
+        self.by_stage: Dict[str, _Tally] = {}
+        self.by_symbol: Dict[str, _Tally] = {}
+        self._lock = threading.RLock()
+
+    def exhausted(self) -> bool:
+        return bool(self.budget) and self.total.calls >= self.budget
+
+    def record(self, endpoint: str, stage: str, symbol: str, ms: float, nbytes: int, ok: bool):
+        with self._lock:
+            self.total.add(ms, nbytes, ok)
+            for table, key in ((self.by_endpoint, endpoint), (self.by_stage, stage), (self.by_symbol, symbol)):
+                if not key:
+                    continue
+                tally = table.get(key)
+                if tally is None:
+                    tally = table[key] = _Tally()
+                tally.add(ms, nbytes, ok)
+
+    def _mark(self, field: str, endpoint: str):
+        with self._lock:
+            setattr(self.total, field, getattr(self.total, field) + 1)
+            tally = self.by_endpoint.setdefault(endpoint, _Tally())
+            setattr(tally, field, getattr(tally, field) + 1)
+
+    @staticmethod
+    def _top(table: Dict[str, _Tally], limit: int) -> str:
+        ranked = sorted(table.items(), key=lambda item: item[1].calls, reverse=True)[:limit]
+        return ", ".join(f"{key} {tally.calls}" for key, tally in ranked if tally.calls)
+
+    def summary(self, limit: int = 3) -> str:
+        """한 줄 요약"""
+        with self._lock:
+            return self._summary(limit)
+
+    def _summary(self, limit: int) -> str:
+        t = self.total
+        extra = [f"{name} {value}" for name, value in (("캐시", t.cached), ("차단", t.blocked), ("오류", t.errors)) if value]
+        head = f"📡 API {self.label}: {t.calls}회" + (f" ({', '.join(extra)})" if extra else "")
+        if not t.calls:
+            return head
+        return (
+            f"{head} | {_format_bytes(t.bytes)} | {t.total_ms / 1000:.2f}s (평균 {t.total_ms / t.calls:.0f}ms) | "
+            f"{self._top(self.by_endpoint, limit)} | 구간 {self._top(self.by_stage, limit)}"
+            + (f" | 심볼 {self._top(self.by_symbol, limit)}" if len(self.by_symbol) > 1 else "")
+        )
+
+    def format_report(self, limit: int = 10) -> List[str]:
+        """표 형식 (엔드포인트 / 구간 / 심볼별)"""
+        with self._lock:
+            return self._format_report(limit)
+
+    def _format_report(self, limit: int) -> List[str]:
+        lines = [self._summary(3)]
+        for title, table in (("엔드포인트", self.by_endpoint), ("구간", self.by_stage), ("심볼", self.by_symbol)):
+            if not table:
+                continue
+            lines.append(f"  [{title}]")
+            for key, tally in sorted(table.items(), key=lambda item: item[1].calls, reverse=True)[:limit]:
+                lines.append(
+                    f"    {key:<48} {tally.calls:>6}회 {_format_bytes(tally.bytes):>9} "
+                    f"평균 {tally.total_ms / tally.calls if tally.calls else 0:>6.0f}ms 최대 {tally.max_ms:>6.0f}ms"
+                )
+        return lines
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "label": self.label,
+                "budget": self.budget,
+                "total": self.total.to_dict(),
+                "endpoints": {k: v.to_dict() for k, v in self.by_endpoint.items()},
+                "stages": {k: v.to_dict() for k, v in self.by_stage.items()},
+                "symbols": {k: v.to_dict() for k, v in self.by_symbol.items()}
+            }
+
+
+LEDGER = Footprint("process")
+
+
+@contextmanager
+def footprint(label: str, budget: Optional[int] = None, mode: Optional[str] = None):
+    """이 블록 안의 API 호출 집계 (budget/mode 기본값은 API_BUDGET / API_BUDGET_MODE)"""
+    fp = Footprint(
+        label,
+        budget=int(os.getenv("API_BUDGET", "0")) if budget is None else budget,
+        mode=(mode or os.getenv("API_BUDGET_MODE", "fail")).lower()
+    )
+    token = _footprints.set(_footprints.get() + (fp,))
+    try:
+        yield fp
+    finally:
+        _footprints.reset(token)
+
+
+@contextmanager
+def caller(stage: str):
+    """이 블록 안의 호출을 stage 이름으로 집계"""
+    token = _caller.set(stage)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def _auto_stage() -> str:
+    """래퍼 계층 밖의 첫 호출 함수 (모듈.함수)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.endswith(_SKIP_FILES[1]) and os.path.abspath(filename) != _SKIP_FILES[0]:
+            module = os.path.splitext(os.path.basename(filename))[0]
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+def _response_hook(response, *args, **kwargs):
+    """requests 응답 훅 - 실제 본문 크기 (pybit 재시도 포함 누적)"""
+    _local.bytes = getattr(_local, "bytes", 0) + len(response.content or b"")
+    _local.hooked = True
+
+
+class MeteredSession:
+    """pybit HTTP 호환 세션 래퍼 (메서드 호출마다 집계 + 예산 확인)"""
+
+    def __init__(self, session, cache_size: Optional[int] = None):
+        object.__setattr__(self, "_session", session)
+        object.__setattr__(self, "_cache", OrderedDict())
+        object.__setattr__(self, "_cache_lock", threading.Lock())
+        object.__setattr__(self, "_cache_size", int(os.getenv("API_CACHE_SIZE", "512")) if cache_size is None else cache_size)
+        client = getattr(session, "client", None)
+        hooks = getattr(client, "hooks", None)
+        if isinstance(hooks, dict) and _response_hook not in hooks.setdefault("response", []):
+            hooks["response"].append(_response_hook)
+
+    def __getattr__(self, name):
+        attr = getattr(self._session, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return self._call(name, attr, args, kwargs)
+
+        call.__name__ = name
+        return call
+
+    def __setattr__(self, name, value):
+        # session.endpoint = ... 등은 원본 세션에 설정
+        setattr(self._session, name, value)
+
+    def _call(self, endpoint: str, fn, args, kwargs):
+        scopes = (LEDGER,) + _footprints.get()
+        read = endpoint.startswith("get_")
+        use_cache = read and any(fp.mode == "cache" for fp in scopes)
+        key = None
+        if use_cache:
+            key = (endpoint, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+
+        if read:
+            limited = next((fp for fp in reversed(scopes) if fp.exhausted()), None)
+            if limited is not None:
+                cached = self._cached(key) if limited.mode == "cache" and key is not None else None
+                for fp in scopes:
+                    fp._mark("cached" if cached is not None else "blocked", endpoint)
+                if cached is not None:
+                    return cached
+                raise ApiBudgetExceeded(
+                    f"API 예산 초과: {limited.label} {limited.total.calls}/{limited.budget}회 ({endpoint} {kwargs.get('symbol', '')})"
+                )
+
+        stage = _caller.get() or _auto_stage()
+        _local.bytes = 0
+        _local.hooked = False
+        started = time.perf_counter()
+        ok = False
+        response = None
+        try:
+            response = fn(*args, **kwargs)
+            ok = not isinstance(response, dict) or response.get("retCode", 0) == 0
+            return response
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            nbytes = _local.bytes
+            if not _local.hooked and response is not None:
+                try:
+                    nbytes = len(json.dumps(response, separators=(",", ":"), default=str))
+                except (TypeError, ValueError):
+                    nbytes = 0
+            symbol = kwargs.get("symbol") or ""
+            for fp in scopes:
+                fp.record(endpoint, stage, symbol, ms, nbytes, ok)
+            if key is not None and ok and self._cache_size:
+                with self._cache_lock:
+                    self._cache[key] = response
+                    self._cache.move_to_end(key)
+                    if len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
+
+    def _cached(self, key):
+        """캐시된 응답 (LRU 갱신), 없으면 None"""
+        with self._cache_lock:
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+            return response
+
+
+def metered(session, cache_size: Optional[int] = None) -> MeteredSession:
+    """세션 래핑 (이미 래핑된 세션은 그대로)"""
+    if isinstance(session, MeteredSession):
+        return session
+    return MeteredSession(session, cache_size)
@@ -1,16 +1,38 @@
 from pybit.unified_trading import HTTP
 from config.config import Config
+from src.utils.local_candles import LocalCandleStore
+from src.utils.api_accounting import ApiBudgetExceeded, metered
+from src.utils import structured_log
 import pandas as pd
 from datetime import datetime, timedelta
 import time
 
+logger = structured_log.get_logger(__name__)
+
 class BybitClient:
-    def __init__(self):
-        self.session = HTTP(
-            testnet=Config.BYBIT_TESTNET,
-            api_key=Config.BYBIT_API_KEY,
-            api_secret=Config.BYBIT_API_SECRET
-        )
+    def __init__(self, session=None):
+        """
+        Args:
+            session: pybit HTTP 대신 쓸 세션 (예: 합성 시장 SyntheticSession), 없으면 Bybit 연결
+                (어느 쪽이든 호출 집계 / 예산용 MeteredSession으로 감쌈 - api_accounting)
+        """
+        if session is None:
+            session = HTTP(
+                testnet=Config.BYBIT_TESTNET,
+                api_key=Config.BYBIT_API_KEY,
+                api_secret=Config.BYBIT_API_SECRET
+            )
+            if Config.BYBIT_REST_URL:
+                session.endpoint = Config.BYBIT_REST_URL.rstrip('/')
+        self.session = metered(session)
+        
+        # Scanner가 합성한 캔들 (Redis) - 설정 시 REST보다 먼저 조회
+        self.local_candles = None
+        if Config.LOCAL_CANDLES_REDIS_URL:
+            import redis
+            self.local_candles = LocalCandleStore(
+                redis.Redis.from_url(Config.LOCAL_CANDLES_REDIS_URL, decode_responses=True)
+            )
     
     def get_tickers(self, category='linear'):
         """모든 티커 정보 가져오기"""
@@ -19,8 +41,10 @@ class BybitClient:
             if response['retCode'] == 0:
                 return response['result']['list']
             return []
+        except ApiBudgetExceeded:
+            raise
         except Exception as e:
-            print(f"티커 조회 오류: {e}")
+            logger.error(f"티커 조회 오류: {e}")
             return []
     
     def get_klines(self, symbol, interval='60', limit=200):
@@ -50,8 +74,10 @@ class BybitClient:
                 df = df.sort_values('timestamp').reset_index(drop=True)
                 return df
             return pd.DataFrame()
+        except ApiBudgetExceeded:
+            raise
         except Exception as e:
-            print(f"K라인 조회 오류 ({symbol}): {e}")
+            logger.error(f"K라인 조회 오류 ({symbol}): {e}")
             return pd.DataFrame()
     
     def get_klines_for_days(self, symbol, interval, days):
@@ -60,6 +86,11 @@ class BybitClient:
         interval_minutes = self._interval_to_minutes(interval)
         required_candles = int((days * 24 * 60) / interval_minutes)
         
+        # 로컬 합성 캔들로 충분하면 REST 호출 생략
+        local = self._get_local_klines(symbol, interval, min(required_candles, 1000))
+        if local is not None:
+            return local
+        
         # Bybit API 제한: 최대 200개씩
         all_data = []
         remaining = min(required_candles, 1000)  # 최대 1000개
@@ -84,6 +115,18 @@ class BybitClient:
         
         return pd.DataFrame()
     
+    def _get_local_klines(self, symbol, interval, limit):
+        """로컬 합성 캔들 조회 (limit개 미만이면 None)"""
+        if self.local_candles is None:
+            return None
+        try:
+            df = self.local_candles.get_klines(symbol, interval, limit)
+            if len(df) >= limit:
+                return df
+        except Exception as e:
+            logger.error(f"로컬 캔들 조회 오류 ({symbol}): {e}")
+        return None
+    
     def _interval_to_minutes(self, interval):
         """인터벌을 분으로 변환"""
         if interval == 'D':
@@ -148,8 +191,10 @@ class BybitClient:
             
             return None
             
+        except ApiBudgetExceeded:
+            raise
         except Exception as e:
-            print(f"심볼 정보 조회 오류 ({symbol}): {e}")
+            logger.error(f"심볼 정보 조회 오류 ({symbol}): {e}")
             return None
     
     def round_price(self, price, tick_size, price_decimals):
@@ -198,8 +243,10 @@ class BybitClient:
             
             return None
             
+        except ApiBudgetExceeded:
+            raise
         except Exception as e:
-            print(f"심볼 정보 조회 오류 ({symbol}): {e}")
+            logger.error(f"심볼 정보 조회 오류 ({symbol}): {e}")
             return None
     
     def round_price_to_tick(self, price, tick_size):
@@ -0,0 +1,52 @@
+"""
+Local Candles (Redis)
+
+Scanner가 1분봉 스트림으로 합성한 상위 타임프레임 완성 봉을 Redis에 보관하고,
+Finder/Analyzer 등 다른 서비스가 REST 호출 없이 읽어갈 수 있게 한다.
+
+키: ``candles:{symbol}:{interval}`` (LIST, 오래된 봉 → 최신 봉)
+값: Bybit REST kline과 같은 순서의 JSON 배열 ``[start_ms, open, high, low, close, volume, turnover]``
+
+쓰기는 Scanner (redis.asyncio), 읽기는 동기 redis-py 클라이언트를 사용한다.
+"""
+import json
+
+CANDLES_KEY = "candles:{symbol}:{interval}"
+
+
+def candle_key(symbol, interval):
+    """심볼/타임프레임별 Redis 키"""
+    return CANDLES_KEY.format(symbol=symbol, interval=interval)
+
+
+def encode_bar(bar):
+    """봉 튜플 → JSON 문자열"""
+    return json.dumps(list(bar), separators=(",", ":"))
+
+
+class LocalCandleStore:
+    """Redis에 저장된 합성 캔들 조회"""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+
+    def get_bars(self, symbol, interval, limit=200):
+        """완성 봉 리스트 (오래된 순, 최대 limit개)"""
+        raw = self.redis_client.lrange(candle_key(symbol, interval), -limit, -1)
+        return [json.loads(item) for item in raw]
+
+    def get_klines(self, symbol, interval='60', limit=200):
+        """BybitClient.get_klines와 같은 형식의 데이터프레임 (없으면 빈 데이터프레임)"""
+        import pandas as pd  # 쓰기 쪽(Scanner)은 pandas 불필요
+
+        bars = self.get_bars(symbol, interval, limit)
+        if not bars:
+            return pd.DataFrame()
+
+        df = pd.DataFrame(bars, columns=[
+            'timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover'
+        ])
+        # 재시작 백필로 같은 봉이 다시 기록될 수 있음
+        df = df.drop_duplicates(subset=['timestamp'], keep='last').sort_values('timestamp').reset_index(drop=True)
+        df['timestamp'] = pd.to_datetime(df['timestamp'].astype('int64'), unit='ms', utc=True)
+        return df
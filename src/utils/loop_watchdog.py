@@ -0,0 +1,259 @@
+"""
+Loop Watchdog
+asyncio 이벤트 루프 지연 / 정지(stall) 감시
+
+    watchdog = LoopWatchdog.from_env("scanner", observe=histogram.observe)
+    task = watchdog.start()          # 루프 안에서 호출 (하트비트 태스크 반환)
+    ...
+    watchdog.stop(); task.cancel()
+
+- 하트비트 태스크: interval마다 sleep 예정 시각 대비 재개 지연(lag)을 기록 (observe 콜백으로도 전달)
+- 감시 스레드: 하트비트가 interval + stall_ms 이상 멈추면 정지로 판단하고,
+  정지가 이어지는 동안 sample_ms마다 루프 스레드 스택을 샘플링 (sys._current_frames)
+  → 그 순간 실행 중이던 태스크/코루틴과 호출 위치 (블로킹 I/O, 무거운 콜백 등)
+- 정지 시작/종료 로그 + 최근 정지 기록 (get_stats / format_report)
+
+환경 변수:
+    LOOP_WATCHDOG=1                 활성화 (기본)
+    LOOP_WATCHDOG_INTERVAL_MS=50    하트비트 간격
+    LOOP_STALL_MS=200               정지 판단 기준 (하트비트 간격 초과분)
+    LOOP_STALL_SAMPLE_MS=100        정지 중 스택 샘플링 간격
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from src.utils.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIZE = 4096
+STACK_DEPTH = 12
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
+
+class _Stall:
+    """정지 1건"""
+
+    __slots__ = ("started", "duration_ms", "task", "stacks", "samples")
+
+    def __init__(self, started: float, task: str):
+        self.started = started
+        self.duration_ms = 0.0
+        self.task = task
+        self.stacks: Dict[tuple, int] = {}  # 샘플링한 스택 → 횟수
+        self.samples = 0
+
+    def add_stack(self, stack: tuple):
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+    def top_stack(self) -> tuple:
+        return max(self.stacks.items(), key=lambda item: item[1])[0] if self.stacks else ()
+
+    def to_dict(self) -> Dict:
+        return {
+            "started": self.started,
+            "duration_ms": round(self.duration_ms, 1),
+            "task": self.task,
+            "samples": self.samples,
+            "stack": list(self.top_stack())
+        }
+
+
+class LoopWatchdog:
+    """이벤트 루프 1개 감시"""
+
+    def __init__(
+        self,
+        name: str = "loop",
+        interval_ms: float = 50,
+        stall_ms: float = 200,
+        sample_ms: float = 100,
+        enabled: bool = True,
+        observe: Optional[Callable[[float], None]] = None,
+        max_stalls: int = 20
+    ):
+        """
+        Args:
+            name: 로그 표시 이름
+            interval_ms: 하트비트 간격
+            stall_ms: 하트비트가 interval_ms + stall_ms 동안 없으면 정지
+            sample_ms: 정지 중 스택 샘플링 간격
+            enabled: False면 start()가 아무것도 하지 않음
+            observe: 지연(초) 관측 콜백 (메트릭 히스토그램 등)
+            max_stalls: 보관할 최근 정지 수
+        """
+        self.name = name
+        self.interval = interval_ms / 1000
+        self.stall_sec = stall_ms / 1000
+        self.sample_sec = sample_ms / 1000
+        self.enabled = enabled
+        self.observe = observe
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread_id: Optional[int] = None
+        self.last_beat = time.perf_counter()
+        self.lags: deque = deque(maxlen=SAMPLE_SIZE)  # 초
+        self.beats = 0
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.stall_total_ms = 0.0
+        self.stalls: deque = deque(maxlen=max_stalls)
+        self.current: Optional[_Stall] = None
+        self._last_sample = 0.0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, name: str, observe: Optional[Callable[[float], None]] = None) -> "LoopWatchdog":
+        return cls(
+            name=name,
+            interval_ms=float(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "50")),
+            stall_ms=float(os.getenv("LOOP_STALL_MS", "200")),
+            sample_ms=float(os.getenv("LOOP_STALL_SAMPLE_MS", "100")),
+            enabled=_env_flag("LOOP_WATCHDOG", "1"),
+            observe=observe
+        )
+
+    def start(self) -> Optional[asyncio.Task]:
+        """실행 중인 루프에 하트비트 태스크 + 감시 스레드 시작 (비활성이면 None)"""
+        if not self.enabled:
+            return None
+        self.loop = asyncio.get_running_loop()
+        self.thread_id = threading.get_ident()
+        self.last_beat = time.perf_counter()
+        self._stop.clear()
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._monitor, name=f"loop-watchdog-{self.name}", daemon=True)
+            self._thread.start()
+        logger.info(
+            f"🐕 루프 감시 시작: {self.name} (하트비트 {self.interval * 1000:.0f}ms, "
+            f"정지 기준 {self.stall_sec * 1000:.0f}ms)"
+        )
+        return asyncio.create_task(self._heartbeat(), name=f"loop-watchdog-{self.name}")
+
+    def stop(self):
+        self._stop.set()
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            self.last_beat = time.perf_counter()
+            with self._lock:
+                self.lags.append(lag)
+                self.beats += 1
+                if lag > self.max_lag:
+                    self.max_lag = lag
+            if self.observe:
+                self.observe(lag)
+
+    def _monitor(self):
+        """감시 스레드: 하트비트 정지 감지 + 루프 스레드 스택 샘플링"""
+        poll = min(self.sample_sec, self.interval)
+        while not self._stop.wait(poll):
+            if self.loop is None or self.loop.is_closed() or not self.loop.is_running():
+                self._finish_stall()
+                continue
+
+            silent = time.perf_counter() - self.last_beat
+            if silent < self.interval + self.stall_sec:
+                self._finish_stall()
+                continue
+
+            if self.current is None:
+                self.current = _Stall(time.time() - silent, self._current_task())
+                self._sample()
+                stack = self.current.top_stack()
+                logger.warning(
+                    f"🐢 이벤트 루프 정지: {self.name} {silent * 1000:.0f}ms+ | 태스크 {self.current.task} | "
+                    f"{stack[-1] if stack else '?'}"
+                )
+            elif time.perf_counter() - self._last_sample >= self.sample_sec:
+                self._sample()
+            self.current.duration_ms = silent * 1000
+        self._finish_stall()
+
+    def _current_task(self) -> str:
+        try:
+            task = asyncio.current_task(self.loop)
+        except RuntimeError:
+            task = None
+        if task is None:
+            return "(콜백)"
+        coro = task.get_coro()
+        return f"{task.get_name()}:{getattr(coro, '__qualname__', coro)}"
+
+    def _sample(self):
+        self._last_sample = time.perf_counter()
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        frames = traceback.extract_stack(frame)
+        # 루프 내부 프레임 (run_forever → Handle._run)은 제외하고 실행 중인 콜백부터
+        for i in range(len(frames) - 1, -1, -1):
+            if frames[i].filename.endswith(os.path.join("asyncio", "events.py")):
+                frames = frames[i + 1:]
+                break
+        stack = tuple(f"{os.path.basename(f.filename)}:{f.lineno} {f.name}" for f in frames[-STACK_DEPTH:])
+        self.current.add_stack(stack)
+
+    def _finish_stall(self):
+        stall = self.current
+        if stall is None:
+            return
+        self.current = None
+        with self._lock:
+            self.stall_count += 1
+            self.stall_total_ms += stall.duration_ms
+            self.stalls.append(stall)
+        logger.warning(
+            f"🐢 이벤트 루프 정지 종료: {self.name} 약 {stall.duration_ms:.0f}ms | 태스크 {stall.task} | "
+            f"샘플 {stall.samples}개\n    " + "\n    ".join(stall.top_stack())
+        )
+
+    def get_stats(self) -> Dict:
+        """지연 분포 (최근 SAMPLE_SIZE 하트비트) + 정지 요약"""
+        with self._lock:
+            ordered = sorted(self.lags)
+            last = self.stalls[-1].to_dict() if self.stalls else None
+            return {
+                "beats": self.beats,
+                "lag_p50_ms": round(percentile(ordered, 0.5) * 1000, 2),
+                "lag_p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+                "lag_max_ms": round(self.max_lag * 1000, 1),
+                "stalls": self.stall_count,
+                "stall_total_ms": round(self.stall_total_ms, 1),
+                "stalled_now": self.current is not None,
+                "last_stall": last
+            }
+
+    def recent_stalls(self) -> List[Dict]:
+        with self._lock:
+            return [stall.to_dict() for stall in self.stalls]
+
+    def format_report(self, limit: int = 3) -> List[str]:
+        """로그용 요약 (지연 분포 + 최근 정지 limit건)"""
+        stats = self.get_stats()
+        lines = [
+            f"루프 지연 p50/p99/max {stats['lag_p50_ms']}/{stats['lag_p99_ms']}/{stats['lag_max_ms']}ms | "
+            f"정지 {stats['stalls']}회 (누적 {stats['stall_total_ms']:,.0f}ms)"
+        ]
+        for stall in self.recent_stalls()[-limit:]:
+            where = stall["stack"][-1] if stall["stack"] else "?"
+            lines.append(f"  - {stall['duration_ms']:,.0f}ms | {stall['task']} | {where}")
+        return lines
@@ -0,0 +1,132 @@
+"""
+Scanner 멤버십 프로토콜 (Redis ZSET)
+
+Scanner와 Discovery가 같은 키를 보도록 멤버십을 한 곳에서 관리한다.
+
+- 키: ``scanner:members`` (ZSET)
+- 멤버: scanner_id, 점수: 마지막 하트비트 시각 (epoch 초)
+- 하트비트 / 순위 조회 / 만료 정리는 각각 Redis 왕복 1회 (pipeline 또는 Lua)
+
+redis-py의 동기 클라이언트와 ``redis.asyncio`` 클라이언트 모두 지원한다.
+"""
+import time
+from typing import List, Optional, Tuple
+
+MEMBERS_KEY = "scanner:members"
+MEMBER_TTL_SEC = 60  # 하트비트가 이 시간 이상 없으면 만료
+
+# 만료 멤버 정리 후 scanner_id 정렬 기준 순위 반환
+# KEYS[1]=members, ARGV[1]=cutoff, ARGV[2]=scanner_id
+# 반환: {rank, total} (rank는 1부터, 미등록 시 0)
+_RANK_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1])
+local members = redis.call('ZRANGE', KEYS[1], 0, -1)
+table.sort(members)
+local rank = 0
+for i, member in ipairs(members) do
+    if member == ARGV[2] then
+        rank = i
+        break
+    end
+end
+return {rank, #members}
+"""
+
+# 만료 멤버 정리 후 (활성 목록, 제거 목록) 반환
+# KEYS[1]=members, ARGV[1]=cutoff
+_PRUNE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1])
+if #expired > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1])
+end
+local active = redis.call('ZRANGE', KEYS[1], 0, -1)
+table.sort(active)
+return {active, expired}
+"""
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _parse_rank(result) -> Tuple[int, int]:
+    rank, total = int(result[0]), int(result[1])
+    if rank == 0:
+        # 아직 등록 전이면 단독 Scanner로 간주
+        return 1, max(total, 1)
+    return rank, total
+
+
+def _parse_prune(result) -> Tuple[List[str], List[str]]:
+    active, expired = result
+    return [_decode(m) for m in active], [_decode(m) for m in expired]
+
+
+class ScannerMembership:
+    """동기 Redis 클라이언트용 멤버십 (Discovery)"""
+
+    def __init__(self, redis_client, ttl_sec: int = MEMBER_TTL_SEC, key: str = MEMBERS_KEY):
+        self.redis_client = redis_client
+        self.ttl_sec = ttl_sec
+        self.key = key
+        self._rank_script = redis_client.register_script(_RANK_SCRIPT)
+        self._prune_script = redis_client.register_script(_PRUNE_SCRIPT)
+
+    def heartbeat(self, scanner_id: str, now: Optional[float] = None):
+        """하트비트 기록 (ZADD + 키 TTL 갱신, 1회 왕복)"""
+        now = time.time() if now is None else now
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zadd(self.key, {scanner_id: now})
+        pipe.expire(self.key, self.ttl_sec * 2)
+        pipe.execute()
+
+    def leave(self, scanner_id: str):
+        """멤버십 탈퇴"""
+        self.redis_client.zrem(self.key, scanner_id)
+
+    def get_rank(self, scanner_id: str, now: Optional[float] = None) -> Tuple[int, int]:
+        """(rank, total) 조회 - 만료 정리 포함"""
+        now = time.time() if now is None else now
+        result = self._rank_script(keys=[self.key], args=[now - self.ttl_sec, scanner_id])
+        return _parse_rank(result)
+
+    def prune(self, now: Optional[float] = None) -> Tuple[List[str], List[str]]:
+        """만료 멤버 정리 후 (활성, 제거) 목록 반환"""
+        now = time.time() if now is None else now
+        result = self._prune_script(keys=[self.key], args=[now - self.ttl_sec])
+        return _parse_prune(result)
+
+
+class AsyncScannerMembership:
+    """redis.asyncio 클라이언트용 멤버십 (Scanner)"""
+
+    def __init__(self, redis_client, ttl_sec: int = MEMBER_TTL_SEC, key: str = MEMBERS_KEY):
+        self.redis_client = redis_client
+        self.ttl_sec = ttl_sec
+        self.key = key
+        self._rank_script = redis_client.register_script(_RANK_SCRIPT)
+        self._prune_script = redis_client.register_script(_PRUNE_SCRIPT)
+
+    async def heartbeat(self, scanner_id: str, now: Optional[float] = None):
+        """하트비트 기록 (ZADD + 키 TTL 갱신, 1회 왕복)"""
+        now = time.time() if now is None else now
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zadd(self.key, {scanner_id: now})
+        pipe.expire(self.key, self.ttl_sec * 2)
+        await pipe.execute()
+
+    async def leave(self, scanner_id: str):
+        """멤버십 탈퇴"""
+        await self.redis_client.zrem(self.key, scanner_id)
+
+    async def get_rank(self, scanner_id: str, now: Optional[float] = None) -> Tuple[int, int]:
+        """(rank, total) 조회 - 만료 정리 포함"""
+        now = time.time() if now is None else now
+        result = await self._rank_script(keys=[self.key], args=[now - self.ttl_sec, scanner_id])
+        return _parse_rank(result)
+
+    async def prune(self, now: Optional[float] = None) -> Tuple[List[str], List[str]]:
+        """만료 멤버 정리 후 (활성, 제거) 목록 반환"""
+        now = time.time() if now is None else now
+        result = await self._prune_script(keys=[self.key], args=[now - self.ttl_sec])
+        return _parse_prune(result)
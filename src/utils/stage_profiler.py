@@ -0,0 +1,315 @@
+"""
+Stage Profiler
+중첩 구간(stage) 시간 측정 - 호출 수, 누적/자기 시간, p50/p99, 할당 바이트 (선택)
+
+    from src.utils import stage_profiler
+    from src.utils.stage_profiler import stage, profiled
+
+    with stage("backtest.indicators"):
+        ...
+
+    @profiled("finder.process_message")
+    def process_message(...): ...
+
+환경 변수:
+    STAGE_PROFILE=1                 측정 활성화 (기본 비활성 - stage()는 공용 no-op 객체, profiled는 원본 함수 반환)
+    STAGE_PROFILE_TRACEMALLOC=1     구간별 순 할당 바이트 (tracemalloc, 느려짐)
+    STAGE_PROFILE_DIR=./profiles    출력 디렉터리
+    STAGE_PROFILE_DUMP_SEC=60       주기적 기록 (0이면 종료 시에만)
+
+출력 (프로세스별):
+    {name}-{pid}.folded   flame graph 입력 (folded stacks: "a;b;c 자기 시간us") - flamegraph.pl, speedscope
+    {name}-{pid}.json     구간별 통계
+
+- 구간 경로는 contextvars로 추적 → asyncio 태스크/스레드마다 따로 중첩
+- 분위수는 구간별 최근 SAMPLE_SIZE개 기준
+"""
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.stats import percentile
+
+SAMPLE_SIZE = 1024
+
+_path: ContextVar[Tuple[str, ...]] = ContextVar("stage_path", default=())
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes", "on")
+
+
+class StageStats:
+    """구간 1개 통계"""
+
+    __slots__ = ("count", "total_ns", "max_ns", "alloc_bytes", "samples", "_next")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.alloc_bytes = 0
+        self.samples: List[int] = []
+        self._next = 0
+
+    def add(self, elapsed_ns: int, alloc_bytes: int):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.alloc_bytes += alloc_bytes
+        if len(self.samples) < SAMPLE_SIZE:
+            self.samples.append(elapsed_ns)
+        else:
+            self.samples[self._next] = elapsed_ns
+            self._next = (self._next + 1) % SAMPLE_SIZE
+
+
+class _NullStage:
+    """비활성 시 공용 no-op"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "path", "token", "start_ns", "mem")
+
+    def __init__(self, profiler: "StageProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.path = _path.get() + (self.name,)
+        self.token = _path.set(self.path)
+        self.mem = tracemalloc.get_traced_memory()[0] if self.profiler.trace_memory else 0
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter_ns() - self.start_ns
+        alloc = tracemalloc.get_traced_memory()[0] - self.mem if self.profiler.trace_memory else 0
+        try:
+            _path.reset(self.token)
+        except ValueError:
+            # 다른 컨텍스트에서 종료 (제너레이터 등) - 부모 경로로 복원
+            _path.set(self.path[:-1])
+        self.profiler.record(self.path, elapsed, max(alloc, 0))
+        return False
+
+
+class StageProfiler:
+    """구간 통계 저장소 (프로세스당 1개, 모듈 함수로 사용)"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        trace_memory: bool = False,
+        output_dir: str = "./profiles",
+        dump_interval_sec: float = 60.0,
+        name: Optional[str] = None
+    ):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.output_dir = output_dir
+        self.dump_interval_sec = dump_interval_sec
+        self.name = name or os.path.splitext(os.path.basename(sys.argv[0]))[0].lstrip("-") or "python"
+        self.started = datetime.utcnow().isoformat() + "Z"
+        self.stats: Dict[Tuple[str, ...], StageStats] = {}
+        self._lock = threading.Lock()
+        self._dump_thread = None
+
+        if self.enabled:
+            if self.trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            atexit.register(self.dump)
+            if dump_interval_sec > 0:
+                self._dump_thread = threading.Thread(target=self._dump_loop, name="stage-profiler", daemon=True)
+                self._dump_thread.start()
+
+    @classmethod
+    def from_env(cls) -> "StageProfiler":
+        return cls(
+            enabled=_env_flag("STAGE_PROFILE"),
+            trace_memory=_env_flag("STAGE_PROFILE_TRACEMALLOC"),
+            output_dir=os.getenv("STAGE_PROFILE_DIR", "./profiles"),
+            dump_interval_sec=float(os.getenv("STAGE_PROFILE_DUMP_SEC", "60"))
+        )
+
+    def record(self, path: Tuple[str, ...], elapsed_ns: int, alloc_bytes: int = 0):
+        with self._lock:
+            stats = self.stats.get(path)
+            if stats is None:
+                stats = self.stats[path] = StageStats()
+            stats.add(elapsed_ns, alloc_bytes)
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+    def summary(self) -> List[Dict]:
+        """구간별 통계 (경로 순, 자기 시간 = 누적 - 자식 누적)"""
+        with self._lock:
+            items = [(path, s.count, s.total_ns, s.max_ns, s.alloc_bytes, list(s.samples)) for path, s in self.stats.items()]
+
+        child_ns: Dict[Tuple[str, ...], int] = {}
+        for path, _, total_ns, *_ in items:
+            if len(path) > 1:
+                child_ns[path[:-1]] = child_ns.get(path[:-1], 0) + total_ns
+
+        rows = []
+        for path, count, total_ns, max_ns, alloc_bytes, samples in sorted(items):
+            samples.sort()
+            rows.append({
+                "path": ";".join(path),
+                "depth": len(path) - 1,
+                "count": count,
+                "total_ms": total_ns / 1e6,
+                "self_ms": max(total_ns - child_ns.get(path, 0), 0) / 1e6,
+                "p50_us": percentile(samples, 0.5) / 1e3,
+                "p99_us": percentile(samples, 0.99) / 1e3,
+                "max_us": max_ns / 1e3,
+                "alloc_kib": alloc_bytes / 1024 if self.trace_memory else None
+            })
+        return rows
+
+    def folded(self) -> str:
+        """flame graph folded stacks (자기 시간, 마이크로초)"""
+        lines = []
+        for row in self.summary():
+            value = int(row["self_ms"] * 1000)
+            if value > 0:
+                frames = ";".join(frame.replace(" ", "_") for frame in row["path"].split(";"))
+                lines.append(f"{frames} {value}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def format_report(self, limit: int = 30) -> List[str]:
+        """로그용 요약 (누적 시간 상위 limit개, 트리 들여쓰기)"""
+        rows = self.summary()
+        top = set(r["path"] for r in sorted(rows, key=lambda r: r["total_ms"], reverse=True)[:limit])
+        lines = []
+        for row in rows:
+            if row["path"] not in top:
+                continue
+            name = "  " * row["depth"] + row["path"].rsplit(";", 1)[-1]
+            line = (
+                f"{name:<40} {row['count']:>9,}회 | 누적 {row['total_ms']:>10,.1f}ms | "
+                f"p50 {row['p50_us']:>9,.1f}us | p99 {row['p99_us']:>9,.1f}us"
+            )
+            if row["alloc_kib"] is not None:
+                line += f" | 할당 {row['alloc_kib']:>9,.0f}KiB"
+            lines.append(line)
+        return lines
+
+    def dump(self) -> Optional[str]:
+        """folded + JSON 기록 → folded 파일 경로 (비활성/기록할 구간 없음이면 None)"""
+        if not self.enabled or not self.stats:
+            return None
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            base = os.path.join(self.output_dir, f"{self.name}-{os.getpid()}")
+            report = {
+                "name": self.name,
+                "pid": os.getpid(),
+                "started": self.started,
+                "written": datetime.utcnow().isoformat() + "Z",
+                "trace_memory": self.trace_memory,
+                "stages": self.summary()
+            }
+            self._write(base + ".json", json.dumps(report, indent=2))
+            self._write(base + ".folded", self.folded())
+            return base + ".folded"
+        except Exception as e:
+            print(f"⚠️ 프로파일 기록 실패: {e}", file=sys.stderr)
+            return None
+
+    @staticmethod
+    def _write(path: str, text: str):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def _dump_loop(self):
+        while True:
+            time.sleep(self.dump_interval_sec)
+            self.dump()
+
+
+_profiler = StageProfiler.from_env()
+
+
+def enabled() -> bool:
+    return _profiler.enabled
+
+
+def get_profiler() -> StageProfiler:
+    return _profiler
+
+
+def set_name(name: str):
+    """출력 파일 이름 (기본: 실행 스크립트 이름)"""
+    _profiler.name = name
+
+
+def stage(name: str):
+    """중첩 구간 측정 (with 문)"""
+    if not _profiler.enabled:
+        return _NULL_STAGE
+    return _Stage(_profiler, name)
+
+
+def profiled(name: Optional[str] = None):
+    """
+    함수 전체를 구간으로 측정하는 데코레이터 (동기/async 모두)
+
+    비활성이면 원본 함수를 그대로 반환 (호출 오버헤드 없음)
+    """
+    def decorator(fn):
+        if not _profiler.enabled:
+            return fn
+        stage_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with _Stage(_profiler, stage_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Stage(_profiler, stage_name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def dump() -> Optional[str]:
+    return _profiler.dump()
+
+
+def format_report(limit: int = 30) -> List[str]:
+    return _profiler.format_report(limit)
+
+
+def reset():
+    _profiler.reset()
@@ -0,0 +1,20 @@
+"""
+통계 헬퍼 (지연/처리 시간 분포 보고용)
+"""
+from typing import Sequence
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """
+    정렬된 샘플의 분위수 (nearest-rank, 보간 없음)
+
+    Args:
+        ordered: 오름차순 정렬된 샘플
+        q: 분위 (0~1, 예: 0.99)
+
+    Returns:
+        분위수 (샘플이 없으면 0.0)
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
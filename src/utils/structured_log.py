@@ -0,0 +1,346 @@
+"""
+Structured Log
+비동기 로깅 - 큐 핸들러 + 백그라운드 쓰기 스레드, 호출 위치별 속도 제한 / 샘플링, 모듈별 레벨, 핫패스 집계 카운터
+
+    from src.utils import structured_log
+
+    structured_log.setup("scanner", fmt="text")          # 진입점에서 1회 (logging.basicConfig 대체)
+    logger = structured_log.get_logger(__name__)          # 설정 전이면 기본값(plain)으로 자동 설정
+
+    counts = structured_log.counters("scanner.messages")  # 이벤트마다 로그 한 줄 대신 집계
+    counts.incr("ticker")                                 # → 주기마다 "📊 scanner.messages 60s: ticker 45012, ..." 한 줄
+
+- 호출 스레드는 메시지 문자열만 만들어 큐에 넣음 (시각/JSON 포맷과 쓰기는 QueueListener 스레드)
+  큐가 가득 차면 버리고 개수만 집계 (호출 스레드를 막지 않음)
+- 속도 제한 / 샘플링 키: 호출 위치 (로거 이름 + 줄 번호), extra={"log_key": ...}로 지정 가능
+  제한으로 버린 개수는 같은 키의 다음 레코드에 "(+N건 생략)"으로 붙음
+- 샘플링은 INFO 이하만 (WARNING 이상은 속도 제한만)
+- 종료 시 (atexit) 큐에 남은 레코드와 카운터 마지막 구간을 출력, fork된 자식은 스레드를 새로 시작
+
+환경 변수:
+    LOG_LEVEL=INFO          기본 레벨
+    LOG_LEVELS=             모듈별 레벨 (예: "data_processor=WARNING,src.backtesting=INFO")
+    LOG_FORMAT=             plain (메시지만) | text (시각 - 로거 - 레벨 - 메시지) | json (기본: setup 인자)
+    LOG_RATE_LIMIT=100      키당 LOG_RATE_WINDOW초 동안 최대 레코드 수 (0 = 제한 없음)
+    LOG_RATE_WINDOW=10
+    LOG_SAMPLE=             모듈별 INFO 이하 샘플링 비율 (예: "order_executor_service=0.1" → 10건 중 1건)
+    LOG_COUNTER_SEC=60      집계 카운터 출력 주기 (초)
+    LOG_QUEUE_SIZE=10000
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+FORMATS = {
+    "plain": "%(message)s",
+    "text": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+}
+
+
+def _parse_map(text: str) -> Dict[str, str]:
+    """"a=1,b=2" → {"a": "1", "b": "2"}"""
+    result = {}
+    for item in text.split(","):
+        name, sep, value = item.strip().partition("=")
+        if sep and name:
+            result[name.strip()] = value.strip()
+    return result
+
+
+def _match(table: Dict[str, float], name: str) -> Optional[float]:
+    """로거 이름 계층에서 가장 가까운 설정 (a.b.c → a.b.c, a.b, a)"""
+    while name:
+        if name in table:
+            return table[name]
+        name = name.rpartition(".")[0]
+    return None
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON (extra={"fields": {...}}는 최상위 필드로)"""
+
+    def __init__(self, service: str = ""):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if self.service:
+            entry["service"] = self.service
+        fields = getattr(record, "fields", None)
+        if isinstance(fields, dict):
+            entry.update(fields)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RateFilter(logging.Filter):
+    """
+    호출 위치별 속도 제한 + 샘플링 (큐에 넣기 전, 호출 스레드에서 실행)
+
+    키별 상태는 락 없이 갱신 (스레드 경합 시 개수가 약간 어긋날 수 있음)
+    """
+
+    def __init__(self, limit: int, window: float, samples: Dict[str, float]):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        # 비율 → 간격 (0.1 → 10건 중 1건)
+        self.sample_every = {name: max(1, round(1 / rate)) for name, rate in samples.items() if rate > 0}
+        self.state: Dict[object, list] = {}  # 키 → [구간 시작, 구간 내 개수, 생략 개수, 샘플 순번]
+        self.suppressed = 0
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "log_key", None) or (record.name, record.lineno)
+        state = self.state.get(key)
+        if state is None:
+            state = self.state[key] = [record.created, 0, 0, 0]
+
+        if self.sample_every and record.levelno < logging.WARNING:
+            every = _match(self.sample_every, record.name)
+            if every and every > 1:
+                state[3] += 1
+                if state[3] % every != 1:
+                    self.sampled_out += 1
+                    return False
+
+        if self.limit:
+            if record.created - state[0] >= self.window:
+                state[0] = record.created
+                state[1] = 0
+            if state[1] >= self.limit:
+                state[2] += 1
+                self.suppressed += 1
+                return False
+            state[1] += 1
+
+        if state[2]:
+            record.msg = f"{record.getMessage()} (+{state[2]}건 생략)"
+            record.args = None
+            state[2] = 0
+        return True
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """메시지만 만들어 큐에 넣는 핸들러 (포맷은 쓰기 스레드, 큐가 가득 차면 버림)"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 인자는 호출 시점 값으로 고정 (가변 객체), 예외는 호출 스레드에서 문자열로
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class Counters:
+    """
+    핫패스 집계 카운터 (이벤트마다 로그를 남기는 대신 incr, 주기마다 한 줄)
+
+    누적값만 갱신하고 출력 스레드가 직전 스냅샷과의 차이를 계산 (락 없음, 값 유실 없음)
+    """
+
+    __slots__ = ("name", "totals", "last", "logger")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.totals: Dict[str, int] = {}
+        self.last: Dict[str, int] = {}
+        self.logger = logging.getLogger(name)
+
+    def incr(self, key: str, n: int = 1):
+        totals = self.totals
+        totals[key] = totals.get(key, 0) + n
+
+    def flush(self, interval: float):
+        """직전 출력 이후 증가분 한 줄 (없으면 출력 안 함)"""
+        snapshot = dict(self.totals)
+        delta = {key: value - self.last.get(key, 0) for key, value in snapshot.items()}
+        delta = {key: value for key, value in delta.items() if value}
+        self.last = snapshot
+        if not delta:
+            return
+        text = ", ".join(f"{key} {value}" for key, value in sorted(delta.items(), key=lambda kv: -kv[1]))
+        self.logger.info(
+            f"📊 {self.name} {interval:.0f}s: {text}",
+            extra={"fields": {"counter": self.name, "interval_s": round(interval, 1), "counts": delta}, "log_key": self.name}
+        )
+
+
+class _Runtime:
+    """설정 상태 (setup 1회, 다시 호출하면 교체)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.args = ("", None, None, None)  # setup 인자 (fork 후 자식에서 재설정)
+        self.handler: Optional[AsyncQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.rate_filter: Optional[RateFilter] = None
+        self.counters: Dict[str, Counters] = {}
+        self.counter_thread: Optional[threading.Thread] = None
+        self.counter_interval = 60.0
+        self.counter_flushed = time.monotonic()
+
+
+_runtime = _Runtime()
+
+
+def setup(service: str = "", fmt: Optional[str] = None, level: Optional[str] = None,
+          levels: Optional[Dict[str, str]] = None):
+    """
+    루트 로거를 큐 핸들러 + 쓰기 스레드로 설정 (기존 루트 핸들러는 제거)
+
+    Args:
+        service: JSON 출력의 service 필드
+        fmt: 기본 출력 형식 (plain | text | json, LOG_FORMAT이 우선)
+        level: 기본 레벨 (LOG_LEVEL이 우선)
+        levels: 모듈별 기본 레벨 (LOG_LEVELS가 우선)
+    """
+    _runtime.args = (service, fmt, level, levels)
+    fmt = (os.getenv("LOG_FORMAT") or fmt or "plain").lower()
+    level = (os.getenv("LOG_LEVEL") or level or "INFO").upper()
+
+    with _runtime.lock:
+        root = logging.getLogger()
+        _stop_listener()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(JsonFormatter(service) if fmt == "json" else logging.Formatter(FORMATS.get(fmt, FORMATS["plain"])))
+
+        log_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+        handler = AsyncQueueHandler(log_queue)
+        rate_filter = RateFilter(
+            limit=int(os.getenv("LOG_RATE_LIMIT", "100")),
+            window=float(os.getenv("LOG_RATE_WINDOW", "10")),
+            samples={name: float(rate) for name, rate in _parse_map(os.getenv("LOG_SAMPLE", "")).items()}
+        )
+        handler.addFilter(rate_filter)
+        root.addHandler(handler)
+        root.setLevel(getattr(logging, level, logging.INFO))
+
+        # LOG_LEVELS의 항목은 같은 이름과 하위 모듈의 기본값을 덮음
+        overrides = _parse_map(os.getenv("LOG_LEVELS", ""))
+        module_levels = {
+            name: value for name, value in (levels or {}).items()
+            if not any(name == parent or name.startswith(parent + ".") for parent in overrides)
+        }
+        module_levels.update(overrides)
+        for name, module_level in module_levels.items():
+            logging.getLogger(name).setLevel(module_level.upper())
+
+        listener = logging.handlers.QueueListener(log_queue, stream)
+        listener.start()
+
+        _runtime.handler = handler
+        _runtime.listener = listener
+        _runtime.rate_filter = rate_filter
+        _runtime.counter_interval = float(os.getenv("LOG_COUNTER_SEC", "60"))
+
+
+def _stop_listener():
+    if _runtime.listener is not None:
+        _runtime.listener.stop()  # 남은 레코드 쓰기 후 종료
+        _runtime.listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """모듈 로거 (아직 설정 전이면 기본값으로 설정 - 스크립트에서 바로 import해도 출력되도록)"""
+    if _runtime.handler is None:
+        setup()
+    return logging.getLogger(name)
+
+
+def counters(name: str) -> Counters:
+    """이름별 집계 카운터 (같은 이름이면 같은 객체), 첫 호출 시 출력 스레드 시작"""
+    with _runtime.lock:
+        counter = _runtime.counters.get(name)
+        if counter is None:
+            counter = _runtime.counters[name] = Counters(name)
+        if _runtime.counter_thread is None:
+            _runtime.counter_thread = threading.Thread(target=_counter_loop, name="log-counters", daemon=True)
+            _runtime.counter_thread.start()
+    return counter
+
+
+def flush_counters():
+    """카운터 증가분 출력 (주기 스레드 / 종료 시)"""
+    now = time.monotonic()
+    interval = now - _runtime.counter_flushed
+    _runtime.counter_flushed = now
+    for counter in list(_runtime.counters.values()):
+        try:
+            counter.flush(interval)
+        except Exception as e:
+            print(f"⚠️  카운터 출력 실패 ({counter.name}): {e}", file=sys.stderr)
+
+
+def _counter_loop():
+    while True:
+        time.sleep(max(1.0, _runtime.counter_interval))
+        flush_counters()
+
+
+def _after_fork_in_child():
+    """fork된 자식에는 쓰기/카운터 스레드가 없으므로 새로 시작 (Scanner 멀티 프로세스 워커)"""
+    _runtime.lock = threading.Lock()
+    if _runtime.handler is not None:
+        _runtime.listener = None  # 부모의 스레드 (자식에는 없음)
+        setup(*_runtime.args)
+    if _runtime.counter_thread is not None:
+        _runtime.counter_thread = threading.Thread(target=_counter_loop, name="log-counters", daemon=True)
+        _runtime.counter_thread.start()
+    # multiprocessing 자식은 atexit 없이 os._exit → 종료 정리 함수로 등록 (자식 부트스트랩이 정리 목록을 비운 뒤)
+    mp_util = sys.modules.get("multiprocessing.util")
+    if mp_util is not None:
+        mp_util.register_after_fork(_runtime, lambda _: mp_util.Finalize(None, shutdown, exitpriority=100))
+
+
+def stats() -> Dict[str, int]:
+    """로깅 계층 자체 통계 (버린/생략/샘플링 제외 레코드 수, 큐 깊이)"""
+    handler, rate_filter = _runtime.handler, _runtime.rate_filter
+    return {
+        "dropped": handler.dropped if handler else 0,
+        "queued": handler.queue.qsize() if handler else 0,
+        "suppressed": rate_filter.suppressed if rate_filter else 0,
+        "sampled_out": rate_filter.sampled_out if rate_filter else 0,
+    }
+
+
+def shutdown():
+    """카운터 마지막 구간 출력 + 큐 비우기 (atexit 등록)"""
+    if _runtime.counters:
+        flush_counters()
+    with _runtime.lock:
+        _stop_listener()
+
+
+atexit.register(shutdown)
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,645 @@
+"""
+Synthetic Market
+재현 가능한 합성 시장 데이터 (백테스트/벤치마크용)
+
+가격: GBM + 변동성 군집 (로그 변동성 AR(1)) + 점프 (포아송 × 정규)
+거래량: 로그정규 기본량 × |수익률| 비례 × 거래량 폭증 (포아송 발생, AR(1) 감쇠)
+펀딩비: 8시간마다, 직전 8시간 수익률을 따라가는 평균 회귀 값
+호가/티커: 1분봉 안의 가격 경로 (시가 → 저가/고가 → 종가 꺾은선)에서 유도
+
+- 같은 seed + 심볼이면 항상 같은 경로 (심볼 시드는 이름에서 유도 → 심볼을 추가/제거해도 다른 심볼 경로 불변)
+- 1분봉 경로는 1주(10080분) 블록 단위로 생성하고 블록 시작 상태만 체크포인트로 보관
+  → 수백만 봉도 블록 몇 개 분량 메모리로 스트리밍, 상위 타임프레임은 블록 안에서 1분봉을 합성
+- 시작 시각(origin)은 월요일 00:00 UTC 기준 (모든 타임프레임 구간 경계가 블록 경계와 맞음)
+
+출력 형식:
+    bars()            numpy (N, 7) [start_ms, open, high, low, close, volume, turnover]
+    klines_frame()    BybitClient.get_klines와 같은 데이터프레임
+    SyntheticSession  pybit HTTP 대역 (BybitClient(session=...) → BacktestEngine)
+    ws_frames()       Scanner가 받는 public linear WS 프레임 (캡처/리플레이용)
+"""
+import json
+import math
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MINUTE_MS = 60_000
+BLOCK_MINUTES = 10_080  # 1주 (모든 지원 타임프레임의 배수)
+BLOCK_MS = BLOCK_MINUTES * MINUTE_MS
+DEFAULT_ORIGIN_MS = 1_704_067_200_000  # 2024-01-01 00:00 UTC (월요일)
+DEFAULT_HISTORY_DAYS = 200
+FUNDING_MINUTES = 480  # 8시간
+BLOCK_CACHE_SIZE = 16  # 최근 생성 블록 캐시 (심볼 × 블록)
+BOOK_REFRESH_TICKS = 5  # 호가 단 수량 갱신 주기 (100ms 단위)
+
+INTERVAL_MINUTES = {
+    '1': 1, '3': 3, '5': 5, '15': 15, '30': 30, '60': 60, '120': 120, '240': 240,
+    '360': 360, '720': 720, 'D': 1440, 'W': 10_080
+}
+
+# 대표 심볼 시작 가격 (나머지는 심볼 시드로 0.01~1000 로그 균등)
+BASE_PRICES = {'BTCUSDT': 60_000.0, 'ETHUSDT': 3_000.0, 'SOLUSDT': 150.0, 'XRPUSDT': 0.6, 'DOGEUSDT': 0.15}
+
+
+def default_symbols(count: int) -> List[str]:
+    """합성 심볼 이름 (대표 심볼 + SYN0000USDT...)"""
+    symbols = list(BASE_PRICES)[:count]
+    symbols += [f"SYN{i:04d}USDT" for i in range(count - len(symbols))]
+    return symbols
+
+
+def interval_minutes(interval) -> int:
+    """타임프레임 → 분 (M은 길이가 일정하지 않아 미지원)"""
+    minutes = INTERVAL_MINUTES.get(str(interval))
+    if minutes is None:
+        raise ValueError(f"지원하지 않는 타임프레임: {interval} (가능: {list(INTERVAL_MINUTES)})")
+    return minutes
+
+
+def fmt_num(value: float) -> str:
+    """Bybit 응답처럼 지수 표기 없는 최단 숫자 문자열"""
+    return np.format_float_positional(float(value), trim='-')
+
+
+def _step_size(price: float, digits: int) -> float:
+    return 10.0 ** (math.floor(math.log10(price)) - digits)
+
+
+def _hash_uniform(values: np.ndarray, salt: int) -> np.ndarray:
+    """정수 배열 → (0, 1) 균등 난수 (splitmix64, 같은 입력은 항상 같은 값)"""
+    z = values.astype(np.uint64) + np.uint64((salt * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return ((z >> np.uint64(11)).astype(np.float64) + 0.5) / float(1 << 53)
+
+
+def _ar1(shocks: np.ndarray, phi: float, x0: float) -> np.ndarray:
+    """
+    x_t = phi * x_{t-1} + e_t (벡터화)
+
+    x_t = phi^t * (x0 + Σ e_j * phi^-j) 를 phi^-m이 커지지 않는 구간 단위로 계산
+    """
+    n = len(shocks)
+    out = np.empty(n)
+    if phi <= 0:
+        out[:] = shocks
+        return out
+    span = max(1, min(n, int(math.log(1e6) / -math.log(phi)) if phi < 1 else n))
+    powers = phi ** np.arange(1, span + 1)
+    x = x0
+    for begin in range(0, n, span):
+        e = shocks[begin:begin + span]
+        p = powers[:len(e)]
+        out[begin:begin + len(e)] = p * (x + np.cumsum(e / p))
+        x = out[begin + len(e) - 1]
+    return out
+
+
+class _SymbolModel:
+    """심볼별 모델 파라미터 (seed + 심볼 이름으로 결정)"""
+
+    __slots__ = ("symbol", "key", "price0", "drift", "vol", "vol_of_vol", "vol_persistence",
+                 "jump_prob", "jump_scale", "volume_base", "burst_prob", "burst_size", "burst_decay",
+                 "funding_mean", "tick_size", "qty_step", "price_decimals", "qty_decimals")
+
+    def __init__(self, seed: int, symbol: str):
+        self.symbol = symbol
+        self.key = [seed, zlib.crc32(symbol.encode())]
+        rng = np.random.default_rng(self.key)
+
+        self.price0 = BASE_PRICES.get(symbol) or float(10 ** rng.uniform(-2, 3))
+        major = symbol in BASE_PRICES
+        daily_vol = rng.uniform(0.02, 0.04) if major else rng.uniform(0.03, 0.10)
+        self.vol = daily_vol / math.sqrt(1440)  # 1분 수익률 표준편차
+        self.drift = rng.normal(0.0, 0.2) / (365 * 1440)  # 연 ±20% 수준 추세
+        self.vol_of_vol = rng.uniform(0.03, 0.06)
+        self.vol_persistence = rng.uniform(0.995, 0.999)  # 변동성 군집 반감기 약 2~12시간
+        self.jump_prob = rng.uniform(1, 6) / 1440  # 하루 1~6회
+        self.jump_scale = self.vol * rng.uniform(5, 12)
+        daily_turnover = 10 ** (rng.uniform(9, 10) if major else rng.uniform(6.5, 9))  # 24시간 거래대금 (USDT)
+        self.volume_base = daily_turnover / 1440 / self.price0  # 1분 기본 거래량 (코인)
+        self.burst_prob = rng.uniform(2, 10) / 1440
+        self.burst_size = rng.uniform(2, 8)
+        self.burst_decay = rng.uniform(0.8, 0.95)
+        self.funding_mean = rng.normal(0.0001, 0.00005)
+        self.tick_size = _step_size(self.price0, 4)
+        self.qty_step = 10.0 ** max(-3, min(3, -math.floor(math.log10(self.price0)) + 1))
+        self.price_decimals = max(0, -int(math.floor(math.log10(self.tick_size))))
+        self.qty_decimals = max(0, -int(math.floor(math.log10(self.qty_step))))
+
+
+class SyntheticMarketGenerator:
+    """재현 가능한 합성 시장 (전 심볼)"""
+
+    def __init__(
+        self,
+        symbols=20,
+        seed: int = 42,
+        origin_ms: int = DEFAULT_ORIGIN_MS,
+        now_ms: Optional[int] = None
+    ):
+        """
+        Args:
+            symbols: 심볼 목록 또는 개수 (default_symbols)
+            seed: 전체 시드
+            origin_ms: 경로 시작 시각 (월요일 00:00 UTC로 내림)
+            now_ms: 현재 시각 (이보다 늦게 끝나는 봉은 반환하지 않음, 기본 origin + 200일)
+        """
+        if isinstance(symbols, int):
+            symbols = default_symbols(symbols)
+        self.seed = seed
+        self.origin_ms = origin_ms - (origin_ms - DEFAULT_ORIGIN_MS) % BLOCK_MS
+        self.now_ms = now_ms if now_ms is not None else self.origin_ms + DEFAULT_HISTORY_DAYS * 1440 * MINUTE_MS
+        self.models: Dict[str, _SymbolModel] = {s: _SymbolModel(seed, s) for s in symbols}
+
+        # 블록 시작 상태 (log 가격, 로그 변동성 편차, 거래량 폭증) - 심볼별 순서대로 확장
+        self._checkpoints: Dict[str, List[Tuple[float, float, float]]] = {
+            s: [(math.log(m.price0), 0.0, 0.0)] for s, m in self.models.items()
+        }
+        self._cache: "OrderedDict[Tuple[str, int], np.ndarray]" = OrderedDict()
+        # 스트림용 심볼별 1건 캐시 (같은 분의 24시간 통계, 같은 정산 시각의 펀딩비)
+        self._day_cache: Dict[str, Tuple[int, Tuple[float, float, float, float, float]]] = {}
+        self._funding_cache: Dict[str, Tuple[int, float]] = {}
+
+        # 통계
+        self.blocks_generated = 0
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.models)
+
+    def _model(self, symbol: str) -> _SymbolModel:
+        model = self.models.get(symbol)
+        if model is None:
+            raise KeyError(f"합성 시장에 없는 심볼: {symbol}")
+        return model
+
+    # ------------------------------------------------------------------
+    # 1분봉 블록
+    # ------------------------------------------------------------------
+
+    def _generate_block(self, model: _SymbolModel, block: int, state: Tuple[float, float, float]):
+        """블록 1개 (BLOCK_MINUTES × 6: open, high, low, close, volume, turnover) + 다음 블록 시작 상태"""
+        n = BLOCK_MINUTES
+        rng = np.random.default_rng(model.key + [block])
+        log_p0, h0, burst0 = state
+
+        # 변동성 군집: 로그 변동성 편차 AR(1)
+        h = _ar1(rng.standard_normal(n) * model.vol_of_vol, model.vol_persistence, h0)
+        sigma = model.vol * np.exp(h)
+
+        # 수익률 = 추세 + 확산 + 점프
+        jumps = (rng.random(n) < model.jump_prob) * rng.standard_normal(n) * model.jump_scale
+        returns = model.drift - 0.5 * sigma * sigma + sigma * rng.standard_normal(n) + jumps
+        log_close = log_p0 + np.cumsum(returns)
+        close = np.exp(log_close)
+        open_ = np.empty(n)
+        open_[0] = math.exp(log_p0)
+        open_[1:] = close[:-1]
+
+        # 봉 안 변동 폭 (변동성 비례)
+        top = np.maximum(open_, close)
+        bottom = np.minimum(open_, close)
+        high = top * np.exp(np.abs(rng.standard_normal(n)) * sigma * 0.6)
+        low = bottom * np.exp(-np.abs(rng.standard_normal(n)) * sigma * 0.6)
+
+        # 호가 단위 반올림 (반올림 후에도 고가 ≥ 시가/종가 ≥ 저가 유지)
+        tick = model.tick_size
+        open_ = np.maximum(np.round(open_ / tick), 1) * tick
+        close = np.maximum(np.round(close / tick), 1) * tick
+        high = np.maximum(np.round(high / tick) * tick, np.maximum(open_, close))
+        low = np.minimum(np.maximum(np.round(low / tick), 1) * tick, np.minimum(open_, close))
+
+        # 거래량: 기본량 × |수익률| 반응 × 폭증 구간
+        burst_shocks = (rng.random(n) < model.burst_prob) * rng.exponential(model.burst_size, n)
+        burst = _ar1(burst_shocks, model.burst_decay, burst0)
+        activity = 1.0 + 2.0 * np.abs(returns) / model.vol
+        volume = model.volume_base * np.exp(0.5 * rng.standard_normal(n) - 0.125) * activity * (1.0 + burst)
+        step = model.qty_step
+        volume = np.maximum(np.round(volume / step), 1) * step
+        turnover = volume * (open_ + high + low + close) / 4
+
+        bars = np.column_stack((open_, high, low, close, volume, turnover))
+        return bars, (float(log_close[-1]), float(h[-1]), float(burst[-1]))
+
+    def _block(self, symbol: str, block: int) -> np.ndarray:
+        """블록 1분봉 (캐시 → 체크포인트에서 생성)"""
+        key = (symbol, block)
+        bars = self._cache.get(key)
+        if bars is not None:
+            self._cache.move_to_end(key)
+            return bars
+
+        model = self._model(symbol)
+        checkpoints = self._checkpoints[symbol]
+        # 체크포인트가 없는 앞 블록은 순서대로 생성하며 시작 상태를 기록
+        while True:
+            index = min(block, len(checkpoints) - 1)
+            bars, state = self._generate_block(model, index, checkpoints[index])
+            self.blocks_generated += 1
+            if index == len(checkpoints) - 1:
+                checkpoints.append(state)
+            self._remember((symbol, index), bars)
+            if index == block:
+                return bars
+
+    def _remember(self, key: Tuple[str, int], bars: np.ndarray):
+        self._cache[key] = bars
+        self._cache.move_to_end(key)
+        while len(self._cache) > BLOCK_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # 봉
+    # ------------------------------------------------------------------
+
+    def iter_bars(self, symbol: str, interval, start_ms: int, end_ms: int) -> Iterator[np.ndarray]:
+        """
+        [start_ms, end_ms) 안에서 시작하는 봉을 블록 단위 청크로 (각 청크 (k, 7))
+
+        청크는 생성 블록을 복사해 만든 새 배열이므로 호출 측이 보관/수정해도 안전하다.
+        """
+        return self._iter_minutes(symbol, interval_minutes(interval), start_ms, end_ms)
+
+    def _iter_minutes(self, symbol: str, minutes: int, start_ms: int, end_ms: int) -> Iterator[np.ndarray]:
+        length_ms = minutes * MINUTE_MS
+        start_ms = max(start_ms, self.origin_ms)
+        if end_ms <= start_ms:
+            return
+        first_block = (start_ms - self.origin_ms) // BLOCK_MS
+        last_block = (end_ms - 1 - self.origin_ms) // BLOCK_MS
+
+        for block in range(first_block, last_block + 1):
+            minute_bars = self._block(symbol, block)
+            block_start = self.origin_ms + block * BLOCK_MS
+            if minutes == 1:
+                ohlcv = minute_bars
+            else:
+                grouped = minute_bars.reshape(-1, minutes, 6)
+                ohlcv = np.column_stack((
+                    grouped[:, 0, 0],
+                    grouped[:, :, 1].max(axis=1),
+                    grouped[:, :, 2].min(axis=1),
+                    grouped[:, -1, 3],
+                    grouped[:, :, 4].sum(axis=1),
+                    grouped[:, :, 5].sum(axis=1)
+                ))
+            starts = block_start + np.arange(len(ohlcv), dtype=np.int64) * length_ms
+            mask = (starts >= start_ms) & (starts < end_ms)
+            if mask.any():
+                yield np.column_stack((starts[mask], ohlcv[mask]))
+
+    def bars(self, symbol: str, interval, limit: int, end_ms: Optional[int] = None) -> np.ndarray:
+        """end_ms(기본 now_ms)까지 끝난 최근 limit개 봉 (오래된 순, (N, 7))"""
+        end_ms = self.now_ms if end_ms is None else end_ms
+        length_ms = interval_minutes(interval) * MINUTE_MS
+        # 구간이 끝난 봉만 (마지막 봉 시작 ≤ end - 길이)
+        last_start = end_ms - length_ms
+        last_start -= (last_start - self.origin_ms) % length_ms
+        chunks = list(self.iter_bars(symbol, interval, last_start - (limit - 1) * length_ms, last_start + 1))
+        if not chunks:
+            return np.empty((0, 7))
+        return np.concatenate(chunks)[-limit:]
+
+    def klines_frame(self, symbol: str, interval, limit: int, end_ms: Optional[int] = None) -> pd.DataFrame:
+        """BybitClient.get_klines와 같은 형식 (timestamp UTC, 가격/거래량 float)"""
+        bars = self.bars(symbol, interval, limit, end_ms)
+        df = pd.DataFrame(bars[:, 1:], columns=['open', 'high', 'low', 'close', 'volume', 'turnover'])
+        df.insert(0, 'timestamp', pd.to_datetime(bars[:, 0].astype('int64'), unit='ms', utc=True))
+        return df
+
+    def panel(self, interval, limit: int, symbols: Optional[Iterable[str]] = None,
+              end_ms: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """여러 심볼 OHLCV (심볼 → klines_frame)"""
+        return {s: self.klines_frame(s, interval, limit, end_ms) for s in (symbols or self.models)}
+
+    # ------------------------------------------------------------------
+    # 봉 안 가격 경로 / 티커 / 펀딩비 / 호가
+    # ------------------------------------------------------------------
+
+    def _minute(self, symbol: str, ts_ms: int) -> Tuple[int, np.ndarray]:
+        offset = max(0, ts_ms - self.origin_ms)
+        block, rest = divmod(offset, BLOCK_MS)
+        index = rest // MINUTE_MS
+        return self.origin_ms + block * BLOCK_MS + index * MINUTE_MS, self._block(symbol, block)[index]
+
+    @staticmethod
+    def _path_price(bar, fraction: float) -> float:
+        """1분봉 안 꺾은선 경로: 양봉은 시가→저가→고가→종가, 음봉은 시가→고가→저가→종가"""
+        open_, high, low, close = bar[0], bar[1], bar[2], bar[3]
+        points = (open_, low, high, close) if close >= open_ else (open_, high, low, close)
+        position = min(max(fraction, 0.0), 1.0) * 3
+        leg = min(int(position), 2)
+        return points[leg] + (points[leg + 1] - points[leg]) * (position - leg)
+
+    def partial_bar(self, symbol: str, ts_ms: int) -> Tuple[int, float, float, float, float, float, float]:
+        """ts_ms 시점 진행 중 1분봉 (경로상 고가/저가/현재가, 거래량은 경과 비율만큼)"""
+        start, bar = self._minute(symbol, ts_ms)
+        fraction = (ts_ms - start) / MINUTE_MS
+        tick = self.models[symbol].tick_size
+        samples = [self._path_price(bar, f) for f in (0.0, min(fraction, 1 / 3), min(fraction, 2 / 3), fraction)]
+        price = round(samples[-1] / tick) * tick
+        return (start, float(bar[0]), max(samples), min(samples), price,
+                float(bar[4]) * fraction, float(bar[5]) * fraction)
+
+    def price_at(self, symbol: str, ts_ms: int) -> float:
+        return self.partial_bar(symbol, ts_ms)[4]
+
+    def funding_rates(self, symbol: str, start_ms: int, end_ms: int) -> np.ndarray:
+        """[start_ms, end_ms) 펀딩 시각의 펀딩비 (N, 2) [ts_ms, rate]"""
+        model = self._model(symbol)
+        rows = []
+        for chunk in self._iter_minutes(symbol, FUNDING_MINUTES, start_ms - FUNDING_MINUTES * MINUTE_MS, end_ms):
+            for start, open_, _, _, close, _, _ in chunk:
+                settle = int(start) + FUNDING_MINUTES * MINUTE_MS
+                if not start_ms <= settle < end_ms:
+                    continue
+                # 직전 8시간 수익률을 따라가는 프리미엄 + 시각별 고정 잡음
+                noise = np.random.default_rng(model.key + [settle // MINUTE_MS, 1]).normal(0.0, 0.00005)
+                rate = model.funding_mean + 0.05 * math.log(close / open_) + noise
+                rows.append((settle, round(min(max(rate, -0.0075), 0.0075), 6)))
+        return np.array(rows, dtype=float).reshape(-1, 2)
+
+    def funding_rate(self, symbol: str, ts_ms: int) -> float:
+        """ts_ms 시점 예상 펀딩비 (다음 정산 값)"""
+        period = FUNDING_MINUTES * MINUTE_MS
+        settle = ts_ms - (ts_ms - self.origin_ms) % period + period
+        cached = self._funding_cache.get(symbol)
+        if cached and cached[0] == settle:
+            return cached[1]
+        rates = self.funding_rates(symbol, settle, settle + 1)
+        rate = float(rates[0, 1]) if len(rates) else self.models[symbol].funding_mean
+        self._funding_cache[symbol] = (settle, rate)
+        return rate
+
+    def _day_stats(self, symbol: str, minute_start: int) -> Tuple[float, float, float, float, float]:
+        """minute_start 직전 24시간 확정 1분봉 (시가, 고가, 저가, 거래량, 거래대금)"""
+        cached = self._day_cache.get(symbol)
+        if cached and cached[0] == minute_start:
+            return cached[1]
+        day = self.bars(symbol, '1', 1440, end_ms=minute_start)
+        if len(day):
+            stats = (float(day[0, 1]), float(day[:, 2].max()), float(day[:, 3].min()),
+                     float(day[:, 5].sum()), float(day[:, 6].sum()))
+        else:
+            stats = (0.0, 0.0, math.inf, 0.0, 0.0)
+        self._day_cache[symbol] = (minute_start, stats)
+        return stats
+
+    def ticker(self, symbol: str, ts_ms: Optional[int] = None) -> Dict:
+        """Bybit v5 linear 티커 (REST tickers / WS tickers 스냅샷 공용 필드)"""
+        ts_ms = self.now_ms if ts_ms is None else ts_ms
+        model = self._model(symbol)
+        current = self.partial_bar(symbol, ts_ms)
+        prev_price, high, low, volume, turnover = self._day_stats(symbol, current[0])
+        price = current[4]
+        prev_price = prev_price or current[1]
+        high = max(high, current[2])
+        low = min(low, current[3])
+        volume += current[5]
+        turnover += current[6]
+        period = FUNDING_MINUTES * MINUTE_MS
+        tick = model.tick_size
+        price_fmt = f"{{:.{model.price_decimals}f}}".format
+        return {
+            'symbol': symbol,
+            'lastPrice': price_fmt(price),
+            'markPrice': price_fmt(price),
+            'indexPrice': price_fmt(price),
+            'bid1Price': price_fmt(price - tick),
+            'bid1Size': fmt_num(model.qty_step * 100),
+            'ask1Price': price_fmt(price + tick),
+            'ask1Size': fmt_num(model.qty_step * 100),
+            'prevPrice24h': price_fmt(prev_price),
+            'price24hPcnt': f"{(price - prev_price) / prev_price:.6f}",
+            'highPrice24h': price_fmt(high),
+            'lowPrice24h': price_fmt(low),
+            'volume24h': fmt_num(round(volume, 3)),
+            'turnover24h': fmt_num(round(turnover, 4)),
+            'fundingRate': f"{self.funding_rate(symbol, ts_ms):.6f}",
+            'nextFundingTime': str(ts_ms - (ts_ms - self.origin_ms) % period + period),
+            'openInterest': fmt_num(round(volume * 2, 3))
+        }
+
+    def orderbook(self, symbol: str, ts_ms: int, depth: int = 50) -> Dict:
+        """
+        ts_ms 시점 호가 (Bybit orderbook data: {"s", "b", "a"})
+
+        호가 수량은 (가격 단, 갱신 주기)의 해시로 정해진다 → 같은 시각은 항상 같은 호가이고,
+        가격이 움직여도 남아 있는 단은 수량을 유지하며 100ms마다 약 1/5 단만 바뀐다.
+        거래량 폭증 구간일수록 호가가 두꺼움.
+        """
+        model = self._model(symbol)
+        _, bar = self._minute(symbol, ts_ms)
+        center = int(round(self.price_at(symbol, ts_ms) / model.tick_size))
+        levels = np.arange(1, depth + 1, dtype=np.int64)
+        ticks = np.concatenate((np.maximum(center - levels, 1), center + levels)).astype(np.uint64)
+
+        # 단별 갱신 주기 위상이 달라 한 번에 일부 단만 바뀜
+        phase = _hash_uniform(ticks, model.key[1]) * BOOK_REFRESH_TICKS
+        epoch = ((ts_ms // 100 + phase) // BOOK_REFRESH_TICKS).astype(np.uint64)
+        u = _hash_uniform(ticks * np.uint64(1_000_003) + epoch, model.key[1] ^ model.key[0])
+        scale = max(float(bar[4]) / 20, model.qty_step)
+        sizes = -np.log(u) * scale * (1 + 0.05 * np.concatenate((levels, levels)))
+        sizes = np.maximum(np.round(sizes / model.qty_step), 1) * model.qty_step
+
+        price_fmt = f"{{:.{model.price_decimals}f}}".format
+        qty_fmt = f"{{:.{model.qty_decimals}f}}".format
+        tick = model.tick_size
+        rows = [[price_fmt(t * tick), qty_fmt(q)] for t, q in zip(ticks.tolist(), sizes.tolist())]
+        return {'s': symbol, 'b': rows[:depth], 'a': rows[depth:]}
+
+    def instrument(self, symbol: str) -> Dict:
+        """Bybit v5 instruments-info 항목"""
+        model = self._model(symbol)
+        return {
+            'symbol': symbol,
+            'contractType': 'LinearPerpetual',
+            'status': 'Trading',
+            'baseCoin': symbol[:-4],
+            'quoteCoin': 'USDT',
+            'settleCoin': 'USDT',
+            'priceScale': str(model.price_decimals),
+            'leverageFilter': {'minLeverage': '1', 'maxLeverage': '50.00', 'leverageStep': '0.01'},
+            'priceFilter': {
+                'minPrice': fmt_num(model.tick_size),
+                'maxPrice': fmt_num(model.tick_size * 10_000_000),
+                'tickSize': fmt_num(model.tick_size)
+            },
+            'lotSizeFilter': {
+                'maxOrderQty': fmt_num(model.qty_step * 1_000_000),
+                'minOrderQty': fmt_num(model.qty_step),
+                'qtyStep': fmt_num(model.qty_step),
+                'postOnlyMaxOrderQty': fmt_num(model.qty_step * 1_000_000)
+            },
+            'fundingInterval': FUNDING_MINUTES
+        }
+
+    # ------------------------------------------------------------------
+    # WebSocket 스트림
+    # ------------------------------------------------------------------
+
+    def ws_frames(
+        self,
+        start_ms: int,
+        end_ms: int,
+        symbols: Optional[Iterable[str]] = None,
+        ticker_ms: int = 100,
+        orderbook_ms: int = 100,
+        depth: int = 50,
+        kline_ms: int = 1000
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Scanner가 구독하는 public linear 프레임 (시각 순 (ts_ms, JSON))
+
+        - tickers.{s}: 첫 프레임 스냅샷, 이후 변경 필드만 델타
+        - orderbook.{depth}.{s}: 첫 프레임 스냅샷, 이후 u가 1씩 증가하는 델타 (depth 1은 항상 스냅샷)
+        - kline.1.{s}: kline_ms마다 진행 중 봉, 분이 바뀌면 확정 봉 (confirm=true)
+        """
+        symbols = list(symbols or self.models)
+        step = math.gcd(math.gcd(ticker_ms, orderbook_ms), kline_ms)
+        last_tickers: Dict[str, Dict] = {}
+        books: Dict[str, Tuple[Dict[str, str], Dict[str, str], int]] = {}
+
+        for ts in range(start_ms, end_ms, step):
+            for symbol in symbols:
+                if ts % MINUTE_MS == 0 and ts > start_ms:
+                    yield ts, self._kline_frame(symbol, self._confirmed_minute(symbol, ts - MINUTE_MS), True, ts)
+
+                if ts % ticker_ms == 0:
+                    ticker = self.ticker(symbol, ts)
+                    last = last_tickers.get(symbol)
+                    last_tickers[symbol] = ticker
+                    if last is None:
+                        yield ts, json.dumps({'topic': f"tickers.{symbol}", 'type': 'snapshot',
+                                              'data': ticker, 'cs': 0, 'ts': ts})
+                    else:
+                        delta = {k: v for k, v in ticker.items() if last.get(k) != v}
+                        if delta:
+                            delta['symbol'] = symbol
+                            yield ts, json.dumps({'topic': f"tickers.{symbol}", 'type': 'delta',
+                                                  'data': delta, 'cs': 0, 'ts': ts})
+
+                if ts % orderbook_ms == 0:
+                    yield ts, self._book_frame(symbol, ts, depth, books)
+
+                if ts % kline_ms == 0:
+                    yield ts, self._kline_frame(symbol, self.partial_bar(symbol, ts), False, ts)
+
+    def _confirmed_minute(self, symbol: str, start: int) -> Tuple:
+        minute_start, bar = self._minute(symbol, start)
+        return (minute_start, *(float(v) for v in bar))
+
+    @staticmethod
+    def _kline_frame(symbol: str, bar: Tuple, confirm: bool, ts: int) -> str:
+        start, open_, high, low, close, volume, turnover = bar
+        return json.dumps({
+            'topic': f"kline.1.{symbol}",
+            'data': [{
+                'start': start, 'end': start + MINUTE_MS - 1, 'interval': '1',
+                'open': fmt_num(open_), 'close': fmt_num(close), 'high': fmt_num(high), 'low': fmt_num(low),
+                'volume': fmt_num(round(volume, 6)), 'turnover': fmt_num(round(turnover, 6)),
+                'confirm': confirm, 'timestamp': ts
+            }],
+            'ts': ts,
+            'type': 'snapshot'
+        })
+
+    def _book_frame(self, symbol: str, ts: int, depth: int, books: Dict) -> str:
+        data = self.orderbook(symbol, ts, depth)
+        bids, asks = dict(data['b']), dict(data['a'])
+        topic = f"orderbook.{depth}.{symbol}"
+        previous = books.get(symbol)
+        update_id = previous[2] + 1 if previous else 1
+        books[symbol] = (bids, asks, update_id)
+
+        if previous is None or depth == 1:
+            payload = {'s': symbol, 'b': data['b'], 'a': data['a'], 'u': update_id, 'seq': update_id}
+            return json.dumps({'topic': topic, 'type': 'snapshot', 'ts': ts, 'data': payload, 'cts': ts})
+
+        old_bids, old_asks, _ = previous
+        payload = {
+            's': symbol,
+            'b': [[p, q] for p, q in bids.items() if old_bids.get(p) != q] + [[p, '0'] for p in old_bids if p not in bids],
+            'a': [[p, q] for p, q in asks.items() if old_asks.get(p) != q] + [[p, '0'] for p in old_asks if p not in asks],
+            'u': update_id,
+            'seq': update_id
+        }
+        return json.dumps({'topic': topic, 'type': 'delta', 'ts': ts, 'data': payload, 'cts': ts})
+
+    def get_stats(self) -> Dict:
+        return {
+            'symbols': len(self.models),
+            'blocks_generated': self.blocks_generated,
+            'cached_blocks': len(self._cache),
+            'checkpoints': sum(len(c) for c in self._checkpoints.values())
+        }
+
+
+def _envelope(result, code: int = 0, message: str = 'OK') -> Dict:
+    return {'retCode': code, 'retMsg': message, 'result': result, 'retExtInfo': {}, 'time': 0}
+
+
+class SyntheticSession:
+    """
+    pybit HTTP 대역 (시장 데이터 조회만)
+
+    BybitClient(session=SyntheticSession(generator))로 넘기면 BybitClient/BacktestEngine이
+    실제 응답과 같은 형식(문자열 필드, 최신 봉 먼저)을 받는다.
+    """
+
+    def __init__(self, generator: SyntheticMarketGenerator):
+        self.generator = generator
+        self.calls = 0
+
+    def _unknown(self, symbol) -> Optional[Dict]:
+        if symbol and symbol not in self.generator.models:
+            return _envelope({}, 10001, 'Not supported symbols')
+        return None
+
+    def get_kline(self, category='linear', symbol=None, interval='1', limit=200, start=None, end=None, **kwargs):
+        self.calls += 1
+        error = self._unknown(symbol)
+        if error or not symbol:
+            return error or _envelope({}, 10001, 'params error: symbol')
+        try:
+            bars = self.generator.bars(symbol, str(interval), min(int(limit), 1000),
+                                       end_ms=int(end) + 1 if end is not None else None)
+        except ValueError as e:
+            return _envelope({}, 10001, str(e))
+        if start is not None:
+            bars = bars[bars[:, 0] >= int(start)]
+        rows = [[str(int(b[0])), *(fmt_num(v) for v in b[1:])] for b in bars[::-1]]
+        return _envelope({'symbol': symbol, 'category': category, 'list': rows})
+
+    def get_tickers(self, category='linear', symbol=None, **kwargs):
+        self.calls += 1
+        error = self._unknown(symbol)
+        if error:
+            return error
+        symbols = [symbol] if symbol else self.generator.symbols
+        return _envelope({'category': category, 'list': [self.generator.ticker(s) for s in symbols]})
+
+    def get_instruments_info(self, category='linear', symbol=None, **kwargs):
+        self.calls += 1
+        symbols = [symbol] if symbol else self.generator.symbols
+        symbols = [s for s in symbols if s in self.generator.models]
+        return _envelope({'category': category, 'list': [self.generator.instrument(s) for s in symbols],
+                          'nextPageCursor': ''})
+
+    def get_funding_rate_history(self, category='linear', symbol=None, limit=200, startTime=None, endTime=None, **kwargs):
+        self.calls += 1
+        error = self._unknown(symbol)
+        if error or not symbol:
+            return error or _envelope({}, 10001, 'params error: symbol')
+        end_ms = int(endTime) + 1 if endTime is not None else self.generator.now_ms
+        start_ms = int(startTime) if startTime is not None else end_ms - int(limit) * FUNDING_MINUTES * MINUTE_MS
+        rates = self.generator.funding_rates(symbol, start_ms, end_ms)[-int(limit):]
+        rows = [{'symbol': symbol, 'fundingRate': f"{rate:.6f}", 'fundingRateTimestamp': str(int(ts))}
+                for ts, rate in rates[::-1]]
+        return _envelope({'category': category, 'list': rows})
@@ -0,0 +1,187 @@
+"""
+Trace Collector
+trace_context.report() 결과를 모아 구간별 지연 분포 출력
+
+    # 로그 (TRACE_SINK=log, CloudWatch 내보내기 등)
+    python -m src.utils.trace_collector service-*.log
+    aws logs tail /ecs/finder --since 1h | python -m src.utils.trace_collector -
+
+    # Redis (TRACE_SINK=redis)
+    python -m src.utils.trace_collector --redis localhost:6379 --outcome ordered --histogram
+
+- 같은 id의 보고를 합쳐 (서비스마다 자기 구간까지 보고) 시작 시각 순으로 정렬
+- 항목:
+    [stage]         구간 자체 시간 (처리)
+    a → b           앞 구간 끝 ~ 다음 구간 시작 (큐 대기, 폴링 주기, 스케줄 간격)
+    origin → a      트레이스 시작 ~ 첫 구간
+    total           트레이스 시작 ~ 마지막 구간 끝
+- 평균 기준 total 대비 비중이 가장 큰 항목이 먼저 줄여야 할 구간
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.stats import percentile
+from src.utils.trace_context import LOG_PREFIX
+
+# 히스토그램 경계 (ms)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000, 120000, 300000)
+BAR_WIDTH = 40
+
+
+def parse_line(line: str) -> Optional[Dict]:
+    """로그 한 줄 → 보고 (TRACE 접두어 앞의 타임스탬프/로그 형식은 무시)"""
+    index = line.find(LOG_PREFIX + "{")
+    text = line[index + len(LOG_PREFIX):] if index >= 0 else line.strip()
+    if not text.startswith("{"):
+        return None
+    try:
+        record = json.loads(text)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) and record.get("id") else None
+
+
+def read_lines(lines: Iterable[str]) -> List[Dict]:
+    return [record for record in map(parse_line, lines) if record]
+
+
+def read_redis(address: str, key: str, limit: int) -> List[Dict]:
+    import redis
+
+    host, _, port = address.partition(":")
+    client = redis.Redis(host=host or "localhost", port=int(port or 6379), decode_responses=True)
+    return read_lines(client.lrange(key, 0, limit - 1))
+
+
+def merge(records: Iterable[Dict]) -> Dict[str, Dict]:
+    """id별로 보고 합치기 (구간 합집합, 결과는 마지막 보고 기준)"""
+    traces: Dict[str, Dict] = {}
+    for record in records:
+        trace = traces.get(record["id"])
+        if trace is None:
+            trace = traces[record["id"]] = {
+                "id": record["id"], "origin_ms": record.get("origin_ms", 0), "spans": {},
+                "outcome": "", "reported_ms": 0
+            }
+        trace["origin_ms"] = min(trace["origin_ms"], record.get("origin_ms", trace["origin_ms"]))
+        for s in record.get("spans", []):
+            trace["spans"][(s["stage"], s["start"], s["end"])] = s
+        if record.get("reported_ms", 0) >= trace["reported_ms"]:
+            trace["reported_ms"] = record.get("reported_ms", 0)
+            trace["outcome"] = record.get("outcome", "")
+    for trace in traces.values():
+        trace["spans"] = sorted(trace["spans"].values(), key=lambda s: (s["start"], s["end"]))
+    return traces
+
+
+def breakdown(traces: Iterable[Dict]) -> Dict[str, Dict]:
+    """항목별 지연 목록 (ms) + 트레이스 시작 기준 평균 위치 (출력 순서용)"""
+    items: Dict[str, Dict] = defaultdict(lambda: {"values": [], "offsets": []})
+
+    def add(name: str, value: int, offset: int):
+        items[name]["values"].append(value)
+        items[name]["offsets"].append(offset)
+
+    for trace in traces:
+        spans = trace["spans"]
+        if not spans:
+            continue
+        origin = trace["origin_ms"]
+        first = spans[0]
+        add(f"origin → {first['stage']}", first["start"] - origin, 0)
+        for i, s in enumerate(spans):
+            if i > 0:
+                prev = spans[i - 1]
+                add(f"{prev['stage']} → {s['stage']}", s["start"] - prev["end"], prev["end"] - origin)
+            add(f"[{s['stage']}]", s["end"] - s["start"], s["start"] - origin)
+        add("total", max(s["end"] for s in spans) - origin, 1 << 62)
+    return items
+
+
+def histogram(values: List[int]) -> List[str]:
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for value in values:
+        index = 0
+        while index < len(BUCKETS_MS) and value > BUCKETS_MS[index]:
+            index += 1
+        counts[index] += 1
+    peak = max(counts) or 1
+    lines = []
+    for index, count in enumerate(counts):
+        if not count:
+            continue
+        label = f"<= {BUCKETS_MS[index]:>6}ms" if index < len(BUCKETS_MS) else f" > {BUCKETS_MS[-1]:>6}ms"
+        lines.append(f"      {label} {'#' * max(1, count * BAR_WIDTH // peak):<{BAR_WIDTH}} {count}")
+    return lines
+
+
+def format_report(traces: Dict[str, Dict], show_histogram: bool = False) -> List[str]:
+    items = breakdown(traces.values())
+    outcomes: Dict[str, int] = defaultdict(int)
+    for trace in traces.values():
+        outcomes[trace["outcome"] or "?"] += 1
+
+    lines = [
+        f"트레이스 {len(traces)}개 | 결과: " + ", ".join(f"{k} {v}" for k, v in sorted(outcomes.items())),
+        f"{'항목':<48} {'n':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} {'비중':>6}"
+    ]
+    if not items:
+        return lines
+
+    total_mean = sum(items["total"]["values"]) / len(items["total"]["values"]) if "total" in items else 0
+    order = sorted(items.items(), key=lambda kv: percentile(sorted(kv[1]["offsets"]), 0.5))
+    worst = max(
+        (name for name in items if name != "total"),
+        key=lambda name: sum(items[name]["values"]) / len(items[name]["values"])
+    )
+    for name, item in order:
+        ordered = sorted(item["values"])
+        mean = sum(ordered) / len(ordered)
+        share = f"{mean / total_mean * 100:5.1f}%" if total_mean and name != "total" else ""
+        mark = " ◀" if name == worst else ""
+        lines.append(
+            f"{name:<48} {len(ordered):>6} {percentile(ordered, 0.5):>7}ms {percentile(ordered, 0.9):>7}ms "
+            f"{percentile(ordered, 0.99):>7}ms {ordered[-1]:>7}ms {share:>6}{mark}"
+        )
+        if show_histogram:
+            lines.extend(histogram(ordered))
+    return lines
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="신호 → 주문 구간별 지연 분포")
+    parser.add_argument("files", nargs="*", help="TRACE 로그 파일 (- 는 stdin)")
+    parser.add_argument("--redis", help="host:port (TRACE_SINK=redis 수집 LIST)")
+    parser.add_argument("--key", default="trace:reports", help="Redis LIST 키")
+    parser.add_argument("--limit", type=int, default=100000, help="Redis에서 읽을 최근 보고 수")
+    parser.add_argument("--outcome", help="최종 결과가 이 값인 트레이스만 (예: ordered)")
+    parser.add_argument("--stage", help="이 구간을 지난 트레이스만 (예: finder.find)")
+    parser.add_argument("--histogram", action="store_true", help="항목별 히스토그램 출력")
+    args = parser.parse_args(argv)
+
+    records: List[Dict] = []
+    if args.redis:
+        records.extend(read_redis(args.redis, args.key, args.limit))
+    for path in args.files:
+        if path == "-":
+            records.extend(read_lines(sys.stdin))
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                records.extend(read_lines(f))
+    if not args.redis and not args.files:
+        records.extend(read_lines(sys.stdin))
+
+    traces = merge(records)
+    if args.outcome:
+        traces = {k: t for k, t in traces.items() if t["outcome"] == args.outcome}
+    if args.stage:
+        traces = {k: t for k, t in traces.items() if any(s["stage"] == args.stage for s in t["spans"])}
+
+    print("\n".join(format_report(traces, args.histogram)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Trace Context
+신호 → 주문 구간별 지연 추적 (서비스 간 메시지/아이템에 함께 실어 보냄)
+
+    from src.utils import trace_context
+    from src.utils.trace_context import span
+
+    trace = trace_context.extract(message) or trace_context.new_trace()
+    with span(trace, "finder.find"):
+        ...
+    trace_context.inject(position, trace)      # RabbitMQ 본문 / DynamoDB 아이템 / Redis 페이로드
+    trace_context.report(trace, "saved")       # 수집기로 전달 (TRACE_SINK)
+
+트레이스 형식 (JSON / DynamoDB 그대로 저장 가능하도록 정수 ms만 사용):
+    {"id": "9f1c...", "origin_ms": 1700000000000,
+     "spans": [{"stage": "selector.query", "start": ..., "end": ...}, ...]}
+
+- 각 서비스는 자기 구간(span)만 추가하고 다음 단계로 넘김 → 구간 사이 간격이 큐/폴링 대기 시간
+- report()는 서비스별 시점의 스냅샷을 내보내고, 수집기(trace_collector)가 id로 합쳐 구간별 분포 계산
+- 시각은 호스트 벽시계 (서비스 간 간격에는 호스트 간 시계 차이가 섞임, AWS NTP 기준 보통 수 ms)
+
+환경 변수:
+    TRACE_SINK=off                  off (기본, 전파만) | log (stdout "TRACE {json}" 한 줄) | redis (LIST)
+    TRACE_REDIS_KEY=trace:reports   redis 싱크 LIST 키 (REDIS_HOST/REDIS_PORT 사용)
+    TRACE_REDIS_MAX=100000          LIST 최대 길이
+"""
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, Optional
+
+TRACE_KEY = "trace"
+LOG_PREFIX = "TRACE "
+MAX_SPANS = 32  # 메시지 크기 상한 (재시도 루프 등)
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def new_trace(origin_ms: Optional[int] = None) -> Dict:
+    """
+    새 트레이스
+
+    Args:
+        origin_ms: 시작 시각 (기본 현재, 거래소 봉 마감 시각 등 실제 원인 시각을 넘길 수 있음)
+    """
+    return {
+        "id": uuid.uuid4().hex[:16],
+        "origin_ms": int(origin_ms) if origin_ms is not None else now_ms(),
+        "spans": []
+    }
+
+
+def add_span(trace: Optional[Dict], stage: str, start_ms: int, end_ms: Optional[int] = None):
+    """구간 기록 (trace가 None이면 무시)"""
+    if trace is None:
+        return
+    spans = trace.setdefault("spans", [])
+    if len(spans) >= MAX_SPANS:
+        return
+    spans.append({"stage": stage, "start": int(start_ms), "end": int(end_ms if end_ms is not None else now_ms())})
+
+
+@contextmanager
+def span(trace: Optional[Dict], stage: str):
+    """with 블록 실행 시간을 구간으로 기록"""
+    start = now_ms()
+    try:
+        yield trace
+    finally:
+        add_span(trace, stage, start)
+
+
+def _plain(value):
+    """DynamoDB Decimal → int"""
+    if isinstance(value, Decimal):
+        return int(value)
+    return value
+
+
+def extract(payload: Optional[Dict]) -> Optional[Dict]:
+    """메시지/아이템에서 트레이스 꺼내기 (없거나 형식이 다르면 None, DynamoDB Decimal은 정수로)"""
+    if not isinstance(payload, dict):
+        return None
+    trace = payload.get(TRACE_KEY)
+    if not isinstance(trace, dict) or not trace.get("id"):
+        return None
+    return {
+        "id": str(trace["id"]),
+        "origin_ms": _plain(trace.get("origin_ms", 0)),
+        "spans": [
+            {"stage": s.get("stage", "?"), "start": _plain(s.get("start", 0)), "end": _plain(s.get("end", 0))}
+            for s in trace.get("spans", []) if isinstance(s, dict)
+        ]
+    }
+
+
+def inject(payload: Dict, trace: Optional[Dict]) -> Dict:
+    """트레이스를 메시지/아이템에 넣기 (현재 상태 복사본, 이후 구간 추가와 분리)"""
+    if trace is not None:
+        payload[TRACE_KEY] = {
+            "id": trace["id"],
+            "origin_ms": trace["origin_ms"],
+            "spans": [dict(s) for s in trace.get("spans", [])]
+        }
+    return payload
+
+
+# ==================== 수집기 전달 ====================
+
+class _RedisSink:
+    """백그라운드 스레드에서 LPUSH (호출 스레드/이벤트 루프를 막지 않음)"""
+
+    def __init__(self):
+        self.key = os.getenv("TRACE_REDIS_KEY", "trace:reports")
+        self.max_len = int(os.getenv("TRACE_REDIS_MAX", "100000"))
+        self.queue: queue.Queue = queue.Queue(maxsize=10000)
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._run, name="trace-sink", daemon=True)
+        self.thread.start()
+
+    def put(self, line: str):
+        try:
+            self.queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        import redis  # 싱크를 쓰는 서비스만 필요
+
+        client = redis.Redis(host=os.getenv("REDIS_HOST", "localhost"), port=int(os.getenv("REDIS_PORT", "6379")))
+        while True:
+            lines = [self.queue.get()]
+            while len(lines) < 500:
+                try:
+                    lines.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.lpush(self.key, *lines)
+                pipe.ltrim(self.key, 0, self.max_len - 1)
+                pipe.execute()
+            except Exception as e:
+                self.dropped += len(lines)
+                print(f"⚠️  트레이스 전송 실패 ({len(lines)}건): {e}", file=sys.stderr)
+                time.sleep(1)
+
+
+_sink_mode = os.getenv("TRACE_SINK", "off").lower()
+_redis_sink: Optional[_RedisSink] = None
+_lock = threading.Lock()
+
+
+def configure(sink: str):
+    """싱크 변경 (off | log | redis)"""
+    global _sink_mode
+    _sink_mode = sink.lower()
+
+
+def enabled() -> bool:
+    return _sink_mode in ("log", "redis")
+
+
+def report(trace: Optional[Dict], outcome: str = "", service: str = ""):
+    """
+    현재 트레이스 스냅샷을 수집기로 전달 (TRACE_SINK=off면 무시)
+
+    Args:
+        outcome: 이 시점 결과 (published/saved/ordered/skipped 등, 마지막 보고가 최종 결과)
+        service: 보고한 서비스 (HOSTNAME 기본)
+    """
+    global _redis_sink
+    if trace is None or not enabled():
+        return
+    record = {
+        "id": trace["id"],
+        "origin_ms": trace["origin_ms"],
+        "spans": trace.get("spans", []),
+        "outcome": outcome,
+        "service": service or os.getenv("HOSTNAME", ""),
+        "reported_ms": now_ms()
+    }
+    line = json.dumps(record, separators=(",", ":"), default=_plain)
+    if _sink_mode == "log":
+        sys.stdout.write(LOG_PREFIX + line + "\n")
+        sys.stdout.flush()
+        return
+    if _redis_sink is None:
+        with _lock:
+            if _redis_sink is None:
+                _redis_sink = _RedisSink()
+    _redis_sink.put(line)
@@ -4,7 +4,6 @@
 - 개별 코인 추세 (30분/1시간)
 """
 import pandas as pd
-from config.config import Config
 
 class TrendAnalyzer:
     
@@ -48,10 +47,17 @@ class TrendAnalyzer:
         # 가격 변화율
         price_change_pct = ((latest['close'] - first['close']) / first['close']) * 100
         
-        # 추세 판단
-        ma_5 = latest['ma_5']
-        ma_20 = latest['ma_20']
+        return TrendAnalyzer.classify_btc_trend(latest['ma_5'], latest['ma_20'], price_change_pct)
+    
+    @staticmethod
+    def classify_btc_trend(ma_5, ma_20, price_change_pct):
+        """
+        비트코인 추세 분류 (get_btc_trend와 스트리밍 평가기 공용)
         
+        Args:
+            ma_5, ma_20: 1분봉 종가 이동평균
+            price_change_pct: 분석 기간 가격 변화율 (%)
+        """
         # 추세 강도 계산 (MA 간격)
         if ma_20 > 0:
             ma_diff_pct = ((ma_5 - ma_20) / ma_20) * 100
@@ -124,10 +130,18 @@ class TrendAnalyzer:
         volume_second_half = recent_df.iloc[len(recent_df)//2:]['volume'].mean()
         volume_trend = 'INCREASING' if volume_second_half > volume_first_half else 'DECREASING'
         
-        # 이동평균
-        ma_5 = latest['ma_5']
-        ma_20 = latest['ma_20']
+        return TrendAnalyzer.classify_coin_trend(latest['ma_5'], latest['ma_20'], price_change_pct, volume_trend)
+    
+    @staticmethod
+    def classify_coin_trend(ma_5, ma_20, price_change_pct, volume_trend):
+        """
+        개별 코인 추세 분류 (get_coin_trend와 스트리밍 평가기 공용)
         
+        Args:
+            ma_5, ma_20: 최근 N봉 기준 이동평균 (부족하면 NaN)
+            price_change_pct: 최근 N봉 가격 변화율 (%)
+            volume_trend: 'INCREASING' | 'DECREASING'
+        """
         # 추세 강도 계산
         if ma_20 > 0:
             ma_diff_pct = ((ma_5 - ma_20) / ma_20) * 100